@@ -3,27 +3,18 @@ import importlib
 import logging
 import os
 import sys
-from typing import Dict, Any  # noqa: F401
+from typing import Dict, Any, Optional  # noqa: F401
 
 from flask import Flask, Blueprint
 from flask_restful import Api
 
-from metadata_service.api.column import ColumnDescriptionAPI
-from metadata_service.api.healthcheck import healthcheck
-from metadata_service.api.popular_tables import PopularTablesAPI
-from metadata_service.api.system import Neo4jDetailAPI
-from metadata_service.api.table \
-    import TableDetailAPI, TableOwnerAPI, TableTagAPI, TableDescriptionAPI
-from metadata_service.api.tag import TagAPI
-from metadata_service.api.user import UserDetailAPI, UserFollowAPI, UserOwnAPI, UserReadAPI
-
 # For customized flask use below arguments to override.
 FLASK_APP_MODULE_NAME = os.getenv('FLASK_APP_MODULE_NAME')
 FLASK_APP_CLASS_NAME = os.getenv('FLASK_APP_CLASS_NAME')
 FLASK_APP_KWARGS_DICT_STR = os.getenv('FLASK_APP_KWARGS_DICT')
 
 
-def create_app(*, config_module_class: str) -> Flask:
+def create_app(*, config_module_class: str, proxy_eager_init: Optional[bool] =None) -> Flask:
     """
     Creates app in function so that flask with flask extensions can be
     initialized with specific config. Here it defines the route of APIs
@@ -36,8 +27,35 @@ def create_app(*, config_module_class: str) -> Flask:
     More on: http://flask.pocoo.org/docs/1.0/config/
 
     :param config_module_class: name of the config (TODO: Implement config.py)
+    :param proxy_eager_init: overrides config.PROXY_EAGER_INIT if set
     :return: Flask
     """
+    # Imported here rather than at the top of the module, so that importing a module of the package (entities,
+    # config, tools) doesn't import every API. Proxy backends are imported by get_proxy_client, once selected.
+    from metadata_service import config
+    from metadata_service.api.changes import TableChangesAPI
+    from metadata_service.api.column import ColumnDescriptionAPI
+    from metadata_service.api.debug import HotKeysAPI, ProfileAPI, ProfileListAPI
+    from metadata_service.api.export import TableExportAPI
+    from metadata_service.api.healthcheck import healthcheck, readiness
+    from metadata_service.api.metrics import metrics
+    from metadata_service.api.popular_tables import PopularTablesAPI
+    from metadata_service.api.system import Neo4jDetailAPI
+    from metadata_service.api.table \
+        import TableDetailAPI, TableOwnerAPI, TableTagAPI, TableDescriptionAPI
+    from metadata_service.api.tag import TagAPI
+    from metadata_service.api.user import UserDetailAPI, UserFollowAPI, UserOwnAPI, UserReadAPI
+    from metadata_service.compression import init_compression
+    from metadata_service.hot_keys import init_hot_keys
+    from metadata_service.metrics import init_metrics
+    from metadata_service.profiler import init_profiler
+    from metadata_service.proxy import init_proxy_client
+    from metadata_service.proxy.statsd_utilities import init_statsd
+    from metadata_service.response_cache import init_response_cache
+    from metadata_service.server_timing import init_server_timing
+    from metadata_service.table_filter import init_table_filter
+    from metadata_service.write_hooks import init_write_hooks
+
     if FLASK_APP_MODULE_NAME and FLASK_APP_CLASS_NAME:
         print('Using requested Flask module {module_name} and class {class_name}'
               .format(module_name=FLASK_APP_MODULE_NAME, class_name=FLASK_APP_CLASS_NAME), file=sys.stderr)
@@ -57,6 +75,8 @@ def create_app(*, config_module_class: str) -> Flask:
     config_module_class = \
         os.getenv('METADATA_SVC_CONFIG_MODULE_CLASS') or config_module_class
     app.config.from_object(config_module_class)
+    if proxy_eager_init is not None:
+        app.config[config.PROXY_EAGER_INIT] = proxy_eager_init
 
     logging.basicConfig(format=app.config.get('LOG_FORMAT'), datefmt=app.config.get('LOG_DATE_FORMAT'))
     logging.getLogger().setLevel(app.config.get('LOG_LEVEL'))
@@ -65,6 +85,8 @@ def create_app(*, config_module_class: str) -> Flask:
 
     api_bp = Blueprint('api', __name__)
     api_bp.add_url_rule('/healthcheck', 'healthcheck', healthcheck)
+    api_bp.add_url_rule('/readiness', 'readiness', readiness)
+    api_bp.add_url_rule('/metrics', 'metrics', metrics)
 
     api = Api(api_bp)
 
@@ -85,6 +107,10 @@ def create_app(*, config_module_class: str) -> Flask:
                      '/latest_updated_ts')
     api.add_resource(TagAPI,
                      '/tags/')
+    api.add_resource(TableExportAPI,
+                     '/export/tables')
+    api.add_resource(TableChangesAPI,
+                     '/changes')
     api.add_resource(UserDetailAPI,
                      '/user/<path:user_id>')
     api.add_resource(UserFollowAPI,
@@ -96,6 +122,23 @@ def create_app(*, config_module_class: str) -> Flask:
     api.add_resource(UserReadAPI,
                      '/user/<path:user_id>/read/',
                      '/user/<path:user_id>/read/<resource_type>/<path:table_uri>')
+    api.add_resource(ProfileListAPI,
+                     '/debug/profiles')
+    api.add_resource(ProfileAPI,
+                     '/debug/profiles/<profile_id>')
+    api.add_resource(HotKeysAPI,
+                     '/debug/hot_keys')
     app.register_blueprint(api_bp)
 
+    init_metrics(app)
+    init_statsd(app)
+    init_server_timing(app)
+    init_profiler(app)
+    init_compression(app)
+    init_write_hooks(app)
+    init_hot_keys(app)
+    init_response_cache(app)
+    init_table_filter(app)
+    init_proxy_client(app)
+
     return app
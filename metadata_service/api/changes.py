@@ -0,0 +1,34 @@
+from http import HTTPStatus
+from typing import Iterable, Union, Mapping
+
+from flask_restful import Resource, inputs, reqparse
+
+from metadata_service.proxy import get_proxy_client
+
+
+class TableChangesAPI(Resource):
+    """
+    Change feed of the tables whose description, tags, owners or columns have been modified since a given time.
+    It lets downstream consumers (e.g. search index) update incrementally instead of re-crawling all the tables.
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('since', type=inputs.natural, required=True, location='args',
+                                 help='since needs to be epoch seconds')
+        self.parser.add_argument('cursor', type=str, default='', location='args')
+        self.parser.add_argument('limit', type=inputs.int_range(1, 10000), default=1000, location='args')
+
+        super(TableChangesAPI, self).__init__()
+
+    def get(self) -> Iterable[Union[Mapping, int, None]]:
+        """
+        Returns one page of modified table uris, and cursor of the next page if there's more.
+        """
+        args = self.parser.parse_args()
+        table_uris, next_cursor = self.client.get_tables_modified_since(since=args['since'],
+                                                                        cursor=args['cursor'],
+                                                                        num_entries=args['limit'])
+        return {'table_uris': table_uris, 'next_cursor': next_cursor}, HTTPStatus.OK
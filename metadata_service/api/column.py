@@ -5,6 +5,7 @@ from flask_restful import Resource, reqparse
 
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import get_proxy_client
+from metadata_service.table_filter import check_table_may_exist
 
 
 class ColumnDescriptionAPI(Resource):
@@ -20,32 +21,36 @@ class ColumnDescriptionAPI(Resource):
         super(ColumnDescriptionAPI, self).__init__()
 
     def put(self,
-            column_id: str,
+            table_uri: str,
+            column_name: str,
             description_val: str) -> Iterable[Union[dict, tuple, int, None]]:
         """
         Updates column description
         """
         try:
-            self.client.put_column_description(column_id=column_id,
+            self.client.put_column_description(table_uri=table_uri,
+                                               column_name=column_name,
                                                description=description_val)
 
             return None, HTTPStatus.OK
 
         except NotFoundException:
-            msg = 'column {} does not exist'.format(column_id)
+            msg = 'table_uri {} with column {} does not exist'.format(table_uri, column_name)
             return {'message': msg}, HTTPStatus.NOT_FOUND
 
-    def get(self, column_id: str) -> Union[tuple, int, None]:
+    def get(self, table_uri: str, column_name: str) -> Union[tuple, int, None]:
         """
         Gets column descriptions in Neo4j
         """
         try:
-            description = self.client.get_column_description(column_id=column_id)
+            check_table_may_exist(table_uri)
+            description = self.client.get_column_description(table_uri=table_uri,
+                                                             column_name=column_name)
 
             return {'description': description}, HTTPStatus.OK
 
         except NotFoundException:
-            msg = 'column {} does not exist'.format(column_id)
+            msg = 'table_uri {} with column {} does not exist'.format(table_uri, column_name)
             return {'message': msg}, HTTPStatus.NOT_FOUND
 
         except Exception:
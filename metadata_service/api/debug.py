@@ -0,0 +1,81 @@
+import io
+import pstats
+from http import HTTPStatus
+from typing import Any, Iterable, Mapping, Union  # noqa: F401
+
+from flask import Response, current_app, send_file
+from flask_restful import Resource, abort, inputs, reqparse
+
+from metadata_service import config
+from metadata_service.hot_keys import TABLE_KIND, USER_KIND, get_hot_keys
+from metadata_service.profiler import PROFILE_SUFFIX, get_profile_info, get_profile_path, list_profile_ids
+
+
+def _abort_if_profiler_disabled() -> None:
+    if not current_app.config[config.REQUEST_PROFILER_ENABLED]:
+        abort(HTTPStatus.NOT_FOUND, message='Request profiler is not enabled')
+
+
+class ProfileListAPI(Resource):
+    """
+    Lists the request profiles stored by metadata_service.profiler, latest first
+    """
+
+    def get(self) -> Iterable[Union[Mapping, int, None]]:
+        _abort_if_profiler_disabled()
+        profiles = [get_profile_info(profile_id) for profile_id in list_profile_ids()]
+        return {'profiles': [info for info in profiles if info is not None]}, HTTPStatus.OK
+
+
+class ProfileAPI(Resource):
+    """
+    Downloads a request profile in pstats format (e.g. for snakeviz), or as text with format=text
+    """
+
+    def __init__(self) -> None:
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('format', type=str, choices=('pstats', 'text'), default='pstats', location='args')
+        self.parser.add_argument('sort', type=str, default='cumulative', location='args')
+        self.parser.add_argument('limit', type=inputs.positive, default=50, location='args')
+
+        super(ProfileAPI, self).__init__()
+
+    def get(self, profile_id: str) -> Any:
+        _abort_if_profiler_disabled()
+        args = self.parser.parse_args()
+        path = get_profile_path(profile_id)
+        if path is None:
+            abort(HTTPStatus.NOT_FOUND, message='Profile {} does not exist'.format(profile_id))
+
+        if args['format'] == 'text':
+            output = io.StringIO()
+            try:
+                pstats.Stats(path, stream=output).sort_stats(args['sort']).print_stats(args['limit'])
+            except KeyError:
+                abort(HTTPStatus.BAD_REQUEST, message='Unknown sort key {}'.format(args['sort']))
+            return Response(output.getvalue(), mimetype='text/plain')
+
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                         attachment_filename=profile_id + PROFILE_SUFFIX)
+
+
+class HotKeysAPI(Resource):
+    """
+    Lists the most requested tables and users of the process serving the request, with their estimated number of
+    requests and its max overestimation (see metadata_service.hot_keys)
+    """
+
+    def __init__(self) -> None:
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('limit', type=inputs.positive, default=20, location='args')
+
+        super(HotKeysAPI, self).__init__()
+
+    def get(self) -> Iterable[Union[Mapping, int, None]]:
+        if not current_app.config[config.HOT_KEYS_ENABLED]:
+            abort(HTTPStatus.NOT_FOUND, message='Hot keys tracking is not enabled')
+        limit = self.parser.parse_args()['limit']
+        return {
+            'tables': [hot_key._asdict() for hot_key in get_hot_keys(TABLE_KIND, limit)],
+            'users': [hot_key._asdict() for hot_key in get_hot_keys(USER_KIND, limit)],
+        }, HTTPStatus.OK
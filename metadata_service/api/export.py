@@ -0,0 +1,41 @@
+import json
+from typing import Iterator
+
+from flask import Response, current_app, stream_with_context
+from flask_restful import Resource, fields
+
+from metadata_service import config
+from metadata_service.api.table import tag_fields, user_fields
+from metadata_service.proxy import get_proxy_client
+from metadata_service.server_timing import marshal
+
+table_export_fields = {
+    'key': fields.String,
+    'database': fields.String,
+    'cluster': fields.String,
+    'schema': fields.String,
+    'table_name': fields.String(attribute='name'),
+    'table_description': fields.String(attribute='description'),  # Optional
+    'tags': fields.List(fields.Nested(tag_fields)),  # Can be an empty list
+    'owners': fields.List(fields.Nested(user_fields))  # Can be an empty list
+}
+
+
+class TableExportAPI(Resource):
+    """
+    Streams all the tables as newline delimited JSON (one table per line).
+    Tables are fetched from proxy in batches and written as they arrive, so that memory usage of the service
+    does not grow with the size of the catalog.
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+
+    def get(self) -> Response:
+        tables = self.client.export_tables(batch_size=current_app.config[config.EXPORT_BATCH_SIZE])
+
+        def generate() -> Iterator[str]:
+            for table in tables:
+                yield json.dumps(marshal(table, table_export_fields)) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
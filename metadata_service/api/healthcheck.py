@@ -1,5 +1,72 @@
-from typing import Tuple
+import logging
+import time
+from threading import Lock
+from typing import Optional, Tuple  # noqa: F401
+
+from flask import Response, current_app, jsonify
+
+from metadata_service import config
+from metadata_service.proxy import get_proxy_client
+
+LOGGER = logging.getLogger(__name__)
 
 
 def healthcheck() -> Tuple[str, int]:
     return '', 200
+
+
+class _ReadinessCheck:
+    """
+    Result of the last backend check, shared by the threads of the process. A single thread checks the backend
+    once the result is older than config.READINESS_CACHE_SEC, the others answer with the previous result meanwhile.
+    """
+    def __init__(self) -> None:
+        self.checked_at = None  # type: Optional[float]
+        self.error = None  # type: Optional[str]
+        self.lock = Lock()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.checked_at = None
+            self.error = None
+
+
+_readiness_check = _ReadinessCheck()
+
+
+def _check_backend() -> Optional[str]:
+    """
+    :return: None if the backend of the proxy client can be reached, the error otherwise
+    """
+    try:
+        get_proxy_client().check_connectivity()
+        return None
+    except Exception as e:
+        LOGGER.exception('Readiness check failed')
+        return '{}: {}'.format(type(e).__name__, e)
+
+
+def readiness() -> Response:
+    """
+    Ready (200) when the backend of the proxy client can be reached, 503 otherwise. Unlike /healthcheck, which only
+    tells the process is up, it is meant for the readiness probe of the orchestrator and the load balancer.
+    """
+    check = _readiness_check
+    max_age_sec = current_app.config[config.READINESS_CACHE_SEC]
+    now = time.monotonic()
+    # Only one thread checks, the others don't wait for it if there is a previous result
+    if check.checked_at is None or now - check.checked_at >= max_age_sec:
+        if check.lock.acquire(blocking=check.checked_at is None):
+            try:
+                if check.checked_at is None or now - check.checked_at >= max_age_sec:
+                    check.error = _check_backend()
+                    check.checked_at = time.monotonic()
+            finally:
+                check.lock.release()
+
+    error = check.error
+    if error is not None:
+        response = jsonify({'status': 'unavailable', 'error': error})
+        response.status_code = 503
+        return response
+    return jsonify({'status': 'ready'})
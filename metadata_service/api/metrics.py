@@ -0,0 +1,13 @@
+from flask import Response
+
+from metadata_service.metrics import CONTENT_TYPE, get_metrics
+
+
+def metrics() -> Response:
+    """
+    Metrics of this service, aggregated over all the worker processes, in Prometheus text format
+    """
+    service_metrics = get_metrics()
+    if service_metrics is None:
+        return Response('Metrics are not enabled\n', status=404, mimetype='text/plain')
+    return Response(service_metrics.registry.exposition(), content_type=CONTENT_TYPE)
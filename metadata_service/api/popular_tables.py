@@ -1,9 +1,10 @@
 from http import HTTPStatus
 from typing import Iterable, Union, Mapping
 
-from flask_restful import Resource, fields, marshal
+from flask_restful import Resource, fields
 
 from metadata_service.proxy import get_proxy_client
+from metadata_service.server_timing import marshal
 
 popular_table_fields = {
     'database': fields.String,
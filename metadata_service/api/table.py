@@ -1,10 +1,12 @@
 from http import HTTPStatus
 from typing import Iterable, Mapping, Union, Any
 
-from flask_restful import Resource, fields, reqparse, marshal
+from flask_restful import Resource, fields, reqparse
 
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import get_proxy_client
+from metadata_service.server_timing import marshal
+from metadata_service.table_filter import check_table_may_exist
 
 
 user_fields = {
@@ -89,13 +91,14 @@ class TableDetailAPI(Resource):
     def __init__(self) -> None:
         self.client = get_proxy_client()
 
-    def get(self, table_id: str) -> Iterable[Union[Mapping, int, None]]:
+    def get(self, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
         try:
-            table = self.client.get_table(table_id=table_id)
+            check_table_may_exist(table_uri)
+            table = self.client.get_table(table_uri=table_uri)
             return marshal(table, table_detail_fields), HTTPStatus.OK
 
         except NotFoundException:
-            return {'message': 'table_id {} does not exist'.format(table_id)}, HTTPStatus.NOT_FOUND
+            return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
 
 class TableOwnerAPI(Resource):
@@ -106,27 +109,27 @@ class TableOwnerAPI(Resource):
     def __init__(self) -> None:
         self.client = get_proxy_client()
 
-    def put(self, table_id: str, owner: str) -> Iterable[Union[Mapping, int, None]]:
+    def put(self, table_uri: str, owner: str) -> Iterable[Union[Mapping, int, None]]:
         try:
-            self.client.add_owner(table_id=table_id, owner=owner)
-            return {'message': 'The owner {} for table_id {} '
+            self.client.add_owner(table_uri=table_uri, owner=owner)
+            return {'message': 'The owner {} for table_uri {} '
                                'is added successfully'.format(owner,
-                                                              table_id)}, HTTPStatus.OK
+                                                              table_uri)}, HTTPStatus.OK
         except Exception as e:
-            return {'message': 'The owner {} for table_id {} '
+            return {'message': 'The owner {} for table_uri {} '
                                'is not added successfully'.format(owner,
-                                                                  table_id)}, HTTPStatus.INTERNAL_SERVER_ERROR
+                                                                  table_uri)}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-    def delete(self, table_id: str, owner: str) -> Iterable[Union[Mapping, int, None]]:
+    def delete(self, table_uri: str, owner: str) -> Iterable[Union[Mapping, int, None]]:
         try:
-            self.client.delete_owner(table_id=table_id, owner=owner)
-            return {'message': 'The owner {} for table_id {} '
+            self.client.delete_owner(table_uri=table_uri, owner=owner)
+            return {'message': 'The owner {} for table_uri {} '
                                'is deleted successfully'.format(owner,
-                                                                table_id)}, HTTPStatus.OK
+                                                                table_uri)}, HTTPStatus.OK
         except Exception:
-            return {'message': 'The owner {} for table_id {} '
+            return {'message': 'The owner {} for table_uri {} '
                                'is not deleted successfully'.format(owner,
-                                                                    table_id)}, HTTPStatus.INTERNAL_SERVER_ERROR
+                                                                    table_uri)}, HTTPStatus.INTERNAL_SERVER_ERROR
 
 
 class TableDescriptionAPI(Resource):
@@ -141,33 +144,34 @@ class TableDescriptionAPI(Resource):
 
         super(TableDescriptionAPI, self).__init__()
 
-    def get(self, table_id: str) -> Iterable[Any]:
+    def get(self, table_uri: str) -> Iterable[Any]:
         """
         Returns description in Neo4j endpoint
         """
         try:
-            description = self.client.get_table_description(table_id=table_id)
+            check_table_may_exist(table_uri)
+            description = self.client.get_table_description(table_uri=table_uri)
             return {'description': description}, HTTPStatus.OK
 
         except NotFoundException:
-            return {'message': 'table_id {} does not exist'.format(table_id)}, HTTPStatus.NOT_FOUND
+            return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
         except Exception:
             return {'message': 'Internal server error!'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-    def put(self, table_id: str, description_val: str) -> Iterable[Any]:
+    def put(self, table_uri: str, description_val: str) -> Iterable[Any]:
         """
         Updates table description
-        :param table_id:
+        :param table_uri:
         :param description_val:
         :return:
         """
         try:
-            self.client.put_table_description(table_id=table_id, description=description_val)
+            self.client.put_table_description(table_uri=table_uri, description=description_val)
             return None, HTTPStatus.OK
 
         except NotFoundException:
-            return {'message': 'table_id {} does not exist'.format(table_id)}, HTTPStatus.NOT_FOUND
+            return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
 
 class TableTagAPI(Resource):
@@ -182,42 +186,42 @@ class TableTagAPI(Resource):
         self.parser.add_argument('tag', type=str, location='json')
         super(TableTagAPI, self).__init__()
 
-    def put(self, table_id: str, tag: str) -> Iterable[Union[Mapping, int, None]]:
+    def put(self, table_uri: str, tag: str) -> Iterable[Union[Mapping, int, None]]:
         """
         API to add a tag to existing table id.
 
-        :param table_id:
+        :param table_uri:
         :param tag:
         :return:
         """
         try:
-            self.client.add_tag(table_id=table_id, tag=tag)
-            return {'message': 'The tag {} for table_id {} '
+            self.client.add_tag(table_uri=table_uri, tag=tag)
+            return {'message': 'The tag {} for table_uri {} '
                                'is added successfully'.format(tag,
-                                                              table_id)}, HTTPStatus.OK
+                                                              table_uri)}, HTTPStatus.OK
         except NotFoundException:
             return \
-                {'message': 'The tag {} for table_id {} '
+                {'message': 'The tag {} for table_uri {} '
                             'is not added successfully'.format(tag,
-                                                               table_id)}, \
+                                                               table_uri)}, \
                 HTTPStatus.NOT_FOUND
 
-    def delete(self, table_id: str, tag: str) -> Iterable[Union[Mapping, int, None]]:
+    def delete(self, table_uri: str, tag: str) -> Iterable[Union[Mapping, int, None]]:
         """
         API to remove a association between a given tag and a table.
 
-        :param table_id:
+        :param table_uri:
         :param tag:
         :return:
         """
         try:
-            self.client.delete_tag(table_id=table_id, tag=tag)
-            return {'message': 'The tag {} for table_id {} '
+            self.client.delete_tag(table_uri=table_uri, tag=tag)
+            return {'message': 'The tag {} for table_uri {} '
                                'is deleted successfully'.format(tag,
-                                                                table_id)}, HTTPStatus.OK
+                                                                table_uri)}, HTTPStatus.OK
         except NotFoundException:
             return \
-                {'message': 'The tag {} for table_id {} '
+                {'message': 'The tag {} for table_uri {} '
                             'is not deleted successfully'.format(tag,
-                                                                 table_id)}, \
+                                                                 table_uri)}, \
                 HTTPStatus.NOT_FOUND
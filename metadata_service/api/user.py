@@ -1,12 +1,13 @@
 from http import HTTPStatus
 from typing import Iterable, Mapping, Union
 
-from flask_restful import Resource, fields, marshal
+from flask_restful import Resource, fields
 
 from metadata_service.api.popular_tables import popular_table_fields
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import get_proxy_client
 from metadata_service.util import UserResourceRel
+from metadata_service.server_timing import marshal
 
 
 user_detail_fields = {
@@ -71,48 +72,48 @@ class UserFollowAPI(Resource):
         except Exception:
             return {'message': 'Internal server error!'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-    def put(self, user_id: str, resource_type: str, table_id: str) -> Iterable[Union[Mapping, int, None]]:
+    def put(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
         """
         Create the follow relationship between user and resources.
         todo: It will need to refactor all neo4j proxy api to take a type argument.
 
         :param user_id:
-        :param table_id:
+        :param table_uri:
         :return:
         """
         try:
-            self.client.add_table_relation_by_user(table_id=table_id,
+            self.client.add_table_relation_by_user(table_uri=table_uri,
                                                    user_email=user_id,
                                                    relation_type=UserResourceRel.follow)
-            return {'message': 'The user {} for table_id {} '
+            return {'message': 'The user {} for table_uri {} '
                                'is added successfully'.format(user_id,
-                                                              table_id)}, HTTPStatus.OK
+                                                              table_uri)}, HTTPStatus.OK
         except Exception as e:
-            return {'message': 'The user {} for table_id {} '
+            return {'message': 'The user {} for table_uri {} '
                                'is not added successfully'.format(user_id,
-                                                                  table_id)}, \
+                                                                  table_uri)}, \
                 HTTPStatus.INTERNAL_SERVER_ERROR
 
-    def delete(self, user_id: str, resource_type: str, table_id: str) -> Iterable[Union[Mapping, int, None]]:
+    def delete(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
         """
         Delete the follow relationship between user and resources.
         todo: It will need to refactor all neo4j proxy api to take a type argument.
 
         :param user_id:
-        :param table_id:
+        :param table_uri:
         :return:
         """
         try:
-            self.client.delete_table_relation_by_user(table_id=table_id,
+            self.client.delete_table_relation_by_user(table_uri=table_uri,
                                                       user_email=user_id,
                                                       relation_type=UserResourceRel.follow)
-            return {'message': 'The user {} for table_id {} '
+            return {'message': 'The user {} for table_uri {} '
                                'is added successfully'.format(user_id,
-                                                              table_id)}, HTTPStatus.OK
+                                                              table_uri)}, HTTPStatus.OK
         except Exception as e:
-            return {'message': 'The user {} for table_id {} '
+            return {'message': 'The user {} for table_uri {} '
                                'is not added successfully'.format(user_id,
-                                                                  table_id)}, \
+                                                                  table_uri)}, \
                 HTTPStatus.INTERNAL_SERVER_ERROR
 
 
@@ -144,35 +145,35 @@ class UserOwnAPI(Resource):
         except Exception:
             return {'message': 'Internal server error!'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-    def put(self, user_id: str, resource_type: str, table_id: str) -> Iterable[Union[Mapping, int, None]]:
+    def put(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
         """
         Create the follow relationship between user and resources.
 
         :param user_id:
         :param resource_type:
-        :param table_id:
+        :param table_uri:
         :return:
         """
         try:
-            self.client.add_owner(table_id=table_id, owner=user_id)
-            return {'message': 'The owner {} for table_id {} '
+            self.client.add_owner(table_uri=table_uri, owner=user_id)
+            return {'message': 'The owner {} for table_uri {} '
                                'is added successfully'.format(user_id,
-                                                              table_id)}, HTTPStatus.OK
+                                                              table_uri)}, HTTPStatus.OK
         except Exception as e:
-            return {'message': 'The owner {} for table_id {} '
+            return {'message': 'The owner {} for table_uri {} '
                                'is not added successfully'.format(user_id,
-                                                                  table_id)}, HTTPStatus.INTERNAL_SERVER_ERROR
+                                                                  table_uri)}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-    def delete(self, user_id: str, resource_type: str, table_id: str) -> Iterable[Union[Mapping, int, None]]:
+    def delete(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
         try:
-            self.client.delete_owner(table_id=table_id, owner=user_id)
-            return {'message': 'The owner {} for table_id {} '
+            self.client.delete_owner(table_uri=table_uri, owner=user_id)
+            return {'message': 'The owner {} for table_uri {} '
                                'is deleted successfully'.format(user_id,
-                                                                table_id)}, HTTPStatus.OK
+                                                                table_uri)}, HTTPStatus.OK
         except Exception:
-            return {'message': 'The owner {} for table_id {} '
+            return {'message': 'The owner {} for table_uri {} '
                                'is not deleted successfully'.format(user_id,
-                                                                    table_id)}, HTTPStatus.INTERNAL_SERVER_ERROR
+                                                                    table_uri)}, HTTPStatus.INTERNAL_SERVER_ERROR
 
 
 class UserReadAPI(Resource):
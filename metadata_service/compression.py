@@ -0,0 +1,175 @@
+"""
+Compression of the response bodies, negotiated through Accept-Encoding.
+
+Bodies of at least config.COMPRESSION_MIN_SIZE bytes are compressed with brotli when the client accepts it and the
+brotli package is installed (pip install amundsen-metadata[brotli]), with gzip otherwise. Streamed responses
+(/export/tables), files and responses already encoded are sent as is.
+
+Compressed bodies are kept in a cache keyed by the digest of the body and the encoding, bounded to
+config.COMPRESSION_CACHE_MAX_BYTES, so that a body served again (the same table detail, a response served from a
+cache of pre-serialized responses) is compressed once. Digesting a body is an order of magnitude cheaper than
+compressing it.
+"""
+import hashlib
+import logging
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple  # noqa: F401
+
+from flask import Flask, Response, current_app, request
+
+from metadata_service import config
+from metadata_service.metrics import record_cache_access
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LOGGER = logging.getLogger(__name__)
+
+GZIP = 'gzip'
+BROTLI = 'br'
+
+# Name of the compressed bodies cache in the cache metrics
+CACHE_NAME = 'compression'
+
+# Statuses of responses whose body isn't compressed
+_UNCOMPRESSED_STATUSES = frozenset([204, 206, 304])
+
+
+class CompressedBodyCache:
+    """
+    LRU cache of compressed bodies, bounded by the total size of the compressed bodies
+    """
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._bodies = OrderedDict()  # type: Dict[Tuple[bytes, str], bytes]
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)  # type: ignore
+            return body
+
+    def put(self, key: Tuple[bytes, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._bodies.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._bodies[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._bodies.popitem(last=False)  # type: ignore
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+# Cache of the process, set by init_compression. None when compression is disabled
+_cache = None  # type: Optional[CompressedBodyCache]
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Registers the hook compressing the responses if config.COMPRESSION_ENABLED is True
+    """
+    global _cache
+
+    if not app.config[config.COMPRESSION_ENABLED]:
+        _cache = None
+        return
+
+    if brotli is None and app.config[config.COMPRESSION_BROTLI_ENABLED]:
+        LOGGER.info('brotli is not installed, responses are compressed with gzip only')
+    max_bytes = app.config[config.COMPRESSION_CACHE_MAX_BYTES]
+    if max_bytes <= 0:
+        _cache = None
+    elif _cache is None:
+        _cache = CompressedBodyCache(max_bytes)
+    app.after_request(_compress_response)
+
+
+def compress(body: bytes, encoding: str, *, gzip_level: int =6, brotli_quality: int =4) -> bytes:
+    """
+    :param body: bytes to compress
+    :param encoding: GZIP or BROTLI
+    :param gzip_level: compression level of gzip, from 1 (fastest) to 9 (smallest)
+    :param brotli_quality: quality of brotli, from 0 (fastest) to 11 (smallest)
+    :return: body compressed. gzip output doesn't depend on the time, so that a body is always compressed the same
+    """
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=brotli_quality)
+    # wbits 16 + 15: gzip header and trailer, with a zero mtime
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def compress_cached(body: bytes, encoding: str) -> bytes:
+    """
+    compress with the levels of the app config, using the compressed bodies cache of the process if enabled
+    """
+    app_config = current_app.config
+    cache = _cache
+    if cache is None:
+        return compress(body, encoding, gzip_level=app_config[config.COMPRESSION_GZIP_LEVEL],
+                        brotli_quality=app_config[config.COMPRESSION_BROTLI_QUALITY])
+
+    key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+    compressed = cache.get(key)
+    record_cache_access(CACHE_NAME, compressed is not None)
+    if compressed is None:
+        compressed = compress(body, encoding, gzip_level=app_config[config.COMPRESSION_GZIP_LEVEL],
+                              brotli_quality=app_config[config.COMPRESSION_BROTLI_QUALITY])
+        cache.put(key, compressed)
+    return compressed
+
+
+def negotiate_encoding() -> Optional[str]:
+    """
+    :return: encoding of the highest quality in the Accept-Encoding header of the request, among the supported ones,
+    brotli first on a tie. None if the client accepts none
+    """
+    encodings = [GZIP]  # type: List[str]
+    if brotli is not None and current_app.config[config.COMPRESSION_BROTLI_ENABLED]:
+        encodings.insert(0, BROTLI)
+
+    accepted = request.accept_encodings
+    best_encoding, best_quality = None, 0.0  # type: Optional[str], float
+    for encoding in encodings:
+        quality = accepted.quality(encoding)
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+def _compress_response(response: Response) -> Response:
+    if (response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers or
+            response.status_code < 200 or response.status_code in _UNCOMPRESSED_STATUSES):
+        return response
+
+    body = response.get_data()
+    if len(body) < current_app.config[config.COMPRESSION_MIN_SIZE]:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress_cached(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -1,4 +1,7 @@
+import multiprocessing
 import os
+import tempfile
+from typing import Any, Dict  # noqa: F401
 
 # PROXY configuration keys
 PROXY_HOST = 'PROXY_HOST'
@@ -6,15 +9,101 @@ PROXY_PORT = 'PROXY_PORT'
 PROXY_USER = 'PROXY_USER'
 PROXY_PASSWORD = 'PROXY_PASSWORD'
 PROXY_CLIENT = 'PROXY_CLIENT'
+# Additional keyword arguments passed to the proxy client on top of host, port, user and password
+PROXY_CLIENT_KWARGS = 'PROXY_CLIENT_KWARGS'
+# Creates the proxy client and connects to the backend in create_app rather than on the first request
+PROXY_EAGER_INIT = 'PROXY_EAGER_INIT'
+# Number of seconds the result of the backend check of /readiness is reused for
+READINESS_CACHE_SEC = 'READINESS_CACHE_SEC'
 
 
 PROXY_CLIENTS = {
     'NEO4J': 'metadata_service.proxy.neo4j_proxy.Neo4jProxy',
-    'ATLAS': 'metadata_service.proxy.atlas_proxy.AtlasProxy'
+    'ATLAS': 'metadata_service.proxy.atlas_proxy.AtlasProxy',
+    'NEO4J_SNAPSHOT': 'metadata_service.proxy.snapshot_proxy.SnapshotProxy',
+    'SQLITE': 'metadata_service.proxy.sqlite_proxy.SqliteProxy',
+    'CACHED': 'metadata_service.proxy.cached_proxy.CachedProxy'
 }
 
 IS_STATSD_ON = 'IS_STATSD_ON'
 
+# Number of tables fetched from proxy per batch on /export/tables
+EXPORT_BATCH_SIZE = 'EXPORT_BATCH_SIZE'
+
+# Adds Server-Timing header with the time spent in queries, entity construction and marshal to the responses
+SERVER_TIMING_ENABLED = 'SERVER_TIMING_ENABLED'
+
+# Prometheus style metrics on /metrics. See metadata_service.metrics
+METRICS_ENABLED = 'METRICS_ENABLED'
+# Directory shared by the worker processes, holding the values of each process. Values are kept in memory if empty
+METRICS_MULTIPROCESS_DIR = 'METRICS_MULTIPROCESS_DIR'
+# Upper bounds of the latency histogram buckets in seconds
+METRICS_LATENCY_BUCKETS = 'METRICS_LATENCY_BUCKETS'
+
+# Response compression configuration keys. See metadata_service.compression
+COMPRESSION_ENABLED = 'COMPRESSION_ENABLED'
+# Bodies smaller than this number of bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = 'COMPRESSION_MIN_SIZE'
+COMPRESSION_GZIP_LEVEL = 'COMPRESSION_GZIP_LEVEL'
+# Uses brotli for the clients accepting it, if the brotli package is installed
+COMPRESSION_BROTLI_ENABLED = 'COMPRESSION_BROTLI_ENABLED'
+COMPRESSION_BROTLI_QUALITY = 'COMPRESSION_BROTLI_QUALITY'
+# Max total size of the compressed bodies kept in the cache of each process. 0 disables the cache
+COMPRESSION_CACHE_MAX_BYTES = 'COMPRESSION_CACHE_MAX_BYTES'
+
+# Bloom filter of the table keys answering 404 for tables that don't exist. See metadata_service.table_filter
+TABLE_FILTER_ENABLED = 'TABLE_FILTER_ENABLED'
+TABLE_FILTER_FALSE_POSITIVE_RATE = 'TABLE_FILTER_FALSE_POSITIVE_RATE'
+# Max size of the filter of each process. The false positive rate is higher if the tables don't fit
+TABLE_FILTER_MAX_BYTES = 'TABLE_FILTER_MAX_BYTES'
+# Interval of checking whether the catalog was updated by an ingestion, and rebuilding the filter if so
+TABLE_FILTER_CHECK_INTERVAL_SEC = 'TABLE_FILTER_CHECK_INTERVAL_SEC'
+# Interval of rebuilding the filter even if the catalog wasn't updated
+TABLE_FILTER_REBUILD_INTERVAL_SEC = 'TABLE_FILTER_REBUILD_INTERVAL_SEC'
+
+# Cache of the encoded responses of the GET routes. See metadata_service.response_cache
+RESPONSE_CACHE_ENABLED = 'RESPONSE_CACHE_ENABLED'
+# Max total size of the bodies and compressed variants kept by each process
+RESPONSE_CACHE_MAX_BYTES = 'RESPONSE_CACHE_MAX_BYTES'
+# Time to live of the responses, bounding how long the other processes serve a response changed by a write
+RESPONSE_CACHE_EXPIRE_SEC = 'RESPONSE_CACHE_EXPIRE_SEC'
+# Rules of the routes whose responses are cached
+RESPONSE_CACHE_ROUTES = 'RESPONSE_CACHE_ROUTES'
+
+# Most requested tables and users, and the tables kept cached because of it. See metadata_service.hot_keys
+HOT_KEYS_ENABLED = 'HOT_KEYS_ENABLED'
+# Keys of each kind (table, user) tracked by each process
+HOT_KEYS_CAPACITY = 'HOT_KEYS_CAPACITY'
+# Number of the most requested tables kept cached by the proxy client
+HOT_KEYS_PINNED_TABLES = 'HOT_KEYS_PINNED_TABLES'
+# Interval of refreshing the pinned tables. Must be shorter than half of local_expire_sec of CachedProxy
+HOT_KEYS_REFRESH_INTERVAL_SEC = 'HOT_KEYS_REFRESH_INTERVAL_SEC'
+
+# Production server configuration keys. See metadata_service.server
+SERVER_BIND = 'SERVER_BIND'
+SERVER_WORKERS = 'SERVER_WORKERS'
+# gthread or gevent
+SERVER_WORKER_CLASS = 'SERVER_WORKER_CLASS'
+# Threads per worker of the gthread worker class
+SERVER_THREADS = 'SERVER_THREADS'
+# Concurrent connections per worker of the gevent worker class
+SERVER_WORKER_CONNECTIONS = 'SERVER_WORKER_CONNECTIONS'
+# Workers silent for more than this number of seconds are restarted. Warm up must complete within it
+SERVER_TIMEOUT = 'SERVER_TIMEOUT'
+# Access log file, '-' for stdout, empty to disable
+SERVER_ACCESS_LOG = 'SERVER_ACCESS_LOG'
+# Paths requested by each worker before it accepts traffic
+SERVER_WARMUP_PATHS = 'SERVER_WARMUP_PATHS'
+
+# Request profiler configuration keys. See metadata_service.profiler
+REQUEST_PROFILER_ENABLED = 'REQUEST_PROFILER_ENABLED'
+# Requests carrying this header (with any non empty value) are profiled
+REQUEST_PROFILER_HEADER = 'REQUEST_PROFILER_HEADER'
+# Ratio of the other requests that are profiled, from 0 to 1
+REQUEST_PROFILER_SAMPLE_RATE = 'REQUEST_PROFILER_SAMPLE_RATE'
+REQUEST_PROFILER_DIR = 'REQUEST_PROFILER_DIR'
+REQUEST_PROFILER_MAX_PROFILES = 'REQUEST_PROFILER_MAX_PROFILES'
+
 
 class Config:
     LOG_FORMAT = '%(asctime)s.%(msecs)03d [%(levelname)s] %(module)s.%(funcName)s:%(lineno)d (%(process)d:'\
@@ -24,9 +113,60 @@ class Config:
 
     PROXY_USER = os.environ.get('CREDENTIALS_PROXY_USER', 'neo4j')
     PROXY_PASSWORD = os.environ.get('CREDENTIALS_PROXY_PASSWORD', 'test')
+    PROXY_CLIENT_KWARGS = {}  # type: Dict[str, Any]
+    PROXY_EAGER_INIT = os.environ.get('PROXY_EAGER_INIT', 'true').lower() == 'true'
+
+    READINESS_CACHE_SEC = 5.0
 
     IS_STATSD_ON = False
 
+    EXPORT_BATCH_SIZE = 1000
+
+    SERVER_TIMING_ENABLED = True
+
+    METRICS_ENABLED = False
+    METRICS_MULTIPROCESS_DIR = os.environ.get('METRICS_MULTIPROCESS_DIR', '')
+    METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_GZIP_LEVEL = 6
+    COMPRESSION_BROTLI_ENABLED = True
+    COMPRESSION_BROTLI_QUALITY = 4
+    COMPRESSION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+    TABLE_FILTER_ENABLED = False
+    TABLE_FILTER_FALSE_POSITIVE_RATE = 0.01
+    TABLE_FILTER_MAX_BYTES = 16 * 1024 * 1024
+    TABLE_FILTER_CHECK_INTERVAL_SEC = 60
+    TABLE_FILTER_REBUILD_INTERVAL_SEC = 6 * 60 * 60
+
+    RESPONSE_CACHE_ENABLED = False
+    RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    RESPONSE_CACHE_EXPIRE_SEC = 30
+    RESPONSE_CACHE_ROUTES = ('/table/<path:table_uri>', '/popular_tables/', '/tags/', '/user/<path:user_id>',
+                             '/latest_updated_ts')
+
+    HOT_KEYS_ENABLED = False
+    HOT_KEYS_CAPACITY = 1000
+    HOT_KEYS_PINNED_TABLES = 20
+    HOT_KEYS_REFRESH_INTERVAL_SEC = 10
+
+    SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:5000')
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', multiprocessing.cpu_count()))
+    SERVER_WORKER_CLASS = os.environ.get('SERVER_WORKER_CLASS', 'gthread')
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 8))
+    SERVER_WORKER_CONNECTIONS = int(os.environ.get('SERVER_WORKER_CONNECTIONS', 100))
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 60))
+    SERVER_ACCESS_LOG = os.environ.get('SERVER_ACCESS_LOG', '-')
+    SERVER_WARMUP_PATHS = ('/popular_tables/', '/tags/')
+
+    REQUEST_PROFILER_ENABLED = False
+    REQUEST_PROFILER_HEADER = 'X-Metadata-Profile'
+    REQUEST_PROFILER_SAMPLE_RATE = 0.0
+    REQUEST_PROFILER_DIR = os.path.join(tempfile.gettempdir(), 'metadata_service_profiles')
+    REQUEST_PROFILER_MAX_PROFILES = 100
+
     # Used to differentiate tables with other entities in Atlas. For more details:
     # https://github.com/lyft/amundsenmetadatalibrary/blob/master/docs/proxy/atlas_proxy.md
     ATLAS_TABLE_ENTITY = 'Table'
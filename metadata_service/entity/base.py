@@ -0,0 +1,50 @@
+import sys
+from typing import Any, Dict, Optional, TypeVar
+
+OptionalStr = TypeVar('OptionalStr', str, Optional[str])
+
+
+class Entity:
+    """
+    Base of the entities. Subclasses declare their attributes in __slots__, so that instances don't carry a __dict__:
+    a column with its stats takes about half the memory, which matters once table details are cached.
+
+    Entities are equal when they are of the same class and their attributes are equal. They are mutable (proxies
+    update descriptions, tags, ... in place), hence not hashable.
+    """
+    __slots__ = ()  # type: Any
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        for name in self.__slots__:
+            if getattr(self, name) != getattr(other, name):
+                return False
+        return True
+
+    __hash__ = None  # type: ignore
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: attributes of the entity by name. Nested entities are converted too, and iterables of entities to
+        lists of dicts
+        """
+        return {name: _to_dict_value(getattr(self, name)) for name in self.__slots__}
+
+
+def _to_dict_value(value: Any) -> Any:
+    if isinstance(value, Entity):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_to_dict_value(item) for item in value]
+    return value
+
+
+def intern(value: OptionalStr) -> OptionalStr:
+    """
+    Interns the string, for the attributes repeated in many entities (database, cluster, schema, types, ...), so that
+    they share one copy. None and str subclasses are returned as is.
+    """
+    if isinstance(value, str) and value.__class__ is str:
+        return sys.intern(value)
+    return value
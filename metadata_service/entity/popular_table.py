@@ -1,7 +1,10 @@
 from typing import Optional
 
+from metadata_service.entity.base import Entity, intern
 
-class PopularTable:
+
+class PopularTable(Entity):
+    __slots__ = ('database', 'cluster', 'schema', 'name', 'description')
 
     def __init__(self, *,
                  database: str,
@@ -9,9 +12,9 @@ class PopularTable:
                  schema: str,
                  name: str,
                  description: Optional[str] = None) -> None:
-        self.database = database
-        self.cluster = cluster
-        self.schema = schema
+        self.database = intern(database)
+        self.cluster = intern(cluster)
+        self.schema = intern(schema)
         self.name = name
         self.description = description
 
@@ -1,7 +1,11 @@
 from typing import Iterable, Optional
 
+from metadata_service.entity.base import Entity, intern
+
+
+class User(Entity):
+    __slots__ = ('email', 'first_name', 'last_name')
 
-class User:
     def __init__(self, *,
                  email: str,
                  first_name: str =None,
@@ -14,7 +18,9 @@ class User:
         return 'User(email={!r}, first_name={!r}, last_name={!r})'.format(self.email, self.first_name, self.last_name)
 
 
-class Reader:
+class Reader(Entity):
+    __slots__ = ('user', 'read_count')
+
     def __init__(self, *,
                  user: User,
                  read_count: int) -> None:
@@ -25,26 +31,30 @@ class Reader:
         return 'Reader(user={!r}, read_count={!r})'.format(self.user, self.read_count)
 
 
-class Tag:
+class Tag(Entity):
+    __slots__ = ('tag_name', 'tag_type')
+
     def __init__(self, *,
                  tag_type: str,
                  tag_name: str) -> None:
         self.tag_name = tag_name
-        self.tag_type = tag_type
+        self.tag_type = intern(tag_type)
 
     def __repr__(self) -> str:
         return 'Tag(tag_name={!r}, tag_type={!r})'.format(self.tag_name,
                                                           self.tag_type)
 
 
-class Watermark:
+class Watermark(Entity):
+    __slots__ = ('watermark_type', 'partition_key', 'partition_value', 'create_time')
+
     def __init__(self, *,
                  watermark_type: str =None,
                  partition_key: str =None,
                  partition_value: str =None,
                  create_time: str =None) -> None:
-        self.watermark_type = watermark_type
-        self.partition_key = partition_key
+        self.watermark_type = intern(watermark_type)
+        self.partition_key = intern(partition_key)
         self.partition_value = partition_value
         self.create_time = create_time
 
@@ -58,13 +68,15 @@ class Watermark:
                                            self.create_time)
 
 
-class Statistics:
+class Statistics(Entity):
+    __slots__ = ('stat_type', 'stat_val', 'start_epoch', 'end_epoch')
+
     def __init__(self, *,
                  stat_type: str,
                  stat_val: str =None,
                  start_epoch: int =None,
                  end_epoch: int =None) -> None:
-        self.stat_type = stat_type
+        self.stat_type = intern(stat_type)
         self.stat_val = stat_val
         self.start_epoch = start_epoch
         self.end_epoch = end_epoch
@@ -79,7 +91,9 @@ class Statistics:
                                         self.end_epoch)
 
 
-class Column:
+class Column(Entity):
+    __slots__ = ('name', 'description', 'col_type', 'sort_order', 'stats')
+
     def __init__(self, *,
                  name: str,
                  description: Optional[str],
@@ -88,7 +102,7 @@ class Column:
                  stats: Iterable[Statistics] =()) -> None:
         self.name = name
         self.description = description
-        self.col_type = col_type
+        self.col_type = intern(col_type)
         self.sort_order = sort_order
         self.stats = stats
 
@@ -101,7 +115,9 @@ class Column:
                     self.stats)
 
 
-class Application:
+class Application(Entity):
+    __slots__ = ('application_url', 'description', 'name', 'id')
+
     def __init__(self, *,
                  application_url: str,
                  description: str,
@@ -117,11 +133,13 @@ class Application:
             .format(self.application_url, self.description, self.name, self.id)
 
 
-class Source:
+class Source(Entity):
+    __slots__ = ('source_type', 'source')
+
     def __init__(self, *,
                  source_type: str,
                  source: str) -> None:
-        self.source_type = source_type
+        self.source_type = intern(source_type)
         self.source = source
 
     def __repr__(self) -> str:
@@ -130,7 +148,10 @@ class Source:
                                      self.source)
 
 
-class Table:
+class Table(Entity):
+    __slots__ = ('database', 'cluster', 'schema', 'name', 'tags', 'table_readers', 'description', 'columns', 'owners',
+                 'watermarks', 'table_writer', 'last_updated_timestamp', 'source', 'is_view')
+
     def __init__(self, *,
                  database: str,
                  cluster: str,
@@ -148,9 +169,9 @@ class Table:
                  is_view: Optional[bool] = None,
                  ) -> None:
 
-        self.database = database
-        self.cluster = cluster
-        self.schema = schema
+        self.database = intern(database)
+        self.cluster = intern(cluster)
+        self.schema = intern(schema)
         self.name = name
         self.tags = tags
         self.table_readers = table_readers
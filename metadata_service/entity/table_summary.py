@@ -0,0 +1,35 @@
+from typing import Iterable, Optional
+
+from metadata_service.entity.base import Entity, intern
+from metadata_service.entity.table_detail import Tag, User
+
+
+class TableSummary(Entity):
+    """
+    Table with its key, description, tags and owners. Used to export the whole catalog where the columns and
+    the usage of Table are not needed.
+    """
+    __slots__ = ('key', 'database', 'cluster', 'schema', 'name', 'description', 'tags', 'owners')
+
+    def __init__(self, *,
+                 key: str,
+                 database: str,
+                 cluster: str,
+                 schema: str,
+                 name: str,
+                 description: Optional[str] = None,
+                 tags: Iterable[Tag] = (),
+                 owners: Iterable[User] = ()) -> None:
+        self.key = key
+        self.database = intern(database)
+        self.cluster = intern(cluster)
+        self.schema = intern(schema)
+        self.name = name
+        self.description = description
+        self.tags = tags
+        self.owners = owners
+
+    def __repr__(self) -> str:
+        return 'TableSummary(key={!r}, database={!r}, cluster={!r}, schema={!r}, name={!r}, description={!r}, ' \
+               'tags={!r}, owners={!r})'.format(self.key, self.database, self.cluster, self.schema, self.name,
+                                                self.description, self.tags, self.owners)
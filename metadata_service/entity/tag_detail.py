@@ -1,4 +1,8 @@
-class TagDetail:
+from metadata_service.entity.base import Entity
+
+
+class TagDetail(Entity):
+    __slots__ = ('tag_name', 'tag_count')
 
     def __init__(self, *,
                  tag_name: str,
@@ -1,4 +1,10 @@
-class User:
+from metadata_service.entity.base import Entity, intern
+
+
+class User(Entity):
+    __slots__ = ('email', 'first_name', 'last_name', 'full_name', 'is_active', 'github_username', 'team_name',
+                 'slack_id', 'employee_type', 'manager_fullname')
+
     def __init__(self, *,
                  email: str,
                  first_name: str =None,
@@ -17,9 +23,9 @@ class User:
         self.full_name = full_name
         self.is_active = is_active
         self.github_username = github_username
-        self.team_name = team_name
+        self.team_name = intern(team_name)
         self.slack_id = slack_id
-        self.employee_type = employee_type
+        self.employee_type = intern(employee_type)
         self.manager_fullname = manager_fullname
 
     def __repr__(self) -> str:
@@ -0,0 +1,166 @@
+"""
+Most requested tables and users of the process, tracked in fixed memory, and the tables kept cached because of it.
+
+When config.HOT_KEYS_ENABLED is True, the table URI and the user id of each GET request are counted in a
+space-saving sketch of config.HOT_KEYS_CAPACITY keys per kind: a key out of the sketch replaces the key of the
+lowest count, and starts from that count, which is its max overestimation (error). Every key requested more than
+1 / capacity of the requests is in the sketch, and the top keys are exact in practice as traffic is skewed. The top
+keys are served on /debug/hot_keys.
+
+Every config.HOT_KEYS_REFRESH_INTERVAL_SEC, a thread passes the config.HOT_KEYS_PINNED_TABLES most requested
+tables to pin_tables of the proxy client, which keeps them cached (see CachedProxy.pin_tables). The interval must be
+shorter than the time to live of the cache, so that they are refreshed before expiring. Proxies without a cache
+ignore it.
+
+The thread is started by the first request of each process rather than by create_app, as threads don't survive
+the fork of the gunicorn workers.
+"""
+import logging
+import os
+from threading import Event, Lock, Thread
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set  # noqa: F401
+
+from flask import Flask, current_app, request
+
+from metadata_service import config
+from metadata_service.proxy import get_proxy_client
+from metadata_service.write_hooks import TABLE_URI_ARGUMENT, USER_ID_ARGUMENT
+
+LOGGER = logging.getLogger(__name__)
+
+TABLE_KIND = 'table'
+USER_KIND = 'user'
+
+HotKey = NamedTuple('HotKey', [('key', Hashable), ('count', int), ('error', int)])
+
+
+class SpaceSaving:
+    """
+    Space-saving sketch (Metwally et al.) of the most frequent keys of a stream, holding at most capacity keys.
+    Keys are grouped by count, so that adding a key takes constant time.
+    """
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._counts = {}  # type: Dict[Hashable, int]
+        self._errors = {}  # type: Dict[Hashable, int]
+        self._keys_by_count = {}  # type: Dict[int, Set[Hashable]]
+        self._min_count = 0
+        self._lock = Lock()
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._move(key, count, count + 1)
+                return
+
+            if len(self._counts) < self.capacity:
+                self._counts[key] = 1
+                self._errors[key] = 0
+                self._keys_by_count.setdefault(1, set()).add(key)
+                self._min_count = 1
+                return
+
+            # Replaces a key of the lowest count, whose count is the max number of times the new key was missed
+            min_count = self._min_count
+            evicted = next(iter(self._keys_by_count[min_count]))
+            del self._counts[evicted]
+            del self._errors[evicted]
+            self._counts[key] = min_count
+            self._errors[key] = min_count
+            self._keys_by_count[min_count].discard(evicted)
+            self._keys_by_count[min_count].add(key)
+            self._move(key, min_count, min_count + 1)
+
+    def _move(self, key: Hashable, count: int, new_count: int) -> None:
+        keys = self._keys_by_count[count]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_count[count]
+            if self._min_count == count:
+                self._min_count = new_count
+        self._counts[key] = new_count
+        self._keys_by_count.setdefault(new_count, set()).add(key)
+
+    def top(self, k: int) -> List[HotKey]:
+        """
+        :return: k keys of the highest counts, highest first
+        """
+        with self._lock:
+            keys = sorted(self._counts, key=self._counts.__getitem__, reverse=True)[:k]
+            return [HotKey(key=key, count=self._counts[key], error=self._errors[key]) for key in keys]
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class _HotKeys:
+    """
+    Sketches of the process, and the thread pinning the hot tables
+    """
+    def __init__(self) -> None:
+        self.sketches = {}  # type: Dict[str, SpaceSaving]
+        self.reset(1000)
+        self.lock = Lock()
+        self.pid = None  # type: Optional[int]
+        self.stop_event = Event()
+
+    def reset(self, capacity: int) -> None:
+        self.sketches = {TABLE_KIND: SpaceSaving(capacity), USER_KIND: SpaceSaving(capacity)}
+
+    def pin_tables(self, num_tables: int) -> None:
+        table_uris = [str(hot_key.key) for hot_key in self.sketches[TABLE_KIND].top(num_tables)]
+        get_proxy_client().pin_tables(table_uris=table_uris)
+
+    def run(self, app: Flask) -> None:
+        with app.app_context():
+            while not self.stop_event.wait(app.config[config.HOT_KEYS_REFRESH_INTERVAL_SEC]):
+                try:
+                    self.pin_tables(app.config[config.HOT_KEYS_PINNED_TABLES])
+                except Exception:
+                    LOGGER.exception('Failed to pin the hot tables')
+
+    def start(self, app: Flask) -> None:
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+        Thread(target=self.run, args=(app,), name='hot-keys', daemon=True).start()
+
+
+_hot_keys = _HotKeys()
+
+
+def init_hot_keys(app: Flask) -> None:
+    """
+    Registers the request hook counting the tables and users requested, and starting the thread pinning the hot
+    tables, if config.HOT_KEYS_ENABLED is True. Must be called before init_response_cache, so that requests served
+    from the response cache are counted.
+    """
+    if not app.config[config.HOT_KEYS_ENABLED]:
+        return
+    capacity = app.config[config.HOT_KEYS_CAPACITY]
+    if _hot_keys.sketches[TABLE_KIND].capacity != capacity:
+        _hot_keys.reset(capacity)
+    app.before_request(_count_request)
+
+
+def _count_request() -> None:
+    _hot_keys.start(current_app._get_current_object())
+    if request.method != 'GET' or not request.view_args:
+        return
+    sketches = _hot_keys.sketches
+    table_uri = request.view_args.get(TABLE_URI_ARGUMENT)
+    if table_uri:
+        sketches[TABLE_KIND].add(table_uri)
+    user_id = request.view_args.get(USER_ID_ARGUMENT)
+    if user_id:
+        sketches[USER_KIND].add(user_id)
+
+
+def get_hot_keys(kind: str, k: int) -> List[HotKey]:
+    """
+    :param kind: TABLE_KIND or USER_KIND
+    :return: k most requested keys of the kind, highest count first
+    """
+    return _hot_keys.sketches[kind].top(k)
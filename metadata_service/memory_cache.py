@@ -0,0 +1,210 @@
+"""
+Memory cache of a process, bounded by number of entries and estimated size, with a jittered time to live.
+
+Entries are evicted least recently used first once the cache holds max_entries entries or max_bytes bytes. The
+size of an entry is given by the caller when it has one at hand, e.g. the size of the value encoded for another
+cache, and estimated by estimate_size otherwise, which walks the whole value: for large values, as wide tables, it
+costs about as much as encoding them. Each entry expires after expire_sec plus a random share of
+jitter_sec, so that entries put at the same time, e.g. by the worker processes warming up, aren't recomputed at
+once.
+
+Hits, misses and evictions are counted in statsd as metadata_service.memory_cache.<name>.hit, .miss and .eviction.
+
+e.g:
+    _TAGS_CACHE = MemoryCache('tags', max_entries=1, expire_sec=300)
+
+    @_TAGS_CACHE.cached(key=lambda self: '')
+    def get_tags(self) -> List:
+
+    _TAGS_CACHE.invalidate('')
+"""
+import random
+import sys
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple  # noqa: F401
+
+from metadata_service.proxy.statsd_utilities import increment
+from metadata_service.shared_cache import MISSING
+
+
+def estimate_size(value: Any) -> int:
+    """
+    :return: sum of sys.getsizeof of the value and of the objects it references through containers, __dict__ and
+    __slots__, each object counted once
+    """
+    size = 0
+    seen = set()  # type: Set[int]
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for slot in getattr(type(obj), '__slots__', ()):
+                stack.append(getattr(obj, slot, None))
+    return size
+
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value: Any, expires_at: float, size: int) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class MemoryCache:
+    """
+    LRU cache with a time to live, bounded by number of entries and estimated size
+    """
+    def __init__(self, name: str, *,
+                 max_entries: int =1000,
+                 max_bytes: Optional[int] =None,
+                 expire_sec: float =300,
+                 jitter_sec: float =0) -> None:
+        """
+        :param name: name of the cache in the statsd metrics
+        :param max_entries: max number of entries
+        :param max_bytes: max total size of the entries. None for no bound, and no size estimation
+        :param expire_sec: time to live of the entries put without an expire_sec
+        :param jitter_sec: max random time added to the time to live of each entry
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.expire_sec = expire_sec
+        self.jitter_sec = jitter_sec
+
+        metric = '{}.{}'.format(__name__, name)
+        self._hit_metric = '{}.hit'.format(metric)
+        self._miss_metric = '{}.miss'.format(metric)
+        self._eviction_metric = '{}.eviction'.format(metric)
+
+        self._entries = OrderedDict()  # type: Dict[Hashable, _Entry]
+        # Keys never evicted to make room, they still expire
+        self._pinned = frozenset()  # type: FrozenSet[Hashable]
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        :return: value of the key, MISSING if it isn't cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)  # type: ignore
+        increment(self._miss_metric if entry is None else self._hit_metric)
+        return MISSING if entry is None else entry.value
+
+    def put(self, key: Hashable, value: Any, expire_sec: Optional[float] =None, size: Optional[int] =None) -> None:
+        """
+        :param size: size of the value counted in max_bytes, estimated with estimate_size if None
+        """
+        if expire_sec is None:
+            expire_sec = self.expire_sec
+        expires_at = time.monotonic() + expire_sec + random.uniform(0, self.jitter_sec)
+        if self.max_bytes is None:
+            size = 0
+        elif size is None:
+            size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        evictions = 0
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(value, expires_at, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and
+                                                            self._size > self.max_bytes):
+                evicted = next((entry_key for entry_key in self._entries if entry_key not in self._pinned), None)
+                if evicted is None:
+                    break
+                self._remove(evicted)
+                evictions += 1
+        for _ in range(evictions):
+            increment(self._eviction_metric)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        :return: value of the key, computed and put if it isn't cached
+        """
+        value = self.get(key)
+        if value is MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def pin(self, keys: Iterable[Hashable]) -> None:
+        """
+        Entries of the keys are no longer evicted to make room, they still expire. Replaces the keys pinned before
+        """
+        self._pinned = frozenset(keys)
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """
+        :return: seconds until the entry of the key expires, None if it isn't cached
+        """
+        entry = self._entries.get(key)
+        return None if entry is None else entry.expires_at - time.monotonic()
+
+    def cached(self, key: Optional[Callable[..., Hashable]] =None) -> Callable[[Callable], Callable]:
+        """
+        A decorator caching the results of a function in this cache
+
+        :param key: function of the arguments of the decorated function returning the key of its result. By
+        default, the arguments themselves, which must be hashable
+        """
+        def decorator(f: Callable) -> Callable:
+            @wraps(f)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                cache_key = key(*args, **kwargs) if key is not None else (args, tuple(sorted(kwargs.items())))
+                return self.get_or_compute(cache_key, lambda: f(*args, **kwargs))
+
+            wrapper.cache = self  # type: ignore
+            return wrapper
+
+        return decorator
+
+    @property
+    def size(self) -> int:
+        """
+        Estimated total size of the entries, 0 if max_bytes is None
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
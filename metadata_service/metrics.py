@@ -0,0 +1,415 @@
+"""
+In-process metrics registry exposed in Prometheus text format on /metrics.
+
+It keeps latency histograms per route and per proxy method, the number of requests in flight, error counters and
+cache hit / miss counters. It can be used alongside statsd (IS_STATSD_ON) or instead of it.
+
+With several worker processes (e.g. gunicorn), set config.METRICS_MULTIPROCESS_DIR to a directory shared by the
+workers and emptied before the server starts. Each process writes its values into its own mmap'd file there, and
+/metrics aggregates the files of all the processes, whichever worker serves it: counters and histograms are summed
+over all the processes, including the ones that exited, and gauges over the live processes. Without it, values are
+kept in memory of the process.
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from threading import Lock, local
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple  # noqa: F401
+
+from flask import Flask, Response, request
+
+from metadata_service import config
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Sample key: (sample name, ((label name, label value), ...))
+SampleKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _MmapedValues:
+    """
+    Float values by key in a file mapped in memory, which other processes can read while this one writes.
+
+    Layout: 8 bytes header holding the number of bytes used, then entries of 4 bytes key length, key padded to
+    a multiple of 8 bytes from the start of the entry, and 8 bytes double value. Entries are only appended, and the
+    header is updated once the entry is complete.
+    """
+    _INITIAL_SIZE = 1 << 16
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'a+b')
+        capacity = os.fstat(self._file.fileno()).st_size
+        if capacity == 0:
+            capacity = self._INITIAL_SIZE
+            self._file.truncate(capacity)
+        self._capacity = capacity
+        # Typeshed of mmap lacks the buffer protocol
+        self._mmap = mmap.mmap(self._file.fileno(), capacity)  # type: Any
+        self._positions = {}  # type: Dict[str, int]
+        self._used = struct.unpack_from('q', self._mmap, 0)[0] or 8
+        for key, _, position in _read_entries(self._mmap, self._used):
+            self._positions[key] = position
+
+    def get(self, key: str) -> float:
+        position = self._positions.get(key)
+        if position is None:
+            return 0.0
+        return struct.unpack_from('d', self._mmap, position)[0]
+
+    def set(self, key: str, value: float) -> None:
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        struct.pack_into('d', self._mmap, position, value)
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode('utf-8')
+        padded_length = len(encoded) + (8 - (len(encoded) + 4) % 8) % 8
+        entry_size = 4 + padded_length + 8
+        while self._used + entry_size > self._capacity:
+            self._capacity *= 2
+            self._mmap.close()
+            self._file.truncate(self._capacity)
+            self._mmap = mmap.mmap(self._file.fileno(), self._capacity)
+
+        struct.pack_into('i{}s'.format(padded_length), self._mmap, self._used, len(encoded), encoded)
+        position = self._used + 4 + padded_length
+        struct.pack_into('d', self._mmap, position, 0.0)
+        self._used += entry_size
+        struct.pack_into('q', self._mmap, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        for key, value, _ in _read_entries(self._mmap, self._used):
+            yield key, value
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+
+def _read_entries(data: Any, used: int) -> Iterator[Tuple[str, float, int]]:
+    """
+    :return: key, value and position of the value of the entries of a _MmapedValues buffer
+    """
+    position = 8
+    while position < used:
+        key_length = struct.unpack_from('i', data, position)[0]
+        padded_length = key_length + (8 - (key_length + 4) % 8) % 8
+        key = bytes(data[position + 4:position + 4 + key_length]).decode('utf-8')
+        value_position = position + 4 + padded_length
+        yield key, struct.unpack_from('d', data, value_position)[0], value_position
+        position = value_position + 8
+
+
+def read_values_file(path: str) -> List[Tuple[str, float]]:
+    """
+    Reads a file written by another process
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < 8:
+        return []
+    used = min(struct.unpack_from('q', data, 0)[0], len(data))
+    return [(key, value) for key, value, _ in _read_entries(data, used)]
+
+
+class _InMemoryValues:
+
+    def __init__(self) -> None:
+        self._values = {}  # type: Dict[str, float]
+
+    def get(self, key: str) -> float:
+        return self._values.get(key, 0.0)
+
+    def set(self, key: str, value: float) -> None:
+        self._values[key] = value
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        return iter(list(self._values.items()))
+
+    def close(self) -> None:
+        pass
+
+
+def _encode_key(key: SampleKey) -> str:
+    return json.dumps([key[0], key[1]], separators=(',', ':'))
+
+
+def _decode_key(encoded: str) -> SampleKey:
+    name, labels = json.loads(encoded)
+    return name, tuple((label, value) for label, value in labels)
+
+
+class MetricFamily:
+    """
+    A metric with its label names. Values are held by the registry
+    """
+    def __init__(self, registry: 'MetricsRegistry', metric_type: str, name: str, documentation: str,
+                 label_names: Sequence[str], buckets: Sequence[float] =()) -> None:
+        self.registry = registry
+        self.type = metric_type
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _labels(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple((name, str(labels[name])) for name in self.label_names)
+
+    def inc(self, amount: float =1.0, **labels: str) -> None:
+        self.registry.add((self.name, self._labels(labels)), amount, gauge=self.type == GAUGE)
+
+    def dec(self, amount: float =1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def observe(self, value: float, **labels: str) -> None:
+        label_values = self._labels(labels)
+        index = bisect_left(self.buckets, value)
+        le = _format_float(self.buckets[index]) if index < len(self.buckets) else '+Inf'
+        self.registry.add((self.name + '_bucket', label_values + (('le', le),)), 1.0)
+        self.registry.add((self.name + '_sum', label_values), value)
+        self.registry.add((self.name + '_count', label_values), 1.0)
+
+
+class MetricsRegistry:
+    """
+    Holds the values of the metrics of this process, in files of multiprocess_dir if set
+    """
+    def __init__(self, multiprocess_dir: str ='') -> None:
+        self._multiprocess_dir = multiprocess_dir
+        self._lock = Lock()
+        self._families = OrderedDict()  # type: Dict[str, MetricFamily]
+        self._pid = -1
+        self._values = _InMemoryValues()  # type: Any
+        self._gauge_values = self._values  # type: Any
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] =()) -> MetricFamily:
+        return self._register(MetricFamily(self, COUNTER, name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] =()) -> MetricFamily:
+        return self._register(MetricFamily(self, GAUGE, name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] =(),
+                  buckets: Sequence[float] =()) -> MetricFamily:
+        return self._register(MetricFamily(self, HISTOGRAM, name, documentation, label_names, buckets))
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        self._families[family.name] = family
+        return family
+
+    def _ensure_process_values(self) -> None:
+        # Values are per process. After a fork the child writes into its own files
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+        self._pid = pid
+        if self._multiprocess_dir:
+            os.makedirs(self._multiprocess_dir, exist_ok=True)
+            self._values = _MmapedValues(os.path.join(self._multiprocess_dir, 'values_{}.db'.format(pid)))
+            # Unlike counters, gauges of an exited process with the same pid must not be carried on
+            gauge_path = os.path.join(self._multiprocess_dir, 'gauge_{}.db'.format(pid))
+            if os.path.exists(gauge_path):
+                os.remove(gauge_path)
+            self._gauge_values = _MmapedValues(gauge_path)
+        else:
+            self._values = self._gauge_values = _InMemoryValues()
+
+    def add(self, key: SampleKey, amount: float, gauge: bool =False) -> None:
+        encoded = _encode_key(key)
+        with self._lock:
+            self._ensure_process_values()
+            values = self._gauge_values if gauge else self._values
+            values.set(encoded, values.get(encoded) + amount)
+
+    def _collect_values(self) -> Dict[SampleKey, float]:
+        totals = {}  # type: Dict[str, float]
+
+        def add_all(items: Iterable[Tuple[str, float]]) -> None:
+            for encoded, value in items:
+                totals[encoded] = totals.get(encoded, 0.0) + value
+
+        if not self._multiprocess_dir:
+            with self._lock:
+                self._ensure_process_values()
+                add_all(self._values.items())
+        else:
+            for path in glob.glob(os.path.join(self._multiprocess_dir, 'values_*.db')):
+                add_all(read_values_file(path))
+            for path in glob.glob(os.path.join(self._multiprocess_dir, 'gauge_*.db')):
+                if _is_process_alive(int(os.path.basename(path)[len('gauge_'):-len('.db')])):
+                    add_all(read_values_file(path))
+        return {_decode_key(encoded): value for encoded, value in totals.items()}
+
+    def exposition(self) -> str:
+        """
+        :return: all the metrics in Prometheus text format
+        """
+        values = self._collect_values()
+        samples_by_family = {}  # type: Dict[str, Dict[SampleKey, float]]
+        for key, value in values.items():
+            family_name = key[0]
+            if family_name not in self._families:
+                for suffix in ('_bucket', '_sum', '_count'):
+                    if family_name.endswith(suffix):
+                        family_name = family_name[:-len(suffix)]
+            samples_by_family.setdefault(family_name, {})[key] = value
+
+        lines = []  # type: List[str]
+        for family in self._families.values():
+            lines.append('# HELP {} {}'.format(family.name, family.documentation.replace('\n', ' ')))
+            lines.append('# TYPE {} {}'.format(family.name, family.type))
+            samples = samples_by_family.get(family.name, {})
+            if family.type == HISTOGRAM:
+                lines.extend(_histogram_lines(family, samples))
+            else:
+                for (name, labels), value in sorted(samples.items()):
+                    lines.append(_sample_line(name, labels, value))
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(family: MetricFamily, samples: Dict[SampleKey, float]) -> List[str]:
+    bucket_counts = {}  # type: Dict[Tuple[Tuple[str, str], ...], Dict[str, float]]
+    for (name, labels), value in samples.items():
+        if name == family.name + '_bucket':
+            bucket_counts.setdefault(labels[:-1], {})[labels[-1][1]] = value
+
+    lines = []
+    for labels in sorted(bucket_counts):
+        cumulative = 0.0
+        for le in [_format_float(bound) for bound in family.buckets] + ['+Inf']:
+            cumulative += bucket_counts[labels].get(le, 0.0)
+            lines.append(_sample_line(family.name + '_bucket', labels + (('le', le),), cumulative))
+        lines.append(_sample_line(family.name + '_sum', labels, samples.get((family.name + '_sum', labels), 0.0)))
+        lines.append(_sample_line(family.name + '_count', labels, cumulative))
+    return lines
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _sample_line(name: str, labels: Tuple[Tuple[str, str], ...], value: float) -> str:
+    if labels:
+        name += '{' + ','.join('{}="{}"'.format(label, _escape(val)) for label, val in labels) + '}'
+    return '{} {}'.format(name, _format_float(value))
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ServiceMetrics:
+    """
+    Metrics of Metadata service
+    """
+    def __init__(self, registry: MetricsRegistry, latency_buckets: Sequence[float]) -> None:
+        self.registry = registry
+        self.request_latency = registry.histogram(
+            'metadata_request_latency_seconds', 'Latency of the requests per route',
+            ('route', 'method'), latency_buckets)
+        self.requests = registry.counter(
+            'metadata_requests_total', 'Requests per route and status', ('route', 'method', 'status'))
+        self.requests_in_flight = registry.gauge(
+            'metadata_requests_in_flight', 'Requests being served')
+        self.proxy_latency = registry.histogram(
+            'metadata_proxy_latency_seconds', 'Latency of the proxy methods', ('method',), latency_buckets)
+        self.proxy_errors = registry.counter(
+            'metadata_proxy_errors_total', 'Proxy method calls that raised an exception', ('method',))
+        self.proxy_coalesced_calls = registry.counter(
+            'metadata_proxy_coalesced_calls_total',
+            'Proxy method calls served by the result of an identical call in flight', ('method',))
+        self.table_filter_rejections = registry.counter(
+            'metadata_table_filter_rejections_total', 'Reads of tables answered 404 by the table filter')
+        self.cache_requests = registry.counter(
+            'metadata_cache_requests_total', 'Cache lookups per cache and result (hit or miss)', ('cache', 'result'))
+
+
+# Set by init_metrics when config.METRICS_ENABLED is True
+_metrics = None  # type: Optional[ServiceMetrics]
+
+
+class _Local(local):
+    """
+    Start time of the request being handled by the thread
+    """
+    request_start = None  # type: Optional[float]
+
+
+_local = _Local()
+
+
+def get_metrics() -> Optional[ServiceMetrics]:
+    """
+    :return: ServiceMetrics, or None if metrics are disabled
+    """
+    return _metrics
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    metrics = _metrics
+    if metrics is not None:
+        metrics.cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Creates the registry if config.METRICS_ENABLED is True and registers the request hooks measuring the routes
+    """
+    global _metrics
+
+    if not app.config[config.METRICS_ENABLED]:
+        _metrics = None
+        return
+
+    registry = MetricsRegistry(multiprocess_dir=app.config[config.METRICS_MULTIPROCESS_DIR])
+    _metrics = ServiceMetrics(registry, app.config[config.METRICS_LATENCY_BUCKETS])
+    app.before_request(_start_request)
+    app.after_request(_end_request)
+    app.teardown_request(_teardown_request)
+
+
+def _start_request() -> None:
+    metrics = _metrics
+    if metrics is not None:
+        _local.request_start = time.time()
+        metrics.requests_in_flight.inc()
+
+
+def _end_request(response: Response) -> Response:
+    metrics = _metrics
+    start = _local.request_start
+    if metrics is not None and start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        metrics.request_latency.observe(time.time() - start, route=route, method=request.method)
+        metrics.requests.inc(route=route, method=request.method, status=str(int(response.status_code)))
+    return response
+
+
+def _teardown_request(exc: Optional[BaseException]) -> None:
+    metrics = _metrics
+    if metrics is not None and _local.request_start is not None:
+        _local.request_start = None
+        metrics.requests_in_flight.dec()
@@ -0,0 +1,204 @@
+"""
+Popularity of the tables decayed over time, updated from the read counts of the tables rather than recomputed.
+
+Each read counts for 1 when it happens, then for half of it after every half life, so that tables read a lot a year
+ago rank below tables read today. Scores are kept in NumPy arrays indexed by table: an update adds the reads of a
+batch of tables in one vectorized operation, and the top tables are computed once per update, then served from a
+list. Requires the popularity extra (pip install amundsen-metadata[popularity]).
+
+Scores aren't decayed on every update: a score is stored as its value at a reference time, each read being scaled up
+by the decay between the reference time and the time of the read. Ranks don't depend on the reference time, which
+is moved forward before the scaled values get too large for float64.
+
+The read counts are totals (the read_count of the READ_BY relations summed by table, see
+Neo4jProxy.get_table_read_counts): the increase of the total of a table since the previous update is counted as reads
+at the time of the update. The first update counts all the reads so far at its time, hence an index starts
+from the all time read counts, decayed from then on.
+"""
+import logging
+import math
+import os
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple  # noqa: F401
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOGGER = logging.getLogger(__name__)
+
+# Max exponent of the scale of the reads, before moving the reference time. exp(500) is about 1e217
+_MAX_SCALE_EXPONENT = 500.0
+_INITIAL_CAPACITY = 1024
+
+
+class DecayedPopularity:
+    """
+    Time decayed read counts of the tables, and the tables of the highest ones
+    """
+    def __init__(self, *, half_life_sec: float, now: Optional[float] =None) -> None:
+        """
+        :param half_life_sec: time after which a read counts for half
+        :param now: reference time of the scores, current time by default
+        """
+        if np is None:
+            raise ImportError('numpy is required by DecayedPopularity: pip install amundsen-metadata[popularity]')
+        self.decay_rate = math.log(2) / half_life_sec
+        self._reference_time = time.time() if now is None else now
+
+        self._table_keys = []  # type: List[str]
+        self._indices = {}  # type: Dict[str, int]
+        self._scores = np.zeros(_INITIAL_CAPACITY)
+        self._totals = np.zeros(_INITIAL_CAPACITY)
+        # Number of tables requested and their keys ordered by score, since the last update
+        self._top = None  # type: Optional[Tuple[int, List[str]]]
+        self._lock = Lock()
+
+    def _index(self, table_keys: Sequence[str]) -> Any:
+        indices = np.empty(len(table_keys), dtype=np.int64)
+        for i, table_key in enumerate(table_keys):
+            index = self._indices.get(table_key)
+            if index is None:
+                index = len(self._table_keys)
+                self._indices[table_key] = index
+                self._table_keys.append(table_key)
+            indices[i] = index
+
+        size = len(self._table_keys)
+        if size > len(self._scores):
+            capacity = max(size, 2 * len(self._scores))
+            self._scores = np.concatenate([self._scores, np.zeros(capacity - len(self._scores))])
+            self._totals = np.concatenate([self._totals, np.zeros(capacity - len(self._totals))])
+        return indices
+
+    def _scale(self, at: float) -> float:
+        """
+        :return: weight of a read at the given time relative to the reference time
+        """
+        exponent = self.decay_rate * (at - self._reference_time)
+        if exponent > _MAX_SCALE_EXPONENT:
+            self._scores *= math.exp(-exponent)
+            self._reference_time = at
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def add_reads(self, table_keys: Sequence[str], reads: Sequence[float], at: Optional[float] =None) -> None:
+        """
+        :param table_keys: tables read, a table can be repeated
+        :param reads: number of reads of each table
+        :param at: time of the reads, current time by default
+        """
+        at = time.time() if at is None else at
+        with self._lock:
+            indices = self._index(table_keys)
+            np.add.at(self._scores, indices, np.asarray(reads, dtype=np.float64) * self._scale(at))
+            self._top = None
+
+    def update_read_counts(self, table_keys: Sequence[str], read_counts: Sequence[float],
+                           at: Optional[float] =None) -> None:
+        """
+        Counts the increase of the read counts of the tables since the previous update as reads at the given time.
+        A read count lower than the previous one (e.g. relations removed) isn't counted, and becomes the reference
+        of the next update.
+
+        :param table_keys: tables, each at most once
+        :param read_counts: total read count of each table
+        :param at: time of the read counts, current time by default
+        """
+        at = time.time() if at is None else at
+        with self._lock:
+            indices = self._index(table_keys)
+            read_counts = np.asarray(read_counts, dtype=np.float64)
+            reads = np.maximum(read_counts - self._totals[indices], 0)
+            self._totals[indices] = read_counts
+            self._scores[indices] += reads * self._scale(at)
+            self._top = None
+
+    def top(self, k: int) -> List[str]:
+        """
+        :return: keys of the k tables of the highest scores, highest first. Tables never read aren't returned
+        """
+        top = self._top
+        if top is not None and k <= top[0]:
+            return top[1][:k]
+
+        with self._lock:
+            size = len(self._table_keys)
+            scores = self._scores[:size]
+            if k < size:
+                candidates = np.argpartition(-scores, k)[:k]
+                indices = candidates[np.argsort(-scores[candidates], kind='stable')]
+            else:
+                indices = np.argsort(-scores, kind='stable')
+            table_keys = [self._table_keys[i] for i in indices if scores[i] > 0]
+            self._top = (k, table_keys)
+            return table_keys
+
+    def scores(self, now: Optional[float] =None) -> Dict[str, float]:
+        """
+        :return: decayed number of reads of each table at the given time, current time by default
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            decay = math.exp(-self.decay_rate * (now - self._reference_time))
+            values = self._scores[:len(self._table_keys)] * decay
+            return dict(zip(self._table_keys, values.tolist()))
+
+    def __len__(self) -> int:
+        return len(self._table_keys)
+
+
+def graph_popularity_scores(readers: Sequence[int], total_reads: Sequence[int], *, min_readers: int =10) -> Any:
+    """
+    Popularity of Neo4jProxy._get_popular_tables_uris, readers * log(total reads) of the tables read by more than
+    min_readers users, for comparison with DecayedPopularity.
+
+    :return: array of the scores, 0 for the tables not read by enough users
+    """
+    reader_counts = np.asarray(readers, dtype=np.float64)
+    read_counts = np.asarray(total_reads, dtype=np.float64)
+    scores = reader_counts * np.log(np.maximum(read_counts, 1))
+    return np.where(reader_counts > min_readers, scores, 0.0)
+
+
+class PopularityUpdater:
+    """
+    Updates a DecayedPopularity from the read counts returned by a function, every interval, in a thread started on
+    the first call of start in each process, as threads don't survive the fork of the gunicorn workers
+    """
+    def __init__(self, popularity: DecayedPopularity,
+                 read_counts: Callable[[], Tuple[Sequence[str], Sequence[float]]], *,
+                 interval_sec: float) -> None:
+        """
+        :param read_counts: returns table keys and their total read counts
+        """
+        self.popularity = popularity
+        self.read_counts = read_counts
+        self.interval_sec = interval_sec
+        self.updated = Event()
+        self.stop_event = Event()
+        self._pid = None  # type: Optional[int]
+        self._lock = Lock()
+
+    def update(self) -> None:
+        table_keys, read_counts = self.read_counts()
+        self.popularity.update_read_counts(table_keys, read_counts)
+        self.updated.set()
+        LOGGER.info('Updated the popularity of {} tables'.format(len(table_keys)))
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                self.update()
+            except Exception:
+                LOGGER.exception('Failed to update the popularity of the tables')
+            self.stop_event.wait(self.interval_sec)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        Thread(target=self.run, name='popularity-update', daemon=True).start()
@@ -0,0 +1,139 @@
+"""
+Opt-in cProfile of whole requests.
+
+When config.REQUEST_PROFILER_ENABLED is True, a request is profiled if it carries the header
+config.REQUEST_PROFILER_HEADER, or if it's sampled with config.REQUEST_PROFILER_SAMPLE_RATE. The profile covers the
+request from Resource dispatch through proxy calls to marshal, and is written to config.REQUEST_PROFILER_DIR so
+that it can be downloaded from /debug/profiles/<profile_id> by any worker. The id of the profile is returned in
+the response header X-Metadata-Profile-Id. Only the latest config.REQUEST_PROFILER_MAX_PROFILES are kept.
+"""
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional  # noqa: F401
+
+from flask import Flask, Response, current_app, g, request
+
+from metadata_service import config
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_ID_HEADER = 'X-Metadata-Profile-Id'
+PROFILE_SUFFIX = '.prof'
+_INFO_SUFFIX = '.json'
+_PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f-]+$')
+
+
+def init_profiler(app: Flask) -> None:
+    """
+    Registers the request hooks on the app. They do nothing unless config.REQUEST_PROFILER_ENABLED is True.
+    """
+    app.before_request(_start_profile)
+    app.after_request(_stop_profile)
+
+
+def _should_profile() -> bool:
+    app_config = current_app.config
+    if not app_config[config.REQUEST_PROFILER_ENABLED]:
+        return False
+    if request.headers.get(app_config[config.REQUEST_PROFILER_HEADER]):
+        return True
+    sample_rate = app_config[config.REQUEST_PROFILER_SAMPLE_RATE]
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def _start_profile() -> None:
+    if not _should_profile():
+        return
+    profile = cProfile.Profile()
+    g.request_profile = profile
+    g.request_profile_start = time.time()
+    profile.enable()
+
+
+def _stop_profile(response: Response) -> Response:
+    profile = g.pop('request_profile', None)  # type: Optional[cProfile.Profile]
+    if profile is None:
+        return response
+    profile.disable()
+
+    elapsed_sec = time.time() - g.pop('request_profile_start')
+    try:
+        profile_id = save_profile(profile, {
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'status': response.status_code,
+            'elapsed_ms': elapsed_sec * 1000,
+            'pid': os.getpid(),
+        })
+        response.headers[PROFILE_ID_HEADER] = profile_id
+    except OSError:
+        LOGGER.exception('Failed to save the profile of {}'.format(request.path))
+    return response
+
+
+def _profile_dir() -> str:
+    profile_dir = current_app.config[config.REQUEST_PROFILER_DIR]
+    os.makedirs(profile_dir, exist_ok=True)
+    return profile_dir
+
+
+def save_profile(profile: cProfile.Profile, info: Dict[str, Any]) -> str:
+    """
+    Writes the profile in pstats format, along with the information of the request, and removes the oldest
+    profiles beyond config.REQUEST_PROFILER_MAX_PROFILES.
+    :return: profile id
+    """
+    profile_dir = _profile_dir()
+    # Time first so that ids sort by creation
+    profile_id = '{}-{}'.format(int(time.time() * 1000), uuid.uuid4().hex[:12])
+    info = dict(info, profile_id=profile_id, created_ts=time.time())
+
+    profile.dump_stats(os.path.join(profile_dir, profile_id + PROFILE_SUFFIX))
+    with open(os.path.join(profile_dir, profile_id + _INFO_SUFFIX), 'w') as f:
+        json.dump(info, f)
+
+    for stale_id in list_profile_ids()[current_app.config[config.REQUEST_PROFILER_MAX_PROFILES]:]:
+        for suffix in (PROFILE_SUFFIX, _INFO_SUFFIX):
+            try:
+                os.remove(os.path.join(profile_dir, stale_id + suffix))
+            except FileNotFoundError:
+                # Removed by another worker
+                pass
+    return profile_id
+
+
+def list_profile_ids() -> List[str]:
+    """
+    :return: ids of the stored profiles, latest first
+    """
+    return sorted((name[:-len(PROFILE_SUFFIX)] for name in os.listdir(_profile_dir())
+                   if name.endswith(PROFILE_SUFFIX)), reverse=True)
+
+
+def get_profile_info(profile_id: str) -> Optional[Dict[str, Any]]:
+    """
+    :return: information of the profiled request, or None if the profile does not exist
+    """
+    if not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(_profile_dir(), profile_id + _INFO_SUFFIX)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def get_profile_path(profile_id: str) -> Optional[str]:
+    """
+    :return: path of the pstats file, or None if the profile does not exist
+    """
+    if not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(_profile_dir(), profile_id + PROFILE_SUFFIX)
+    return path if os.path.isfile(path) else None
@@ -1,11 +1,14 @@
+import logging
 from threading import Lock
 
-from flask import current_app
+from flask import Flask, current_app
 from werkzeug.utils import import_string
 
 from metadata_service import config
 from metadata_service.proxy.base_proxy import BaseProxy
 
+LOGGER = logging.getLogger(__name__)
+
 _proxy_client = None
 _proxy_client_lock = Lock()
 
@@ -29,8 +32,48 @@ def get_proxy_client() -> BaseProxy:
             port = current_app.config[config.PROXY_PORT]
             user = current_app.config[config.PROXY_USER]
             password = current_app.config[config.PROXY_PASSWORD]
+            client_kwargs = current_app.config.get(config.PROXY_CLIENT_KWARGS) or {}
 
             client = import_string(current_app.config[config.PROXY_CLIENT])
-            _proxy_client = client(host=host, port=port, user=user, password=password)
+            _proxy_client = client(host=host, port=port, user=user, password=password, **client_kwargs)
 
     return _proxy_client
+
+
+def init_proxy_client(app: Flask) -> None:
+    """
+    Creates the proxy client and connects to the backend if config.PROXY_EAGER_INIT is True, so that the first
+    requests don't wait for it (see connect_proxy_client).
+    """
+    if app.config[config.PROXY_EAGER_INIT]:
+        connect_proxy_client(app)
+
+
+def connect_proxy_client(app: Flask) -> None:
+    """
+    Creates the proxy client of the process and connects to the backend. A backend that can't be reached doesn't
+    prevent the app from starting: /readiness reports it, and the client is created on the first request if it
+    couldn't be created here.
+    """
+    with app.app_context():
+        try:
+            client = get_proxy_client()
+            client.check_connectivity()
+        except Exception:
+            LOGGER.exception('Failed to connect to the backend of {}'.format(app.config[config.PROXY_CLIENT]))
+            return
+    LOGGER.info('Connected to the backend of {}'.format(app.config[config.PROXY_CLIENT]))
+
+
+def reset_proxy_client() -> None:
+    """
+    Drops the proxy client of the process, so that the next get_proxy_client creates a new one. Called in processes
+    forked from one that may have created a client, as connections and threads of a client can't be shared across
+    processes.
+    """
+    global _proxy_client, _proxy_client_lock
+
+    if _proxy_client is not None:
+        LOGGER.info('Dropping proxy client {} inherited from the parent process'.format(_proxy_client))
+    _proxy_client = None
+    _proxy_client_lock = Lock()
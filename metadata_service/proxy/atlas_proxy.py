@@ -1,5 +1,5 @@
 import logging
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, Iterator, Optional, Tuple
 
 from atlasclient.client import Atlas
 from atlasclient.exceptions import BadRequest
@@ -10,9 +10,11 @@ from metadata_service.entity.tag_detail import TagDetail
 
 from metadata_service.entity.popular_table import PopularTable
 from metadata_service.entity.table_detail import Table, User, Tag, Column
+from metadata_service.entity.table_summary import TableSummary
 from metadata_service.entity.user_detail import User as UserEntity
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import BaseProxy
+from metadata_service.proxy.single_flight import single_flight
 from metadata_service.util import UserResourceRel
 
 LOGGER = logging.getLogger(__name__)
@@ -23,9 +25,6 @@ class AtlasProxy(BaseProxy):
     Atlas Proxy client for the amundsen metadata
     {ATLAS_API_DOCS} = https://atlas.apache.org/api/v2/
     """
-    TABLE_ENTITY = app.config['ATLAS_TABLE_ENTITY']
-    DB_ATTRIBUTE = app.config['ATLAS_DB_ATTRIBUTE']
-    NAME_ATTRIBUTE = app.config['ATLAS_NAME_ATTRIBUTE']
     ATTRS_KEY = 'attributes'
     REL_ATTRS_KEY = 'relationshipAttributes'
 
@@ -35,9 +34,20 @@ class AtlasProxy(BaseProxy):
                  user: str = 'admin',
                  password: str = '') -> None:
         """
-        Initiate the Apache Atlas client with the provided credentials
+        Initiate the Apache Atlas client with the provided credentials.
+        Entity and attribute names are read from the config of the app here rather than when the module is imported,
+        so that it can be imported outside of an app context.
         """
         self._driver = Atlas(host=host, port=port, username=user, password=password)
+        self.TABLE_ENTITY = app.config['ATLAS_TABLE_ENTITY']
+        self.DB_ATTRIBUTE = app.config['ATLAS_DB_ATTRIBUTE']
+        self.NAME_ATTRIBUTE = app.config['ATLAS_NAME_ATTRIBUTE']
+
+    def check_connectivity(self) -> None:
+        """
+        Requests the version of Atlas, which needs authentication
+        """
+        self._driver.client.get('{}/api/atlas/admin/version'.format(self._driver.base_url))
 
     def _get_ids_from_basic_search(self, *, params: Dict) -> List[str]:
         """
@@ -113,16 +123,18 @@ class AtlasProxy(BaseProxy):
     def get_user_detail(self, *, user_id: str) -> Union[UserEntity, None]:
         pass
 
-    def get_table(self, *, table_id: str, table_info: Dict) -> Table:
+    @single_flight
+    def get_table(self, *, table_uri: str, table_info: Optional[Dict] = None) -> Table:
         """
         Gathers all the information needed for the Table Detail Page.
-        :param table_id:
-        :param table_info: Additional table information (entity, db, cluster, name)
+        :param table_uri: Table GUID
+        :param table_info: Additional table information (entity, db, cluster, name).
+        Derived from the table entity if not provided.
         :return: A Table object with all the information available
         or gathered from different entities.
         """
 
-        table_entity = self._get_table_entity(table_id=table_id)
+        table_entity = self._get_table_entity(table_id=table_uri)
         table_details = table_entity.entity
 
         try:
@@ -152,6 +164,9 @@ class AtlasProxy(BaseProxy):
                     )
                 )
 
+            if table_info is None:
+                table_info = self._get_table_info(table_details=table_details)
+
             table = Table(database=table_info['entity'],
                           cluster=table_info['cluster'],
                           schema=table_info['db'],
@@ -167,70 +182,70 @@ class AtlasProxy(BaseProxy):
             LOGGER.exception('Error while accessing table information. {}'
                              .format(str(ex)))
             raise BadRequest('Some of the required attributes '
-                             'are missing in : ( {table_id} )'
-                             .format(table_id=table_id))
+                             'are missing in : ( {table_uri} )'
+                             .format(table_uri=table_uri))
 
-    def delete_owner(self, *, table_id: str, owner: str) -> None:
+    def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
 
-    def add_owner(self, *, table_id: str, owner: str) -> None:
+    def add_owner(self, *, table_uri: str, owner: str) -> None:
         """
         It simply replaces the owner field in atlas with the new string.
         FixMe (Verdan): Implement multiple data owners and
         atlas changes in the documentation if needed to make owner field a list
-        :param table_id:
+        :param table_uri: Table GUID
         :param owner: Email address of the owner
         :return: None, as it simply adds the owner.
         """
-        entity = self._get_table_entity(table_id=table_id)
+        entity = self._get_table_entity(table_id=table_uri)
         entity.entity[self.ATTRS_KEY]['owner'] = owner
         entity.update()
 
     def get_table_description(self, *,
-                              table_id: str) -> Union[str, None]:
+                              table_uri: str) -> Union[str, None]:
         """
-        :param table_id:
+        :param table_uri: Table GUID
         :return: The description of the table as a string
         """
-        entity = self._get_table_entity(table_id=table_id)
+        entity = self._get_table_entity(table_id=table_uri)
         return entity.entity[self.ATTRS_KEY].get('description')
 
     def put_table_description(self, *,
-                              table_id: str,
+                              table_uri: str,
                               description: str) -> None:
         """
         Update the description of the given table.
-        :param table_id:
+        :param table_uri: Table GUID
         :param description: Description string
         :return: None
         """
-        entity = self._get_table_entity(table_id=table_id)
+        entity = self._get_table_entity(table_id=table_uri)
         entity.entity[self.ATTRS_KEY]['description'] = description
         entity.update()
 
-    def add_tag(self, *, table_id: str, tag: str) -> None:
+    def add_tag(self, *, table_uri: str, tag: str) -> None:
         """
         Assign the tag/classification to the give table
         API Ref: /resource_EntityREST.html#resource_EntityREST_addClassification_POST
-        :param table_id:
+        :param table_uri: Table GUID
         :param tag: Tag/Classification Name
         :return: None
         """
-        entity = self._get_table_entity(table_id=table_id)
+        entity = self._get_table_entity(table_id=table_uri)
         entity_bulk_tag = {"classification": {"typeName": tag},
                            "entityGuids": [entity.entity['guid']]}
         self._driver.entity_bulk_classification.create(data=entity_bulk_tag)
 
-    def delete_tag(self, *, table_id: str, tag: str) -> None:
+    def delete_tag(self, *, table_uri: str, tag: str) -> None:
         """
         Delete the assigned classfication/tag from the given table
         API Ref: /resource_EntityREST.html#resource_EntityREST_deleteClassification_DELETE
-        :param table_id:
+        :param table_uri: Table GUID
         :param tag:
         :return:
         """
         try:
-            entity = self._get_table_entity(table_id=table_id)
+            entity = self._get_table_entity(table_id=table_uri)
             guid_entity = self._driver.entity_guid(entity.entity['guid'])
             guid_entity.classifications(tag).delete()
         except Exception as ex:
@@ -238,30 +253,67 @@ class AtlasProxy(BaseProxy):
             LOGGER.exception('For some reason this deletes the classification '
                              'but also always return exception. {}'.format(str(ex)))
 
+    def _get_table_info(self, *, table_details: Dict) -> Dict[str, Any]:
+        """
+        Builds the additional table information (entity, db, cluster, name) from the table entity itself
+        :param table_details: The entity dict of the table entity
+        :return: dict with entity, db, cluster and name
+        """
+        attrs = table_details[self.ATTRS_KEY]
+        db = table_details[self.REL_ATTRS_KEY].get(self.DB_ATTRIBUTE) or {}
+        db_attrs = db.get(self.ATTRS_KEY) or {}
+        return {
+            'entity': table_details.get('typeName'),
+            'db': db_attrs.get(self.NAME_ATTRIBUTE) or db.get('displayText'),
+            'cluster': db_attrs.get('clusterName'),
+            'name': attrs.get(self.NAME_ATTRIBUTE),
+        }
+
+    def _get_column_id(self, *, table_uri: str, column_name: str) -> str:
+        """
+        Finds the column GUID by name among the columns of the table
+        :param table_uri: Table GUID
+        :param column_name: Name of the column
+        :return: Column GUID
+        """
+        table_entity = self._get_table_entity(table_id=table_uri)
+        for column in table_entity.entity[self.REL_ATTRS_KEY].get('columns') or list():
+            col_entity = table_entity.referredEntities.get(column['guid']) or {}
+            if col_entity.get(self.ATTRS_KEY, {}).get(self.NAME_ATTRIBUTE) == column_name:
+                return column['guid']
+
+        raise NotFoundException('Column {column_name} not found in table GUID( {table_uri} )'
+                                .format(column_name=column_name, table_uri=table_uri))
+
     def put_column_description(self, *,
-                               column_id: str,
+                               table_uri: str,
+                               column_name: str,
                                description: str) -> None:
         """
-        :param column_id:
+        :param table_uri: Table GUID
+        :param column_name: Name of the column
         :param description: The description string
         :return: None, as it simply updates the description of a column
         """
         column_entity = self._get_column(
-            column_id=column_id)
+            column_id=self._get_column_id(table_uri=table_uri, column_name=column_name))
 
         column_entity.entity[self.ATTRS_KEY]['description'] = description
         column_entity.update(attribute='description')
 
     def get_column_description(self, *,
-                               column_id: str) -> Union[str, None]:
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
         """
-        :param column_id:
+        :param table_uri: Table GUID
+        :param column_name: Name of the column
         :return: The column description using the column id
         """
         column_entity = self._get_column(
-            column_id=column_id)
+            column_id=self._get_column_id(table_uri=table_uri, column_name=column_name))
         return column_entity.entity[self.ATTRS_KEY].get('description')
 
+    @single_flight
     def get_popular_tables(self, *,
                            num_entries: int = 10) -> List[PopularTable]:
         """
@@ -293,19 +345,7 @@ class AtlasProxy(BaseProxy):
         # Make instances of PopularTable
         for entity in table_entities:
             attrs = entity.attributes
-
-            # DB would be available in attributes
-            # because it is in the request parameter.
-            db_id = attrs.get(self.DB_ATTRIBUTE, {}).get('guid')
-            db_entity = dbs_dict.get(db_id)
-
-            if db_entity:
-                db_attrs = db_entity.attributes
-                db_name = db_attrs.get(self.NAME_ATTRIBUTE)
-                db_cluster = db_attrs.get('clusterName')
-            else:
-                db_name = ''
-                db_cluster = ''
+            db_name, db_cluster = self._get_db_name_and_cluster(entity=entity, dbs_dict=dbs_dict)
 
             popular_table = PopularTable(database=entity.typeName,
                                          cluster=db_cluster,
@@ -315,9 +355,106 @@ class AtlasProxy(BaseProxy):
             popular_tables.append(popular_table)
         return popular_tables
 
+    def _get_db_name_and_cluster(self, *, entity: Entity, dbs_dict: Dict) -> Tuple[str, str]:
+        """
+        Finds the database name and cluster of the table entity
+        :param entity: Table entity with the DB attribute
+        :param dbs_dict: Database entities by GUID from _get_rel_attributes_dict
+        :return: database name and cluster. Empty strings if the database entity is not found
+        """
+        # DB would be available in attributes
+        # because it is in the request parameter.
+        db_id = entity.attributes.get(self.DB_ATTRIBUTE, {}).get('guid')
+        db_entity = dbs_dict.get(db_id)
+
+        if db_entity:
+            db_attrs = db_entity.attributes
+            return db_attrs.get(self.NAME_ATTRIBUTE), db_attrs.get('clusterName')
+        return '', ''
+
+    def export_tables(self, *,
+                      batch_size: int = 1000) -> Iterator[TableSummary]:
+        """
+        Iterates all the tables ordered by the name attribute. Tables are fetched in batches with keyset
+        pagination on the name attribute (qualifiedName by default), which is indexed by Atlas.
+        :param batch_size: number of tables fetched per search
+        :return: Iterator of TableSummary where key is the GUID of the table
+        """
+        last_name = ''
+        while True:
+            params = {'typeName': self.TABLE_ENTITY,
+                      'excludeDeletedEntities': True,
+                      'limit': batch_size,
+                      'sortBy': self.NAME_ATTRIBUTE,
+                      'sortOrder': 'ASCENDING',
+                      self.ATTRS_KEY: [self.DB_ATTRIBUTE, 'description', 'owner']
+                      }  # type: Dict[str, Any]
+            if last_name:
+                params['entityFilters'] = {'attributeName': self.NAME_ATTRIBUTE,
+                                           'operator': 'gt',
+                                           'attributeValue': last_name}
+
+            table_entities = self._driver.search_basic.create(data=params).entities or []
+            dbs_dict = self._get_rel_attributes_dict(entities=table_entities,
+                                                     attribute=self.DB_ATTRIBUTE) if table_entities else {}
+
+            for entity in table_entities:
+                attrs = entity.attributes
+                db_name, db_cluster = self._get_db_name_and_cluster(entity=entity, dbs_dict=dbs_dict)
+                owner = attrs.get('owner')
+
+                yield TableSummary(key=entity.guid,
+                                   database=entity.typeName,
+                                   cluster=db_cluster,
+                                   schema=db_name,
+                                   name=attrs.get(self.NAME_ATTRIBUTE),
+                                   description=attrs.get('description'),
+                                   tags=[Tag(tag_name=classification, tag_type='default')
+                                         for classification in entity.classificationNames or []],
+                                   owners=[User(email=owner)] if owner else [])
+
+            if len(table_entities) < batch_size:
+                return
+            last_name = table_entities[-1].attributes.get(self.NAME_ATTRIBUTE)
+
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str = '',
+                                  num_entries: int = 1000) -> Tuple[List[str], Optional[str]]:
+        """
+        Search the tables modified at or after the given time, using the modification timestamp that Atlas
+        maintains on every entity update. Tables are ordered by the name attribute, which is used as cursor.
+        :param since: epoch seconds
+        :param cursor: cursor returned from the previous page. Empty string for the first page
+        :param num_entries: max number of tables per page
+        :return: table GUIDs and the cursor of the next page. Cursor is None on the last page
+        """
+        criterion = [{'attributeName': '__modificationTimestamp',
+                      'operator': 'gte',
+                      'attributeValue': since * 1000}]  # Atlas timestamps are in milliseconds
+        if cursor:
+            criterion.append({'attributeName': self.NAME_ATTRIBUTE,
+                              'operator': 'gt',
+                              'attributeValue': cursor})
+
+        params = {'typeName': self.TABLE_ENTITY,
+                  'excludeDeletedEntities': True,
+                  'limit': num_entries,
+                  'sortBy': self.NAME_ATTRIBUTE,
+                  'sortOrder': 'ASCENDING',
+                  'entityFilters': {'condition': 'AND', 'criterion': criterion}}
+
+        table_entities = self._driver.search_basic.create(data=params).entities or []
+
+        next_cursor = None
+        if len(table_entities) == num_entries:
+            next_cursor = table_entities[-1].attributes.get(self.NAME_ATTRIBUTE)
+        return [entity.guid for entity in table_entities], next_cursor
+
     def get_latest_updated_ts(self) -> int:
         pass
 
+    @single_flight
     def get_tags(self) -> List:
         """
         Fetch all the classification entity definitions from atlas  as this
@@ -340,13 +477,13 @@ class AtlasProxy(BaseProxy):
         pass
 
     def add_table_relation_by_user(self, *,
-                                   table_id: str,
+                                   table_uri: str,
                                    user_email: str,
                                    relation_type: UserResourceRel) -> None:
         pass
 
     def delete_table_relation_by_user(self, *,
-                                      table_id: str,
+                                      table_uri: str,
                                       user_email: str,
                                       relation_type: UserResourceRel) -> None:
         pass
@@ -1,8 +1,9 @@
 from abc import ABCMeta, abstractmethod
 
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, Iterator, Optional, Tuple
 
 from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_summary import TableSummary
 from metadata_service.entity.user_detail import User as UserEntity
 from metadata_service.entity.table_detail import Table
 from metadata_service.util import UserResourceRel
@@ -18,45 +19,47 @@ class BaseProxy(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_table(self, *, table_id: str, table_info: Dict) -> Table:
+    def get_table(self, *, table_uri: str) -> Table:
         pass
 
     @abstractmethod
-    def delete_owner(self, *, table_id: str, owner: str) -> None:
+    def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
 
     @abstractmethod
-    def add_owner(self, *, table_id: str, owner: str) -> None:
+    def add_owner(self, *, table_uri: str, owner: str) -> None:
         pass
 
     @abstractmethod
     def get_table_description(self, *,
-                              table_id: str) -> Union[str, None]:
+                              table_uri: str) -> Union[str, None]:
         pass
 
     @abstractmethod
     def put_table_description(self, *,
-                              table_id: str,
+                              table_uri: str,
                               description: str) -> None:
         pass
 
     @abstractmethod
-    def add_tag(self, *, table_id: str, tag: str) -> None:
+    def add_tag(self, *, table_uri: str, tag: str) -> None:
         pass
 
     @abstractmethod
-    def delete_tag(self, *, table_id: str, tag: str) -> None:
+    def delete_tag(self, *, table_uri: str, tag: str) -> None:
         pass
 
     @abstractmethod
     def put_column_description(self, *,
-                               column_id: str,
+                               table_uri: str,
+                               column_name: str,
                                description: str) -> None:
         pass
 
     @abstractmethod
     def get_column_description(self, *,
-                               column_id: str) -> Union[str, None]:
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
         pass
 
     @abstractmethod
@@ -64,6 +67,18 @@ class BaseProxy(metaclass=ABCMeta):
                            num_entries: int =10) -> List[PopularTable]:
         pass
 
+    @abstractmethod
+    def export_tables(self, *,
+                      batch_size: int =1000) -> Iterator[TableSummary]:
+        pass
+
+    @abstractmethod
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str ='',
+                                  num_entries: int =1000) -> Tuple[List[str], Optional[str]]:
+        pass
+
     @abstractmethod
     def get_latest_updated_ts(self) -> int:
         pass
@@ -79,14 +94,81 @@ class BaseProxy(metaclass=ABCMeta):
 
     @abstractmethod
     def add_table_relation_by_user(self, *,
-                                   table_id: str,
+                                   table_uri: str,
                                    user_email: str,
                                    relation_type: UserResourceRel) -> None:
         pass
 
     @abstractmethod
     def delete_table_relation_by_user(self, *,
-                                      table_id: str,
+                                      table_uri: str,
                                       user_email: str,
                                       relation_type: UserResourceRel) -> None:
         pass
+
+    def export_table_keys(self, *,
+                          batch_size: int =1000) -> Iterator[str]:
+        """
+        Iterates the keys of all the tables ordered by table key. Proxies backed by a database override it to
+        fetch the keys only rather than the summaries of export_tables.
+
+        :param batch_size: number of keys fetched per batch
+        """
+        for summary in self.export_tables(batch_size=batch_size):
+            yield summary.key
+
+    def get_table_count(self) -> int:
+        """
+        :return: number of tables, as iterated by export_table_keys
+        """
+        return sum(1 for _ in self.export_table_keys())
+
+    def export_table_details(self, *,
+                             batch_size: int =1000) -> Iterator[Tuple[str, Table]]:
+        """
+        Iterates all the tables with their details, as get_table returns them, ordered by table key. Proxies
+        backed by a database override it to load them in batches rather than with one get_table per table.
+
+        :param batch_size: number of tables fetched per batch
+        :return: Iterator of table key and Table
+        """
+        for summary in self.export_tables(batch_size=batch_size):
+            yield summary.key, self.get_table(table_uri=summary.key)
+
+    def export_users(self, *,
+                     batch_size: int =1000) -> Iterator[UserEntity]:
+        """
+        Iterates all the users, as get_user_detail returns them, ordered by email. Proxies which can't list the
+        users don't override it.
+
+        :param batch_size: number of users fetched per batch
+        :raises NotImplementedError: if the proxy can't list the users
+        """
+        raise NotImplementedError('{} does not export users'.format(type(self).__name__))
+
+    def export_user_relations(self, *,
+                              batch_size: int =1000) -> Iterator[Tuple[str, Any, List[str]]]:
+        """
+        Iterates the tables related to each user, as get_table_by_user_relation returns them, ordered by user email.
+        Proxies which can't list the users don't override it.
+
+        :param batch_size: number of users fetched per batch
+        :return: Iterator of user email, relation type (UserResourceRel) and table keys
+        :raises NotImplementedError: if the proxy can't list the users
+        """
+        raise NotImplementedError('{} does not export user relations'.format(type(self).__name__))
+
+    def check_connectivity(self) -> None:
+        """
+        Raises if the backend can't be reached. Called on /readiness and when the client is created in create_app,
+        which also opens the first connection of the pool. Proxies serving from the process have nothing to check.
+        """
+        pass
+
+    def pin_tables(self, *, table_uris: List[str]) -> None:
+        """
+        Keeps the given tables, the most requested ones, cached and refreshes them before they expire, so that their
+        reads never miss. Called periodically by metadata_service.hot_keys with the latest list, the tables of the
+        previous call which aren't in it are no longer kept. Proxies without a cache have nothing to keep.
+        """
+        pass
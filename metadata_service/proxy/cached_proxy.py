@@ -0,0 +1,257 @@
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union  # noqa: F401
+
+from werkzeug.utils import import_string
+
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Table
+from metadata_service.entity.table_summary import TableSummary
+from metadata_service.entity.user_detail import User as UserEntity
+from metadata_service.exception import NotFoundException
+from metadata_service.memory_cache import MemoryCache
+from metadata_service.metrics import record_cache_access
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.shared_cache import MISSING, SharedCache, default_directory
+from metadata_service.util import UserResourceRel
+
+LOGGER = logging.getLogger(__name__)
+
+# Names of the caches in the cache metrics
+LOCAL_CACHE_NAME = 'proxy_local'
+SHARED_CACHE_NAME = 'proxy_shared'
+
+
+class CachedProxy(BaseProxy):
+    """
+    Caches the results of get_popular_tables, get_tags and get_table of another proxy (Neo4jProxy by default) in
+    two tiers: a memory cache of the process, in front of a cache shared by the worker processes of the host (see
+    metadata_service.shared_cache). A result computed by a worker is served by the other workers from the shared
+    cache, rather than computed again by each of them.
+
+    Writes go through the wrapped proxy, then remove the cached table and tags from the shared cache and the memory
+    cache of the process. Memory caches of the other processes keep them up to local_expire_sec, hence it is kept
+    short. Popular tables expire only.
+
+    To use it, set PROXY_CLIENT to PROXY_CLIENTS['CACHED']. Arguments other than host, port, user and password can
+    be passed through config PROXY_CLIENT_KWARGS.
+    """
+    def __init__(self, *,
+                 host: str,
+                 port: int,
+                 user: str ='neo4j',
+                 password: str ='',
+                 client: str ='metadata_service.proxy.neo4j_proxy.Neo4jProxy',
+                 client_kwargs: Optional[Dict[str, Any]] =None,
+                 local_expire_sec: int =30,
+                 local_max_entries: int =10000,
+                 local_max_bytes: int =64 * 1024 * 1024,
+                 popular_tables_expire_sec: int =3600,
+                 tags_expire_sec: int =300,
+                 table_expire_sec: int =300,
+                 shared_cache_dir: str ='',
+                 shared_cache_max_bytes: int =256 * 1024 * 1024) -> None:
+        """
+        :param client: path to class name of the wrapped proxy
+        :param client_kwargs: keyword arguments of the wrapped proxy on top of host, port, user and password
+        :param local_expire_sec: time to live of the results in the memory cache of the process
+        :param local_max_entries: max number of results of each method in the memory cache of the process
+        :param local_max_bytes: max size of the results of each method in the memory cache of the process, counted
+        as their pickled size in the shared cache
+        :param popular_tables_expire_sec: time to live of get_popular_tables results in the shared cache
+        :param tags_expire_sec: time to live of get_tags results in the shared cache
+        :param table_expire_sec: time to live of get_table results in the shared cache
+        :param shared_cache_dir: directory of the shared cache, on /dev/shm by default. Processes of different
+        releases or backends must use different directories
+        :param shared_cache_max_bytes: max total size of the shared cache
+        """
+        self._proxy = import_string(client)(host=host, port=port, user=user, password=password,
+                                            **(client_kwargs or {}))  # type: BaseProxy
+        self._shared_cache = SharedCache(shared_cache_dir or default_directory(), max_bytes=shared_cache_max_bytes)
+
+        self._shared_expire_sec = {
+            'get_popular_tables': popular_tables_expire_sec,
+            'get_tags': tags_expire_sec,
+            'get_table': table_expire_sec,
+        }
+        self._local_caches = {
+            method: MemoryCache('cached_proxy.{}'.format(method), max_entries=local_max_entries,
+                                max_bytes=local_max_bytes, expire_sec=local_expire_sec)
+            for method in self._shared_expire_sec
+        }  # type: Dict[str, MemoryCache]
+
+    def _cached(self, method: str, key: str, compute: Callable[[], Any]) -> Any:
+        local_cache = self._local_caches[method]
+        value = local_cache.get(key)
+        record_cache_access(LOCAL_CACHE_NAME, value is not MISSING)
+        if value is not MISSING:
+            return value
+
+        value, size = self._get_shared(method, key, compute)
+        local_cache.put(key, value, size=size)
+        return value
+
+    def _get_shared(self, method: str, key: str, compute: Callable[[], Any]) -> Tuple[Any, Optional[int]]:
+        """
+        :return: value of the shared cache, computed and put first if it isn't in it, and its pickled size, which
+        is the size of the value in the memory cache rather than walking the value for an estimate
+        """
+        shared_key = '{}:{}'.format(method, key)
+        value, size = self._shared_cache.get_with_size(shared_key)  # type: Any, Optional[int]
+        record_cache_access(SHARED_CACHE_NAME, value is not MISSING)
+        if value is MISSING:
+            value = compute()
+            size = self._shared_cache.put(shared_key, value, expire_sec=self._shared_expire_sec[method])
+        return value, size
+
+    def _refresh(self, method: str, key: str, compute: Callable[[], Any]) -> None:
+        """
+        Puts the value of the shared cache in the memory cache, computing it first if it isn't in the shared cache
+        """
+        value, size = self._get_shared(method, key, compute)
+        self._local_caches[method].put(key, value, size=size)
+
+    def _invalidate(self, method: str, key: str) -> None:
+        self._shared_cache.delete('{}:{}'.format(method, key))
+        self._local_caches[method].invalidate(key)
+
+    def _invalidate_table(self, table_uri: str) -> None:
+        self._invalidate('get_table', table_uri)
+
+    def check_connectivity(self) -> None:
+        self._proxy.check_connectivity()
+
+    def pin_tables(self, *, table_uris: List[str]) -> None:
+        """
+        Pins the tables in the memory cache of the process, and refreshes those expiring within half of
+        local_expire_sec, from the shared cache or the wrapped proxy. Called more often than that, pinned tables
+        are always in the memory cache.
+        """
+        local_cache = self._local_caches['get_table']
+        local_cache.pin(table_uris)
+        for table_uri in table_uris:
+            expires_in = local_cache.expires_in(table_uri)
+            if expires_in is None or expires_in < local_cache.expire_sec / 2:
+                try:
+                    self._refresh('get_table', table_uri, lambda: self._proxy.get_table(table_uri=table_uri))
+                except NotFoundException:
+                    local_cache.invalidate(table_uri)
+
+    def get_table(self, *, table_uri: str) -> Table:
+        return self._cached('get_table', table_uri, lambda: self._proxy.get_table(table_uri=table_uri))
+
+    def get_table_description(self, *,
+                              table_uri: str) -> Union[str, None]:
+        return self._proxy.get_table_description(table_uri=table_uri)
+
+    def put_table_description(self, *,
+                              table_uri: str,
+                              description: str) -> None:
+        self._proxy.put_table_description(table_uri=table_uri, description=description)
+        self._invalidate_table(table_uri)
+
+    def get_column_description(self, *,
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
+        return self._proxy.get_column_description(table_uri=table_uri, column_name=column_name)
+
+    def put_column_description(self, *,
+                               table_uri: str,
+                               column_name: str,
+                               description: str) -> None:
+        self._proxy.put_column_description(table_uri=table_uri,
+                                           column_name=column_name,
+                                           description=description)
+        self._invalidate_table(table_uri)
+
+    def add_owner(self, *,
+                  table_uri: str,
+                  owner: str) -> None:
+        self._proxy.add_owner(table_uri=table_uri, owner=owner)
+        self._invalidate_table(table_uri)
+
+    def delete_owner(self, *,
+                     table_uri: str,
+                     owner: str) -> None:
+        self._proxy.delete_owner(table_uri=table_uri, owner=owner)
+        self._invalidate_table(table_uri)
+
+    def add_tag(self, *,
+                table_uri: str,
+                tag: str) -> None:
+        self._proxy.add_tag(table_uri=table_uri, tag=tag)
+        self._invalidate_table(table_uri)
+        self._invalidate('get_tags', '')
+
+    def delete_tag(self, *,
+                   table_uri: str,
+                   tag: str) -> None:
+        self._proxy.delete_tag(table_uri=table_uri, tag=tag)
+        self._invalidate_table(table_uri)
+        self._invalidate('get_tags', '')
+
+    def get_tags(self) -> List:
+        return self._cached('get_tags', '', self._proxy.get_tags)
+
+    def get_popular_tables(self, *,
+                           num_entries: int =10) -> List[PopularTable]:
+        return self._cached('get_popular_tables', str(num_entries),
+                            lambda: self._proxy.get_popular_tables(num_entries=num_entries))
+
+    def export_tables(self, *,
+                      batch_size: int =1000) -> Iterator[TableSummary]:
+        return self._proxy.export_tables(batch_size=batch_size)
+
+    def export_table_keys(self, *,
+                          batch_size: int =1000) -> Iterator[str]:
+        return self._proxy.export_table_keys(batch_size=batch_size)
+
+    def get_table_count(self) -> int:
+        return self._proxy.get_table_count()
+
+    def export_table_details(self, *,
+                             batch_size: int =1000) -> Iterator[Tuple[str, Table]]:
+        return self._proxy.export_table_details(batch_size=batch_size)
+
+    def export_users(self, *,
+                     batch_size: int =1000) -> Iterator[UserEntity]:
+        return self._proxy.export_users(batch_size=batch_size)
+
+    def export_user_relations(self, *,
+                              batch_size: int =1000) -> Iterator[Tuple[str, Any, List[str]]]:
+        return self._proxy.export_user_relations(batch_size=batch_size)
+
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str ='',
+                                  num_entries: int =1000) -> Tuple[List[str], Optional[str]]:
+        return self._proxy.get_tables_modified_since(since=since, cursor=cursor, num_entries=num_entries)
+
+    def get_latest_updated_ts(self) -> int:
+        return self._proxy.get_latest_updated_ts()
+
+    def get_user_detail(self, *, user_id: str) -> Union[UserEntity, None]:
+        return self._proxy.get_user_detail(user_id=user_id)
+
+    def get_table_by_user_relation(self, *,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+        return self._proxy.get_table_by_user_relation(user_email=user_email, relation_type=relation_type)
+
+    def add_table_relation_by_user(self, *,
+                                   table_uri: str,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> None:
+        self._proxy.add_table_relation_by_user(table_uri=table_uri,
+                                               user_email=user_email,
+                                               relation_type=relation_type)
+        # Owners are part of the table
+        self._invalidate_table(table_uri)
+
+    def delete_table_relation_by_user(self, *,
+                                      table_uri: str,
+                                      user_email: str,
+                                      relation_type: UserResourceRel) -> None:
+        self._proxy.delete_table_relation_by_user(table_uri=table_uri,
+                                                  user_email=user_email,
+                                                  relation_type=relation_type)
+        self._invalidate_table(table_uri)
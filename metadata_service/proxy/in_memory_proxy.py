@@ -0,0 +1,283 @@
+import math
+import random
+import time
+from bisect import bisect_right
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union  # noqa: F401
+
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Table, Tag, User
+from metadata_service.entity.table_summary import TableSummary
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.entity.user_detail import User as UserEntity
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.tools.synthetic_catalog import SyntheticCatalog, generate_catalog, top_readers
+from metadata_service.util import UserResourceRel
+
+
+class InMemoryProxy(BaseProxy):
+    """
+    Fake proxy serving a catalog held in memory, by default a synthetic one from
+    metadata_service.tools.synthetic_catalog. It is used to benchmark the service layer (routes, marshalling) in
+    isolation. A backend round trip can be emulated with latency_ms and latency_jitter_ms, which are added to each
+    call.
+
+    It can be selected with PROXY_CLIENT=metadata_service.proxy.in_memory_proxy.InMemoryProxy, and
+    PROXY_CLIENT_KWARGS e.g. {'synthetic': {'num_tables': 100}, 'latency_ms': 5}.
+    """
+    # Same threshold as Neo4jProxy popular tables
+    POPULAR_TABLE_MIN_READERS = 10
+
+    def __init__(self, *,
+                 host: str ='',
+                 port: int =0,
+                 user: str ='',
+                 password: str ='',
+                 catalog: Optional[SyntheticCatalog] =None,
+                 synthetic: Optional[Dict[str, Any]] =None,
+                 latency_ms: float =0.0,
+                 latency_jitter_ms: float =0.0) -> None:
+        """
+        :param catalog: catalog to serve. Generated with generate_catalog(**synthetic) if not provided
+        :param synthetic: arguments of generate_catalog
+        :param latency_ms: latency added to every call
+        :param latency_jitter_ms: max random latency added on top of latency_ms
+        """
+        self._catalog = catalog if catalog is not None else generate_catalog(**(synthetic or {}))
+        self._latency_sec = latency_ms / 1000.0
+        self._latency_jitter_sec = latency_jitter_ms / 1000.0
+        self._lock = Lock()
+
+        self._sorted_keys = sorted(self._catalog.tables.keys())
+        self._modified_ts = {}  # type: Dict[str, int]
+        self._popular_table_keys = None  # type: Optional[List[str]]
+
+        self._tag_counts = {}  # type: Dict[str, int]
+        # relation -> user email -> table keys
+        self._relations = {
+            UserResourceRel.follow: self._catalog.follows,
+            UserResourceRel.own: {},
+            UserResourceRel.read: {},
+        }  # type: Dict[Any, Dict[str, Set[str]]]
+        for key, table in self._catalog.tables.items():
+            for tag in table.tags:
+                self._tag_counts[tag.tag_name] = self._tag_counts.get(tag.tag_name, 0) + 1
+            for owner in table.owners:
+                self._relations[UserResourceRel.own].setdefault(owner.email, set()).add(key)
+        for key, reads in self._catalog.reads.items():
+            for email in reads:
+                self._relations[UserResourceRel.read].setdefault(email, set()).add(key)
+
+    def _wait(self) -> None:
+        latency_sec = self._latency_sec
+        if self._latency_jitter_sec:
+            latency_sec += random.uniform(0, self._latency_jitter_sec)
+        if latency_sec > 0:
+            time.sleep(latency_sec)
+
+    def _get_table(self, table_uri: str) -> Table:
+        table = self._catalog.tables.get(table_uri)
+        if table is None:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+        return table
+
+    def _touch(self, table_uri: str) -> None:
+        self._modified_ts[table_uri] = int(time.time())
+
+    @staticmethod
+    def _to_popular_table(table: Table) -> PopularTable:
+        return PopularTable(database=table.database, cluster=table.cluster, schema=table.schema, name=table.name,
+                            description=table.description)
+
+    def get_table(self, *, table_uri: str) -> Table:
+        self._wait()
+        return self._get_table(table_uri)
+
+    def get_table_description(self, *,
+                              table_uri: str) -> Union[str, None]:
+        self._wait()
+        return self._get_table(table_uri).description
+
+    def put_table_description(self, *,
+                              table_uri: str,
+                              description: str) -> None:
+        self._wait()
+        self._get_table(table_uri).description = description
+        self._touch(table_uri)
+
+    def get_column_description(self, *,
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
+        self._wait()
+        for column in self._get_table(table_uri).columns:
+            if column.name == column_name:
+                return column.description
+        return None
+
+    def put_column_description(self, *,
+                               table_uri: str,
+                               column_name: str,
+                               description: str) -> None:
+        self._wait()
+        for column in self._get_table(table_uri).columns:
+            if column.name == column_name:
+                column.description = description
+                self._touch(table_uri)
+                return
+        raise NotFoundException('table_uri {} with column {} does not exist'.format(table_uri, column_name))
+
+    def add_owner(self, *,
+                  table_uri: str,
+                  owner: str) -> None:
+        self.add_table_relation_by_user(table_uri=table_uri, user_email=owner, relation_type=UserResourceRel.own)
+
+    def delete_owner(self, *,
+                     table_uri: str,
+                     owner: str) -> None:
+        self.delete_table_relation_by_user(table_uri=table_uri, user_email=owner, relation_type=UserResourceRel.own)
+
+    def add_tag(self, *,
+                table_uri: str,
+                tag: str) -> None:
+        self._wait()
+        table = self._get_table(table_uri)
+        with self._lock:
+            if tag not in (t.tag_name for t in table.tags):
+                table.tags = list(table.tags) + [Tag(tag_name=tag, tag_type='default')]
+                self._tag_counts[tag] = self._tag_counts.get(tag, 0) + 1
+                self._touch(table_uri)
+
+    def delete_tag(self, *,
+                   table_uri: str,
+                   tag: str) -> None:
+        self._wait()
+        table = self._get_table(table_uri)
+        with self._lock:
+            if tag in (t.tag_name for t in table.tags):
+                table.tags = [t for t in table.tags if t.tag_name != tag]
+                self._tag_counts[tag] -= 1
+                self._touch(table_uri)
+
+    def get_tags(self) -> List:
+        self._wait()
+        return [TagDetail(tag_name=tag_name, tag_count=tag_count)
+                for tag_name, tag_count in list(self._tag_counts.items())]
+
+    def get_latest_updated_ts(self) -> int:
+        self._wait()
+        return self._catalog.latest_updated_ts
+
+    def _get_popular_table_keys(self) -> List[str]:
+        popular_table_keys = self._popular_table_keys
+        if popular_table_keys is None:
+            scores = []
+            for key, reads in list(self._catalog.reads.items()):
+                if len(reads) > self.POPULAR_TABLE_MIN_READERS:
+                    scores.append((len(reads) * math.log(sum(reads.values())), key))
+            popular_table_keys = [key for _, key in sorted(scores, reverse=True)]
+            self._popular_table_keys = popular_table_keys
+        return popular_table_keys
+
+    def get_popular_tables(self, *,
+                           num_entries: int =10) -> List[PopularTable]:
+        self._wait()
+        return [self._to_popular_table(self._catalog.tables[key])
+                for key in self._get_popular_table_keys()[:num_entries]]
+
+    def export_tables(self, *,
+                      batch_size: int =1000) -> Iterator[TableSummary]:
+        for i, key in enumerate(list(self._sorted_keys)):
+            if i % batch_size == 0:
+                self._wait()
+            table = self._catalog.tables[key]
+            yield TableSummary(key=key, database=table.database, cluster=table.cluster, schema=table.schema,
+                               name=table.name, description=table.description, tags=table.tags,
+                               owners=table.owners)
+
+    def export_table_keys(self, *,
+                          batch_size: int =1000) -> Iterator[str]:
+        for i, key in enumerate(list(self._sorted_keys)):
+            if i % batch_size == 0:
+                self._wait()
+            yield key
+
+    def get_table_count(self) -> int:
+        self._wait()
+        return len(self._sorted_keys)
+
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str ='',
+                                  num_entries: int =1000) -> Tuple[List[str], Optional[str]]:
+        self._wait()
+        keys = sorted(key for key, ts in list(self._modified_ts.items()) if ts >= since)
+        table_uris = keys[bisect_right(keys, cursor):][:num_entries]
+        next_cursor = table_uris[-1] if len(table_uris) == num_entries else None
+        return table_uris, next_cursor
+
+    def get_user_detail(self, *, user_id: str) -> Union[UserEntity, None]:
+        self._wait()
+        user = self._catalog.users.get(user_id)
+        if user is None:
+            raise NotFoundException('User {user_id} not found'.format(user_id=user_id))
+        return user
+
+    def export_users(self, *,
+                     batch_size: int =1000) -> Iterator[UserEntity]:
+        for i, user_id in enumerate(sorted(self._catalog.users.keys())):
+            if i % batch_size == 0:
+                self._wait()
+            yield self._catalog.users[user_id]
+
+    def export_user_relations(self, *,
+                              batch_size: int =1000) -> Iterator[Tuple[str, Any, List[str]]]:
+        self._wait()
+        user_emails = sorted({user_email for tables_by_user in self._relations.values()
+                              for user_email in tables_by_user})
+        for user_email in user_emails:
+            for relation_type, tables_by_user in self._relations.items():
+                table_keys = tables_by_user.get(user_email)
+                if table_keys:
+                    yield user_email, relation_type, sorted(table_keys)
+
+    def get_table_by_user_relation(self, *,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+        self._wait()
+        table_keys = sorted(self._relations[relation_type].get(user_email, ()))
+        return {'table': [self._to_popular_table(self._catalog.tables[key]) for key in table_keys]}
+
+    def add_table_relation_by_user(self, *,
+                                   table_uri: str,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> None:
+        self._wait()
+        table = self._get_table(table_uri)
+        with self._lock:
+            self._relations[relation_type].setdefault(user_email, set()).add(table_uri)
+            if relation_type == UserResourceRel.own and user_email not in (o.email for o in table.owners):
+                table.owners = list(table.owners) + [User(email=user_email)]
+                self._touch(table_uri)
+            elif relation_type == UserResourceRel.read:
+                reads = self._catalog.reads.setdefault(table_uri, {})
+                reads[user_email] = reads.get(user_email, 0) + 1
+                table.table_readers = top_readers(reads)
+                self._popular_table_keys = None
+
+    def delete_table_relation_by_user(self, *,
+                                      table_uri: str,
+                                      user_email: str,
+                                      relation_type: UserResourceRel) -> None:
+        self._wait()
+        table = self._get_table(table_uri)
+        with self._lock:
+            self._relations[relation_type].get(user_email, set()).discard(table_uri)
+            if relation_type == UserResourceRel.own and user_email in (o.email for o in table.owners):
+                table.owners = [o for o in table.owners if o.email != user_email]
+                self._touch(table_uri)
+            elif relation_type == UserResourceRel.read:
+                reads = self._catalog.reads.get(table_uri, {})
+                reads.pop(user_email, None)
+                table.table_readers = top_readers(reads)
+                self._popular_table_keys = None
@@ -1,29 +1,36 @@
 import logging
 import textwrap
-from random import randint
-from typing import Dict, Any, no_type_check, List, Tuple, Union, Optional  # noqa: F401
+from typing import Dict, Any, no_type_check, Iterator, List, Tuple, Union, Optional  # noqa: F401
 
 import time
-from beaker.cache import CacheManager
-from beaker.util import parse_cache_config_options
 from neo4j.v1 import BoltStatementResult
 from neo4j.v1 import GraphDatabase, Driver  # noqa: F401
 
 from metadata_service.entity.popular_table import PopularTable
 from metadata_service.entity.table_detail import Application, Column, Reader, Source, \
     Statistics, Table, Tag, User, Watermark
+from metadata_service.entity.table_summary import TableSummary
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.entity.user_detail import User as UserEntity
 from metadata_service.exception import NotFoundException
+from metadata_service.memory_cache import MemoryCache
+from metadata_service.popularity import DecayedPopularity, PopularityUpdater
 from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.neo4j_replay import RecordingDriver, ReplayDriver
+from metadata_service.proxy.single_flight import single_flight
 from metadata_service.proxy.statsd_utilities import timer_with_counter
+from metadata_service.server_timing import get_request_timing
 from metadata_service.util import UserResourceRel
 
-_CACHE = CacheManager(**parse_cache_config_options({'cache.type': 'memory'}))
-
-
 # Expire cache every 11 hours + jitter
-_GET_POPULAR_TABLE_CACHE_EXPIRY_SEC = 11 * 60 * 60 + randint(0, 3600)
+_GET_POPULAR_TABLE_CACHE_EXPIRY_SEC = 11 * 60 * 60
+_GET_POPULAR_TABLE_CACHE_JITTER_SEC = 60 * 60
+
+# Shared by the proxies of the process, keyed by num_entries
+_POPULAR_TABLES_URIS_CACHE = MemoryCache('neo4j_proxy.popular_tables_uris',
+                                         max_entries=16,
+                                         expire_sec=_GET_POPULAR_TABLE_CACHE_EXPIRY_SEC,
+                                         jitter_sec=_GET_POPULAR_TABLE_CACHE_JITTER_SEC)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -39,7 +46,12 @@ class Neo4jProxy(BaseProxy):
                  user: str ='neo4j',
                  password: str ='',
                  num_conns: int =50,
-                 max_connection_lifetime_sec: int =100) -> None:
+                 max_connection_lifetime_sec: int =100,
+                 record_path: str ='',
+                 replay_path: str ='',
+                 replay_latency_scale: float =1.0,
+                 popularity_half_life_days: float =0,
+                 popularity_update_interval_sec: int =3600) -> None:
         """
         There's currently no request timeout from client side where server
         side can be enforced via "dbms.transaction.timeout"
@@ -49,13 +61,42 @@ class Neo4jProxy(BaseProxy):
         :param max_connection_lifetime_sec: max life time the connection can have when it comes to reuse. In other
         words, connection life time longer than this value won't be reused and closed on garbage collection. This
         value needs to be smaller than surrounding network environment's timeout.
+        :param record_path: if set, every statement and its records are appended to this file. See neo4j_replay
+        :param replay_path: if set, statements are served from this recording instead of connecting to Neo4j
+        :param replay_latency_scale: factor applied to the recorded latencies on replay. 0 replays without sleeping
+        :param popularity_half_life_days: if set, popular tables are the tables of the highest read counts decayed
+        with this half life (see metadata_service.popularity), updated from get_table_read_counts, instead of
+        readers * log(total reads). Requires the popularity extra
+        :param popularity_update_interval_sec: interval of updating the decayed read counts
         """
+        self._popularity_updater = None  # type: Optional[PopularityUpdater]
+        if popularity_half_life_days > 0:
+            popularity = DecayedPopularity(half_life_sec=popularity_half_life_days * 24 * 60 * 60)
+            self._popularity_updater = PopularityUpdater(popularity, self._get_total_read_counts,
+                                                         interval_sec=popularity_update_interval_sec)
+
+        if replay_path:
+            self._driver = ReplayDriver(replay_path, latency_scale=replay_latency_scale)  # type: Any
+            return
+
         endpoint = f'{host}:{port}'
         self._driver = GraphDatabase.driver(endpoint, max_connection_pool_size=num_conns,
                                             connection_timeout=10,
                                             max_connection_lifetime=max_connection_lifetime_sec,
-                                            auth=(user, password))  # type: Driver
+                                            auth=(user, password))
+        if record_path:
+            self._driver = RecordingDriver(self._driver, record_path)
 
+    def check_connectivity(self) -> None:
+        """
+        Runs a trivial statement. A recording being replayed has nothing to check
+        """
+        if isinstance(self._driver, ReplayDriver):
+            return
+        with self._driver.session() as session:
+            session.run('RETURN 1').consume()
+
+    @single_flight
     @timer_with_counter
     def get_table(self, *, table_uri: str) -> Table:
         """
@@ -104,30 +145,34 @@ class Neo4jProxy(BaseProxy):
         cols = []
         for tbl_col_neo4j_record in tbl_col_neo4j_records:
             # Getting last record from this for loop as Neo4j's result's random access is O(n) operation.
-            col_stats = []
-            for stat in tbl_col_neo4j_record['col_stats']:
-                col_stat = Statistics(
-                    stat_type=stat['stat_name'],
-                    stat_val=stat['stat_val'],
-                    start_epoch=int(float(stat['start_epoch'])),
-                    end_epoch=int(float(stat['end_epoch']))
-                )
-                col_stats.append(col_stat)
-
             last_neo4j_record = tbl_col_neo4j_record
-            col = Column(name=tbl_col_neo4j_record['col']['name'],
-                         description=self._safe_get(tbl_col_neo4j_record, 'col_dscrpt', 'description'),
-                         col_type=tbl_col_neo4j_record['col']['type'],
-                         sort_order=int(tbl_col_neo4j_record['col']['sort_order']),
-                         stats=col_stats)
-
-            cols.append(col)
+            cols.append(self._get_column(tbl_col_neo4j_record))
 
         if not cols:
             raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
 
         return (cols, last_neo4j_record)
 
+    def _get_column(self, record: Any) -> Column:
+        """
+        :param record: record with col, col_dscrpt and col_stats
+        """
+        col_stats = []
+        for stat in record['col_stats']:
+            col_stat = Statistics(
+                stat_type=stat['stat_name'],
+                stat_val=stat['stat_val'],
+                start_epoch=int(float(stat['start_epoch'])),
+                end_epoch=int(float(stat['end_epoch']))
+            )
+            col_stats.append(col_stat)
+
+        return Column(name=record['col']['name'],
+                      description=self._safe_get(record, 'col_dscrpt', 'description'),
+                      col_type=record['col']['type'],
+                      sort_order=int(record['col']['sort_order']),
+                      stats=col_stats)
+
     @timer_with_counter
     def _exec_usage_query(self, table_uri: str) -> List[Reader]:
         # Return Value: List[Reader]
@@ -176,8 +221,14 @@ class Neo4jProxy(BaseProxy):
         table_records = self._execute_cypher_query(statement=table_level_query,
                                                    param_dict={'tbl_key': table_uri})
 
-        table_records = table_records.single()
+        return self._get_table_level_fields(table_records.single())
 
+    def _get_table_level_fields(self, table_records: Any) -> Tuple:
+        """
+        :param table_records: record with wmk_records, application, last_updated_timestamp, owner_records,
+        tag_records and src
+        :return: (Watermark Results, Table Writer, Last Updated Timestamp, owners, tags, source)
+        """
         wmk_results = []
         table_writer = None
 
@@ -224,6 +275,14 @@ class Neo4jProxy(BaseProxy):
 
         return wmk_results, table_writer, timestamp_value, owner_record, tags, src
 
+    @staticmethod
+    def _modified_ts() -> int:
+        """
+        Epoch seconds stamped on Table.metadata_modified_ts by the methods that update description, tags, owners or
+        columns of the table. It's used to serve the tables modified since a given time.
+        """
+        return int(time.time())
+
     @no_type_check
     def _safe_get(self, dct, *keys):
         """
@@ -251,9 +310,13 @@ class Neo4jProxy(BaseProxy):
                 return session.run(statement, **param_dict)
 
         finally:
-            # TODO: Add support on statsd
+            elapsed_sec = time.time() - start
+            timing = get_request_timing()
+            if timing is not None:
+                # This method is the innermost call, the query is named after the proxy method calling it
+                timing.add_query(timing.caller(1), elapsed_sec)
             if LOGGER.isEnabledFor(logging.DEBUG):
-                LOGGER.debug('Cypher query execution elapsed for {} seconds'.format(time.time() - start))
+                LOGGER.debug('Cypher query execution elapsed for {} seconds'.format(elapsed_sec))
 
     @timer_with_counter
     def get_table_description(self, *,
@@ -300,6 +363,7 @@ class Neo4jProxy(BaseProxy):
         upsert_desc_tab_relation_query = textwrap.dedent("""
             MATCH (n1:Description {key: $desc_key}), (n2:Table {key: $tbl_key})
             MERGE (n1)-[r1:DESCRIPTION_OF]->(n2)-[r2:DESCRIPTION]->(n1)
+            SET n2.metadata_modified_ts = $modified_ts
             RETURN n1.key, n2.key
             """)
 
@@ -312,7 +376,8 @@ class Neo4jProxy(BaseProxy):
                                        'desc_key': desc_key})
 
             result = tx.run(upsert_desc_tab_relation_query, {'desc_key': desc_key,
-                                                             'tbl_key': table_uri})
+                                                             'tbl_key': table_uri,
+                                                             'modified_ts': self._modified_ts()})
 
             if not result.single():
                 raise RuntimeError('Failed to update the table {tbl} description'.format(tbl=table_uri))
@@ -387,6 +452,9 @@ class Neo4jProxy(BaseProxy):
         upsert_desc_col_relation_query = textwrap.dedent("""
             MATCH (n1:Description {key: $desc_key}), (n2:Column {key: $column_key})
             MERGE (n1)-[r1:DESCRIPTION_OF]->(n2)-[r2:DESCRIPTION]->(n1)
+            WITH n1, n2
+            OPTIONAL MATCH (tbl:Table {key: $tbl_key})
+            SET tbl.metadata_modified_ts = $modified_ts
             RETURN n1.key, n2.key
             """)
 
@@ -399,7 +467,9 @@ class Neo4jProxy(BaseProxy):
                                        'desc_key': desc_key})
 
             result = tx.run(upsert_desc_col_relation_query, {'desc_key': desc_key,
-                                                             'column_key': column_uri})
+                                                             'column_key': column_uri,
+                                                             'tbl_key': table_uri,
+                                                             'modified_ts': self._modified_ts()})
 
             if not result.single():
                 raise RuntimeError('Failed to update the table {tbl} '
@@ -448,6 +518,7 @@ class Neo4jProxy(BaseProxy):
         upsert_owner_relation_query = textwrap.dedent("""
         MATCH (n1:User {key: $user_email}), (n2:Table {key: $tbl_key})
         MERGE (n1)-[r1:OWNER_OF]->(n2)-[r2:OWNER]->(n1)
+        SET n2.metadata_modified_ts = $modified_ts
         RETURN n1.key, n2.key
         """)
 
@@ -456,7 +527,8 @@ class Neo4jProxy(BaseProxy):
             # upsert the node
             tx.run(upsert_owner_query, {'user_email': owner})
             result = tx.run(upsert_owner_relation_query, {'user_email': owner,
-                                                          'tbl_key': table_uri})
+                                                          'tbl_key': table_uri,
+                                                          'modified_ts': self._modified_ts()})
 
             if not result.single():
                 raise RuntimeError('Failed to create relation between '
@@ -483,13 +555,16 @@ class Neo4jProxy(BaseProxy):
         :return:
         """
         delete_query = textwrap.dedent("""
-        MATCH (n1:User{key: $user_email})-[r1:OWNER_OF]->(n2:Table {key: $tbl_key})-[r2:OWNER]->(n1) DELETE r1,r2
+        MATCH (n1:User{key: $user_email})-[r1:OWNER_OF]->(n2:Table {key: $tbl_key})-[r2:OWNER]->(n1)
+        SET n2.metadata_modified_ts = $modified_ts
+        DELETE r1,r2
         """)
 
         try:
             tx = self._driver.session().begin_transaction()
             tx.run(delete_query, {'user_email': owner,
-                                  'tbl_key': table_uri})
+                                  'tbl_key': table_uri,
+                                  'modified_ts': self._modified_ts()})
         except Exception as e:
             # propagate the exception back to api
             if not tx.closed():
@@ -525,6 +600,7 @@ class Neo4jProxy(BaseProxy):
         upsert_tag_relation_query = textwrap.dedent("""
         MATCH (n1:Tag {key: $tag}), (n2:Table {key: $tbl_key})
         MERGE (n1)-[r1:TAG]->(n2)-[r2:TAGGED_BY]->(n1)
+        SET n2.metadata_modified_ts = $modified_ts
         RETURN n1.key, n2.key
         """)
 
@@ -538,7 +614,8 @@ class Neo4jProxy(BaseProxy):
             tx.run(upsert_tag_query, {'tag': tag,
                                       'tag_type': 'default'})
             result = tx.run(upsert_tag_relation_query, {'tag': tag,
-                                                        'tbl_key': table_uri})
+                                                        'tbl_key': table_uri,
+                                                        'modified_ts': self._modified_ts()})
             if not result.single():
                 raise RuntimeError('Failed to create relation between '
                                    'tag {tag} and table {tbl}'.format(tag=tag,
@@ -568,13 +645,16 @@ class Neo4jProxy(BaseProxy):
 
         LOGGER.info('Delete tag {} for table_uri {}'.format(tag, table_uri))
         delete_query = textwrap.dedent("""
-        MATCH (n1:Tag{key: $tag})-[r1:TAG]->(n2:Table {key: $tbl_key})-[r2:TAGGED_BY]->(n1) DELETE r1,r2
+        MATCH (n1:Tag{key: $tag})-[r1:TAG]->(n2:Table {key: $tbl_key})-[r2:TAGGED_BY]->(n1)
+        SET n2.metadata_modified_ts = $modified_ts
+        DELETE r1,r2
         """)
 
         try:
             tx = self._driver.session().begin_transaction()
             tx.run(delete_query, {'tag': tag,
-                                  'tbl_key': table_uri})
+                                  'tbl_key': table_uri,
+                                  'modified_ts': self._modified_ts()})
         except Exception as e:
             # propagate the exception back to api
             if not tx.closed():
@@ -584,6 +664,7 @@ class Neo4jProxy(BaseProxy):
             tx.commit()
             tx.close()
 
+    @single_flight
     @timer_with_counter
     def get_tags(self) -> List:
         """
@@ -626,13 +707,13 @@ class Neo4jProxy(BaseProxy):
             return None
 
     @timer_with_counter
-    @_CACHE.cache('_get_popular_tables_uris', _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC)
+    @_POPULAR_TABLES_URIS_CACHE.cached(key=lambda self, num_entries: num_entries)
     def _get_popular_tables_uris(self, num_entries: int) -> List[str]:
         """
         Retrieve popular table uris. Will provide tables with top x popularity score.
         Popularity score = number of distinct readers * log(total number of reads)
         The result of this method will be cached based on the key (num_entries), and the cache will be expired based on
-        _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC
+        _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC plus up to _GET_POPULAR_TABLE_CACHE_JITTER_SEC
 
         For score computation, it uses logarithm on total number of reads so that score won't be affected by small
         number of users reading a lot of times.
@@ -652,17 +733,50 @@ class Neo4jProxy(BaseProxy):
 
         return [record['table_key'] for record in records]
 
+    @timer_with_counter
+    def get_table_read_counts(self) -> List[Tuple[str, int, int]]:
+        """
+        Number of readers and total read count of every table read, from the READ_BY relations. Full scan of the
+        relations, meant for background updates and offline checks.
+        :return: table key, number of distinct readers and total read count of each table
+        """
+        query = textwrap.dedent("""
+        MATCH (tbl:Table)-[r:READ_BY]->(u:User)
+        RETURN tbl.key as table_key, count(distinct u) as readers, sum(r.read_count) as total_reads
+        """)
+
+        records = self._execute_cypher_query(statement=query, param_dict={})
+        return [(record['table_key'], record['readers'], record['total_reads']) for record in records]
+
+    def _get_total_read_counts(self) -> Tuple[List[str], List[int]]:
+        rows = self.get_table_read_counts()
+        return [table_key for table_key, _, _ in rows], [total_reads for _, _, total_reads in rows]
+
+    def _get_popular_tables_uris_from_source(self, num_entries: int) -> List[str]:
+        """
+        Popular tables from the decayed read counts if enabled and updated once, from _get_popular_tables_uris
+        otherwise
+        """
+        updater = self._popularity_updater
+        if updater is not None:
+            updater.start()
+            if updater.updated.is_set():
+                return updater.popularity.top(num_entries)
+        return self._get_popular_tables_uris(num_entries)
+
+    @single_flight
     @timer_with_counter
     def get_popular_tables(self, *, num_entries: int =10) -> List[PopularTable]:
         """
         Retrieve popular tables. As popular table computation requires full scan of table and user relationship,
-        it will utilize cached method _get_popular_tables_uris.
+        it will utilize cached method _get_popular_tables_uris, or the decayed read counts if
+        popularity_half_life_days is set.
 
         :param num_entries:
         :return: Iterable of PopularTable
         """
 
-        table_uris = self._get_popular_tables_uris(num_entries)
+        table_uris = self._get_popular_tables_uris_from_source(num_entries)
         if not table_uris:
             return []
 
@@ -688,6 +802,252 @@ class Neo4jProxy(BaseProxy):
             popular_tables.append(popular_table)
         return popular_tables
 
+    def export_tables(self, *,
+                      batch_size: int =1000) -> Iterator[TableSummary]:
+        """
+        Iterates all the tables ordered by table key. Tables are fetched in batches with keyset pagination on
+        Table.key, which keeps memory usage constant regardless of the number of tables.
+
+        :param batch_size: number of tables fetched per query
+        :return: Iterator of TableSummary
+        """
+        last_key = ''
+        while True:
+            tables = self._exec_export_query(last_key=last_key, batch_size=batch_size)
+            yield from tables
+
+            if len(tables) < batch_size:
+                return
+            last_key = tables[-1].key
+
+    @timer_with_counter
+    def _exec_export_query(self, *,
+                           last_key: str,
+                           batch_size: int) -> List[TableSummary]:
+        """
+        Fetches next batch of tables whose key comes after last_key
+        :param last_key: key of the last table from the previous batch. Empty string for the first batch
+        :param batch_size:
+        :return: List of TableSummary ordered by key
+        """
+        query = textwrap.dedent("""
+        MATCH (db:Database)<-[:CLUSTER_OF]-(clstr:Cluster)<-[:SCHEMA_OF]-(schema:Schema)<-[:TABLE_OF]-(tbl:Table)
+        WHERE tbl.key > $last_key
+        WITH db, clstr, schema, tbl
+        ORDER BY tbl.key LIMIT $batch_size
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(dscrpt:Description)
+        OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag)
+        OPTIONAL MATCH (owner:User)-[:OWNER_OF]->(tbl)
+        RETURN tbl.key as table_key, db.name as database_name, clstr.name as cluster_name,
+        schema.name as schema_name, tbl.name as table_name, dscrpt.description as table_description,
+        collect(distinct tag) as tag_records, collect(distinct owner) as owner_records
+        ORDER BY table_key;
+        """)
+
+        records = self._execute_cypher_query(statement=query,
+                                             param_dict={'last_key': last_key, 'batch_size': batch_size})
+
+        tables = []
+        for record in records:
+            table = TableSummary(key=record['table_key'],
+                                 database=record['database_name'],
+                                 cluster=record['cluster_name'],
+                                 schema=record['schema_name'],
+                                 name=record['table_name'],
+                                 description=self._safe_get(record, 'table_description'),
+                                 tags=[Tag(tag_name=tag['key'], tag_type=tag['tag_type'])
+                                       for tag in record['tag_records']],
+                                 owners=[User(email=owner['email']) for owner in record['owner_records']])
+            tables.append(table)
+        return tables
+
+    def export_table_keys(self, *,
+                          batch_size: int =1000) -> Iterator[str]:
+        """
+        Iterates the keys of all the tables ordered by key, with keyset pagination on Table.key
+
+        :param batch_size: number of keys fetched per query
+        """
+        last_key = ''
+        while True:
+            table_keys = self._exec_table_keys_query(last_key=last_key, batch_size=batch_size)
+            yield from table_keys
+
+            if len(table_keys) < batch_size:
+                return
+            last_key = table_keys[-1]
+
+    @timer_with_counter
+    def _exec_table_keys_query(self, *,
+                               last_key: str,
+                               batch_size: int) -> List[str]:
+        query = textwrap.dedent("""
+        MATCH (tbl:Table)
+        WHERE tbl.key > $last_key
+        RETURN tbl.key as table_key
+        ORDER BY table_key LIMIT $batch_size;
+        """)
+
+        records = self._execute_cypher_query(statement=query,
+                                             param_dict={'last_key': last_key, 'batch_size': batch_size})
+        return [record['table_key'] for record in records]
+
+    @timer_with_counter
+    def get_table_count(self) -> int:
+        query = textwrap.dedent("""
+        MATCH (tbl:Table)
+        RETURN count(tbl) as table_count;
+        """)
+
+        record = self._execute_cypher_query(statement=query, param_dict={}).single()
+        return record['table_count'] if record else 0
+
+    def export_table_details(self, *,
+                             batch_size: int =1000) -> Iterator[Tuple[str, Table]]:
+        """
+        Iterates all the tables with their details ordered by table key, as get_table returns them. Each batch of
+        tables is loaded with three queries (tables, columns and readers) with keyset pagination on Table.key,
+        rather than three queries per table. Tables without columns are skipped, as get_table doesn't find them.
+
+        :param batch_size: number of tables fetched per batch
+        :return: Iterator of table key and Table
+        """
+        last_key = ''
+        while True:
+            table_records = list(self._exec_table_details_query(last_key=last_key, batch_size=batch_size))
+            if table_records:
+                table_keys = [record['table_key'] for record in table_records]
+                columns = self._exec_bulk_col_query(table_keys)
+                readers = self._exec_bulk_usage_query(table_keys)
+                for record in table_records:
+                    table_key = record['table_key']
+                    if table_key not in columns:
+                        continue
+                    wmk_results, table_writer, timestamp_value, owners, tags, source = \
+                        self._get_table_level_fields(record)
+                    yield table_key, Table(database=record['database_name'],
+                                           cluster=record['cluster_name'],
+                                           schema=record['schema_name'],
+                                           name=record['tbl']['name'],
+                                           tags=tags,
+                                           description=self._safe_get(record, 'table_description'),
+                                           columns=columns[table_key],
+                                           owners=owners,
+                                           table_readers=readers.get(table_key, []),
+                                           watermarks=wmk_results,
+                                           table_writer=table_writer,
+                                           last_updated_timestamp=timestamp_value,
+                                           source=source,
+                                           is_view=self._safe_get(record, 'tbl', 'is_view'))
+
+            if len(table_records) < batch_size:
+                return
+            last_key = table_records[-1]['table_key']
+
+    @timer_with_counter
+    def _exec_table_details_query(self, *,
+                                  last_key: str,
+                                  batch_size: int) -> BoltStatementResult:
+        """
+        Fetches the table level fields of the next batch of tables whose key comes after last_key, ordered by key
+        """
+        query = textwrap.dedent("""
+        MATCH (db:Database)<-[:CLUSTER_OF]-(clstr:Cluster)<-[:SCHEMA_OF]-(schema:Schema)<-[:TABLE_OF]-(tbl:Table)
+        WHERE tbl.key > $last_key
+        WITH db, clstr, schema, tbl
+        ORDER BY tbl.key LIMIT $batch_size
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        OPTIONAL MATCH (wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl)
+        OPTIONAL MATCH (application:Application)-[:GENERATES]->(tbl)
+        OPTIONAL MATCH (tbl)-[:LAST_UPDATED_AT]->(t:Timestamp)
+        OPTIONAL MATCH (owner:User)-[:OWNER_OF]->(tbl)
+        OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag)
+        OPTIONAL MATCH (tbl)-[:SOURCE]->(src:Source)
+        RETURN tbl.key as table_key, db.name as database_name, clstr.name as cluster_name,
+        schema.name as schema_name, tbl, tbl_dscrpt.description as table_description,
+        collect(distinct wmk) as wmk_records,
+        application,
+        t.last_updated_timestamp as last_updated_timestamp,
+        collect(distinct owner) as owner_records,
+        collect(distinct tag) as tag_records,
+        src
+        ORDER BY table_key;
+        """)
+
+        return self._execute_cypher_query(statement=query,
+                                          param_dict={'last_key': last_key, 'batch_size': batch_size})
+
+    @timer_with_counter
+    def _exec_bulk_col_query(self, table_keys: List[str]) -> Dict[str, List[Column]]:
+        """
+        :return: columns of each of the tables that has any, ordered by sort order
+        """
+        query = textwrap.dedent("""
+        MATCH (tbl:Table)-[:COLUMN]->(col:Column)
+        WHERE tbl.key IN $tbl_keys
+        OPTIONAL MATCH (col)-[:DESCRIPTION]->(col_dscrpt:Description)
+        OPTIONAL MATCH (col)-[:STAT]->(stat:Stat)
+        RETURN tbl.key as table_key, col, col_dscrpt, collect(distinct stat) as col_stats
+        ORDER BY table_key, col.sort_order;
+        """)
+
+        records = self._execute_cypher_query(statement=query, param_dict={'tbl_keys': table_keys})
+        columns = {}  # type: Dict[str, List[Column]]
+        for record in records:
+            columns.setdefault(record['table_key'], []).append(self._get_column(record))
+        return columns
+
+    @timer_with_counter
+    def _exec_bulk_usage_query(self, table_keys: List[str]) -> Dict[str, List[Reader]]:
+        """
+        :return: top 5 readers of each of the tables read, as _exec_usage_query
+        """
+        query = textwrap.dedent("""
+        MATCH (user:User)-[read:READ]->(tbl:Table)
+        WHERE tbl.key IN $tbl_keys
+        WITH tbl, user, read
+        ORDER BY read.read_count DESC
+        RETURN tbl.key as table_key,
+        collect({email: user.email, read_count: read.read_count})[..5] as reader_records;
+        """)
+
+        records = self._execute_cypher_query(statement=query, param_dict={'tbl_keys': table_keys})
+        return {record['table_key']: [Reader(user=User(email=reader['email']), read_count=reader['read_count'])
+                                      for reader in record['reader_records']]
+                for record in records}
+
+    @timer_with_counter
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str ='',
+                                  num_entries: int =1000) -> Tuple[List[str], Optional[str]]:
+        """
+        Retrieve uris of the tables whose description, tags, owners or column descriptions have been modified at or
+        after the given time. Tables are ordered by key and paginated with the key of the last table as cursor.
+        It relies on Table.metadata_modified_ts which is stamped by the update methods of this proxy. An index on it
+        (CREATE INDEX ON :Table(metadata_modified_ts)) avoids scanning all the tables.
+
+        :param since: epoch seconds
+        :param cursor: cursor returned from the previous page. Empty string for the first page
+        :param num_entries: max number of table uris per page
+        :return: table uris and the cursor of the next page. Cursor is None on the last page
+        """
+        query = textwrap.dedent("""
+        MATCH (tbl:Table)
+        WHERE tbl.metadata_modified_ts >= $since AND tbl.key > $cursor
+        RETURN tbl.key as table_key
+        ORDER BY table_key LIMIT $num_entries;
+        """)
+
+        records = self._execute_cypher_query(statement=query,
+                                             param_dict={'since': since, 'cursor': cursor,
+                                                         'num_entries': num_entries})
+
+        table_uris = [record['table_key'] for record in records]
+        next_cursor = table_uris[-1] if len(table_uris) == num_entries else None
+        return table_uris, next_cursor
+
+    @single_flight
     @timer_with_counter
     def get_user_detail(self, *, user_id: str) -> Union[UserEntity, None]:
         """
@@ -708,7 +1068,10 @@ class Neo4jProxy(BaseProxy):
         if not record:
             raise NotFoundException('User {user_id} '
                                     'not found in the graph'.format(user_id=user_id))
-        single_result = record.single()
+        return self._get_user(record.single())
+
+    @staticmethod
+    def _get_user(single_result: Any) -> UserEntity:
         record = single_result.get('user_record', {})
         manager_record = single_result.get('manager_record', {})
         if manager_record:
@@ -727,6 +1090,87 @@ class Neo4jProxy(BaseProxy):
                             manager_fullname=manager_name)
         return result
 
+    def export_users(self, *,
+                     batch_size: int =1000) -> Iterator[UserEntity]:
+        """
+        Iterates all the users ordered by key, with keyset pagination on User.key
+
+        :param batch_size: number of users fetched per query
+        """
+        last_key = ''
+        while True:
+            records = list(self._exec_users_query(last_key=last_key, batch_size=batch_size))
+            yield from (self._get_user(record) for record in records)
+
+            if len(records) < batch_size:
+                return
+            last_key = records[-1]['user_key']
+
+    @timer_with_counter
+    def _exec_users_query(self, *,
+                          last_key: str,
+                          batch_size: int) -> BoltStatementResult:
+        query = textwrap.dedent("""
+        MATCH (user:User)
+        WHERE user.key > $last_key
+        WITH user
+        ORDER BY user.key LIMIT $batch_size
+        OPTIONAL MATCH (user)-[:manage_by]->(manager:User)
+        RETURN user.key as user_key, user as user_record, manager as manager_record
+        ORDER BY user_key;
+        """)
+
+        return self._execute_cypher_query(statement=query,
+                                          param_dict={'last_key': last_key, 'batch_size': batch_size})
+
+    def export_user_relations(self, *,
+                              batch_size: int =1000) -> Iterator[Tuple[str, Any, List[str]]]:
+        """
+        Iterates the tables related to each user ordered by user key, with keyset pagination on User.key
+
+        :param batch_size: number of users fetched per query
+        """
+        relation_types = {self._get_relation_by_type(relation_type)[0]: relation_type
+                          for relation_type in (UserResourceRel.follow, UserResourceRel.own, UserResourceRel.read)}
+        last_key = ''
+        while True:
+            records = list(self._exec_user_relations_query(last_key=last_key,
+                                                           batch_size=batch_size,
+                                                           relations=list(relation_types.keys())))
+            for record in records:
+                for relation, table_keys in record['relations']:
+                    # Users without any related table have a single null relation
+                    if relation is not None:
+                        yield record['user_key'], relation_types[relation], table_keys
+
+            if len(records) < batch_size:
+                return
+            last_key = records[-1]['user_key']
+
+    @timer_with_counter
+    def _exec_user_relations_query(self, *,
+                                   last_key: str,
+                                   batch_size: int,
+                                   relations: List[str]) -> BoltStatementResult:
+        """
+        Fetches the related tables of the next batch of users whose key comes after last_key, one record per user
+        with the list of relation type and table keys pairs
+        """
+        # relationship types can't be parameterized
+        query = textwrap.dedent("""
+        MATCH (user:User)
+        WHERE user.key > $last_key
+        WITH user
+        ORDER BY user.key LIMIT $batch_size
+        OPTIONAL MATCH (user)-[rel:{relations}]->(tbl:Table)
+        WITH user, type(rel) as relation, collect(tbl.key) as table_keys
+        RETURN user.key as user_key, collect([relation, table_keys]) as relations
+        ORDER BY user_key;
+        """).format(relations='|'.join(relations))
+
+        return self._execute_cypher_query(statement=query,
+                                          param_dict={'last_key': last_key, 'batch_size': batch_size})
+
     @staticmethod
     def _get_relation_by_type(relation_type: UserResourceRel) -> Tuple:
 
@@ -740,6 +1184,7 @@ class Neo4jProxy(BaseProxy):
             raise NotImplementedError('The relation type {} is not defined!'.format(relation_type))
         return relation, reverse_relation
 
+    @single_flight
     @timer_with_counter
     def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) -> Dict[str, Any]:
         """
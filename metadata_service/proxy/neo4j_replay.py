@@ -0,0 +1,288 @@
+"""
+Record / replay shim of the Neo4j driver.
+
+RecordingDriver wraps a real driver and appends every statement run through its sessions and transactions to a
+JSON lines file: statement, parameters, records and the time it took to run the statement and fetch all the
+records. ReplayDriver serves the same records from such file without a database, sleeping the recorded time, so
+that the proxy side cost (object construction, marshalling) can be measured against production shaped data.
+
+Both are selected on Neo4jProxy through PROXY_CLIENT_KWARGS, e.g. {'record_path': '/tmp/neo4j.jsonl'} on an
+instance connected to the graph, and then {'replay_path': '/tmp/neo4j.jsonl'} anywhere else.
+"""
+import json
+import logging
+import time
+from threading import Lock
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple  # noqa: F401
+
+from neo4j.v1 import Node, Record, Relationship
+from neo4j.v1.types.graph import Graph
+
+LOGGER = logging.getLogger(__name__)
+
+_NODE = '$node'
+_RELATIONSHIP = '$relationship'
+
+
+class NoRecordingError(LookupError):
+    """
+    Raised on replay when a statement has not been recorded
+    """
+    pass
+
+
+def _merge_parameters(parameters: Optional[Dict[str, Any]], kwparameters: Dict[str, Any]) -> Dict[str, Any]:
+    # Same as the driver: statement parameters can be passed as a dict, as keyword arguments or both
+    merged = dict(parameters or {})
+    merged.update(kwparameters)
+    return merged
+
+
+def _parameters_key(parameters: Dict[str, Any]) -> str:
+    return json.dumps(parameters, sort_keys=True, default=str)
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Converts a value of a record into JSON serializable value. Nodes and relationships are tagged so that they can
+    be restored by decode_value.
+    """
+    if isinstance(value, Node):
+        return {_NODE: {'id': value.id, 'labels': sorted(value.labels), 'properties': encode_value(dict(value))}}
+    if isinstance(value, Relationship):
+        return {_RELATIONSHIP: {'id': value.id, 'type': value.type, 'properties': encode_value(dict(value)),
+                                'start': value.start_node.id if value.start_node is not None else None,
+                                'end': value.end_node.id if value.end_node is not None else None}}
+    if isinstance(value, dict):
+        return {key: encode_value(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(val) for val in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # Paths, spatial and temporal values are not used by the proxies
+    return str(value)
+
+
+def decode_value(value: Any, graph: Graph) -> Any:
+    """
+    Reverse of encode_value. Nodes and relationships are restored as neo4j Node and Relationship.
+    """
+    if isinstance(value, dict):
+        if _NODE in value:
+            node = value[_NODE]
+            return graph.put_node(node['id'], node['labels'], decode_value(node['properties'], graph))
+        if _RELATIONSHIP in value:
+            rel = value[_RELATIONSHIP]
+            return graph.put_relationship(rel['id'], graph.put_node(rel['start']), graph.put_node(rel['end']),
+                                          rel['type'], decode_value(rel['properties'], graph))
+        return {key: decode_value(val, graph) for key, val in value.items()}
+    if isinstance(value, list):
+        return [decode_value(val, graph) for val in value]
+    return value
+
+
+class ReplayResult:
+    """
+    Fully buffered statement result. It supports the part of BoltStatementResult the proxies use.
+    """
+    def __init__(self, keys: List[str], records: List[Record]) -> None:
+        self._keys = tuple(keys)
+        self._records = records
+
+    def __iter__(self) -> Iterator[Record]:
+        return iter(self._records)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._keys
+
+    def records(self) -> Iterator[Record]:
+        return iter(self._records)
+
+    def single(self) -> Optional[Record]:
+        if len(self._records) > 1:
+            LOGGER.warning('Expected a result with a single record, but this result contains at least one more')
+        return self._records[0] if self._records else None
+
+    def peek(self) -> Optional[Record]:
+        return self._records[0] if self._records else None
+
+    def value(self, item: Any =0, default: Any =None) -> List[Any]:
+        return [record.value(item, default) for record in self._records]
+
+    def values(self, *items: Any) -> List[Any]:
+        return [record.values(*items) for record in self._records]
+
+    def data(self, *items: Any) -> List[Dict[str, Any]]:
+        return [record.data(*items) for record in self._records]
+
+    def consume(self) -> None:
+        return None
+
+    def summary(self) -> None:
+        return None
+
+
+class _RecordingRunner:
+    """
+    Runs the statement on the wrapped session or transaction and records it
+    """
+    def __init__(self, runner: Any, driver: 'RecordingDriver') -> None:
+        self._runner = runner
+        self._driver = driver
+
+    def run(self, statement: str, parameters: Optional[Dict[str, Any]] =None, **kwparameters: Any) -> ReplayResult:
+        parameters = _merge_parameters(parameters, kwparameters)
+        start = time.time()
+        result = self._runner.run(statement, parameters)
+        # Fetches all the records so that the recorded time includes streaming the result
+        records = list(result)
+        elapsed_sec = time.time() - start
+        keys = list(result.keys())
+
+        self._driver.record(statement=statement, parameters=parameters, keys=keys, records=records,
+                            elapsed_sec=elapsed_sec)
+        return ReplayResult(keys, records)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._runner, name)
+
+
+class _RecordingSession(_RecordingRunner):
+
+    def begin_transaction(self, *args: Any, **kwargs: Any) -> _RecordingRunner:
+        return _RecordingRunner(self._runner.begin_transaction(*args, **kwargs), self._driver)
+
+    def __enter__(self) -> '_RecordingSession':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._runner.close()
+
+
+class RecordingDriver:
+    """
+    Wraps a neo4j Driver and appends every statement run with it to a JSON lines file. Each line is a dict with
+    statement, parameters, keys, records and elapsed_sec. Results are fully fetched before being returned.
+    """
+    def __init__(self, driver: Any, path: str) -> None:
+        """
+        :param driver: neo4j Driver
+        :param path: file the statements are appended to
+        """
+        self._driver = driver
+        self._lock = Lock()
+        self._file = open(path, 'a')  # type: IO[str]
+
+    def session(self, *args: Any, **kwargs: Any) -> _RecordingSession:
+        return _RecordingSession(self._driver.session(*args, **kwargs), self)
+
+    def record(self, *,
+               statement: str,
+               parameters: Dict[str, Any],
+               keys: List[str],
+               records: List[Any],
+               elapsed_sec: float) -> None:
+        line = json.dumps({
+            'statement': statement,
+            'parameters': encode_value(parameters),
+            'keys': keys,
+            'records': [[encode_value(value) for value in record.values()] for record in records],
+            'elapsed_sec': elapsed_sec,
+        })
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self._driver.close()
+
+
+class _ReplaySession:
+    """
+    Session and transaction of ReplayDriver
+    """
+    def __init__(self, driver: 'ReplayDriver') -> None:
+        self._driver = driver
+        self._closed = False
+
+    def run(self, statement: str, parameters: Optional[Dict[str, Any]] =None, **kwparameters: Any) -> ReplayResult:
+        return self._driver.replay(statement, _merge_parameters(parameters, kwparameters))
+
+    def begin_transaction(self, *args: Any, **kwargs: Any) -> '_ReplaySession':
+        return _ReplaySession(self._driver)
+
+    def commit(self) -> None:
+        self._closed = True
+
+    def rollback(self) -> None:
+        self._closed = True
+
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        self._closed = True
+
+    def __enter__(self) -> '_ReplaySession':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ReplayDriver:
+    """
+    Stands in for a neo4j Driver and serves the results recorded by RecordingDriver.
+
+    A statement is looked up with its parameters first. Parameters that differ on every call (e.g. timestamps of the
+    update statements) would never match, so it falls back to any recording of the same statement. When a statement
+    was recorded more than once, recordings are served in turn.
+    """
+    def __init__(self, path: str, latency_scale: float =1.0) -> None:
+        """
+        :param path: file written by RecordingDriver
+        :param latency_scale: factor applied to the recorded time slept on each statement. 0 disables the sleep
+        """
+        self._latency_scale = latency_scale
+        self._lock = Lock()
+        # (statement, parameters) or (statement, None) -> recordings, next index
+        self._recordings = {}  # type: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]
+        self._next = {}  # type: Dict[Tuple[str, Optional[str]], int]
+
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                recording = json.loads(line)
+                statement = recording['statement']
+                for key in ((statement, _parameters_key(recording['parameters'])), (statement, None)):
+                    self._recordings.setdefault(key, []).append(recording)
+
+    def session(self, *args: Any, **kwargs: Any) -> _ReplaySession:
+        return _ReplaySession(self)
+
+    def replay(self, statement: str, parameters: Dict[str, Any]) -> ReplayResult:
+        key = (statement, _parameters_key(encode_value(parameters)))  # type: Tuple[str, Optional[str]]
+        if key not in self._recordings:
+            key = (statement, None)
+        recordings = self._recordings.get(key)
+        if not recordings:
+            raise NoRecordingError('No recording of statement {} with parameters {}'.format(statement, parameters))
+
+        with self._lock:
+            index = self._next.get(key, 0)
+            self._next[key] = (index + 1) % len(recordings)
+        recording = recordings[index]
+
+        if self._latency_scale:
+            time.sleep(recording['elapsed_sec'] * self._latency_scale)
+
+        graph = Graph()
+        keys = recording['keys']
+        records = [Record(zip(keys, decode_value(values, graph))) for values in recording['records']]
+        return ReplayResult(keys, records)
+
+    def close(self) -> None:
+        pass
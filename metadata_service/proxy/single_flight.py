@@ -0,0 +1,101 @@
+from functools import wraps
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional  # noqa: F401
+
+from metadata_service.metrics import get_metrics
+from metadata_service.proxy.statsd_utilities import increment
+
+
+class _Call:
+    """
+    Call in flight, and its outcome once done
+    """
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls of the same key: while a call is in flight, the calls of the same key wait for it and
+    get its result, or its exception, instead of calling again. A call made once it is done calls again.
+    """
+    def __init__(self) -> None:
+        self._calls = {}  # type: Dict[Hashable, _Call]
+        self._lock = Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any], on_coalesced: Optional[Callable[[], None]] =None) -> Any:
+        """
+        :param on_coalesced: called when there is a call of the same key in flight, before waiting for it
+        :return: result of func, or of the call of the same key in flight
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if on_coalesced is not None:
+                on_coalesced()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def single_flight(f: Callable) -> Any:
+    """
+    A decorator of proxy read methods coalescing the concurrent calls with the same arguments on the same proxy, so
+    that a burst of identical requests (e.g. a table linked in an announcement) runs the queries once. The calls
+    that waited for the result of another are counted in statsd as <module>.<method>.coalesced, and in the
+    coalesced calls counter of metadata_service.metrics if enabled.
+
+    Results are shared by the callers, which must not modify them. Calls with unhashable arguments aren't coalesced.
+
+    e.g:
+        @single_flight
+        @timer_with_counter
+        def get_table(self, *, table_uri: str) -> Table:
+    """
+    name = f.__name__
+    coalesced_metric = '{}.{}.coalesced'.format(f.__module__, name)
+    group = SingleFlight()
+
+    def record_coalesced() -> None:
+        increment(coalesced_metric)
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.proxy_coalesced_calls.inc(method=name)
+
+    @wraps(f)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        key = (id(self), args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return f(self, *args, **kwargs)
+
+        return group.do(key, lambda: f(self, *args, **kwargs), record_coalesced)
+
+    wrapper.single_flight = group  # type: ignore
+    return wrapper
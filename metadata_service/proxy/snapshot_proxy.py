@@ -0,0 +1,538 @@
+import logging
+import os
+import sys
+from array import array
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union  # noqa: F401
+
+from flask import current_app
+from werkzeug.utils import import_string
+
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Application, Column, Reader, Source, \
+    Statistics, Table, Tag, User, Watermark
+from metadata_service.entity.table_summary import TableSummary
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.entity.user_detail import User as UserEntity
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.util import UserResourceRel
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _ColumnList:
+    """
+    Columns of a table stored as parallel arrays instead of one object per column.
+    """
+    __slots__ = ('names', 'descriptions', 'col_types', 'sort_orders', 'stats')
+
+    def __init__(self, columns: Iterable[Column]) -> None:
+        columns = list(columns)
+        self.names = [_intern(col.name) for col in columns]
+        self.descriptions = [col.description for col in columns]
+        self.col_types = [_intern(col.col_type) for col in columns]
+        self.sort_orders = array('l', [col.sort_order for col in columns])
+        self.stats = [tuple((_intern(stat.stat_type), stat.stat_val, stat.start_epoch, stat.end_epoch)
+                            for stat in col.stats) for col in columns]
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def to_columns(self) -> List[Column]:
+        return [Column(name=self.names[i],
+                       description=self.descriptions[i],
+                       col_type=self.col_types[i],
+                       sort_order=self.sort_orders[i],
+                       stats=[Statistics(stat_type=stat_type, stat_val=stat_val,
+                                         start_epoch=start_epoch, end_epoch=end_epoch)
+                              for stat_type, stat_val, start_epoch, end_epoch in self.stats[i]])
+                for i in range(len(self.names))]
+
+
+class _TableRecord:
+    """
+    Compact form of Table. Repeated strings are interned and nested entities are stored as tuples.
+    """
+    __slots__ = ('database', 'cluster', 'schema', 'name', 'description', 'tags', 'owners', 'readers',
+                 'columns', 'watermarks', 'table_writer', 'last_updated_timestamp', 'source', 'is_view')
+
+    def __init__(self, table: Table) -> None:
+        self.database = _intern(table.database)
+        self.cluster = _intern(table.cluster)
+        self.schema = _intern(table.schema)
+        self.name = table.name
+        self.description = table.description
+        self.tags = tuple((_intern(tag.tag_name), _intern(tag.tag_type)) for tag in table.tags)
+        self.owners = tuple(_intern(owner.email) for owner in table.owners)
+        self.readers = tuple((_intern(reader.user.email), reader.read_count) for reader in table.table_readers)
+        self.columns = _ColumnList(table.columns)
+        self.watermarks = tuple((_intern(wmk.watermark_type), _intern(wmk.partition_key), wmk.partition_value,
+                                 wmk.create_time) for wmk in table.watermarks)
+        writer = table.table_writer
+        self.table_writer = (writer.application_url, writer.description, _intern(writer.name), writer.id) \
+            if writer else None
+        self.last_updated_timestamp = table.last_updated_timestamp
+        self.source = (_intern(table.source.source_type), table.source.source) if table.source else None
+        self.is_view = table.is_view
+
+    def to_table(self) -> Table:
+        return Table(database=self.database,
+                     cluster=self.cluster,
+                     schema=self.schema,
+                     name=self.name,
+                     tags=[Tag(tag_name=tag_name, tag_type=tag_type) for tag_name, tag_type in self.tags],
+                     table_readers=[Reader(user=User(email=email), read_count=read_count)
+                                    for email, read_count in self.readers],
+                     description=self.description,
+                     columns=self.columns.to_columns(),
+                     owners=[User(email=email) for email in self.owners],
+                     watermarks=[Watermark(watermark_type=watermark_type, partition_key=partition_key,
+                                           partition_value=partition_value, create_time=create_time)
+                                 for watermark_type, partition_key, partition_value, create_time in self.watermarks],
+                     table_writer=Application(application_url=self.table_writer[0],
+                                              description=self.table_writer[1],
+                                              name=self.table_writer[2],
+                                              id=self.table_writer[3]) if self.table_writer else None,
+                     last_updated_timestamp=self.last_updated_timestamp,
+                     source=Source(source_type=self.source[0], source=self.source[1]) if self.source else None,
+                     is_view=self.is_view)
+
+    def to_popular_table(self) -> PopularTable:
+        return PopularTable(database=self.database, cluster=self.cluster, schema=self.schema, name=self.name,
+                            description=self.description)
+
+
+class _CatalogSnapshot:
+    """
+    In-memory catalog. Tables, tag counts, popular tables, users and their relations are loaded in bulk. Until then,
+    or if the wrapped proxy can't export the users, they are loaded on first access.
+    """
+    def __init__(self) -> None:
+        self.tables = {}  # type: Dict[str, _TableRecord]
+        self.tag_counts = None  # type: Optional[Dict[str, int]]
+        self.popular_tables = []  # type: List[PopularTable]
+        # Number of popular tables requested when popular_tables was loaded
+        self.num_popular_tables = 0
+        self.users = {}  # type: Dict[str, UserEntity]
+        self.user_relations = {}  # type: Dict[Tuple[str, Any], List[str]]
+        # All the users and relations are loaded, hence a relation missing from user_relations has no table
+        self.users_loaded = False
+
+
+class SnapshotProxy(BaseProxy):
+    """
+    Read-only snapshot serving mode. It wraps another proxy (Neo4jProxy by default) and periodically loads the
+    catalog into compact in-process structures, so that reads are answered without a round trip to the backend.
+    Writes go through the wrapped proxy and then patch the snapshot in place.
+
+    Reads of tables, users, tags or popular tables that are not in the snapshot yet (e.g. while the first snapshot is
+    being loaded) fall through to the wrapped proxy and are added to the snapshot.
+
+    To use it, set PROXY_CLIENT to PROXY_CLIENTS['NEO4J_SNAPSHOT']. Arguments other than host, port, user and
+    password can be passed through config PROXY_CLIENT_KWARGS.
+    """
+    def __init__(self, *,
+                 host: str,
+                 port: int,
+                 user: str ='neo4j',
+                 password: str ='',
+                 client: str ='metadata_service.proxy.neo4j_proxy.Neo4jProxy',
+                 refresh_interval_sec: int =3600,
+                 num_popular_tables: int =100,
+                 load_batch_size: int =1000) -> None:
+        """
+        :param client: path to class name of the wrapped proxy
+        :param refresh_interval_sec: interval of reloading the snapshot in background, from the first read of the
+        process. 0 disables background load and the snapshot is only loaded by calling refresh()
+        :param num_popular_tables: number of popular tables kept in the snapshot. It grows to the largest number
+        requested since
+        :param load_batch_size: number of tables and users fetched per batch while loading the snapshot (see
+        BaseProxy.export_table_details and BaseProxy.export_users)
+        """
+        self._proxy = import_string(client)(host=host, port=port, user=user, password=password)  # type: BaseProxy
+        self._num_popular_tables = num_popular_tables
+        self._load_batch_size = load_batch_size
+
+        self._snapshot = _CatalogSnapshot()
+        self._lock = Lock()
+        # Tables updated while a new snapshot is being loaded. They are fetched again once loading is done.
+        self._dirty_table_uris = None  # type: Optional[Set[str]]
+        # User relations added (True) or deleted while a new snapshot is being loaded, applied to it once loaded
+        self._relation_writes = None  # type: Optional[List[Tuple[bool, str, Any, str]]]
+
+        self._refresh_interval_sec = refresh_interval_sec
+        self._stop_event = Event()
+        # Process of the refresh thread. It's started by the first read of each process rather than here, as
+        # threads don't survive the fork of the gunicorn workers
+        self._refresh_pid = None  # type: Optional[int]
+
+    def _start_refresh(self) -> None:
+        if self._refresh_interval_sec <= 0 or self._refresh_pid == os.getpid():
+            return
+        with self._lock:
+            if self._refresh_pid == os.getpid():
+                return
+            self._refresh_pid = os.getpid()
+        # Inner proxy needs app context (e.g. statsd configuration)
+        app = current_app._get_current_object()
+        Thread(target=self._refresh_periodically,
+               args=(app, self._refresh_interval_sec),
+               name='snapshot-refresh',
+               daemon=True).start()
+
+    def _refresh_periodically(self, app: Any, refresh_interval_sec: int) -> None:
+        with app.app_context():
+            while not self._stop_event.is_set():
+                try:
+                    self.refresh()
+                except Exception:
+                    LOGGER.exception('Failed to load snapshot. Serving the previous snapshot.')
+                self._stop_event.wait(refresh_interval_sec)
+
+    def check_connectivity(self) -> None:
+        """
+        Checks the wrapped proxy, which serves the writes and loads the snapshot
+        """
+        self._proxy.check_connectivity()
+
+    def close(self) -> None:
+        """
+        Stops reloading the snapshot in background
+        """
+        self._stop_event.set()
+
+    def refresh(self) -> None:
+        """
+        Loads a new snapshot from the wrapped proxy and swaps it with the current one.
+        """
+        LOGGER.info('Loading catalog snapshot')
+        with self._lock:
+            self._dirty_table_uris = set()
+            self._relation_writes = []
+
+        snapshot = _CatalogSnapshot()
+        try:
+            for table_uri, table in self._proxy.export_table_details(batch_size=self._load_batch_size):
+                snapshot.tables[table_uri] = _TableRecord(table)
+
+            snapshot.tag_counts = {_intern(tag.tag_name): tag.tag_count for tag in self._proxy.get_tags()}
+
+            num_popular_tables = self._num_popular_tables
+            snapshot.popular_tables = list(self._proxy.get_popular_tables(num_entries=num_popular_tables))
+            snapshot.num_popular_tables = num_popular_tables
+
+            self._load_users(snapshot)
+        except Exception:
+            with self._lock:
+                self._dirty_table_uris = None
+                self._relation_writes = None
+            raise
+
+        with self._lock:
+            dirty_table_uris = self._dirty_table_uris or set()
+            for added, user_email, relation_type, table_uri in self._relation_writes or []:
+                self._update_user_relation(snapshot, added, user_email, relation_type, table_uri)
+            self._dirty_table_uris = None
+            self._relation_writes = None
+            self._snapshot = snapshot
+
+        for table_uri in dirty_table_uris:
+            self._reload_table(table_uri)
+
+        LOGGER.info('Loaded catalog snapshot with {} tables and {} users'.format(len(snapshot.tables),
+                                                                                 len(snapshot.users)))
+
+    def _load_users(self, snapshot: _CatalogSnapshot) -> None:
+        try:
+            for user in self._proxy.export_users(batch_size=self._load_batch_size):
+                snapshot.users[_intern(user.email)] = user
+
+            for user_email, relation_type, table_uris in \
+                    self._proxy.export_user_relations(batch_size=self._load_batch_size):
+                snapshot.user_relations[(_intern(user_email), relation_type)] = table_uris
+        except NotImplementedError:
+            LOGGER.info('Users are not exported by the wrapped proxy, they are loaded on first access')
+            snapshot.users = {}
+            snapshot.user_relations = {}
+            return
+        snapshot.users_loaded = True
+
+    def _reload_table(self, table_uri: str) -> Optional[_TableRecord]:
+        try:
+            record = _TableRecord(self._proxy.get_table(table_uri=table_uri))
+        except Exception:
+            LOGGER.exception('Failed to reload table {} into snapshot'.format(table_uri))
+            self._snapshot.tables.pop(table_uri, None)
+            return None
+        self._snapshot.tables[table_uri] = record
+        return record
+
+    def _get_table_record(self, table_uri: str) -> _TableRecord:
+        self._start_refresh()
+        record = self._snapshot.tables.get(table_uri)
+        if record is None:
+            record = _TableRecord(self._proxy.get_table(table_uri=table_uri))
+            self._snapshot.tables[table_uri] = record
+        return record
+
+    def _mark_dirty(self, table_uri: str) -> None:
+        with self._lock:
+            if self._dirty_table_uris is not None:
+                self._dirty_table_uris.add(table_uri)
+
+    def get_table(self, *, table_uri: str) -> Table:
+        return self._get_table_record(table_uri).to_table()
+
+    def get_table_description(self, *,
+                              table_uri: str) -> Union[str, None]:
+        return self._get_table_record(table_uri).description
+
+    def put_table_description(self, *,
+                              table_uri: str,
+                              description: str) -> None:
+        self._proxy.put_table_description(table_uri=table_uri, description=description)
+        self._mark_dirty(table_uri)
+
+        record = self._snapshot.tables.get(table_uri)
+        if record is None:
+            return
+        record.description = description
+        for popular_table in self._snapshot.popular_tables:
+            if (popular_table.database, popular_table.cluster, popular_table.schema, popular_table.name) == \
+                    (record.database, record.cluster, record.schema, record.name):
+                popular_table.description = description
+
+    def get_column_description(self, *,
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
+        columns = self._get_table_record(table_uri).columns
+        if column_name not in columns.names:
+            return None
+        return columns.descriptions[columns.index(column_name)]
+
+    def put_column_description(self, *,
+                               table_uri: str,
+                               column_name: str,
+                               description: str) -> None:
+        self._proxy.put_column_description(table_uri=table_uri,
+                                           column_name=column_name,
+                                           description=description)
+        self._mark_dirty(table_uri)
+
+        record = self._snapshot.tables.get(table_uri)
+        if record is not None and column_name in record.columns.names:
+            record.columns.descriptions[record.columns.index(column_name)] = description
+
+    def add_owner(self, *,
+                  table_uri: str,
+                  owner: str) -> None:
+        self._proxy.add_owner(table_uri=table_uri, owner=owner)
+        self._mark_dirty(table_uri)
+
+        record = self._snapshot.tables.get(table_uri)
+        if record is not None and owner not in record.owners:
+            record.owners = record.owners + (_intern(owner),)
+        self._add_user_relation(user_email=owner, relation_type=UserResourceRel.own, table_uri=table_uri)
+
+    def delete_owner(self, *,
+                     table_uri: str,
+                     owner: str) -> None:
+        self._proxy.delete_owner(table_uri=table_uri, owner=owner)
+        self._mark_dirty(table_uri)
+
+        record = self._snapshot.tables.get(table_uri)
+        if record is not None:
+            record.owners = tuple(email for email in record.owners if email != owner)
+        self._delete_user_relation(user_email=owner, relation_type=UserResourceRel.own, table_uri=table_uri)
+
+    def add_tag(self, *,
+                table_uri: str,
+                tag: str) -> None:
+        self._proxy.add_tag(table_uri=table_uri, tag=tag)
+        self._mark_dirty(table_uri)
+
+        tag = _intern(tag)
+        record = self._snapshot.tables.get(table_uri)
+        tag_counts = self._snapshot.tag_counts
+        if record is not None and tag not in (tag_name for tag_name, _ in record.tags):
+            # Currently the type for all the tags is default.
+            record.tags = record.tags + ((tag, 'default'),)
+            if tag_counts is not None:
+                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        elif record is None and tag_counts is not None:
+            tag_counts.setdefault(tag, 0)
+
+    def delete_tag(self, *,
+                   table_uri: str,
+                   tag: str) -> None:
+        self._proxy.delete_tag(table_uri=table_uri, tag=tag)
+        self._mark_dirty(table_uri)
+
+        record = self._snapshot.tables.get(table_uri)
+        tag_counts = self._snapshot.tag_counts
+        if record is not None and tag in (tag_name for tag_name, _ in record.tags):
+            record.tags = tuple((tag_name, tag_type) for tag_name, tag_type in record.tags if tag_name != tag)
+            if tag_counts is not None and tag_counts.get(tag):
+                tag_counts[tag] -= 1
+
+    def get_tags(self) -> List:
+        self._start_refresh()
+        tag_counts = self._snapshot.tag_counts
+        if tag_counts is None:
+            tags = self._proxy.get_tags()
+            self._snapshot.tag_counts = {_intern(tag.tag_name): tag.tag_count for tag in tags}
+            return tags
+        return [TagDetail(tag_name=tag_name, tag_count=tag_count)
+                for tag_name, tag_count in list(tag_counts.items())]
+
+    def get_popular_tables(self, *,
+                           num_entries: int =10) -> List[PopularTable]:
+        self._start_refresh()
+        snapshot = self._snapshot
+        popular_tables = snapshot.popular_tables
+        if num_entries > snapshot.num_popular_tables:
+            # Not loaded yet, or more than loaded. Next snapshots load as many
+            popular_tables = list(self._proxy.get_popular_tables(num_entries=num_entries))
+            snapshot.popular_tables = popular_tables
+            snapshot.num_popular_tables = num_entries
+            self._num_popular_tables = max(self._num_popular_tables, num_entries)
+        return [PopularTable(database=table.database, cluster=table.cluster, schema=table.schema,
+                             name=table.name, description=table.description)
+                for table in popular_tables[:num_entries]]
+
+    def export_tables(self, *,
+                      batch_size: int =1000) -> Iterator[TableSummary]:
+        return self._proxy.export_tables(batch_size=batch_size)
+
+    def export_table_keys(self, *,
+                          batch_size: int =1000) -> Iterator[str]:
+        return self._proxy.export_table_keys(batch_size=batch_size)
+
+    def get_table_count(self) -> int:
+        return self._proxy.get_table_count()
+
+    def export_table_details(self, *,
+                             batch_size: int =1000) -> Iterator[Tuple[str, Table]]:
+        return self._proxy.export_table_details(batch_size=batch_size)
+
+    def export_users(self, *,
+                     batch_size: int =1000) -> Iterator[UserEntity]:
+        return self._proxy.export_users(batch_size=batch_size)
+
+    def export_user_relations(self, *,
+                              batch_size: int =1000) -> Iterator[Tuple[str, Any, List[str]]]:
+        return self._proxy.export_user_relations(batch_size=batch_size)
+
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str ='',
+                                  num_entries: int =1000) -> Tuple[List[str], Optional[str]]:
+        return self._proxy.get_tables_modified_since(since=since, cursor=cursor, num_entries=num_entries)
+
+    def get_latest_updated_ts(self) -> int:
+        return self._proxy.get_latest_updated_ts()
+
+    def get_user_detail(self, *, user_id: str) -> Union[UserEntity, None]:
+        self._start_refresh()
+        user = self._snapshot.users.get(user_id)
+        if user is None:
+            user = self._proxy.get_user_detail(user_id=user_id)
+            if user is not None:
+                self._snapshot.users[user_id] = user
+        return user
+
+    def get_table_by_user_relation(self, *,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+        self._start_refresh()
+        snapshot = self._snapshot
+        table_uris = snapshot.user_relations.get((user_email, relation_type))
+        if table_uris is None and snapshot.users_loaded:
+            table_uris = []
+        elif table_uris is None:
+            # Neo4jProxy does not return the table uris of the relation, hence look them up in the snapshot
+            resources = self._proxy.get_table_by_user_relation(user_email=user_email, relation_type=relation_type)
+            table_uris = self._find_table_uris(resources['table'])
+            if table_uris is None:
+                return resources
+            snapshot.user_relations[(user_email, relation_type)] = table_uris
+
+        tables = []
+        for table_uri in list(table_uris):
+            try:
+                tables.append(self._get_table_record(table_uri).to_popular_table())
+            except NotFoundException:
+                LOGGER.warning('Table {} related to user {} not found'.format(table_uri, user_email))
+        return {'table': tables}
+
+    def _find_table_uris(self, tables: Iterable[PopularTable]) -> Optional[List[str]]:
+        """
+        :return: uris of the tables in the snapshot. None if any of the tables is not in the snapshot
+        """
+        uri_by_name = {(record.database, record.cluster, record.schema, record.name): table_uri
+                       for table_uri, record in list(self._snapshot.tables.items())}
+        table_uris = []
+        for table in tables:
+            table_uri = uri_by_name.get((table.database, table.cluster, table.schema, table.name))
+            if table_uri is None:
+                return None
+            table_uris.append(table_uri)
+        return table_uris
+
+    @staticmethod
+    def _update_user_relation(snapshot: _CatalogSnapshot,
+                              added: bool,
+                              user_email: str,
+                              relation_type: UserResourceRel,
+                              table_uri: str) -> None:
+        table_uris = snapshot.user_relations.get((user_email, relation_type))
+        if table_uris is None:
+            # Otherwise the relation is loaded on next read
+            if added and snapshot.users_loaded:
+                snapshot.user_relations[(user_email, relation_type)] = [table_uri]
+        elif added and table_uri not in table_uris:
+            table_uris.append(table_uri)
+        elif not added and table_uri in table_uris:
+            table_uris.remove(table_uri)
+
+    def _write_user_relation(self, added: bool, user_email: str, relation_type: UserResourceRel,
+                             table_uri: str) -> None:
+        with self._lock:
+            if self._relation_writes is not None:
+                self._relation_writes.append((added, user_email, relation_type, table_uri))
+        self._update_user_relation(self._snapshot, added, user_email, relation_type, table_uri)
+
+    def _add_user_relation(self, *,
+                           user_email: str,
+                           relation_type: UserResourceRel,
+                           table_uri: str) -> None:
+        self._write_user_relation(True, user_email, relation_type, table_uri)
+
+    def _delete_user_relation(self, *,
+                              user_email: str,
+                              relation_type: UserResourceRel,
+                              table_uri: str) -> None:
+        self._write_user_relation(False, user_email, relation_type, table_uri)
+
+    def add_table_relation_by_user(self, *,
+                                   table_uri: str,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> None:
+        self._proxy.add_table_relation_by_user(table_uri=table_uri,
+                                               user_email=user_email,
+                                               relation_type=relation_type)
+        self._add_user_relation(user_email=user_email, relation_type=relation_type, table_uri=table_uri)
+
+    def delete_table_relation_by_user(self, *,
+                                      table_uri: str,
+                                      user_email: str,
+                                      relation_type: UserResourceRel) -> None:
+        self._proxy.delete_table_relation_by_user(table_uri=table_uri,
+                                                  user_email=user_email,
+                                                  relation_type=relation_type)
+        self._delete_user_relation(user_email=user_email, relation_type=relation_type, table_uri=table_uri)
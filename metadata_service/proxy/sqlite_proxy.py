@@ -0,0 +1,631 @@
+import logging
+import math
+import sqlite3
+import textwrap
+import time
+from itertools import groupby
+from threading import local
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union  # noqa: F401
+
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Application, Column, Reader, Source, \
+    Statistics, Table, Tag, User, Watermark
+from metadata_service.entity.table_summary import TableSummary
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.entity.user_detail import User as UserEntity
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.single_flight import single_flight
+from metadata_service.proxy.statsd_utilities import timer_with_counter
+from metadata_service.server_timing import get_request_timing
+from metadata_service.util import UserResourceRel
+
+LOGGER = logging.getLogger(__name__)
+
+# Key of the row in metadata_timestamps that holds the last time the catalog was updated / indexed
+LATEST_UPDATED_TS_KEY = 'amundsen_updated_timestamp'
+
+SCHEMA = textwrap.dedent("""
+CREATE TABLE IF NOT EXISTS applications (
+    key TEXT PRIMARY KEY,
+    id TEXT,
+    name TEXT,
+    description TEXT,
+    application_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tables (
+    key TEXT PRIMARY KEY,
+    database TEXT NOT NULL,
+    cluster TEXT NOT NULL,
+    schema TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    is_view INTEGER,
+    last_updated_timestamp INTEGER,
+    source_type TEXT,
+    source TEXT,
+    application_key TEXT,
+    metadata_modified_ts INTEGER
+);
+CREATE INDEX IF NOT EXISTS tables_metadata_modified_ts ON tables (metadata_modified_ts);
+
+CREATE TABLE IF NOT EXISTS columns (
+    table_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    col_type TEXT,
+    sort_order INTEGER,
+    description TEXT,
+    PRIMARY KEY (table_key, name)
+);
+CREATE INDEX IF NOT EXISTS columns_sort_order ON columns (table_key, sort_order);
+
+CREATE TABLE IF NOT EXISTS column_stats (
+    table_key TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    stat_type TEXT NOT NULL,
+    stat_val TEXT,
+    start_epoch INTEGER,
+    end_epoch INTEGER
+);
+CREATE INDEX IF NOT EXISTS column_stats_column ON column_stats (table_key, column_name);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    table_key TEXT NOT NULL,
+    watermark_type TEXT,
+    partition_key TEXT,
+    partition_value TEXT,
+    create_time TEXT
+);
+CREATE INDEX IF NOT EXISTS watermarks_table_key ON watermarks (table_key);
+
+CREATE TABLE IF NOT EXISTS tags (
+    key TEXT PRIMARY KEY,
+    tag_type TEXT
+);
+
+CREATE TABLE IF NOT EXISTS table_tags (
+    table_key TEXT NOT NULL,
+    tag_key TEXT NOT NULL,
+    PRIMARY KEY (table_key, tag_key)
+);
+CREATE INDEX IF NOT EXISTS table_tags_tag_key ON table_tags (tag_key);
+
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    full_name TEXT,
+    is_active INTEGER,
+    github_username TEXT,
+    team_name TEXT,
+    slack_id TEXT,
+    employee_type TEXT,
+    manager_email TEXT
+);
+
+CREATE TABLE IF NOT EXISTS user_table_relations (
+    user_email TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    table_key TEXT NOT NULL,
+    read_count INTEGER,
+    PRIMARY KEY (user_email, relation, table_key)
+);
+CREATE INDEX IF NOT EXISTS user_table_relations_table ON user_table_relations (relation, table_key, read_count);
+
+CREATE TABLE IF NOT EXISTS metadata_timestamps (
+    key TEXT PRIMARY KEY,
+    latest_timestamp INTEGER
+);
+""")
+
+
+def create_schema(conn: sqlite3.Connection) -> None:
+    """
+    Creates the tables and indexes used by SqliteProxy, if they do not exist yet.
+    """
+    conn.executescript(SCHEMA)
+
+
+def _popularity_score(readers: int, total_reads: int) -> float:
+    # Same as Neo4jProxy. Logarithm on total number of reads so that score won't be affected by small number of
+    # users reading a lot of times.
+    return readers * math.log(total_reads) if total_reads and total_reads > 0 else 0.0
+
+
+class SqliteProxy(BaseProxy):
+    """
+    A proxy to an embedded SQLite database. Meant for small deployments, CI and for measuring the service layer
+    without a Neo4j server. The database can be populated from a graph dump with
+    metadata_service.tools.sqlite_loader.
+
+    Host is the path of the database file (PROXY_HOST), port, user and password are not used.
+    Each thread uses its own connection, hence the path should point to a file rather than ':memory:'.
+    """
+    # Same threshold as Neo4jProxy popular tables
+    POPULAR_TABLE_MIN_READERS = 10
+
+    RELATIONS = {
+        UserResourceRel.follow: 'follow',
+        UserResourceRel.own: 'own',
+        UserResourceRel.read: 'read',
+    }
+
+    def __init__(self, *,
+                 host: str,
+                 port: int =0,
+                 user: str ='',
+                 password: str ='',
+                 timeout_sec: float =10.0) -> None:
+        """
+        :param host: path of the SQLite database file. It is created if it does not exist
+        :param timeout_sec: how long a connection waits for the lock held by another writer
+        """
+        self._path = host
+        self._timeout_sec = timeout_sec
+        self._local = local()
+        with self._connection() as conn:
+            create_schema(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=self._timeout_sec)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.create_function('popularity_score', 2, _popularity_score)
+            self._local.conn = conn
+        return conn
+
+    def _execute_query(self, *,
+                       statement: str,
+                       params: Union[Tuple, Dict[str, Any]] =()) -> List[sqlite3.Row]:
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('Executing SQL query: {} with params {}'.format(statement, params))
+        start = time.time()
+        try:
+            return self._connection().execute(statement, params).fetchall()
+        finally:
+            timing = get_request_timing()
+            if timing is not None:
+                timing.add_query(timing.caller(), time.time() - start)
+
+    def check_connectivity(self) -> None:
+        self._connection().execute('SELECT 1').fetchall()
+
+    @staticmethod
+    def _modified_ts() -> int:
+        """
+        Epoch seconds stamped on tables.metadata_modified_ts by the methods that update description, tags, owners or
+        columns of the table.
+        """
+        return int(time.time())
+
+    def _get_relation(self, relation_type: UserResourceRel) -> str:
+        if relation_type not in self.RELATIONS:
+            raise NotImplementedError('The relation type {} is not defined!'.format(relation_type))
+        return self.RELATIONS[relation_type]
+
+    def _check_table_exists(self, conn: sqlite3.Connection, table_uri: str) -> None:
+        if not conn.execute('SELECT 1 FROM tables WHERE key = ?', (table_uri,)).fetchone():
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+    @single_flight
+    @timer_with_counter
+    def get_table(self, *, table_uri: str) -> Table:
+        """
+        :param table_uri: Table URI
+        :return:  A Table object
+        """
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT tbl.*, app.id AS app_id, app.name AS app_name, app.description AS app_description,
+        app.application_url AS app_url
+        FROM tables tbl LEFT JOIN applications app ON app.key = tbl.application_key
+        WHERE tbl.key = ?
+        """), params=(table_uri,))
+        if not rows:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+        tbl = rows[0]
+
+        stats = {}  # type: Dict[str, List[Statistics]]
+        for row in self._execute_query(statement=textwrap.dedent("""
+        SELECT column_name, stat_type, stat_val, start_epoch, end_epoch FROM column_stats WHERE table_key = ?
+        """), params=(table_uri,)):
+            stats.setdefault(row['column_name'], []).append(Statistics(stat_type=row['stat_type'],
+                                                                       stat_val=row['stat_val'],
+                                                                       start_epoch=row['start_epoch'],
+                                                                       end_epoch=row['end_epoch']))
+
+        columns = [Column(name=row['name'],
+                          description=row['description'],
+                          col_type=row['col_type'],
+                          sort_order=row['sort_order'],
+                          stats=stats.get(row['name'], []))
+                   for row in self._execute_query(statement=textwrap.dedent("""
+                   SELECT name, description, col_type, sort_order FROM columns WHERE table_key = ?
+                   ORDER BY sort_order
+                   """), params=(table_uri,))]
+
+        readers = [Reader(user=User(email=row['user_email']), read_count=row['read_count'])
+                   for row in self._execute_query(statement=textwrap.dedent("""
+                   SELECT user_email, read_count FROM user_table_relations
+                   WHERE relation = 'read' AND table_key = ?
+                   ORDER BY read_count DESC LIMIT 5
+                   """), params=(table_uri,))]
+
+        owners = [User(email=row['user_email'])
+                  for row in self._execute_query(statement=textwrap.dedent("""
+                  SELECT user_email FROM user_table_relations WHERE relation = 'own' AND table_key = ?
+                  ORDER BY user_email
+                  """), params=(table_uri,))]
+
+        tags = [Tag(tag_name=row['key'], tag_type=row['tag_type'])
+                for row in self._execute_query(statement=textwrap.dedent("""
+                SELECT tag.key, tag.tag_type FROM table_tags tt JOIN tags tag ON tag.key = tt.tag_key
+                WHERE tt.table_key = ?
+                ORDER BY tag.key
+                """), params=(table_uri,))]
+
+        watermarks = [Watermark(watermark_type=row['watermark_type'],
+                                partition_key=row['partition_key'],
+                                partition_value=row['partition_value'],
+                                create_time=row['create_time'])
+                      for row in self._execute_query(statement=textwrap.dedent("""
+                      SELECT watermark_type, partition_key, partition_value, create_time FROM watermarks
+                      WHERE table_key = ?
+                      """), params=(table_uri,))]
+
+        table_writer = None
+        if tbl['application_key'] is not None and tbl['app_name'] is not None:
+            table_writer = Application(application_url=tbl['app_url'],
+                                       description=tbl['app_description'],
+                                       name=tbl['app_name'],
+                                       id=tbl['app_id'] or '')
+
+        source = None
+        if tbl['source_type'] is not None:
+            source = Source(source_type=tbl['source_type'], source=tbl['source'])
+
+        return Table(database=tbl['database'],
+                     cluster=tbl['cluster'],
+                     schema=tbl['schema'],
+                     name=tbl['name'],
+                     tags=tags,
+                     description=tbl['description'],
+                     columns=columns,
+                     owners=owners,
+                     table_readers=readers,
+                     watermarks=watermarks,
+                     table_writer=table_writer,
+                     last_updated_timestamp=tbl['last_updated_timestamp'],
+                     source=source,
+                     is_view=bool(tbl['is_view']) if tbl['is_view'] is not None else None)
+
+    @timer_with_counter
+    def get_table_description(self, *,
+                              table_uri: str) -> Union[str, None]:
+        rows = self._execute_query(statement='SELECT description FROM tables WHERE key = ?', params=(table_uri,))
+        return rows[0]['description'] if rows else None
+
+    @timer_with_counter
+    def put_table_description(self, *,
+                              table_uri: str,
+                              description: str) -> None:
+        with self._connection() as conn:
+            cursor = conn.execute('UPDATE tables SET description = ?, metadata_modified_ts = ? WHERE key = ?',
+                                  (description, self._modified_ts(), table_uri))
+            if not cursor.rowcount:
+                raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+    @timer_with_counter
+    def get_column_description(self, *,
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
+        rows = self._execute_query(statement='SELECT description FROM columns WHERE table_key = ? AND name = ?',
+                                   params=(table_uri, column_name))
+        return rows[0]['description'] if rows else None
+
+    @timer_with_counter
+    def put_column_description(self, *,
+                               table_uri: str,
+                               column_name: str,
+                               description: str) -> None:
+        with self._connection() as conn:
+            cursor = conn.execute('UPDATE columns SET description = ? WHERE table_key = ? AND name = ?',
+                                  (description, table_uri, column_name))
+            if not cursor.rowcount:
+                raise NotFoundException('table_uri {} with column {} does not exist'.format(table_uri, column_name))
+            conn.execute('UPDATE tables SET metadata_modified_ts = ? WHERE key = ?',
+                         (self._modified_ts(), table_uri))
+
+    @timer_with_counter
+    def add_owner(self, *,
+                  table_uri: str,
+                  owner: str) -> None:
+        self.add_table_relation_by_user(table_uri=table_uri, user_email=owner, relation_type=UserResourceRel.own)
+
+    @timer_with_counter
+    def delete_owner(self, *,
+                     table_uri: str,
+                     owner: str) -> None:
+        self.delete_table_relation_by_user(table_uri=table_uri, user_email=owner, relation_type=UserResourceRel.own)
+
+    @timer_with_counter
+    def add_tag(self, *,
+                table_uri: str,
+                tag: str) -> None:
+        LOGGER.info('New tag {} for table_uri {}'.format(tag, table_uri))
+        with self._connection() as conn:
+            self._check_table_exists(conn, table_uri)
+            # Currently the type for all the tags is default.
+            conn.execute('INSERT OR REPLACE INTO tags (key, tag_type) VALUES (?, ?)', (tag, 'default'))
+            conn.execute('INSERT OR IGNORE INTO table_tags (table_key, tag_key) VALUES (?, ?)', (table_uri, tag))
+            conn.execute('UPDATE tables SET metadata_modified_ts = ? WHERE key = ?',
+                         (self._modified_ts(), table_uri))
+
+    @timer_with_counter
+    def delete_tag(self, *,
+                   table_uri: str,
+                   tag: str) -> None:
+        LOGGER.info('Delete tag {} for table_uri {}'.format(tag, table_uri))
+        with self._connection() as conn:
+            cursor = conn.execute('DELETE FROM table_tags WHERE table_key = ? AND tag_key = ?', (table_uri, tag))
+            if cursor.rowcount:
+                conn.execute('UPDATE tables SET metadata_modified_ts = ? WHERE key = ?',
+                             (self._modified_ts(), table_uri))
+
+    @single_flight
+    @timer_with_counter
+    def get_tags(self) -> List:
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT tag.key AS tag_name, COUNT(tt.table_key) AS tag_count
+        FROM tags tag LEFT JOIN table_tags tt ON tt.tag_key = tag.key
+        GROUP BY tag.key
+        """))
+        return [TagDetail(tag_name=row['tag_name'], tag_count=row['tag_count']) for row in rows]
+
+    @timer_with_counter
+    def get_latest_updated_ts(self) -> Optional[int]:
+        rows = self._execute_query(statement='SELECT latest_timestamp FROM metadata_timestamps WHERE key = ?',
+                                   params=(LATEST_UPDATED_TS_KEY,))
+        # None means we don't have record for last updated / index ts
+        return rows[0]['latest_timestamp'] if rows else None
+
+    @single_flight
+    @timer_with_counter
+    def get_popular_tables(self, *,
+                           num_entries: int =10) -> List[PopularTable]:
+        """
+        Retrieve popular tables with the same score as Neo4jProxy:
+        Popularity score = number of distinct readers * log(total number of reads).
+        The aggregation is covered by index user_table_relations_table.
+        """
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT tbl.database, tbl.cluster, tbl.schema, tbl.name, tbl.description
+        FROM (
+            SELECT table_key, popularity_score(COUNT(*), SUM(read_count)) AS score
+            FROM user_table_relations
+            WHERE relation = 'read'
+            GROUP BY table_key
+            HAVING COUNT(*) > :min_readers
+            ORDER BY score DESC LIMIT :num_entries
+        ) popular JOIN tables tbl ON tbl.key = popular.table_key
+        ORDER BY popular.score DESC
+        """), params={'min_readers': self.POPULAR_TABLE_MIN_READERS, 'num_entries': num_entries})
+        return [PopularTable(database=row['database'],
+                             cluster=row['cluster'],
+                             schema=row['schema'],
+                             name=row['name'],
+                             description=row['description'])
+                for row in rows]
+
+    def export_tables(self, *,
+                      batch_size: int =1000) -> Iterator[TableSummary]:
+        """
+        Iterates all the tables ordered by table key, fetched in batches with keyset pagination on the key.
+
+        :param batch_size: number of tables fetched per query
+        :return: Iterator of TableSummary
+        """
+        last_key = ''
+        while True:
+            tables = self._exec_export_query(last_key=last_key, batch_size=batch_size)
+            yield from tables
+
+            if len(tables) < batch_size:
+                return
+            last_key = tables[-1].key
+
+    def export_table_keys(self, *,
+                          batch_size: int =1000) -> Iterator[str]:
+        """
+        Iterates the keys of all the tables ordered by key, with keyset pagination on the key
+
+        :param batch_size: number of keys fetched per query
+        """
+        last_key = ''
+        while True:
+            rows = self._execute_query(statement='SELECT key FROM tables WHERE key > ? ORDER BY key LIMIT ?',
+                                       params=(last_key, batch_size))
+            yield from (row['key'] for row in rows)
+
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1]['key']
+
+    @timer_with_counter
+    def get_table_count(self) -> int:
+        return self._execute_query(statement='SELECT count(*) FROM tables', params=())[0][0]
+
+    @timer_with_counter
+    def _exec_export_query(self, *,
+                           last_key: str,
+                           batch_size: int) -> List[TableSummary]:
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT key, database, cluster, schema, name, description FROM tables
+        WHERE key > ? ORDER BY key LIMIT ?
+        """), params=(last_key, batch_size))
+        if not rows:
+            return []
+
+        # Tags and owners of the batch are fetched by the key range of the batch, using the primary key indexes
+        key_range = (last_key, rows[-1]['key'])
+        tags = {}  # type: Dict[str, List[Tag]]
+        for row in self._execute_query(statement=textwrap.dedent("""
+        SELECT tt.table_key, tag.key, tag.tag_type FROM table_tags tt JOIN tags tag ON tag.key = tt.tag_key
+        WHERE tt.table_key > ? AND tt.table_key <= ?
+        ORDER BY tt.table_key, tag.key
+        """), params=key_range):
+            tags.setdefault(row['table_key'], []).append(Tag(tag_name=row['key'], tag_type=row['tag_type']))
+
+        owners = {}  # type: Dict[str, List[User]]
+        for row in self._execute_query(statement=textwrap.dedent("""
+        SELECT table_key, user_email FROM user_table_relations
+        WHERE relation = 'own' AND table_key > ? AND table_key <= ?
+        ORDER BY table_key, user_email
+        """), params=key_range):
+            owners.setdefault(row['table_key'], []).append(User(email=row['user_email']))
+
+        return [TableSummary(key=row['key'],
+                             database=row['database'],
+                             cluster=row['cluster'],
+                             schema=row['schema'],
+                             name=row['name'],
+                             description=row['description'],
+                             tags=tags.get(row['key'], []),
+                             owners=owners.get(row['key'], []))
+                for row in rows]
+
+    @timer_with_counter
+    def get_tables_modified_since(self, *,
+                                  since: int,
+                                  cursor: str ='',
+                                  num_entries: int =1000) -> Tuple[List[str], Optional[str]]:
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT key FROM tables WHERE metadata_modified_ts >= ? AND key > ?
+        ORDER BY key LIMIT ?
+        """), params=(since, cursor, num_entries))
+
+        table_uris = [row['key'] for row in rows]
+        next_cursor = table_uris[-1] if len(table_uris) == num_entries else None
+        return table_uris, next_cursor
+
+    @single_flight
+    @timer_with_counter
+    def get_user_detail(self, *, user_id: str) -> Union[UserEntity, None]:
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT usr.*, manager.full_name AS manager_fullname
+        FROM users usr LEFT JOIN users manager ON manager.email = usr.manager_email
+        WHERE usr.email = ?
+        """), params=(user_id,))
+        if not rows:
+            raise NotFoundException('User {user_id} not found'.format(user_id=user_id))
+
+        return self._get_user(rows[0])
+
+    @staticmethod
+    def _get_user(row: sqlite3.Row) -> UserEntity:
+        return UserEntity(email=row['email'],
+                          first_name=row['first_name'],
+                          last_name=row['last_name'],
+                          full_name=row['full_name'],
+                          is_active=bool(row['is_active']) if row['is_active'] is not None else True,
+                          github_username=row['github_username'],
+                          team_name=row['team_name'],
+                          slack_id=row['slack_id'],
+                          employee_type=row['employee_type'],
+                          manager_fullname=row['manager_fullname'] or '')
+
+    def export_users(self, *,
+                     batch_size: int =1000) -> Iterator[UserEntity]:
+        """
+        Iterates all the users ordered by email, with keyset pagination on the email
+        """
+        last_email = ''
+        while True:
+            rows = self._execute_query(statement=textwrap.dedent("""
+            SELECT usr.*, manager.full_name AS manager_fullname
+            FROM users usr LEFT JOIN users manager ON manager.email = usr.manager_email
+            WHERE usr.email > ? ORDER BY usr.email LIMIT ?
+            """), params=(last_email, batch_size))
+            yield from (self._get_user(row) for row in rows)
+
+            if len(rows) < batch_size:
+                return
+            last_email = rows[-1]['email']
+
+    def export_user_relations(self, *,
+                              batch_size: int =1000) -> Iterator[Tuple[str, Any, List[str]]]:
+        """
+        Iterates the tables related to each user ordered by email, with keyset pagination on the email
+        """
+        relation_types = {relation: relation_type for relation_type, relation in self.RELATIONS.items()}
+        last_email = ''
+        while True:
+            emails = [row['user_email'] for row in self._execute_query(statement=textwrap.dedent("""
+            SELECT DISTINCT user_email FROM user_table_relations
+            WHERE user_email > ? ORDER BY user_email LIMIT ?
+            """), params=(last_email, batch_size))]
+            if not emails:
+                return
+
+            rows = self._execute_query(statement=textwrap.dedent("""
+            SELECT rel.user_email, rel.relation, rel.table_key
+            FROM user_table_relations rel JOIN tables tbl ON tbl.key = rel.table_key
+            WHERE rel.user_email > ? AND rel.user_email <= ?
+            ORDER BY rel.user_email, rel.relation, rel.table_key
+            """), params=(last_email, emails[-1]))
+            for (user_email, relation), relation_rows in groupby(rows, key=lambda row: (row[0], row[1])):
+                yield user_email, relation_types[relation], [row['table_key'] for row in relation_rows]
+
+            if len(emails) < batch_size:
+                return
+            last_email = emails[-1]
+
+    @single_flight
+    @timer_with_counter
+    def get_table_by_user_relation(self, *,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+        relation = self._get_relation(relation_type)
+        rows = self._execute_query(statement=textwrap.dedent("""
+        SELECT tbl.database, tbl.cluster, tbl.schema, tbl.name, tbl.description
+        FROM user_table_relations rel JOIN tables tbl ON tbl.key = rel.table_key
+        WHERE rel.user_email = ? AND rel.relation = ?
+        ORDER BY tbl.key
+        """), params=(user_email, relation))
+        return {'table': [PopularTable(database=row['database'],
+                                       cluster=row['cluster'],
+                                       schema=row['schema'],
+                                       name=row['name'],
+                                       description=row['description'])
+                          for row in rows]}
+
+    @timer_with_counter
+    def add_table_relation_by_user(self, *,
+                                   table_uri: str,
+                                   user_email: str,
+                                   relation_type: UserResourceRel) -> None:
+        relation = self._get_relation(relation_type)
+        with self._connection() as conn:
+            self._check_table_exists(conn, table_uri)
+            conn.execute('INSERT OR IGNORE INTO users (email) VALUES (?)', (user_email,))
+            conn.execute('INSERT OR IGNORE INTO user_table_relations (user_email, relation, table_key) '
+                         'VALUES (?, ?, ?)', (user_email, relation, table_uri))
+            if relation_type == UserResourceRel.own:
+                conn.execute('UPDATE tables SET metadata_modified_ts = ? WHERE key = ?',
+                             (self._modified_ts(), table_uri))
+
+    @timer_with_counter
+    def delete_table_relation_by_user(self, *,
+                                      table_uri: str,
+                                      user_email: str,
+                                      relation_type: UserResourceRel) -> None:
+        relation = self._get_relation(relation_type)
+        with self._connection() as conn:
+            cursor = conn.execute('DELETE FROM user_table_relations '
+                                  'WHERE user_email = ? AND relation = ? AND table_key = ?',
+                                  (user_email, relation, table_uri))
+            if cursor.rowcount and relation_type == UserResourceRel.own:
+                conn.execute('UPDATE tables SET metadata_modified_ts = ? WHERE key = ?',
+                             (self._modified_ts(), table_uri))
@@ -1,15 +1,87 @@
 import logging
-from threading import Lock
-from typing import Any, Dict, Callable  # noqa: F401
+import time
+from functools import wraps
+from threading import local
+from typing import Any, Callable, Optional  # noqa: F401
 
-from flask import current_app
+from flask import Flask
 from statsd import StatsClient
 
 from metadata_service import config
+from metadata_service.metrics import get_metrics
+from metadata_service.server_timing import get_request_timing
 
 LOGGER = logging.getLogger(__name__)
-__STATSD_POOL = {}  # type: Dict[str, StatsClient]
-__STATSD_POOL_LOCK = Lock()
+
+# Client of the process, set by init_statsd. None when config.IS_STATSD_ON is False
+_statsd_client = None  # type: Optional[StatsClient]
+# Set by init_statsd: False when statsd, Server-Timing and metrics are all disabled, and timer_with_counter only
+# calls the function
+_instrumented = False
+
+
+class _Local(local):
+    """
+    Statsd pipeline of the request being handled by the thread. Typed Any, as statsd.client.Pipeline moved in statsd
+    3.3
+    """
+    pipeline = None  # type: Optional[Any]
+
+
+_local = _Local()
+
+
+def init_statsd(app: Flask) -> None:
+    """
+    Creates the statsd client if config.IS_STATSD_ON is True, and registers the request hooks that buffer the
+    metrics of a request in a statsd pipeline, which is flushed once at request teardown. Metrics are packed into
+    as few UDP packets as their size allows, instead of one packet per metric.
+
+    Also enables timer_with_counter if any of config.IS_STATSD_ON, config.SERVER_TIMING_ENABLED and
+    config.METRICS_ENABLED is True.
+    """
+    global _statsd_client, _instrumented
+
+    _instrumented = bool(app.config[config.IS_STATSD_ON] or app.config[config.SERVER_TIMING_ENABLED] or
+                         app.config[config.METRICS_ENABLED])
+    if not app.config[config.IS_STATSD_ON]:
+        _statsd_client = None
+        return
+
+    if _statsd_client is None:
+        LOGGER.info('Instantiate StatsClient')
+        _statsd_client = StatsClient()
+    app.before_request(_start_pipeline)
+    app.teardown_request(_flush_pipeline)
+
+
+def _start_pipeline() -> None:
+    if _statsd_client is not None:
+        _local.pipeline = _statsd_client.pipeline()
+
+
+def _flush_pipeline(exc: Optional[BaseException]) -> None:
+    pipeline = _local.pipeline
+    if pipeline is not None:
+        _local.pipeline = None
+        pipeline.send()
+
+
+def _get_statsd_client() -> Optional[StatsClient]:
+    """
+    :return: statsd pipeline of the current request, or the client outside of a request. None if statsd is off
+    """
+    return _local.pipeline or _statsd_client
+
+
+def increment(metric: str) -> None:
+    """
+    Increments a statsd counter, buffered in the pipeline of the current request if any. Does nothing if statsd is
+    off
+    """
+    statsd_client = _get_statsd_client()
+    if statsd_client is not None:
+        statsd_client.incr(metric)
 
 
 def timer_with_counter(f: Callable) -> Any:
@@ -23,48 +95,55 @@ def timer_with_counter(f: Callable) -> Any:
       - metadata_service.proxy.neo4j_proxy.get_table.fail.count
       - metadata_service.proxy.neo4j_proxy.get_table.timer
 
+    Metric names are computed once here. Within a request, metrics are buffered and sent at the end of it (see
+    init_statsd). When statsd, Server-Timing and metrics are all disabled, the only overhead is checking one flag.
+
+    Time spent in the function is also added to the Server-Timing of the request (see metadata_service.server_timing)
+    and to the proxy latency histogram of metadata_service.metrics if enabled.
+
     More information on statsd: https://statsd.readthedocs.io/en/v3.2.1/index.html
     For statsd daemon not following default settings, refer to doc above to configure environment variables
 
     :param f:
     :return:
     """
+    name = f.__name__
+    timer_metric = '{}.{}'.format(f.__module__, name)
+    success_metric = '{}.success'.format(timer_metric)
+    fail_metric = '{}.fail'.format(timer_metric)
+
+    @wraps(f)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        statsd_client = _get_statsd_client(prefix=f.__module__)
-        if not statsd_client:
+        if not _instrumented:
             return f(*args, **kwargs)
 
-        with statsd_client.timer(f.__name__):
-            if LOGGER.isEnabledFor(logging.DEBUG):
-                LOGGER.debug('Calling function with emitting statsd metrics on prefix {}'.format(f.__name__))
-            try:
-                result = f(*args, **kwargs)
-                statsd_client.incr('{}.success'.format(f.__name__))
-                return result
-            except Exception as e:
-                statsd_client.incr('{}.fail'.format(f.__name__))
-                raise e
-
-    return wrapper
+        timing = get_request_timing()
+        metrics = get_metrics()
+        if timing is None and metrics is None and _statsd_client is None:
+            return f(*args, **kwargs)
 
+        statsd_client = _get_statsd_client()
+        if timing is not None:
+            timing.enter_call(name)
+        start = time.time()
+        try:
+            result = f(*args, **kwargs)
+            if statsd_client is not None:
+                statsd_client.incr(success_metric)
+            return result
+        except Exception:
+            if statsd_client is not None:
+                statsd_client.incr(fail_metric)
+            if metrics is not None:
+                metrics.proxy_errors.inc(method=name)
+            raise
+        finally:
+            elapsed_sec = time.time() - start
+            if statsd_client is not None:
+                statsd_client.timing(timer_metric, elapsed_sec * 1000)
+            if metrics is not None:
+                metrics.proxy_latency.observe(elapsed_sec, method=name)
+            if timing is not None:
+                timing.exit_call(elapsed_sec)
 
-def _get_statsd_client(*, prefix: str) -> StatsClient:
-    """
-    Object pool method that reuse already created StatsClient based on prefix
-    :param prefix:
-    :return:
-    """
-    if not current_app.config[config.IS_STATSD_ON]:
-        return None
-    else:
-        if prefix not in __STATSD_POOL:
-            with __STATSD_POOL_LOCK:
-                if prefix not in __STATSD_POOL:
-                    LOGGER.info('Instantiate StatsClient with prefix {}'.format(prefix))
-                    statsd_client = StatsClient(prefix=prefix)
-                    __STATSD_POOL[prefix] = statsd_client
-                    return statsd_client
-
-        if LOGGER.isEnabledFor(logging.DEBUG):
-            LOGGER.debug('Reuse StatsClient with prefix {}'.format(prefix))
-        return __STATSD_POOL[prefix]
+    return wrapper
@@ -0,0 +1,219 @@
+"""
+Cache of the encoded responses of the most read routes, served without running the view, marshal or JSON encoding.
+
+When config.RESPONSE_CACHE_ENABLED is True, the 200 responses to GET requests of the routes in
+config.RESPONSE_CACHE_ROUTES are kept by each process for config.RESPONSE_CACHE_EXPIRE_SEC, keyed by the path and
+query string. A request found in the cache is answered with the stored bytes: the body, or its gzip or brotli variant
+negotiated through Accept-Encoding, compressed on the first request accepting it and kept with the body. Entries
+are bounded by the total size of their bodies and variants (config.RESPONSE_CACHE_MAX_BYTES), the least recently
+used ones being evicted first.
+
+Writes through this service remove the responses they changed, through metadata_service.write_hooks: the table,
+the popular tables (holding table descriptions), the tags and the user. The caches of the other processes keep
+them until they expire, hence the short default time to live. Writes of the ingestion are seen once the responses
+expire too.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple  # noqa: F401
+
+from flask import Flask, Response, current_app, g, request
+
+from metadata_service import config, compression
+from metadata_service.metrics import record_cache_access
+from metadata_service.write_hooks import TABLE_URI_ARGUMENT, USER_ID_ARGUMENT, Write, add_write_hook
+
+# Name of the cache in the cache metrics
+CACHE_NAME = 'response'
+
+# Tags of the entries, removed together by a write
+_TABLE_TAG = 'table'
+_USER_TAG = 'user'
+_ROUTE_TAG = 'route'
+_POPULAR_TABLES_ROUTE = '/popular_tables/'
+_TAGS_ROUTE = '/tags/'
+
+
+class CachedResponse:
+    """
+    Encoded body of a response, and its compressed variants by encoding
+    """
+    __slots__ = ('body', 'mimetype', 'expires_at', 'tags', 'variants', 'size')
+
+    def __init__(self, body: bytes, mimetype: str, expires_at: float, tags: List[Tuple[str, str]]) -> None:
+        self.body = body
+        self.mimetype = mimetype
+        self.expires_at = expires_at
+        self.tags = tags
+        self.variants = {}  # type: Dict[str, bytes]
+        self.size = len(body)
+
+
+class ResponseCache:
+    """
+    LRU cache of responses with a time to live, bounded by the total size of the bodies and their variants
+    """
+    def __init__(self, max_bytes: int, expire_sec: float) -> None:
+        self.max_bytes = max_bytes
+        self.expire_sec = expire_sec
+        self._responses = OrderedDict()  # type: Dict[str, CachedResponse]
+        self._keys_by_tag = {}  # type: Dict[Tuple[str, str], Set[str]]
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            response = self._responses.get(key)
+            if response is None:
+                return None
+            if response.expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._responses.move_to_end(key)  # type: ignore
+            return response
+
+    def put(self, key: str, body: bytes, mimetype: str, tags: List[Tuple[str, str]]) -> None:
+        """
+        :param tags: (kind, value) removing the response through invalidate
+        """
+        if len(body) > self.max_bytes:
+            return
+        response = CachedResponse(body, mimetype, time.monotonic() + self.expire_sec, tags)
+        with self._lock:
+            self._remove(key)
+            self._responses[key] = response
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            self._size += response.size
+            self._evict()
+
+    def add_variant(self, key: str, response: CachedResponse, encoding: str, body: bytes) -> None:
+        with self._lock:
+            # Removed or replaced while compressing
+            if self._responses.get(key) is not response or encoding in response.variants:
+                return
+            response.variants[encoding] = body
+            response.size += len(body)
+            self._size += len(body)
+            self._evict()
+
+    def invalidate(self, tag: Tuple[str, str]) -> None:
+        with self._lock:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+            self._keys_by_tag.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._responses)))
+
+    def _remove(self, key: str) -> None:
+        response = self._responses.pop(key, None)
+        if response is None:
+            return
+        self._size -= response.size
+        for tag in response.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+# Cache of the process, set by init_response_cache. None when the cache is disabled
+_cache = None  # type: Optional[ResponseCache]
+
+
+def init_response_cache(app: Flask) -> None:
+    """
+    Registers the request hooks serving and storing the responses, and the write hook removing them, if
+    config.RESPONSE_CACHE_ENABLED is True. Must be called after init_compression, so that responses are stored
+    before being compressed.
+    """
+    global _cache
+
+    if not app.config[config.RESPONSE_CACHE_ENABLED]:
+        _cache = None
+        return
+
+    _cache = ResponseCache(app.config[config.RESPONSE_CACHE_MAX_BYTES], app.config[config.RESPONSE_CACHE_EXPIRE_SEC])
+    app.before_request(_serve_cached_response)
+    app.after_request(_store_response)
+    add_write_hook(_invalidate)
+
+
+def _is_cacheable_request() -> bool:
+    return (request.method == 'GET' and request.url_rule is not None and
+            request.url_rule.rule in current_app.config[config.RESPONSE_CACHE_ROUTES])
+
+
+def _serve_cached_response() -> Optional[Response]:
+    cache = _cache
+    if cache is None or not _is_cacheable_request():
+        return None
+
+    key = request.full_path
+    cached = cache.get(key)
+    record_cache_access(CACHE_NAME, cached is not None)
+    if cached is None:
+        return None
+
+    g.response_cache_hit = True
+    body = cached.body
+    headers = {}  # type: Dict[str, str]
+    app_config = current_app.config
+    if app_config[config.COMPRESSION_ENABLED] and len(body) >= app_config[config.COMPRESSION_MIN_SIZE]:
+        headers['Vary'] = 'Accept-Encoding'
+        encoding = compression.negotiate_encoding()
+        if encoding is not None:
+            variant = cached.variants.get(encoding)
+            if variant is None:
+                variant = compression.compress(body, encoding,
+                                               gzip_level=app_config[config.COMPRESSION_GZIP_LEVEL],
+                                               brotli_quality=app_config[config.COMPRESSION_BROTLI_QUALITY])
+                cache.add_variant(key, cached, encoding, variant)
+            body = variant
+            headers['Content-Encoding'] = encoding
+    return Response(body, mimetype=cached.mimetype, headers=headers)
+
+
+def _store_response(response: Response) -> Response:
+    cache = _cache
+    if (cache is None or response.status_code != 200 or response.is_streamed or response.direct_passthrough or
+            'Content-Encoding' in response.headers or g.get('response_cache_hit') or not _is_cacheable_request()):
+        return response
+
+    view_args = request.view_args or {}
+    tags = [(_ROUTE_TAG, request.url_rule.rule)]
+    if view_args.get(TABLE_URI_ARGUMENT):
+        tags.append((_TABLE_TAG, view_args[TABLE_URI_ARGUMENT]))
+    if view_args.get(USER_ID_ARGUMENT):
+        tags.append((_USER_TAG, view_args[USER_ID_ARGUMENT]))
+    cache.put(request.full_path, response.get_data(), response.mimetype, tags)
+    return response
+
+
+def _invalidate(write: Write) -> None:
+    cache = _cache
+    if cache is None:
+        return
+    if write.table_uri:
+        cache.invalidate((_TABLE_TAG, write.table_uri))
+        cache.invalidate((_ROUTE_TAG, _POPULAR_TABLES_ROUTE))
+    if write.user_id:
+        cache.invalidate((_USER_TAG, write.user_id))
+    if write.tags_changed:
+        cache.invalidate((_ROUTE_TAG, _TAGS_ROUTE))
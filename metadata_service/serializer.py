@@ -0,0 +1,158 @@
+"""
+Precompiled serializers, the fast path of flask_restful.marshal.
+
+marshal walks the fields definition for every object it serializes: it instantiates field classes, splits the
+attribute names and checks the type of the object once per field. For wide tables (thousands of columns, each with
+its stats) that costs more than the queries fetching them. compile_serializer does that work once per fields
+definition, and generates the source of a function which reads and formats the attributes directly.
+
+Output is the same as marshal, so that responses are byte for byte identical, except that plain dicts are returned
+rather than OrderedDicts: both keep the order of the fields and are encoded the same by json. Fields the compiler
+doesn't specialize (custom field classes, dotted or callable attributes, lists of non nested fields) are output by
+the field itself, as marshal does. If serializing raises, the object is serialized again by marshal, so that
+errors are the ones marshal raises.
+"""
+from itertools import count
+from threading import RLock
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple  # noqa: F401
+
+import flask_restful
+from flask_restful import fields
+from flask_restful.fields import _get_value_for_key
+
+Serializer = Callable[[Any], Any]
+
+# Formatting function by field class. Exact classes only, subclasses may override output or format
+_FORMATTERS = {
+    fields.String: 'str',
+    fields.Integer: 'int',
+    fields.Boolean: 'bool',
+    fields.Raw: '',
+}
+
+# id(fields definition) -> (fields definition, serializer). The definition is kept so that its id isn't reused
+_serializers = {}  # type: Dict[int, Tuple[Mapping[str, Any], Serializer]]
+_serializers_lock = RLock()
+_serializer_ids = count()
+
+
+def compile_serializer(fields_def: Mapping[str, Any]) -> Serializer:
+    """
+    :param fields_def: fields definition as given to flask_restful.marshal
+    :return: function serializing an object, or a list or tuple of objects, like marshal(data, fields_def) does.
+    Compiled once per definition.
+    """
+    cached = _serializers.get(id(fields_def))
+    if cached is not None and cached[0] is fields_def:
+        return cached[1]
+
+    with _serializers_lock:
+        cached = _serializers.get(id(fields_def))
+        if cached is not None and cached[0] is fields_def:
+            return cached[1]
+        serializer = _compile(fields_def)
+        _serializers[id(fields_def)] = (fields_def, serializer)
+        return serializer
+
+
+def marshal(data: Any, fields_def: Mapping[str, Any], envelope: Optional[str] =None) -> Any:
+    """
+    flask_restful.marshal using the compiled serializer of fields_def
+    """
+    result = compile_serializer(fields_def)(data)
+    return {envelope: result} if envelope else result
+
+
+def _compile(fields_def: Mapping[str, Any]) -> Serializer:
+    namespace = {
+        '_get_value_for_key': _get_value_for_key,
+        '_marshal': flask_restful.marshal,
+        '_fields': fields_def,
+    }  # type: Dict[str, Any]
+    values = ', '.join('{!r}: v{}'.format(key, i) for i, key in enumerate(fields_def))
+
+    # Objects indexable but not strings (e.g. dicts) are looked up by item first, then by attribute, others by
+    # attribute only, the same as flask_restful.fields.get_value
+    source = '\n'.join([
+        'def serialize(obj):',
+        '    if isinstance(obj, (list, tuple)):',
+        '        return [serialize(item) for item in obj]',
+        '    try:',
+        '        if not hasattr(obj, "strip") and hasattr(obj, "__iter__"):',
+        *_indent(_statements(fields_def, namespace, '_get_value_for_key({name!r}, obj, None)'), 3),
+        '        else:',
+        *_indent(_statements(fields_def, namespace, 'getattr(obj, {name!r}, None)'), 3),
+        '    except Exception:',
+        '        return _marshal(obj, _fields)',
+        '    return {' + values + '}',
+    ])
+    return _exec(source, namespace)
+
+
+def _statements(fields_def: Mapping[str, Any], namespace: Dict[str, Any], lookup_format: str) -> List[str]:
+    """
+    :param lookup_format: expression looking up the attribute {name} of obj
+    :return: statements assigning the value of the i-th field to v<i>. Objects they use are added to namespace
+    """
+    statements = ['pass']
+
+    for i, (key, field) in enumerate(fields_def.items()):
+        value = 'v{}'.format(i)
+
+        if isinstance(field, dict):
+            namespace['_s{}'.format(i)] = compile_serializer(field)
+            statements.append('{} = _s{}(obj)'.format(value, i))
+            continue
+
+        if isinstance(field, type):
+            field = field()
+        name = key if field.attribute is None else field.attribute
+        namespace['_f{}'.format(i)] = field
+        namespace['_d{}'.format(i)] = field.default
+        generic = '{} = _f{}.output({!r}, obj)'.format(value, i, key)
+
+        if not isinstance(name, str) or '.' in name:
+            statements.append(generic)
+            continue
+        lookup = 'v = ' + lookup_format.format(name=name)
+
+        if type(field) in _FORMATTERS:
+            statements.append(lookup)
+            statements.append('{} = _d{} if v is None else {}(v)'.format(value, i, _FORMATTERS[type(field)]))
+
+        elif type(field) is fields.Nested:
+            namespace['_s{}'.format(i)] = compile_serializer(field.nested)
+            statements.append(lookup)
+            if field.allow_null:
+                statements.append('{} = None if v is None else _s{}(v)'.format(value, i))
+            elif field.default is not None:
+                statements.append('{} = _d{} if v is None else _s{}(v)'.format(value, i, i))
+            else:
+                statements.append('{} = _s{}(v)'.format(value, i))
+
+        elif (type(field) is fields.List and type(field.container) is fields.Nested and
+              field.container.attribute is None and not field.container.allow_null and
+              field.container.default is None):
+            # Lists and tuples of nested objects. Sets and other iterables are output by the field
+            namespace['_s{}'.format(i)] = compile_serializer(field.container.nested)
+            statements.append(lookup)
+            statements.append('if v.__class__ is list or v.__class__ is tuple:')
+            statements.append('    {} = [_s{}(item) for item in v]'.format(value, i))
+            statements.append('else:')
+            statements.append('    ' + generic)
+
+        else:
+            statements.append(generic)
+
+    return statements
+
+
+def _indent(lines: List[str], level: int) -> List[str]:
+    return ['    ' * level + line for line in lines]
+
+
+def _exec(source: str, namespace: Dict[str, Any]) -> Serializer:
+    filename = '<serializer {}>'.format(next(_serializer_ids))
+    exec(compile(source, filename, 'exec'), namespace)
+    serializer = namespace['serialize']  # type: Serializer
+    return serializer
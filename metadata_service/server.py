@@ -0,0 +1,119 @@
+"""
+Production server: gunicorn serving the app of metadata_wsgi.
+
+Workers, threads and worker class (gthread or gevent) are read from the app config (SERVER_* keys, which can be set
+through environment variables of the same name). The app is imported once in the master process before forking
+the workers (preload_app), so that workers start fast and share the memory of the imported modules.
+
+The proxy client is never shared across processes: it holds connections (Neo4j driver, Atlas session) and threads
+of the process that created it. The master creates the app without a proxy client (config.PROXY_EAGER_INIT is
+ignored), and each worker warms up before it accepts traffic: the client is created and connected to the backend,
+and the paths of config.SERVER_WARMUP_PATHS are requested concurrently, which opens the pool up to the number of
+threads and fills the caches of the proxy.
+
+Requires gunicorn (pip install amundsen-metadata[gunicorn]), and gevent for the gevent worker class.
+
+e.g:
+  SERVER_WORKERS=4 SERVER_THREADS=16 python3 -m metadata_service.server
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict  # noqa: F401
+
+from flask import Flask
+
+from metadata_service import config, create_app
+from metadata_service.proxy import connect_proxy_client, reset_proxy_client
+
+LOGGER = logging.getLogger(__name__)
+
+GTHREAD = 'gthread'
+GEVENT = 'gevent'
+
+
+def gunicorn_options(app: Flask) -> Dict[str, Any]:
+    """
+    :return: gunicorn settings from the SERVER_* config of the app
+    """
+    worker_class = app.config[config.SERVER_WORKER_CLASS]
+    if worker_class not in (GTHREAD, GEVENT):
+        raise ValueError('{} is {!r}, expected {!r} or {!r}'.format(
+            config.SERVER_WORKER_CLASS, worker_class, GTHREAD, GEVENT))
+
+    return {
+        'bind': app.config[config.SERVER_BIND],
+        'workers': app.config[config.SERVER_WORKERS],
+        'worker_class': worker_class,
+        'threads': app.config[config.SERVER_THREADS],
+        'worker_connections': app.config[config.SERVER_WORKER_CONNECTIONS],
+        'timeout': app.config[config.SERVER_TIMEOUT],
+        'accesslog': app.config[config.SERVER_ACCESS_LOG] or None,
+        'preload_app': True,
+        'post_fork': post_fork,
+        'post_worker_init': post_worker_init,
+    }
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """
+    gunicorn hook called in the worker process after fork. Drops the proxy client inherited from the master if any,
+    e.g. created by a request to the master's app.
+    """
+    reset_proxy_client()
+
+
+def post_worker_init(worker: Any) -> None:
+    """
+    gunicorn hook called in the worker process once the app is loaded, before the worker accepts requests
+    """
+    warm_up(worker.wsgi)
+
+
+def warm_up(app: Flask) -> None:
+    """
+    Creates the proxy client of the process, connects to the backend and requests the paths of
+    config.SERVER_WARMUP_PATHS, as many times each as the number of threads of a worker, concurrently. Failures are
+    logged, the worker starts anyway.
+    """
+    connect_proxy_client(app)
+
+    paths = app.config[config.SERVER_WARMUP_PATHS]
+    concurrency = max(1, app.config[config.SERVER_THREADS])
+    if not paths:
+        return
+
+    def get(path: str) -> None:
+        try:
+            status_code = app.test_client().get(path).status_code
+            if status_code >= 400:
+                LOGGER.warning('Warm up request to {} returned {}'.format(path, status_code))
+        except Exception:
+            LOGGER.exception('Warm up request to {} failed'.format(path))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(get, [path for _ in range(concurrency) for path in paths]))
+    LOGGER.info('Warmed up with {}'.format(', '.join(paths)))
+
+
+def main() -> None:
+    from gunicorn.app.base import BaseApplication
+
+    # Same app as metadata_wsgi, without a proxy client in the master: the workers would inherit its connections
+    application = create_app(config_module_class=os.getenv('METADATA_SVC_CONFIG_MODULE_CLASS')
+                             or 'metadata_service.config.LocalConfig',
+                             proxy_eager_init=False)
+
+    class MetadataApplication(BaseApplication):
+        def load_config(self) -> None:
+            for key, value in gunicorn_options(application).items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Flask:
+            return application
+
+    MetadataApplication().run()
+
+
+if __name__ == '__main__':
+    main()
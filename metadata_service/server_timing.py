@@ -0,0 +1,127 @@
+"""
+Server-Timing response header.
+
+Each request gets a RequestTiming held in a thread local, populated by timer_with_counter (time spent in proxy methods),
+the query helpers of the proxies (time spent per named query) and marshal of this module. The header splits the
+request into:
+  - query.<name>: time of the queries issued by the proxy method <name>
+  - entity: time in the proxy methods outside of queries, i.e. building entities out of the results
+  - marshal: time in marshal, i.e. serializing the entities (see metadata_service.serializer)
+  - total: time from the start to the end of the request handling
+
+e.g: Server-Timing: query._exec_col_query;dur=12.510, query._exec_usage_query;dur=3.102, entity;dur=1.841,
+  marshal;dur=2.004, total;dur=20.212
+"""
+import time
+from collections import OrderedDict
+from threading import local
+from typing import Any, Dict, List, Optional  # noqa: F401
+
+from flask import Flask, Response, current_app
+
+from metadata_service import config, serializer
+
+SERVER_TIMING_HEADER = 'Server-Timing'
+
+# Name of a query issued outside of any proxy method decorated with timer_with_counter
+DEFAULT_QUERY_NAME = 'query'
+
+
+class _Local(local):
+    """
+    Timing of the request being handled by the thread. Thread local rather than flask.g, as it's looked up on every
+    proxy call and flask.g is several times slower to access
+    """
+    timing = None  # type: Optional[RequestTiming]
+
+
+_local = _Local()
+
+
+class RequestTiming:
+    """
+    Timings of one request
+    """
+    def __init__(self) -> None:
+        self.start = time.time()
+        # Names of the proxy methods being executed, outermost first
+        self.calls = []  # type: List[str]
+        self.queries = OrderedDict()  # type: Dict[str, float]
+        self.proxy_sec = 0.0
+        self.marshal_sec = 0.0
+
+    def caller(self, depth: int =0) -> str:
+        """
+        :param depth: 0 for the innermost proxy method being executed, 1 for the one calling it, and so on
+        :return: name of the proxy method, or DEFAULT_QUERY_NAME if there's none
+        """
+        if depth < len(self.calls):
+            return self.calls[-1 - depth]
+        return DEFAULT_QUERY_NAME
+
+    def add_query(self, name: str, duration_sec: float) -> None:
+        self.queries[name] = self.queries.get(name, 0.0) + duration_sec
+
+    def enter_call(self, name: str) -> None:
+        self.calls.append(name)
+
+    def exit_call(self, duration_sec: float) -> None:
+        self.calls.pop()
+        # Nested calls are part of the outermost one
+        if not self.calls:
+            self.proxy_sec += duration_sec
+
+    def header_value(self) -> str:
+        total_sec = time.time() - self.start
+        metrics = [('query.{}'.format(name), duration_sec) for name, duration_sec in self.queries.items()]
+        metrics.append(('entity', max(0.0, self.proxy_sec - sum(self.queries.values()))))
+        metrics.append(('marshal', self.marshal_sec))
+        metrics.append(('total', total_sec))
+        return ', '.join('{};dur={:.3f}'.format(name, duration_sec * 1000) for name, duration_sec in metrics)
+
+
+def get_request_timing() -> Optional[RequestTiming]:
+    """
+    :return: RequestTiming of the current request, or None outside of a request or if Server-Timing is disabled
+    """
+    return _local.timing
+
+
+def marshal(data: Any, fields: Any, envelope: Optional[str] =None) -> Any:
+    """
+    metadata_service.serializer.marshal that adds its time to the RequestTiming of the request
+    """
+    timing = get_request_timing()
+    if timing is None:
+        return serializer.marshal(data, fields, envelope)
+
+    start = time.time()
+    try:
+        return serializer.marshal(data, fields, envelope)
+    finally:
+        timing.marshal_sec += time.time() - start
+
+
+def init_server_timing(app: Flask) -> None:
+    """
+    Registers the request hooks on the app. They do nothing unless config.SERVER_TIMING_ENABLED is True.
+    """
+    app.before_request(_start_timing)
+    app.after_request(_add_header)
+    app.teardown_request(_end_timing)
+
+
+def _start_timing() -> None:
+    if current_app.config[config.SERVER_TIMING_ENABLED]:
+        _local.timing = RequestTiming()
+
+
+def _add_header(response: Response) -> Response:
+    timing = get_request_timing()
+    if timing is not None:
+        response.headers[SERVER_TIMING_HEADER] = timing.header_value()
+    return response
+
+
+def _end_timing(exc: Optional[BaseException]) -> None:
+    _local.timing = None
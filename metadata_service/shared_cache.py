@@ -0,0 +1,224 @@
+"""
+Cache shared by the worker processes of a host, without any external service.
+
+Each entry is a file of the cache directory, named after the digest of its key, holding its expiry time followed by
+the pickled value. Entries are written to a temporary file which then replaces the entry, so that a reader sees
+either the previous or the new entry, never a partial one. The default directory is on /dev/shm when available,
+a memory backed file system, so that reads and writes don't touch the disk.
+
+The total size of the entries is bounded: every process sweeps the directory once it has written a fraction of the
+max size since its last sweep, removing the expired entries, then the least recently written ones.
+
+Values are pickled: the directory must only be writable by the user running the service. It is created with mode
+0700 if it does not exist.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import time
+from threading import Lock
+from typing import Any, List, Optional, Tuple  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+# Expiry time (epoch seconds) in front of the pickled value
+_HEADER = struct.Struct('>d')
+_TEMP_PREFIX = '.tmp'
+# Share of max_bytes a process writes between two sweeps
+_SWEEP_FRACTION = 8
+# A sweep removes entries until the total size is at most this share of max_bytes, so that the next one isn't
+# right after
+_SWEEP_TARGET_RATIO = 0.9
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+# Returned by SharedCache.get for a key that isn't cached, as None can be cached
+MISSING = _Missing()
+
+
+def default_directory() -> str:
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'metadata_service_cache')
+
+
+class SharedCache:
+    """
+    File backed cache of picklable values, shared by the processes using the same directory
+    """
+    def __init__(self, directory: str, *, max_bytes: int, default_expire_sec: float =300) -> None:
+        """
+        :param directory: directory of the entries, created if it does not exist
+        :param max_bytes: max total size of the entries
+        :param default_expire_sec: time to live of the entries put without an expire_sec
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_expire_sec = default_expire_sec
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        self._written_since_sweep = 0
+        self._sweep_lock = Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest())
+
+    def get(self, key: str) -> Any:
+        """
+        :return: value of the key, MISSING if it isn't cached or has expired
+        """
+        return self.get_with_size(key)[0]
+
+    def get_with_size(self, key: str) -> Tuple[Any, int]:
+        """
+        :return: value of the key, MISSING if it isn't cached or has expired, and the size of the entry, 0 if missing
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+                stat = os.fstat(f.fileno())
+        except FileNotFoundError:
+            return MISSING, 0
+
+        try:
+            expires_at, = _HEADER.unpack_from(data)
+            if expires_at < time.time():
+                self._remove_if_unchanged(path, stat)
+                return MISSING, 0
+            return pickle.loads(data[_HEADER.size:]), len(data)
+        except Exception:
+            # Truncated by a full file system, or classes changed by a new release
+            LOGGER.warning('Removing unreadable shared cache entry {}'.format(path), exc_info=True)
+            self._remove_if_unchanged(path, stat)
+            return MISSING, 0
+
+    def put(self, key: str, value: Any, expire_sec: Optional[float] =None) -> Optional[int]:
+        """
+        Failures (e.g. a full file system, a value that can't be pickled) are logged, the value isn't cached
+
+        :return: size of the entry, even if it's larger than max_bytes and isn't cached. None if the value can't be
+        pickled
+        """
+        if expire_sec is None:
+            expire_sec = self.default_expire_sec
+        try:
+            data = _HEADER.pack(time.time() + expire_sec) + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            LOGGER.exception('Failed to pickle the value of {}'.format(key))
+            return None
+        if len(data) > self.max_bytes:
+            return len(data)
+
+        fd, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            LOGGER.exception('Failed to write shared cache entry of {}'.format(key))
+            self._remove(temp_path)
+            return len(data)
+
+        self._written_since_sweep += len(data)
+        if self._written_since_sweep >= self.max_bytes // _SWEEP_FRACTION:
+            self.sweep()
+        return len(data)
+
+    def delete(self, key: str) -> None:
+        self._remove(self._path(key))
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            self._remove(entry.path)
+
+    def sweep(self) -> None:
+        """
+        Removes the expired entries, then the least recently written ones until the total size is back under the
+        max size. Temporary files left by a process killed while writing are removed too.
+        """
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._written_since_sweep = 0
+            live, total_bytes = self._remove_expired(time.time())
+            if total_bytes <= self.max_bytes:
+                return
+            target_bytes = self.max_bytes * _SWEEP_TARGET_RATIO
+            for _, size, path in sorted(live):
+                if total_bytes <= target_bytes:
+                    break
+                self._remove(path)
+                total_bytes -= size
+        finally:
+            self._sweep_lock.release()
+
+    def _remove_expired(self, now: float) -> Tuple[List[Tuple[float, int, str]], int]:
+        """
+        :return: (mtime, size, path) of the live entries, and their total size
+        """
+        live = []  # type: List[Tuple[float, int, str]]
+        total_bytes = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.startswith(_TEMP_PREFIX):
+                # Written for more than a minute: left by a killed process
+                if stat.st_mtime < now - 60:
+                    self._remove(entry.path)
+            else:
+                expired_stat = self._expired(entry.path, now)
+                if expired_stat is not None:
+                    self._remove_if_unchanged(entry.path, expired_stat)
+                    continue
+                live.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+        return live, total_bytes
+
+    def _entries(self) -> List[Any]:
+        try:
+            with os.scandir(self.directory) as entries:
+                return [entry for entry in entries if entry.is_file()]
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _expired(path: str, now: float) -> Optional[os.stat_result]:
+        """
+        :return: stat of the entry read if it has expired or is truncated, None otherwise
+        """
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                stat = os.fstat(f.fileno())
+        except FileNotFoundError:
+            return None
+        return stat if len(header) < _HEADER.size or _HEADER.unpack(header)[0] < now else None
+
+    @classmethod
+    def _remove_if_unchanged(cls, path: str, stat: os.stat_result) -> None:
+        """
+        Removes the entry unless another process replaced it since it was read, i.e. its inode or mtime changed.
+        A replaced entry is left to the sweep.
+        """
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            return
+        if (current.st_ino, current.st_mtime_ns) == (stat.st_ino, stat.st_mtime_ns):
+            cls._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,214 @@
+"""
+Bloom filter of the table keys, answering 404 for tables that don't exist without querying the backend.
+
+When config.TABLE_FILTER_ENABLED is True, each process builds a filter of all the table keys from
+export_table_keys of the proxy client, in a background thread. The filter is sized from get_table_count, and keys
+are added as they are fetched, page by page. Reads of a table (detail, description, column
+description) whose key isn't in the filter are answered 404 after a single get_latest_updated_ts query, without
+reading the table. A Bloom filter has no false negative: a table in the filter may not exist
+(config.TABLE_FILTER_FALSE_POSITIVE_RATE), and is then queried as before.
+
+Tables are created by the ingestion (databuilder) rather than by this service, hence the filter is rebuilt when
+get_latest_updated_ts of the proxy changes, i.e. after an ingestion, which is checked every
+config.TABLE_FILTER_CHECK_INTERVAL_SEC, and every config.TABLE_FILTER_REBUILD_INTERVAL_SEC anyway. Tables updated
+through this service are added to the filter. A table missing from the filter is answered 404 only if
+get_latest_updated_ts of the proxy is still the one of the last build. Otherwise the table may have been ingested
+since, hence it's queried as before, and added to the filter if found, until the filter is rebuilt. Until the
+first filter is built, or if building fails, tables are queried as before.
+
+The thread is started by the first request of each process rather than by create_app, as threads don't survive
+the fork of the gunicorn workers.
+"""
+import hashlib
+import logging
+import math
+import os
+import random
+from threading import Event, Lock, Thread
+from typing import Any, Optional, Set  # noqa: F401
+
+from flask import Flask, Response, current_app, g
+
+from metadata_service import config
+from metadata_service.exception import NotFoundException
+from metadata_service.metrics import get_metrics
+from metadata_service.proxy import get_proxy_client
+from metadata_service.write_hooks import Write, add_write_hook
+
+LOGGER = logging.getLogger(__name__)
+
+# Tables expected on top of the ones at build time, added until the next build
+_GROWTH_RATIO = 1.2
+
+
+class BloomFilter:
+    """
+    Bloom filter of strings, of num_bits bits and num_hashes hash functions derived from one blake2b digest
+    """
+    def __init__(self, num_bits: int, num_hashes: int) -> None:
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, num_hashes)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, *, false_positive_rate: float, max_bytes: int) -> 'BloomFilter':
+        """
+        :param capacity: number of keys expected
+        :param false_positive_rate: expected ratio of absent keys found in the filter, once it holds capacity keys
+        :param max_bytes: max size of the filter. If the size computed from capacity and false_positive_rate is
+        larger, the filter has max_bytes and a higher false positive rate
+        """
+        capacity = max(1, capacity)
+        num_bits = int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        if num_bits > max_bytes * 8:
+            LOGGER.warning('Bloom filter of {} keys capped to {} bytes, false positive rate is higher than {}'.format(
+                capacity, max_bytes, false_positive_rate))
+            num_bits = max_bytes * 8
+        num_hashes = int(round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, key: str) -> Any:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        # Odd, hence never 0 and coprime with any power of 2
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        return ((h1 + i * h2) % num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+
+class _TableFilter:
+    """
+    Filter of the process, and the thread building it
+    """
+    def __init__(self) -> None:
+        self.bloom_filter = None  # type: Optional[BloomFilter]
+        self.latest_updated_ts = None  # type: Any
+        # Keys added while a filter is being built, added to the new filter once built
+        self.added_during_build = None  # type: Optional[Set[str]]
+        self.lock = Lock()
+        self.pid = None  # type: Optional[int]
+        self.stop_event = Event()
+
+    def add(self, key: str) -> None:
+        with self.lock:
+            if self.bloom_filter is not None:
+                self.bloom_filter.add(key)
+            if self.added_during_build is not None:
+                self.added_during_build.add(key)
+
+    def build(self, app: Flask) -> None:
+        with self.lock:
+            self.added_during_build = set()
+        try:
+            proxy = get_proxy_client()
+            latest_updated_ts = proxy.get_latest_updated_ts()
+            bloom_filter = BloomFilter.for_capacity(
+                int(proxy.get_table_count() * _GROWTH_RATIO),
+                false_positive_rate=app.config[config.TABLE_FILTER_FALSE_POSITIVE_RATE],
+                max_bytes=app.config[config.TABLE_FILTER_MAX_BYTES])
+            num_keys = 0
+            for key in proxy.export_table_keys():
+                bloom_filter.add(key)
+                num_keys += 1
+            with self.lock:
+                for key in self.added_during_build or ():
+                    bloom_filter.add(key)
+                self.bloom_filter = bloom_filter
+                self.latest_updated_ts = latest_updated_ts
+            LOGGER.info('Built table filter of {} tables in {} bytes'.format(num_keys, bloom_filter.size_bytes))
+        finally:
+            with self.lock:
+                self.added_during_build = None
+
+    def run(self, app: Flask) -> None:
+        check_interval_sec = app.config[config.TABLE_FILTER_CHECK_INTERVAL_SEC]
+        rebuild_interval_sec = app.config[config.TABLE_FILTER_REBUILD_INTERVAL_SEC]
+        with app.app_context():
+            since_build_sec = rebuild_interval_sec
+            while not self.stop_event.is_set():
+                try:
+                    if (since_build_sec >= rebuild_interval_sec or
+                            get_proxy_client().get_latest_updated_ts() != self.latest_updated_ts):
+                        self.build(app)
+                        since_build_sec = 0
+                except Exception:
+                    LOGGER.exception('Failed to build the table filter')
+                # Jitter, so that workers don't query the backend at once
+                interval_sec = check_interval_sec * random.uniform(0.9, 1.1)
+                self.stop_event.wait(interval_sec)
+                since_build_sec += interval_sec
+
+    def start(self, app: Flask) -> None:
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+        Thread(target=self.run, args=(app,), name='table-filter', daemon=True).start()
+
+
+_table_filter = _TableFilter()
+
+
+def init_table_filter(app: Flask) -> None:
+    """
+    Registers the request hook starting the thread that builds the filter, and the write hook adding the tables
+    updated by the requests, if config.TABLE_FILTER_ENABLED is True
+    """
+    if not app.config[config.TABLE_FILTER_ENABLED]:
+        return
+    app.before_request(_start)
+    app.after_request(_add_found_table)
+    add_write_hook(_add_updated_table)
+
+
+def _start() -> None:
+    _table_filter.start(current_app._get_current_object())
+
+
+def _add_updated_table(write: Write) -> None:
+    if write.table_uri:
+        _table_filter.add(write.table_uri)
+
+
+def _add_found_table(response: Response) -> Response:
+    table_uri = g.get('table_filter_miss')
+    if table_uri and response.status_code == 200:
+        _table_filter.add(table_uri)
+    return response
+
+
+def check_table_may_exist(table_uri: str) -> None:
+    """
+    :raises NotFoundException: if the table is not in the filter, and the filter was built after the latest
+    ingestion, i.e. the table does not exist
+    """
+    table_filter = _table_filter
+    bloom_filter = table_filter.bloom_filter
+    if bloom_filter is None or table_uri in bloom_filter:
+        return
+    try:
+        stale = get_proxy_client().get_latest_updated_ts() != table_filter.latest_updated_ts
+    except Exception:
+        LOGGER.exception('Failed to check the table filter is up to date')
+        stale = True
+    if stale:
+        # Possibly ingested since the filter was built: read from the proxy, and added to the filter if found
+        g.table_filter_miss = table_uri
+        return
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.table_filter_rejections.inc()
+    raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
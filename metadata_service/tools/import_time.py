@@ -0,0 +1,92 @@
+"""
+Import time audit, based on python -X importtime.
+
+Runs a statement in a fresh interpreter, so that nothing is imported yet, and reports the time spent importing each
+module: its own time and its cumulative time, including the modules it imported first. It tells what a cold start
+of the service (a new worker, a new container) spends before serving, and which modules pulled which dependencies.
+
+e.g:
+  python3 -m metadata_service.tools.import_time
+  python3 -m metadata_service.tools.import_time --statement 'import metadata_service.proxy.neo4j_proxy' --top 30
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional  # noqa: F401
+
+# Creates the app, as a worker does on start
+CREATE_APP_STATEMENT = ("from metadata_service import create_app; "
+                        "create_app(config_module_class='metadata_service.config.LocalConfig')")
+
+# import time:  self [us] | cumulative | imported package
+_IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+ImportTime = NamedTuple('ImportTime', [
+    ('module', str),
+    ('self_us', int),
+    ('cumulative_us', int),
+    # 0 for the modules imported by the statement, 1 for the modules imported by those, ...
+    ('depth', int),
+])
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """
+    :param output: stderr of python -X importtime
+    :return: ImportTime of each module, in the order of the output: a module comes after the ones it imported
+    """
+    import_times = []
+    for line in output.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            import_times.append(ImportTime(module=module, self_us=int(self_us), cumulative_us=int(cumulative_us),
+                                           depth=(len(indent) - 1) // 2))
+    return import_times
+
+
+def measure_import_times(statement: str, *,
+                         python: str =sys.executable,
+                         env: Optional[Dict[str, str]] =None) -> List[ImportTime]:
+    """
+    :param statement: Python statement run by a fresh interpreter, with the sys.path of this one
+    :param python: interpreter to run
+    :param env: environment variables set on top of the ones of this process, e.g. to select the config
+    :return: ImportTime of each module imported by the statement
+    """
+    env = dict(os.environ, **(env or {}))
+    env['PYTHONPATH'] = os.pathsep.join(path for path in sys.path if path)
+    process = subprocess.run([python, '-X', 'importtime', '-c', statement], env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    return parse_import_times(process.stderr.decode('utf-8', errors='replace'))
+
+
+def total_us(import_times: List[ImportTime]) -> int:
+    """
+    :return: time spent importing, i.e. sum of the cumulative time of the modules imported by the statement
+    """
+    return sum(import_time.cumulative_us for import_time in import_times if import_time.depth == 0)
+
+
+def format_report(import_times: List[ImportTime], *, top: int =20) -> str:
+    lines = ['Total: {:.1f} ms, {} modules'.format(total_us(import_times) / 1000, len(import_times)), '',
+             '{:>12} {:>12}  {}'.format('self ms', 'cumulative', 'module')]
+    for import_time in sorted(import_times, key=lambda i: -i.cumulative_us)[:top]:
+        lines.append('{:>12.1f} {:>12.1f}  {}{}'.format(
+            import_time.self_us / 1000, import_time.cumulative_us / 1000, '  ' * import_time.depth, import_time.module))
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] =None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statement', default=CREATE_APP_STATEMENT, help='Statement to measure')
+    parser.add_argument('--top', type=int, default=20, help='Number of modules of largest cumulative time shown')
+    args = parser.parse_args(argv)
+
+    print(format_report(measure_import_times(args.statement), top=args.top))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Replays a recorded access log against Metadata service and reports latency percentiles per route.
+
+Requests are sent either in-process through the WSGI app created from a config module class, or over HTTP to a
+running instance. They are sent by a number of concurrent workers, optionally throttled to a target rate, and the
+results are grouped by route template (e.g. /table/<path:table_uri>) so that runs with different configs or
+releases can be compared on the same traffic.
+
+The access log is either JSON lines with method, path and optional body (JSON document or string), or a
+common / combined log format file (e.g. gunicorn access log), of which the request line is used.
+
+e.g:
+  python3 -m metadata_service.tools.load_tester --access-log access.log --concurrency 8 --rate 200
+  python3 -m metadata_service.tools.load_tester --access-log access.log --url http://localhost:5000 --output r.json
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple  # noqa: F401
+
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+
+from metadata_service import create_app
+
+LOGGER = logging.getLogger(__name__)
+
+# Request line of common / combined log format: ... "GET /table/hive://gold.core/fact_rides HTTP/1.1" 200 ...
+_REQUEST_LINE_PATTERN = re.compile(r'"(?P<method>[A-Z]+) (?P<path>\S+) HTTP/[0-9.]+"')
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+LoggedRequest = NamedTuple('LoggedRequest', [('method', str), ('path', str), ('body', Optional[bytes])])
+
+# Outcome of a replayed request. status is None when the request could not be sent
+RequestResult = NamedTuple('RequestResult', [('route', str), ('status', Optional[int]), ('elapsed_sec', float)])
+
+
+def parse_access_log_line(line: str) -> Optional[LoggedRequest]:
+    """
+    :return: LoggedRequest, or None if the line is empty or not a request
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        entry = json.loads(line)
+        body = entry.get('body')
+        if body is not None and not isinstance(body, str):
+            body = json.dumps(body)
+        return LoggedRequest(method=entry.get('method', 'GET').upper(),
+                             path=entry['path'],
+                             body=body.encode('utf-8') if body is not None else None)
+
+    match = _REQUEST_LINE_PATTERN.search(line)
+    if not match:
+        return None
+    return LoggedRequest(method=match.group('method'), path=match.group('path'), body=None)
+
+
+def read_access_log(path: str) -> List[LoggedRequest]:
+    requests = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            request = parse_access_log_line(line)
+            if request is None:
+                if line.strip():
+                    LOGGER.warning('Skipping line {} of {}: not a request'.format(line_number, path))
+                continue
+            requests.append(request)
+    return requests
+
+
+class RouteMatcher:
+    """
+    Maps a request to the rule of the app it's routed to
+    """
+    def __init__(self, app: Flask) -> None:
+        self._adapter = app.url_map.bind('localhost')
+        self._cache = {}  # type: Dict[Tuple[str, str], str]
+
+    def route(self, method: str, path: str) -> str:
+        key = (method, path)
+        route = self._cache.get(key)
+        if route is None:
+            try:
+                rule, _ = self._adapter.match(path.split('?', 1)[0], method=method, return_rule=True)
+                route = rule.rule
+            except HTTPException:
+                route = UNMATCHED_ROUTE
+            self._cache[key] = route
+        return route
+
+
+def wsgi_sender(app: Flask) -> Callable[[LoggedRequest], int]:
+    """
+    Sends requests in-process through the WSGI app. Each worker thread gets its own test client.
+    """
+    local = threading.local()
+
+    def send(request: LoggedRequest) -> int:
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        path, _, query_string = request.path.partition('?')
+        response = client.open(path, method=request.method, query_string=query_string, data=request.body,
+                               content_type='application/json' if request.body is not None else None)
+        # Streamed responses are consumed as a client would
+        response.get_data()
+        return response.status_code
+
+    return send
+
+
+def http_sender(base_url: str, timeout_sec: float =30.0) -> Callable[[LoggedRequest], int]:
+    """
+    Sends requests over HTTP to a running instance
+    """
+    base_url = base_url.rstrip('/')
+
+    def send(request: LoggedRequest) -> int:
+        http_request = urllib.request.Request(base_url + request.path, data=request.body, method=request.method)
+        if request.body is not None:
+            http_request.add_header('Content-Type', 'application/json')
+        try:
+            with urllib.request.urlopen(http_request, timeout=timeout_sec) as response:
+                response.read()
+                return response.getcode()
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+    return send
+
+
+def replay(requests: List[LoggedRequest],
+           send: Callable[[LoggedRequest], int],
+           route_matcher: RouteMatcher, *,
+           concurrency: int =1,
+           rate: float =0.0) -> Tuple[List[RequestResult], float]:
+    """
+    Replays the requests in order.
+    :param send: sends a request and returns the status code
+    :param concurrency: number of workers sending requests
+    :param rate: target requests per second over all workers. 0 sends requests as fast as the workers can. When
+    the workers cannot keep up, the requests are sent late and the achieved throughput is lower than the rate
+    :return: results in the order of the requests and the wall time of the replay in seconds
+    """
+    start = time.time()
+
+    def run(index: int) -> RequestResult:
+        request = requests[index]
+        if rate > 0:
+            delay = start + index / rate - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        route = route_matcher.route(request.method, request.path)
+        request_start = time.time()
+        try:
+            status = send(request)  # type: Optional[int]
+        except Exception as e:
+            LOGGER.warning('{} {} failed: {}'.format(request.method, request.path, e))
+            status = None
+        return RequestResult(route=route, status=status, elapsed_sec=time.time() - request_start)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(run, range(len(requests))))
+    return results, time.time() - start
+
+
+def _percentile(sorted_data: List[float], percent: float) -> float:
+    index = min(len(sorted_data) - 1, int(round(percent / 100.0 * (len(sorted_data) - 1))))
+    return sorted_data[index]
+
+
+def _summarize_results(results: List[RequestResult], duration_sec: float) -> Dict[str, Any]:
+    latencies = sorted(result.elapsed_sec * 1000 for result in results)
+    statuses = {}  # type: Dict[str, int]
+    for result in results:
+        status = str(result.status) if result.status is not None else 'failed'
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        'requests': len(results),
+        # Server errors and requests that could not be sent
+        'errors': sum(1 for result in results if result.status is None or result.status >= 500),
+        'statuses': statuses,
+        'requests_per_sec': len(results) / duration_sec if duration_sec > 0 else 0.0,
+        'p50_ms': _percentile(latencies, 50),
+        'p90_ms': _percentile(latencies, 90),
+        'p99_ms': _percentile(latencies, 99),
+        'max_ms': latencies[-1],
+    }
+
+
+def summarize(results: List[RequestResult], duration_sec: float) -> Dict[str, Any]:
+    """
+    :return: report with the summary of all requests under total, and of each route template under routes.
+    Throughput of a route is its number of requests over the wall time of the whole replay
+    """
+    by_route = {}  # type: Dict[str, List[RequestResult]]
+    for result in results:
+        by_route.setdefault(result.route, []).append(result)
+
+    routes = OrderedDict()  # type: Dict[str, Dict[str, Any]]
+    for route in sorted(by_route):
+        routes[route] = _summarize_results(by_route[route], duration_sec)
+
+    return {
+        'duration_sec': duration_sec,
+        'total': _summarize_results(results, duration_sec) if results else {},
+        'routes': routes,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = ['{:<70} {:>8} {:>7} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'route', 'requests', 'errors', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms')]
+    rows = list(report['routes'].items())
+    if report['total']:
+        rows.append(('TOTAL', report['total']))
+    for route, summary in rows:
+        lines.append('{:<70} {:>8} {:>7} {:>10.1f} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f}'.format(
+            route, summary['requests'], summary['errors'], summary['requests_per_sec'], summary['p50_ms'],
+            summary['p90_ms'], summary['p99_ms'], summary['max_ms']))
+    return '\n'.join(lines)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Replay an access log against Metadata service')
+    parser.add_argument('--access-log', required=True, help='JSON lines (method, path, body) or common log format')
+    parser.add_argument('--config', default=os.getenv('METADATA_SVC_CONFIG_MODULE_CLASS')
+                        or 'metadata_service.config.LocalConfig',
+                        help='Config module class of the app. Requests are served in-process unless --url is set')
+    parser.add_argument('--url', default='', help='Base URL of a running instance, e.g. http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=1, help='Number of concurrent workers')
+    parser.add_argument('--rate', type=float, default=0.0, help='Target requests per second. 0 for no limit')
+    parser.add_argument('--repeat', type=int, default=1, help='Number of times the access log is replayed')
+    parser.add_argument('--timeout', type=float, default=30.0, help='HTTP request timeout in seconds')
+    parser.add_argument('--output', default='', help='Path of JSON report')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] =None) -> None:
+    args = _parse_args(argv)
+    requests = read_access_log(args.access_log) * args.repeat
+
+    # The app is also created in HTTP mode, to map the paths to route templates
+    app = create_app(config_module_class=args.config)
+    send = http_sender(args.url, timeout_sec=args.timeout) if args.url else wsgi_sender(app)
+
+    results, duration_sec = replay(requests, send, RouteMatcher(app), concurrency=args.concurrency, rate=args.rate)
+    report = summarize(results, duration_sec)
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(json.dumps(report, indent=2, sort_keys=True) + '\n')
+
+
+if __name__ == '__main__':
+    main()
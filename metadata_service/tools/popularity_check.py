@@ -0,0 +1,119 @@
+"""
+Recomputes the time decayed popularity of the tables offline from the graph, and compares its popular tables with
+the ones of the current formula, readers * log(total reads) of the tables of more than 10 readers.
+
+READ_BY relations only hold total read counts, hence the decayed popularity is recomputed from snapshots of them
+taken over time: each run can save the read counts of the graph with --save, and replays the saved snapshots given
+with --snapshot, oldest first, then the read counts of the graph now, as the service would have updated them.
+Without snapshots, the decayed popularity is the all time read count.
+
+e.g:
+  python3 -m metadata_service.tools.popularity_check --half-life-days 30 --num-entries 100 \
+      --snapshot read_counts_0401.json --snapshot read_counts_0501.json --save read_counts_0601.json
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple  # noqa: F401
+
+from metadata_service import config, create_app
+from metadata_service.popularity import DecayedPopularity, graph_popularity_scores
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+
+# Table key, number of readers and total read count, as returned by Neo4jProxy.get_table_read_counts
+ReadCounts = List[Tuple[str, int, int]]
+
+
+def recompute_popularity(snapshots: Sequence[Tuple[float, ReadCounts]], *, half_life_sec: float) -> DecayedPopularity:
+    """
+    :param snapshots: time and read counts of the tables, oldest first
+    """
+    popularity = DecayedPopularity(half_life_sec=half_life_sec, now=snapshots[0][0] if snapshots else None)
+    for at, read_counts in snapshots:
+        popularity.update_read_counts([table_key for table_key, _, _ in read_counts],
+                                      [total_reads for _, _, total_reads in read_counts],
+                                      at=at)
+    return popularity
+
+
+def graph_popular_tables(read_counts: ReadCounts, num_entries: int) -> List[str]:
+    """
+    :return: popular tables of Neo4jProxy._get_popular_tables_uris
+    """
+    scores = graph_popularity_scores([readers for _, readers, _ in read_counts],
+                                     [total_reads for _, _, total_reads in read_counts])
+    ranked = sorted(range(len(read_counts)), key=lambda i: -scores[i])
+    return [read_counts[i][0] for i in ranked[:num_entries] if scores[i] > 0]
+
+
+def compare_popular_tables(decayed: List[str], graph: List[str]) -> Dict[str, Any]:
+    """
+    :return: report of the tables popular by both, and by one of them only with their rank
+    """
+    graph_ranks = {table_key: rank for rank, table_key in enumerate(graph)}
+    decayed_ranks = {table_key: rank for rank, table_key in enumerate(decayed)}
+    return {
+        'num_decayed': len(decayed),
+        'num_graph': len(graph),
+        'num_both': len(graph_ranks.keys() & decayed_ranks.keys()),
+        'decayed_only': [{'table': table_key, 'rank': rank} for table_key, rank in decayed_ranks.items()
+                         if table_key not in graph_ranks],
+        'graph_only': [{'table': table_key, 'rank': rank} for table_key, rank in graph_ranks.items()
+                       if table_key not in decayed_ranks],
+    }
+
+
+def load_snapshot(path: str) -> Tuple[float, ReadCounts]:
+    with open(path) as f:
+        snapshot = json.load(f)
+    return snapshot['time'], [tuple(row) for row in snapshot['read_counts']]  # type: ignore
+
+
+def save_snapshot(path: str, at: float, read_counts: ReadCounts) -> None:
+    with open(path, 'w') as f:
+        json.dump({'time': at, 'read_counts': read_counts}, f)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Compare the decayed popularity of the tables with the current one')
+    parser.add_argument('--config', default=os.getenv('METADATA_SVC_CONFIG_MODULE_CLASS')
+                        or 'metadata_service.config.LocalConfig',
+                        help='Config module class that points to the graph')
+    parser.add_argument('--half-life-days', type=float, default=30, help='Half life of the reads')
+    parser.add_argument('--num-entries', type=int, default=100, help='Number of popular tables compared')
+    parser.add_argument('--snapshot', action='append', default=[],
+                        help='Read counts saved by a previous run with --save, oldest first. Can be repeated')
+    parser.add_argument('--save', default='', help='Path to save the read counts of the graph to')
+    parser.add_argument('--output', default='-', help='Path of JSON report. Defaults to stdout')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] =None) -> None:
+    args = _parse_args(argv)
+    app = create_app(config_module_class=args.config)
+    with app.app_context():
+        proxy = Neo4jProxy(host=app.config[config.PROXY_HOST],
+                           port=app.config[config.PROXY_PORT],
+                           user=app.config[config.PROXY_USER],
+                           password=app.config[config.PROXY_PASSWORD])
+        now = time.time()
+        read_counts = proxy.get_table_read_counts()
+
+    if args.save:
+        save_snapshot(args.save, now, read_counts)
+    snapshots = [load_snapshot(path) for path in args.snapshot] + [(now, read_counts)]
+    popularity = recompute_popularity(snapshots, half_life_sec=args.half_life_days * 24 * 60 * 60)
+    report = compare_popular_tables(popularity.top(args.num_entries),
+                                    graph_popular_tables(read_counts, args.num_entries))
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
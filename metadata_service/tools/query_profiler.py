@@ -0,0 +1,196 @@
+"""
+Runs every read query issued by Neo4jProxy with Cypher PROFILE and writes a JSON report.
+
+The queries are collected by calling the proxy methods with representative parameters against the configured
+graph. Each statement that goes through Neo4jProxy._execute_cypher_query is executed once more prefixed with
+PROFILE, and the plan is reduced to db hits, rows and the operators used. The report is written with sorted keys
+so that two reports (e.g. from two releases) can be diffed directly.
+
+e.g:
+  python3 -m metadata_service.tools.query_profiler --table-uri 'hive://gold.core/fact_rides' \
+      --user-id 'tester@lyft.com' --output profile.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple  # noqa: F401
+
+from metadata_service import config, create_app
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.util import UserResourceRel
+
+LOGGER = logging.getLogger(__name__)
+
+# Operators that touch every node (with a given label) instead of using an index lookup.
+FULL_SCAN_OPERATORS = frozenset(['AllNodesScan', 'NodeByLabelScan'])
+
+
+def _operator_name(operator_type: str) -> str:
+    # Neo4j 4.x suffixes operator with the database name. e.g: NodeByLabelScan@neo4j
+    return operator_type.split('@')[0]
+
+
+def summarize_plan(plan: Any) -> Dict[str, Any]:
+    """
+    Reduces neo4j ProfiledPlan tree into a flat summary.
+    :param plan: ProfiledPlan from the summary of a PROFILE statement
+    :return: dict with db_hits (sum over the tree), rows (rows produced by the root operator),
+    operators (pre-order list of operators) and full_scans (operators that scan all nodes)
+    """
+    db_hits = 0
+    operators = []  # type: List[str]
+    full_scans = []  # type: List[str]
+
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        operator = _operator_name(node.operator_type)
+        operators.append(operator)
+        db_hits += getattr(node, 'db_hits', 0)
+        if operator in FULL_SCAN_OPERATORS:
+            label = node.arguments.get('LabelName', '') if isinstance(node.arguments, dict) else ''
+            full_scans.append('{}{}'.format(operator, label))
+        stack.extend(reversed(node.children))
+
+    return {
+        'db_hits': db_hits,
+        'rows': getattr(plan, 'rows', 0),
+        'operators': operators,
+        'full_scans': full_scans,
+    }
+
+
+class QueryProfiler:
+    """
+    Stands in for Neo4jProxy._execute_cypher_query. Every statement is profiled once per (case, calling method)
+    and then executed as usual so that the proxy method can carry on with real results.
+    """
+    def __init__(self, proxy: Neo4jProxy) -> None:
+        self._proxy = proxy
+        self._execute = proxy._execute_cypher_query
+        self.case = ''
+        self.report = OrderedDict()  # type: Dict[str, Dict[str, Any]]
+
+    def __call__(self, *,
+                 statement: str,
+                 param_dict: Dict[str, Any]) -> Any:
+        caller = sys._getframe(1).f_code.co_name
+        name = '{case}.{caller}'.format(case=self.case, caller=caller)
+        if name not in self.report:
+            self.report[name] = self._profile(statement=statement, param_dict=param_dict)
+        return self._execute(statement=statement, param_dict=param_dict)
+
+    def _profile(self, *,
+                 statement: str,
+                 param_dict: Dict[str, Any]) -> Dict[str, Any]:
+        with self._proxy._driver.session() as session:
+            summary = session.run('PROFILE ' + statement, **param_dict).consume()
+
+        result = summarize_plan(summary.profile)
+        result['statement'] = statement.strip()
+        result['params'] = sorted(param_dict.keys())
+        return result
+
+
+def _get_cases(*,
+               table_uri: str,
+               column_name: str,
+               user_id: str,
+               num_entries: int) -> List[Tuple[str, Callable]]:
+    cases = [
+        ('get_table', lambda p: p.get_table(table_uri=table_uri)),
+        ('get_table_description', lambda p: p.get_table_description(table_uri=table_uri)),
+        ('get_column_description',
+         lambda p: p.get_column_description(table_uri=table_uri, column_name=column_name)),
+        ('get_tags', lambda p: p.get_tags()),
+        ('get_latest_updated_ts', lambda p: p.get_latest_updated_ts()),
+        ('get_popular_tables', lambda p: p.get_popular_tables(num_entries=num_entries)),
+        ('get_user_detail', lambda p: p.get_user_detail(user_id=user_id)),
+        ('export_tables', lambda p: list(islice(p.export_tables(batch_size=num_entries), num_entries))),
+    ]  # type: List[Tuple[str, Callable]]
+
+    def relation_case(relation_type: str) -> Callable:
+        return lambda p: p.get_table_by_user_relation(user_email=user_id,
+                                                      relation_type=getattr(UserResourceRel, relation_type))
+
+    for relation_type in UserResourceRel._fields:
+        cases.append(('get_table_by_user_relation[{}]'.format(relation_type), relation_case(relation_type)))
+    return cases
+
+
+def profile_queries(proxy: Neo4jProxy, *,
+                    table_uri: str,
+                    column_name: str,
+                    user_id: str,
+                    num_entries: int =10) -> Dict[str, Any]:
+    """
+    Profiles all read queries of the proxy.
+    :return: report with a profile per query and an error per case that could not complete
+    """
+    profiler = QueryProfiler(proxy)
+    proxy._execute_cypher_query = profiler
+    errors = OrderedDict()  # type: Dict[str, str]
+    try:
+        for case, call in _get_cases(table_uri=table_uri, column_name=column_name,
+                                     user_id=user_id, num_entries=num_entries):
+            profiler.case = case
+            try:
+                call(proxy)
+            except Exception as e:
+                # Queries issued before the failure are still profiled. Usually it's caused by parameters that
+                # do not exist in the graph.
+                LOGGER.warning('Profiling {} did not complete: {}'.format(case, e))
+                errors[case] = '{}: {}'.format(type(e).__name__, e)
+    finally:
+        del proxy._execute_cypher_query
+
+    return {'queries': profiler.report, 'errors': errors}
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Profile Neo4jProxy queries with Cypher PROFILE')
+    parser.add_argument('--config', default=os.getenv('METADATA_SVC_CONFIG_MODULE_CLASS')
+                        or 'metadata_service.config.LocalConfig',
+                        help='Config module class that points to the graph')
+    parser.add_argument('--table-uri', required=True, help='Table key used as representative parameter')
+    parser.add_argument('--column-name', default='', help='Column name of the table. Defaults to first column')
+    parser.add_argument('--user-id', required=True, help='User key (email) used as representative parameter')
+    parser.add_argument('--num-entries', type=int, default=10, help='Number of popular tables')
+    parser.add_argument('--output', default='-', help='Path of JSON report. Defaults to stdout')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] =None) -> None:
+    args = _parse_args(argv)
+    app = create_app(config_module_class=args.config)
+    with app.app_context():
+        proxy = Neo4jProxy(host=app.config[config.PROXY_HOST],
+                           port=app.config[config.PROXY_PORT],
+                           user=app.config[config.PROXY_USER],
+                           password=app.config[config.PROXY_PASSWORD])
+
+        column_name = args.column_name
+        if not column_name:
+            columns = proxy.get_table(table_uri=args.table_uri).columns
+            column_name = next(iter(columns)).name
+
+        report = profile_queries(proxy,
+                                 table_uri=args.table_uri,
+                                 column_name=column_name,
+                                 user_id=args.user_id,
+                                 num_entries=args.num_entries)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Loads a graph dump into the SQLite database served by SqliteProxy.
+
+The dump is the node and relationship CSV files that amundsen databuilder publishes to Neo4j (Neo4jCsvPublisher).
+Node files have KEY and LABEL columns plus the properties of the node. Relationship files have START_LABEL,
+START_KEY, END_LABEL, END_KEY, TYPE and REVERSE_TYPE columns plus the properties of the relationship.
+Property names may carry a type suffix (e.g. read_count:UNQUOTED), which is dropped.
+
+e.g:
+  python3 -m metadata_service.tools.sqlite_loader --nodes dump/nodes --relationships dump/relationships \
+      --database metadata.db
+"""
+import argparse
+import csv
+import glob
+import logging
+import os
+import sqlite3
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple  # noqa: F401
+
+from metadata_service.proxy.sqlite_proxy import LATEST_UPDATED_TS_KEY, create_schema
+
+LOGGER = logging.getLogger(__name__)
+
+# (start label, relation type, end label) -> list of (start key, end key, relation properties)
+Relations = Dict[Tuple[str, str, str], List[Tuple[str, str, Dict[str, str]]]]
+
+# Relation types that are stored per user and table, and the relation name used by SqliteProxy
+USER_TABLE_RELATIONS = {
+    'OWNER_OF': 'own',
+    'FOLLOW': 'follow',
+    'READ': 'read',
+}
+
+
+def _read_csv_files(path: str) -> Iterator[Dict[str, str]]:
+    files = sorted(glob.glob(os.path.join(path, '*.csv'))) if os.path.isdir(path) else [path]
+    for file_path in files:
+        LOGGER.info('Reading {}'.format(file_path))
+        with open(file_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield {name.split(':')[0]: value for name, value in row.items() if name is not None}
+
+
+def read_nodes(path: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    :param path: directory of node CSV files, or a single file
+    :return: node properties by label and key
+    """
+    nodes = defaultdict(dict)  # type: Dict[str, Dict[str, Dict[str, str]]]
+    for row in _read_csv_files(path):
+        label = row.pop('LABEL')
+        key = row.pop('KEY')
+        nodes[label].setdefault(key, {}).update(row)
+    return nodes
+
+
+def read_relations(path: str) -> Relations:
+    """
+    Relations are indexed in both directions, i.e. with TYPE from start to end and with REVERSE_TYPE from end to
+    start, so that lookups do not depend on the direction used in the dump. Types are upper cased.
+
+    :param path: directory of relationship CSV files, or a single file
+    """
+    relations = defaultdict(list)  # type: Relations
+    for row in _read_csv_files(path):
+        start_label, start_key = row.pop('START_LABEL'), row.pop('START_KEY')
+        end_label, end_key = row.pop('END_LABEL'), row.pop('END_KEY')
+        relation_type, reverse_type = row.pop('TYPE').upper(), row.pop('REVERSE_TYPE', '').upper()
+
+        relations[(start_label, relation_type, end_label)].append((start_key, end_key, row))
+        if reverse_type:
+            relations[(end_label, reverse_type, start_label)].append((end_key, start_key, row))
+    return relations
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    return int(float(value))
+
+
+def _to_bool(value: Optional[str]) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    return 1 if value.lower() in ('true', '1') else 0
+
+
+def _to_map(relations: Relations, relation: Tuple[str, str, str]) -> Dict[str, str]:
+    # start key -> end key, for relations with one end node per start node
+    return {start_key: end_key for start_key, end_key, _ in relations.get(relation, [])}
+
+
+def _split_table_key(table_key: str) -> Tuple[str, str, str, str]:
+    # e.g. hive://gold.core/fact_rides
+    database, _, rest = table_key.partition('://')
+    cluster_schema, _, name = rest.partition('/')
+    cluster, _, schema = cluster_schema.partition('.')
+    return database, cluster, schema, name
+
+
+def load_graph_dump(*,
+                    nodes: Dict[str, Dict[str, Dict[str, str]]],
+                    relations: Relations,
+                    conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Replaces the content of the database with the graph.
+    :return: number of rows inserted per table
+    """
+    create_schema(conn)
+    counts = {}  # type: Dict[str, int]
+
+    def insert(table: str, columns: Tuple[str, ...], rows: Sequence[Tuple]) -> None:
+        conn.execute('DELETE FROM {}'.format(table))
+        conn.executemany('INSERT OR REPLACE INTO {} ({}) VALUES ({})'.format(table, ', '.join(columns),
+                                                                             ', '.join('?' * len(columns))),
+                         rows)
+        counts[table] = len(rows)
+
+    descriptions = nodes.get('Description', {})
+    schema_of = _to_map(relations, ('Table', 'TABLE_OF', 'Schema'))
+    cluster_of = _to_map(relations, ('Schema', 'SCHEMA_OF', 'Cluster'))
+    database_of = _to_map(relations, ('Cluster', 'CLUSTER_OF', 'Database'))
+    description_of = _to_map(relations, ('Table', 'DESCRIPTION', 'Description'))
+    timestamp_of = _to_map(relations, ('Table', 'LAST_UPDATED_AT', 'Timestamp'))
+    source_of = _to_map(relations, ('Table', 'SOURCE', 'Source'))
+    application_of = {table_key: app_key
+                      for app_key, table_key, _ in relations.get(('Application', 'GENERATES', 'Table'), [])}
+
+    applications = nodes.get('Application', {})
+    insert('applications', ('key', 'id', 'name', 'description', 'application_url'),
+           [(key, app.get('id'), app.get('name'), app.get('description'), app.get('application_url'))
+            for key, app in applications.items()])
+
+    timestamps = nodes.get('Timestamp', {})
+    sources = nodes.get('Source', {})
+    table_rows = []
+    for table_key, table in nodes.get('Table', {}).items():
+        database, cluster, schema, name = _split_table_key(table_key)
+        schema_key = schema_of.get(table_key)
+        cluster_key = cluster_of.get(schema_key or '')
+        database_key = database_of.get(cluster_key or '')
+        source = sources.get(source_of.get(table_key) or '', {})
+        table_rows.append((
+            table_key,
+            nodes.get('Database', {}).get(database_key or '', {}).get('name') or database,
+            nodes.get('Cluster', {}).get(cluster_key or '', {}).get('name') or cluster,
+            nodes.get('Schema', {}).get(schema_key or '', {}).get('name') or schema,
+            table.get('name') or name,
+            descriptions.get(description_of.get(table_key) or '', {}).get('description'),
+            _to_bool(table.get('is_view')),
+            _to_int(timestamps.get(timestamp_of.get(table_key) or '', {}).get('last_updated_timestamp')),
+            source.get('source_type'),
+            source.get('source'),
+            application_of.get(table_key),
+            _to_int(table.get('metadata_modified_ts')),
+        ))
+    insert('tables', ('key', 'database', 'cluster', 'schema', 'name', 'description', 'is_view',
+                      'last_updated_timestamp', 'source_type', 'source', 'application_key', 'metadata_modified_ts'),
+           table_rows)
+
+    columns = nodes.get('Column', {})
+    column_description_of = _to_map(relations, ('Column', 'DESCRIPTION', 'Description'))
+    column_rows = []
+    column_names = {}  # type: Dict[str, Tuple[str, str]]
+    for table_key, column_key, _ in relations.get(('Table', 'COLUMN', 'Column'), []):
+        column = columns.get(column_key, {})
+        name = column.get('name') or column_key.rsplit('/', 1)[-1]
+        column_names[column_key] = (table_key, name)
+        column_rows.append((table_key, name, column.get('type'), _to_int(column.get('sort_order')),
+                            descriptions.get(column_description_of.get(column_key) or '', {}).get('description')))
+    insert('columns', ('table_key', 'name', 'col_type', 'sort_order', 'description'), column_rows)
+
+    stats = nodes.get('Stat', {})
+    stat_rows = []
+    for column_key, stat_key, _ in relations.get(('Column', 'STAT', 'Stat'), []):
+        if column_key not in column_names:
+            continue
+        stat = stats.get(stat_key, {})
+        stat_rows.append(column_names[column_key] + (stat.get('stat_name'), stat.get('stat_val'),
+                                                     _to_int(stat.get('start_epoch')),
+                                                     _to_int(stat.get('end_epoch'))))
+    insert('column_stats', ('table_key', 'column_name', 'stat_type', 'stat_val', 'start_epoch', 'end_epoch'),
+           stat_rows)
+
+    watermarks = nodes.get('Watermark', {})
+    insert('watermarks', ('table_key', 'watermark_type', 'partition_key', 'partition_value', 'create_time'),
+           [(table_key, wmk_key.split('/')[-2] if '/' in wmk_key else None,
+             watermarks.get(wmk_key, {}).get('partition_key'),
+             watermarks.get(wmk_key, {}).get('partition_value'),
+             watermarks.get(wmk_key, {}).get('create_time'))
+            for wmk_key, table_key, _ in relations.get(('Watermark', 'BELONG_TO_TABLE', 'Table'), [])])
+
+    insert('tags', ('key', 'tag_type'),
+           [(key, tag.get('tag_type') or 'default') for key, tag in nodes.get('Tag', {}).items()])
+    insert('table_tags', ('table_key', 'tag_key'),
+           [(table_key, tag_key) for table_key, tag_key, _ in relations.get(('Table', 'TAGGED_BY', 'Tag'), [])])
+
+    manager_of = _to_map(relations, ('User', 'MANAGE_BY', 'User'))
+    users = nodes.get('User', {})
+    insert('users', ('email', 'first_name', 'last_name', 'full_name', 'is_active', 'github_username', 'team_name',
+                     'slack_id', 'employee_type', 'manager_email'),
+           [(user.get('email') or key, user.get('first_name'), user.get('last_name'), user.get('full_name'),
+             _to_bool(user.get('is_active')), user.get('github_username'), user.get('team_name'),
+             user.get('slack_id'), user.get('employee_type'), manager_of.get(key))
+            for key, user in users.items()])
+
+    relation_rows = []
+    for relation_type, relation in USER_TABLE_RELATIONS.items():
+        for user_key, table_key, props in relations.get(('User', relation_type, 'Table'), []):
+            relation_rows.append((users.get(user_key, {}).get('email') or user_key, relation, table_key,
+                                  _to_int(props.get('read_count'))))
+    insert('user_table_relations', ('user_email', 'relation', 'table_key', 'read_count'), relation_rows)
+
+    updated_ts = nodes.get('Updatedtimestamp', {}).get(LATEST_UPDATED_TS_KEY)
+    insert('metadata_timestamps', ('key', 'latest_timestamp'),
+           [(LATEST_UPDATED_TS_KEY, _to_int(updated_ts.get('latest_timestmap')))] if updated_ts else [])
+
+    conn.commit()
+    return counts
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Load a graph dump (databuilder CSV files) into SQLite')
+    parser.add_argument('--nodes', required=True, help='Directory of node CSV files')
+    parser.add_argument('--relationships', required=True, help='Directory of relationship CSV files')
+    parser.add_argument('--database', required=True, help='Path of SQLite database file served by SqliteProxy')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] =None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args(argv)
+    conn = sqlite3.connect(args.database)
+    try:
+        counts = load_graph_dump(nodes=read_nodes(args.nodes),
+                                 relations=read_relations(args.relationships),
+                                 conn=conn)
+    finally:
+        conn.close()
+
+    for table, count in sorted(counts.items()):
+        LOGGER.info('Loaded {} rows into {}'.format(count, table))
+
+
+if __name__ == '__main__':
+    main()
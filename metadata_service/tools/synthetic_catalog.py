@@ -0,0 +1,149 @@
+"""
+Generates a synthetic catalog for benchmarks and local development.
+
+The catalog is shaped like the one in the graph: tables with columns and column stats, tags, owners, users with
+managers, read edges with read counts and follow edges. Everything is drawn from a seeded random generator, so the
+same arguments always produce the same catalog.
+"""
+import random
+from typing import Dict, List, Set  # noqa: F401
+
+from metadata_service.entity.table_detail import Application, Column, Reader, Source, \
+    Statistics, Table, Tag, User, Watermark
+from metadata_service.entity.user_detail import User as UserEntity
+
+STAT_TYPES = ('avg', 'max', 'min', 'stddev', 'num_nulls', 'num_distinct', 'row_count', 'median')
+COL_TYPES = ('varchar', 'bigint', 'int', 'double', 'boolean', 'timestamp', 'date', 'array<string>')
+
+
+class SyntheticCatalog:
+    """
+    Catalog data held by InMemoryProxy. Owners and the top readers are also set on the tables themselves.
+    """
+    def __init__(self) -> None:
+        self.tables = {}  # type: Dict[str, Table]
+        self.users = {}  # type: Dict[str, UserEntity]
+        # table key -> user email -> read count
+        self.reads = {}  # type: Dict[str, Dict[str, int]]
+        # user email -> table keys
+        self.follows = {}  # type: Dict[str, Set[str]]
+        self.latest_updated_ts = 0
+
+
+def table_key(*, database: str, cluster: str, schema: str, name: str) -> str:
+    return '{}://{}.{}/{}'.format(database, cluster, schema, name)
+
+
+def top_readers(reads: Dict[str, int], num_readers: int =5) -> List[Reader]:
+    """
+    :return: readers with the most reads first, same as Neo4jProxy
+    """
+    return [Reader(user=User(email=email), read_count=read_count)
+            for email, read_count in sorted(reads.items(), key=lambda item: (-item[1], item[0]))[:num_readers]]
+
+
+def generate_catalog(*,
+                     num_tables: int =1000,
+                     min_columns: int =5,
+                     max_columns: int =50,
+                     stats_per_column: int =2,
+                     num_tags: int =50,
+                     tags_per_table: int =2,
+                     num_users: int =200,
+                     owners_per_table: int =2,
+                     readers_per_table: int =20,
+                     max_read_count: int =1000,
+                     follows_per_user: int =5,
+                     num_schemas: int =20,
+                     description_length: int =200,
+                     seed: int =0) -> SyntheticCatalog:
+    """
+    :param num_tables: number of tables
+    :param min_columns: min number of columns of a table
+    :param max_columns: max number of columns of a table. Column widths are uniformly distributed in between
+    :param stats_per_column: number of stats of each column
+    :param num_tags: number of distinct tags
+    :param tags_per_table: number of tags of each table
+    :param num_users: number of users
+    :param owners_per_table: number of owners of each table
+    :param readers_per_table: number of users with a read edge to each table
+    :param max_read_count: max read count of a read edge
+    :param follows_per_user: number of tables followed by each user
+    :param num_schemas: number of schemas the tables are spread over
+    :param description_length: length of table and column descriptions
+    :param seed: seed of the random generator
+    :return: SyntheticCatalog
+    """
+    rnd = random.Random(seed)
+    catalog = SyntheticCatalog()
+    catalog.latest_updated_ts = 1500000000
+
+    def description(prefix: str) -> str:
+        words = []  # type: List[str]
+        while sum(len(word) + 1 for word in words) < description_length:
+            words.append('{}{}'.format(prefix, rnd.randint(0, 9999)))
+        return ' '.join(words)[:description_length]
+
+    emails = ['user{}@example.com'.format(i) for i in range(num_users)]
+    for i, email in enumerate(emails):
+        catalog.users[email] = UserEntity(email=email,
+                                          first_name='First{}'.format(i),
+                                          last_name='Last{}'.format(i),
+                                          full_name='First{} Last{}'.format(i, i),
+                                          github_username='user{}'.format(i),
+                                          team_name='team{}'.format(i % 20),
+                                          slack_id='U{:08d}'.format(i),
+                                          employee_type='teamMember',
+                                          manager_fullname='First{} Last{}'.format(i // 10, i // 10))
+
+    tags = ['tag{}'.format(i) for i in range(num_tags)]
+    for i in range(num_tables):
+        schema = 'schema{}'.format(i % max(num_schemas, 1))
+        name = 'table{}'.format(i)
+        key = table_key(database='hive', cluster='gold', schema=schema, name=name)
+
+        columns = []
+        for sort_order in range(rnd.randint(min_columns, max_columns)):
+            stats = [Statistics(stat_type=stat_type,
+                                stat_val=str(rnd.randint(0, 1000000)),
+                                start_epoch=1500000000,
+                                end_epoch=1500086400)
+                     for stat_type in rnd.sample(STAT_TYPES, min(stats_per_column, len(STAT_TYPES)))]
+            columns.append(Column(name='col{}'.format(sort_order),
+                                  description=description('col'),
+                                  col_type=rnd.choice(COL_TYPES),
+                                  sort_order=sort_order,
+                                  stats=stats))
+
+        reads = {email: rnd.randint(1, max_read_count)
+                 for email in rnd.sample(emails, min(readers_per_table, num_users))}
+        catalog.reads[key] = reads
+
+        catalog.tables[key] = Table(
+            database='hive',
+            cluster='gold',
+            schema=schema,
+            name=name,
+            tags=[Tag(tag_name=tag, tag_type='default')
+                  for tag in rnd.sample(tags, min(tags_per_table, num_tags))],
+            table_readers=top_readers(reads),
+            description=description('desc'),
+            columns=columns,
+            owners=[User(email=email) for email in rnd.sample(emails, min(owners_per_table, num_users))],
+            watermarks=[Watermark(watermark_type='high_watermark', partition_key='ds',
+                                  partition_value='2019-01-01', create_time='2019-01-01 00:00:00'),
+                        Watermark(watermark_type='low_watermark', partition_key='ds',
+                                  partition_value='2018-01-01', create_time='2019-01-01 00:00:00')],
+            table_writer=Application(application_url='https://airflow.example.com/admin/airflow/tree?dag_id=dag',
+                                     description='Airflow DAG generating {}'.format(name),
+                                     name='Airflow',
+                                     id='dag/task{}'.format(i)),
+            last_updated_timestamp=catalog.latest_updated_ts - rnd.randint(0, 86400 * 30),
+            source=Source(source_type='github', source='https://github.com/example/etl/{}.py'.format(name)),
+            is_view=rnd.random() < 0.1)
+
+    table_keys = list(catalog.tables.keys())
+    for email in emails:
+        catalog.follows[email] = set(rnd.sample(table_keys, min(follows_per_user, num_tables)))
+
+    return catalog
@@ -0,0 +1,60 @@
+"""
+Hooks called after each successful write of the API, so that what the process keeps about the catalog (the
+response cache, the table filter) follows the writes of this service.
+
+A write is described by the route arguments of the request: the table and the user it changed, and whether it
+changed the tags. Writes of the ingestion (databuilder) don't go through this service and aren't seen here.
+"""
+import logging
+from typing import Callable, List, NamedTuple, Optional  # noqa: F401
+
+from flask import Flask, Response, request
+
+LOGGER = logging.getLogger(__name__)
+
+# Route arguments of the table and user routes
+TABLE_URI_ARGUMENT = 'table_uri'
+USER_ID_ARGUMENT = 'user_id'
+
+Write = NamedTuple('Write', [('table_uri', Optional[str]),
+                             ('user_id', Optional[str]),
+                             ('tags_changed', bool)])
+
+_READ_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Hooks of the process. Kept across create_app calls, registering a hook twice has no effect
+_hooks = []  # type: List[Callable[[Write], None]]
+
+
+def add_write_hook(hook: Callable[[Write], None]) -> None:
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_write_hook(hook: Callable[[Write], None]) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def init_write_hooks(app: Flask) -> None:
+    """
+    Registers the request hook calling the write hooks after each successful write
+    """
+    app.after_request(_call_write_hooks)
+
+
+def _call_write_hooks(response: Response) -> Response:
+    if (request.method in _READ_METHODS or not 200 <= response.status_code < 300 or
+            request.url_rule is None or not _hooks):
+        return response
+
+    view_args = request.view_args or {}
+    write = Write(table_uri=view_args.get(TABLE_URI_ARGUMENT),
+                  user_id=view_args.get(USER_ID_ARGUMENT),
+                  tags_changed='/tag' in request.url_rule.rule)
+    for hook in list(_hooks):
+        try:
+            hook(write)
+        except Exception:
+            LOGGER.exception('Write hook {} failed on {}'.format(hook, write))
+    return response
@@ -31,8 +31,16 @@ setup(
         # and less than 2.x installed.
         'Flask-RESTful>=0.3.6',
         'neo4j-driver==1.6.0',
-        'beaker>=1.10.0',
         'statsd>=3.2.1',
         'atlasclient>=0.1.6'
-    ]
+    ],
+    extras_require={
+        # Brotli compression of the responses, for the clients accepting it
+        'brotli': ['brotli>=1.0'],
+        # Production server, see metadata_service.server
+        'gunicorn': ['gunicorn>=19.9.0'],
+        'gevent': ['gunicorn>=19.9.0', 'gevent>=1.4.0'],
+        # Time decayed popularity of the tables, see metadata_service.popularity
+        'popularity': ['numpy>=1.16'],
+    }
 )
@@ -0,0 +1,109 @@
+import json
+from typing import Any, Dict, Iterator, List, Tuple  # noqa: F401
+
+import pytest
+from flask import Flask
+
+import metadata_service.proxy
+from metadata_service import config, create_app
+
+pytest.importorskip('pytest_benchmark')
+
+# (benchmark name, latency percentiles and throughput) of each endpoint, printed at the end of the session
+_ENDPOINT_RESULTS = []  # type: List[Tuple[str, Dict[str, float]]]
+
+
+def pytest_addoption(parser: Any) -> None:
+    group = parser.getgroup('metadata benchmark')
+    group.addoption('--catalog-tables', type=int, default=1000, help='Number of tables of the synthetic catalog')
+    group.addoption('--catalog-max-columns', type=int, default=50, help='Max number of columns per table')
+    group.addoption('--proxy-latency-ms', type=float, default=0.0, help='Latency added to every proxy call')
+    group.addoption('--endpoint-rounds', type=int, default=200, help='Number of requests measured per endpoint')
+    group.addoption('--neo4j-record', default='',
+                    help='Benchmark Neo4jProxy against the configured graph and record its statements to this file')
+    group.addoption('--neo4j-replay', default='',
+                    help='Benchmark Neo4jProxy replaying the statements recorded in this file')
+    group.addoption('--route-arguments', default='{}',
+                    help='JSON object overriding the route arguments, e.g. table_uri existing in the graph')
+
+
+@pytest.fixture(scope='session')
+def catalog_options(request: Any) -> Dict[str, Any]:
+    return {
+        'num_tables': request.config.getoption('--catalog-tables'),
+        'max_columns': request.config.getoption('--catalog-max-columns'),
+    }
+
+
+@pytest.fixture(scope='session')
+def app(request: Any, catalog_options: Dict[str, Any]) -> Iterator[Flask]:
+    app = create_app(config_module_class='metadata_service.config.LocalConfig')
+    neo4j_record = request.config.getoption('--neo4j-record')
+    neo4j_replay = request.config.getoption('--neo4j-replay')
+    if neo4j_record or neo4j_replay:
+        app.config[config.PROXY_CLIENT] = config.PROXY_CLIENTS['NEO4J']
+        app.config[config.PROXY_CLIENT_KWARGS] = {'record_path': neo4j_record, 'replay_path': neo4j_replay}
+    else:
+        app.config[config.PROXY_CLIENT] = 'metadata_service.proxy.in_memory_proxy.InMemoryProxy'
+        app.config[config.PROXY_CLIENT_KWARGS] = {
+            'synthetic': catalog_options,
+            'latency_ms': request.config.getoption('--proxy-latency-ms'),
+        }
+
+    # Proxy client is a process wide singleton. Make sure it is created from the config above.
+    metadata_service.proxy._proxy_client = None
+    with app.app_context():
+        metadata_service.proxy.get_proxy_client()
+    yield app
+    metadata_service.proxy._proxy_client = None
+
+
+@pytest.fixture(scope='session')
+def route_arguments_override(request: Any) -> Dict[str, str]:
+    return json.loads(request.config.getoption('--route-arguments'))
+
+
+def _percentile(sorted_data: List[float], percent: float) -> float:
+    index = min(len(sorted_data) - 1, int(round(percent / 100.0 * (len(sorted_data) - 1))))
+    return sorted_data[index]
+
+
+@pytest.fixture
+def endpoint_benchmark(request: Any, benchmark: Any) -> Iterator[Any]:
+    """
+    Runs the benchmark one request per round, so that the round times are the latencies of the requests,
+    and adds latency percentiles and throughput to extra_info (saved with --benchmark-json / --benchmark-autosave).
+    """
+    rounds = request.config.getoption('--endpoint-rounds')
+
+    def run(func: Any) -> Any:
+        return benchmark.pedantic(func, rounds=rounds, iterations=1, warmup_rounds=min(10, rounds))
+
+    yield run
+
+    stats = getattr(benchmark.stats, 'stats', None)
+    if not stats or not stats.data:
+        # --benchmark-disable
+        return
+    data = sorted(stats.data)
+    result = {
+        'p50_ms': _percentile(data, 50) * 1000,
+        'p90_ms': _percentile(data, 90) * 1000,
+        'p99_ms': _percentile(data, 99) * 1000,
+        'max_ms': data[-1] * 1000,
+        'requests_per_sec': len(data) / sum(data),
+    }
+    benchmark.extra_info.update(result)
+    _ENDPOINT_RESULTS.append((benchmark.name, result))
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    if not _ENDPOINT_RESULTS:
+        return
+    terminalreporter.section('endpoint latency')
+    terminalreporter.write_line('{:<90} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'endpoint', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms'))
+    for name, result in sorted(_ENDPOINT_RESULTS):
+        terminalreporter.write_line('{:<90} {:>10.1f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f}'.format(
+            name, result['requests_per_sec'], result['p50_ms'], result['p90_ms'], result['p99_ms'],
+            result['max_ms']))
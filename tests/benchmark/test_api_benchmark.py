@@ -0,0 +1,94 @@
+import inspect
+from typing import Any, Dict, List  # noqa: F401
+
+import pytest
+from flask import Flask
+
+from metadata_service import create_app
+from metadata_service.tools.synthetic_catalog import table_key
+
+# Values of the route arguments. They exist in any synthetic catalog with at least two tables and users.
+ROUTE_ARGUMENTS = {
+    'table_uri': table_key(database='hive', cluster='gold', schema='schema1', name='table1'),
+    'column_name': 'col0',
+    'description_val': 'benchmark description',
+    'tag': 'benchmark_tag',
+    'owner': 'user1@example.com',
+    'user_id': 'user1@example.com',
+    'resource_type': 'table',
+}
+
+QUERY_STRINGS = {
+    '/changes': {'since': 0},
+}
+
+IGNORED_METHODS = frozenset(['HEAD', 'OPTIONS'])
+
+# Registered routes without any method that accepts their arguments. They only answer 405 / 500.
+UNSERVED_ROUTES = frozenset([
+    '/table/<path:table_uri>/tag',
+    '/user/<path:user_id>/read/<resource_type>/<path:table_uri>',
+])
+
+# Routes of opt-in debugging and monitoring features, not part of the API
+DEBUG_ROUTE_PREFIX = '/debug/'
+MONITORING_ROUTES = frozenset(['/metrics'])
+
+
+def _is_api_rule(rule: Any) -> bool:
+    return (rule.endpoint != 'static' and not rule.rule.startswith(DEBUG_ROUTE_PREFIX)
+            and rule.rule not in MONITORING_ROUTES)
+
+
+def _route_cases() -> List[Any]:
+    """
+    Every (rule, method) registered in create_app that can be served, i.e. the view accepts exactly the arguments
+    of the rule. Flask-RESTful registers all methods of a resource on all of its rules.
+    """
+    app = create_app(config_module_class='metadata_service.config.LocalConfig')
+    cases = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if not _is_api_rule(rule):
+            continue
+        view_class = getattr(app.view_functions[rule.endpoint], 'view_class', None)
+        for method in sorted(rule.methods - IGNORED_METHODS):
+            if view_class is not None:
+                params = list(inspect.signature(getattr(view_class, method.lower())).parameters)[1:]
+                if set(params) != rule.arguments:
+                    continue
+            cases.append(pytest.param(rule.rule, method, id='{} {}'.format(method, rule.rule)))
+    return cases
+
+
+ROUTE_CASES = _route_cases()
+
+
+def test_all_routes_covered() -> None:
+    app = create_app(config_module_class='metadata_service.config.LocalConfig')
+    routes = {rule.rule for rule in app.url_map.iter_rules() if _is_api_rule(rule)}
+
+    assert {case.values[0] for case in ROUTE_CASES} == routes - UNSERVED_ROUTES
+
+
+@pytest.mark.parametrize('rule_path,method', ROUTE_CASES)
+def test_endpoint(app: Flask,
+                  endpoint_benchmark: Any,
+                  route_arguments_override: Dict[str, str],
+                  rule_path: str,
+                  method: str) -> None:
+    rule = next(rule for rule in app.url_map.iter_rules() if rule.rule == rule_path)
+    route_arguments = dict(ROUTE_ARGUMENTS, **route_arguments_override)
+    _, path = rule.build({argument: route_arguments[argument] for argument in rule.arguments},
+                         append_unknown=False)
+    query_string = QUERY_STRINGS.get(rule_path, {})  # type: Dict[str, Any]
+    client = app.test_client()
+
+    def request() -> Any:
+        response = client.open(path, method=method, query_string=query_string)
+        # Streamed responses are consumed as part of the request
+        response.get_data()
+        return response
+
+    response = endpoint_benchmark(request)
+
+    assert response.status_code < 400, response.get_data(as_text=True)
@@ -0,0 +1,38 @@
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from metadata_service.tools.synthetic_catalog import SyntheticCatalog, generate_catalog
+
+# 2000 tables of 50 columns
+CATALOG_TABLES = 2000
+COLUMNS_PER_TABLE = 50
+
+
+def _generate() -> SyntheticCatalog:
+    # Short descriptions, so that memory is dominated by the entities rather than the text
+    return generate_catalog(num_tables=CATALOG_TABLES, min_columns=COLUMNS_PER_TABLE, max_columns=COLUMNS_PER_TABLE,
+                            description_length=20)
+
+
+@pytest.mark.benchmark(group='entity_memory')
+def test_catalog_memory(benchmark: Any) -> None:
+    """
+    Memory held by a catalog of 100k columns, in extra_info (saved with --benchmark-json / --benchmark-autosave)
+    """
+    tracemalloc.start()
+    try:
+        catalog = _generate()
+        catalog_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    num_columns = sum(len(table.columns) for table in catalog.tables.values())
+    benchmark.extra_info['catalog_bytes'] = catalog_bytes
+    benchmark.extra_info['bytes_per_column'] = catalog_bytes / num_columns
+    print('\n{} columns: {:.1f} MiB, {:.0f} bytes per column'.format(
+        num_columns, catalog_bytes / 2 ** 20, catalog_bytes / num_columns))
+
+    assert num_columns == CATALOG_TABLES * COLUMNS_PER_TABLE
+    benchmark.pedantic(_generate, rounds=1, iterations=1)
@@ -0,0 +1,38 @@
+import random
+from typing import Any
+
+import pytest
+
+from metadata_service.popularity import DecayedPopularity
+
+NUM_TABLES = 100000
+
+pytest.importorskip('numpy')
+
+
+@pytest.fixture(scope='module')
+def popularity() -> DecayedPopularity:
+    rng = random.Random(1)
+    popularity = DecayedPopularity(half_life_sec=30 * 24 * 60 * 60)
+    popularity.update_read_counts(['table{}'.format(i) for i in range(NUM_TABLES)],
+                                  [rng.randint(0, 10000) for _ in range(NUM_TABLES)])
+    return popularity
+
+
+@pytest.mark.benchmark(group='popularity')
+def test_top(benchmark: Any, popularity: DecayedPopularity) -> None:
+    popularity.top(100)
+
+    assert len(benchmark(lambda: popularity.top(100))) == 100
+
+
+@pytest.mark.benchmark(group='popularity')
+def test_update_and_top(benchmark: Any, popularity: DecayedPopularity) -> None:
+    table_keys = ['table{}'.format(i) for i in range(0, NUM_TABLES, 10)]
+    read_counts = [20000] * len(table_keys)
+
+    def update_and_top() -> Any:
+        popularity.update_read_counts(table_keys, read_counts)
+        return popularity.top(100)
+
+    assert len(benchmark(update_and_top)) == 100
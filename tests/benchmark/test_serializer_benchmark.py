@@ -0,0 +1,31 @@
+import json
+from typing import Any
+
+import flask_restful
+import pytest
+
+from metadata_service.api.table import table_detail_fields
+from metadata_service.entity.table_detail import Table
+from metadata_service.serializer import marshal
+from metadata_service.tools.synthetic_catalog import generate_catalog
+
+WIDE_TABLE_COLUMNS = 5000
+
+
+@pytest.fixture(scope='module')
+def wide_table() -> Table:
+    catalog = generate_catalog(num_tables=1, min_columns=WIDE_TABLE_COLUMNS, max_columns=WIDE_TABLE_COLUMNS)
+    table, = catalog.tables.values()
+    return table
+
+
+@pytest.mark.benchmark(group='marshal_wide_table')
+def test_flask_restful_marshal(benchmark: Any, wide_table: Table) -> None:
+    benchmark(lambda: json.dumps(flask_restful.marshal(wide_table, table_detail_fields)))
+
+
+@pytest.mark.benchmark(group='marshal_wide_table')
+def test_compiled_serializer(benchmark: Any, wide_table: Table) -> None:
+    body = benchmark(lambda: json.dumps(marshal(wide_table, table_detail_fields)))
+
+    assert body == json.dumps(flask_restful.marshal(wide_table, table_detail_fields))
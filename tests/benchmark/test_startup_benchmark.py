@@ -0,0 +1,30 @@
+from typing import Any, List  # noqa: F401
+
+import pytest
+
+from metadata_service.tools.import_time import ImportTime  # noqa: F401
+from metadata_service.tools.import_time import CREATE_APP_STATEMENT, measure_import_times, total_us
+
+
+@pytest.mark.benchmark(group='startup')
+def test_create_app_import_time(benchmark: Any) -> None:
+    """
+    Import time of a fresh interpreter creating the app, measured by python -X importtime. Total and number of
+    modules imported are in extra_info (saved with --benchmark-json / --benchmark-autosave). The proxy client isn't
+    created, so that neither its backend nor its connection are measured
+    """
+    results = []  # type: List[List[ImportTime]]
+
+    def measure() -> None:
+        results.append(measure_import_times(CREATE_APP_STATEMENT, env={'PROXY_EAGER_INIT': 'false'}))
+
+    benchmark.pedantic(measure, rounds=3, iterations=1)
+
+    # Least noisy run
+    import_times = min(results, key=total_us)
+    benchmark.extra_info['import_ms'] = total_us(import_times) / 1000
+    benchmark.extra_info['modules'] = len(import_times)
+    print('\ncreate_app: {:.1f} ms importing {} modules'.format(total_us(import_times) / 1000, len(import_times)))
+
+    modules = {import_time.module for import_time in import_times}
+    assert not modules & {'neo4j', 'atlasclient'}
@@ -0,0 +1,72 @@
+from typing import Any, Callable, Iterator  # noqa: F401
+
+import pytest
+from flask import Flask
+from mock import patch
+from statsd import StatsClient
+
+from metadata_service import config, create_app
+from metadata_service.proxy import statsd_utilities
+from metadata_service.proxy.statsd_utilities import init_statsd, timer_with_counter
+
+# Calls per round, so that the time of a call dominates the time of the benchmark loop
+CALLS = 1000
+
+
+def _undecorated() -> int:
+    return 1
+
+
+_decorated = timer_with_counter(_undecorated)
+
+
+@pytest.fixture
+def statsd_app() -> Iterator[Flask]:
+    app = create_app(config_module_class='metadata_service.config.LocalConfig')
+    app.config[config.SERVER_TIMING_ENABLED] = False
+    yield app
+    statsd_utilities._statsd_client = None
+
+
+def _calls(func: Callable[[], int]) -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(CALLS):
+            func()
+    return run
+
+
+@pytest.mark.benchmark(group='timer_with_counter')
+def test_undecorated(benchmark: Any) -> None:
+    benchmark(_calls(_undecorated))
+
+
+@pytest.mark.benchmark(group='timer_with_counter')
+def test_statsd_off(benchmark: Any, statsd_app: Flask) -> None:
+    init_statsd(statsd_app)
+    with statsd_app.test_request_context('/'):
+        benchmark(_calls(_decorated))
+
+
+@pytest.mark.benchmark(group='timer_with_counter')
+def test_statsd_on_request_pipeline(benchmark: Any, statsd_app: Flask) -> None:
+    statsd_app.config[config.IS_STATSD_ON] = True
+    init_statsd(statsd_app)
+
+    def run() -> None:
+        # One request: metrics are buffered and flushed at teardown
+        with statsd_app.test_request_context('/'):
+            statsd_app.preprocess_request()
+            _calls(_decorated)()
+            statsd_app.do_teardown_request()
+
+    with patch.object(StatsClient, '_send'):
+        benchmark(run)
+
+
+@pytest.mark.benchmark(group='timer_with_counter')
+def test_statsd_on_outside_request(benchmark: Any, statsd_app: Flask) -> None:
+    statsd_app.config[config.IS_STATSD_ON] = True
+    init_statsd(statsd_app)
+
+    with patch.object(StatsClient, '_send'):
+        benchmark(_calls(_decorated))
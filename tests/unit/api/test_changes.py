@@ -0,0 +1,36 @@
+import unittest
+from http import HTTPStatus
+
+from mock import patch
+
+from metadata_service import create_app
+
+
+class TableChangesAPITest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+
+    def test_get_changes(self) -> None:
+        with patch('metadata_service.api.changes.get_proxy_client') as mock_proxy:
+            mock_proxy.return_value.get_tables_modified_since.return_value = (['db://clstr.sch/foo'],
+                                                                              'db://clstr.sch/foo')
+
+            response = self.app.test_client().get('/changes?since=1550000000&cursor=db://clstr.sch/bar&limit=1')
+
+            mock_proxy.return_value.get_tables_modified_since.assert_called_with(since=1550000000,
+                                                                                 cursor='db://clstr.sch/bar',
+                                                                                 num_entries=1)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(response.get_json(), {'table_uris': ['db://clstr.sch/foo'],
+                                                   'next_cursor': 'db://clstr.sch/foo'})
+
+    def test_get_changes_without_since(self) -> None:
+        with patch('metadata_service.api.changes.get_proxy_client') as mock_proxy:
+            response = self.app.test_client().get('/changes')
+
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+            mock_proxy.return_value.get_tables_modified_since.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
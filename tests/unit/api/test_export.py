@@ -0,0 +1,50 @@
+import json
+import unittest
+from http import HTTPStatus
+
+from mock import patch
+
+from metadata_service import create_app
+from metadata_service.entity.table_detail import Tag, User
+from metadata_service.entity.table_summary import TableSummary
+
+
+class TableExportAPITest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app.config['EXPORT_BATCH_SIZE'] = 2
+
+    def test_export_tables(self) -> None:
+        tables = [
+            TableSummary(key='hive://gold.sch/bar', database='hive', cluster='gold', schema='sch', name='bar',
+                         description='bar description', tags=[Tag(tag_name='pii', tag_type='default')],
+                         owners=[User(email='tester@lyft.com')]),
+            TableSummary(key='hive://gold.sch/foo', database='hive', cluster='gold', schema='sch', name='foo'),
+        ]
+
+        with patch('metadata_service.api.export.get_proxy_client') as mock_proxy:
+            mock_proxy.return_value.export_tables.return_value = iter(tables)
+
+            response = self.app.test_client().get('/export/tables')
+
+            mock_proxy.return_value.export_tables.assert_called_with(batch_size=2)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(response.mimetype, 'application/x-ndjson')
+
+            lines = response.get_data(as_text=True).splitlines()
+            self.assertEqual(len(lines), 2)
+
+            first = json.loads(lines[0])
+            self.assertEqual(first['key'], 'hive://gold.sch/bar')
+            self.assertEqual(first['table_name'], 'bar')
+            self.assertEqual(first['table_description'], 'bar description')
+            self.assertEqual(first['tags'], [{'tag_type': 'default', 'tag_name': 'pii'}])
+            self.assertEqual(first['owners'], [{'email': 'tester@lyft.com', 'first_name': None, 'last_name': None}])
+
+            second = json.loads(lines[1])
+            self.assertIsNone(second['table_description'])
+            self.assertEqual(second['tags'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
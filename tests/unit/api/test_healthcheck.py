@@ -0,0 +1,83 @@
+import unittest
+from http import HTTPStatus
+
+from mock import patch
+
+import metadata_service.proxy
+from metadata_service import config, create_app
+from metadata_service.api import healthcheck
+from metadata_service.proxy.in_memory_proxy import InMemoryProxy
+
+IN_MEMORY_PROXY = 'metadata_service.proxy.in_memory_proxy.InMemoryProxy'
+IN_MEMORY_PROXY_KWARGS = {'synthetic': {'num_tables': 1}}
+
+
+class ReadinessTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metadata_service.proxy._proxy_client = None
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app.config[config.PROXY_CLIENT] = IN_MEMORY_PROXY
+        self.app.config[config.PROXY_CLIENT_KWARGS] = IN_MEMORY_PROXY_KWARGS
+        metadata_service.proxy._proxy_client = None
+        healthcheck._readiness_check.reset()
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+        healthcheck._readiness_check.reset()
+
+    def test_ready(self) -> None:
+        response = self.client.get('/readiness')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.get_json(), {'status': 'ready'})
+
+    def test_unavailable(self) -> None:
+        with patch.object(InMemoryProxy, 'check_connectivity', side_effect=ConnectionError('refused')):
+            response = self.client.get('/readiness')
+
+        self.assertEqual(response.status_code, HTTPStatus.SERVICE_UNAVAILABLE)
+        self.assertEqual(response.get_json(), {'status': 'unavailable', 'error': 'ConnectionError: refused'})
+
+    def test_cached(self) -> None:
+        with patch.object(InMemoryProxy, 'check_connectivity') as mock_check:
+            for _ in range(3):
+                self.assertEqual(self.client.get('/readiness').status_code, HTTPStatus.OK)
+            self.assertEqual(mock_check.call_count, 1)
+
+            # Checked again once the result is older than READINESS_CACHE_SEC
+            self.app.config[config.READINESS_CACHE_SEC] = 0
+            mock_check.side_effect = ConnectionError('refused')
+            self.assertEqual(self.client.get('/readiness').status_code, HTTPStatus.SERVICE_UNAVAILABLE)
+            self.assertEqual(mock_check.call_count, 2)
+
+    def test_eager_init(self) -> None:
+        with patch.object(config.LocalConfig, config.PROXY_CLIENT, IN_MEMORY_PROXY), \
+                patch.object(config.LocalConfig, config.PROXY_CLIENT_KWARGS, IN_MEMORY_PROXY_KWARGS), \
+                patch.object(InMemoryProxy, 'check_connectivity') as mock_check:
+            create_app(config_module_class='metadata_service.config.LocalConfig')
+
+        self.assertIsInstance(metadata_service.proxy._proxy_client, InMemoryProxy)
+        mock_check.assert_called_once_with()
+
+    def test_eager_init_failure(self) -> None:
+        with patch.object(config.LocalConfig, config.PROXY_CLIENT, IN_MEMORY_PROXY), \
+                patch.object(config.LocalConfig, config.PROXY_CLIENT_KWARGS, IN_MEMORY_PROXY_KWARGS), \
+                patch.object(InMemoryProxy, '__init__', side_effect=ConnectionError('refused')):
+            # App starts anyway, the client is created on the first request
+            create_app(config_module_class='metadata_service.config.LocalConfig')
+
+        self.assertIsNone(metadata_service.proxy._proxy_client)
+
+    def test_eager_init_disabled(self) -> None:
+        with patch.object(config.LocalConfig, config.PROXY_CLIENT, IN_MEMORY_PROXY), \
+                patch.object(config.LocalConfig, config.PROXY_CLIENT_KWARGS, IN_MEMORY_PROXY_KWARGS), \
+                patch.object(config.LocalConfig, config.PROXY_EAGER_INIT, False):
+            create_app(config_module_class='metadata_service.config.LocalConfig')
+
+        self.assertIsNone(metadata_service.proxy._proxy_client)
+
+
+if __name__ == '__main__':
+    unittest.main()
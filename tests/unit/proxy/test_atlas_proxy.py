@@ -5,8 +5,10 @@ from mock import patch, MagicMock
 from metadata_service import create_app
 from metadata_service.entity.popular_table import PopularTable
 from metadata_service.entity.table_detail import (Table, User, Tag, Column)
+from metadata_service.entity.table_summary import TableSummary
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
+from metadata_service.proxy.atlas_proxy import AtlasProxy
 
 
 class TestAtlasProxy(unittest.TestCase):
@@ -16,9 +18,6 @@ class TestAtlasProxy(unittest.TestCase):
         self.app_context.push()
 
         with patch('metadata_service.proxy.atlas_proxy.Atlas'):
-            # Importing here to make app context work before
-            # importing `current_app` indirectly using the AtlasProxy
-            from metadata_service.proxy.atlas_proxy import AtlasProxy
             self.proxy = AtlasProxy(host='DOES_NOT_MATTER', port=0000)
             self.proxy._driver = MagicMock()
 
@@ -170,7 +169,7 @@ class TestAtlasProxy(unittest.TestCase):
                       'cluster': self.cluster,
                       'db': self.db,
                       'name': self.name}
-        response = self.proxy.get_table(table_id=self.table_id, table_info=table_info)
+        response = self.proxy.get_table(table_uri=self.table_id, table_info=table_info)
 
         classif_name = self.classification_entity['classifications'][0]['typeName']
         ent_attrs = self.entity1['attributes']
@@ -191,6 +190,15 @@ class TestAtlasProxy(unittest.TestCase):
                          last_updated_timestamp=self.entity1['updateTime'])
         self.assertEqual(str(expected), str(response))
 
+    def test_get_table_without_table_info(self):
+        self._mock_get_table_entity()
+        response = self.proxy.get_table(table_uri=self.table_id)
+
+        self.assertEqual(response.database, self.entity_type)
+        self.assertEqual(response.schema, self.db)
+        self.assertEqual(response.name, self.entity1['attributes']['qualifiedName'])
+        self.assertEqual(len(response.columns), 1)
+
     def test_get_table_not_found(self):
         table_info = {'entity': self.entity_type,
                       'cluster': self.cluster,
@@ -198,7 +206,7 @@ class TestAtlasProxy(unittest.TestCase):
                       'name': self.name}
         with self.assertRaises(NotFoundException):
             self.proxy._driver.entity_guid = MagicMock(side_effect=Exception('Boom!'))
-            self.proxy.get_table(table_id=self.table_id, table_info=table_info)
+            self.proxy.get_table(table_uri=self.table_id, table_info=table_info)
 
     def test_get_table_missing_info(self):
         with self.assertRaises(BadRequest):
@@ -208,7 +216,7 @@ class TestAtlasProxy(unittest.TestCase):
             entity_guid_response.entity = local_entity
 
             self.proxy._driver.entity_guid = MagicMock(return_value=entity_guid_response)
-            self.proxy.get_table(table_id=self.table_id, table_info={})
+            self.proxy.get_table(table_uri=self.table_id, table_info={})
 
     def test_get_popular_tables(self):
         entity1 = MagicMock()
@@ -285,14 +293,77 @@ class TestAtlasProxy(unittest.TestCase):
             self.proxy._driver.search_basic.create = MagicMock(side_effect=BadRequest('Boom!'))
             self.proxy.get_popular_tables(num_entries=2)
 
+    def test_export_tables(self):
+        entity1 = MagicMock()
+        entity1.guid = self.entity1['guid']
+        entity1.typeName = self.entity1['typeName']
+        entity1.attributes = self.entity1['attributes']
+        entity1.classificationNames = ['PII_DATA']
+
+        entity2 = MagicMock()
+        entity2.guid = self.entity2['guid']
+        entity2.typeName = self.entity2['typeName']
+        entity2.attributes = self.entity2['attributes']
+        entity2.classificationNames = None
+
+        first_batch = MagicMock()
+        first_batch.entities = [entity1, entity2]
+        second_batch = MagicMock()
+        second_batch.entities = []
+        self.proxy._driver.search_basic.create = MagicMock(side_effect=[first_batch, second_batch])
+
+        db_entity = MagicMock()
+        db_entity.attributes = {
+            'qualifiedName': self.db,
+            'clusterName': self.cluster
+        }
+        self.proxy._get_rel_attributes_dict = MagicMock(return_value={self.db_entity['guid']: db_entity})
+
+        response = list(self.proxy.export_tables(batch_size=2))
+
+        ent1_attrs = self.entity1['attributes']
+        expected = TableSummary(key=self.entity1['guid'], database=self.entity_type, cluster=self.cluster,
+                                schema=self.db, name=ent1_attrs['qualifiedName'],
+                                description=ent1_attrs['description'],
+                                tags=[Tag(tag_name='PII_DATA', tag_type='default')],
+                                owners=[User(email=ent1_attrs['owner'])])
+        self.assertEqual(len(response), 2)
+        self.assertEqual(expected.__repr__(), response[0].__repr__())
+        self.assertEqual(response[1].tags, [])
+
+        # Second search continues after the name of the last table from the first batch
+        second_params = self.proxy._driver.search_basic.create.call_args_list[1][1]['data']
+        self.assertEqual(second_params['entityFilters'], {'attributeName': 'qualifiedName',
+                                                          'operator': 'gt',
+                                                          'attributeValue': 'Table2_Qualified'})
+
+    def test_get_tables_modified_since(self):
+        entity1 = MagicMock()
+        entity1.guid = self.entity1['guid']
+        entity1.attributes = self.entity1['attributes']
+
+        basic_search_collection = MagicMock()
+        basic_search_collection.entities = [entity1]
+        self.proxy._driver.search_basic.create = MagicMock(return_value=basic_search_collection)
+
+        table_ids, next_cursor = self.proxy.get_tables_modified_since(since=100, cursor='Table0', num_entries=1)
+
+        self.assertEqual(table_ids, [self.entity1['guid']])
+        self.assertEqual(next_cursor, self.entity1['attributes']['qualifiedName'])
+
+        params = self.proxy._driver.search_basic.create.call_args[1]['data']
+        self.assertEqual(params['entityFilters']['criterion'],
+                         [{'attributeName': '__modificationTimestamp', 'operator': 'gte', 'attributeValue': 100000},
+                          {'attributeName': 'qualifiedName', 'operator': 'gt', 'attributeValue': 'Table0'}])
+
     def test_get_table_description(self):
         self._mock_get_table_entity()
-        response = self.proxy.get_table_description(table_id=self.table_id)
+        response = self.proxy.get_table_description(table_uri=self.table_id)
         self.assertEqual(response, self.entity1['attributes']['description'])
 
     def test_put_table_description(self):
         self._mock_get_table_entity()
-        self.proxy.put_table_description(table_id=self.table_id,
+        self.proxy.put_table_description(table_uri=self.table_id,
                                          description="DOESNT_MATTER")
 
     def test_get_tags(self):
@@ -315,7 +386,7 @@ class TestAtlasProxy(unittest.TestCase):
         self._mock_get_table_entity()
 
         with patch.object(self.proxy._driver.entity_bulk_classification, 'create') as mock_execute:
-            self.proxy.add_tag(table_id=self.table_id, tag=tag)
+            self.proxy.add_tag(table_uri=self.table_id, tag=tag)
             mock_execute.assert_called_with(
                 data={'classification': {'typeName': tag}, 'entityGuids': [self.entity1['guid']]}
             )
@@ -327,14 +398,14 @@ class TestAtlasProxy(unittest.TestCase):
         self.proxy._driver.entity_guid = MagicMock(return_value=mocked_entity)
 
         with patch.object(mocked_entity.classifications(tag), 'delete') as mock_execute:
-            self.proxy.delete_tag(table_id=self.table_id, tag=tag)
+            self.proxy.delete_tag(table_uri=self.table_id, tag=tag)
             mock_execute.assert_called_with()
 
     def test_add_owner(self):
         owner = "OWNER"
         entity = self._mock_get_table_entity()
         with patch.object(entity, 'update') as mock_execute:
-            self.proxy.add_owner(table_id=self.table_id, owner=owner)
+            self.proxy.add_owner(table_uri=self.table_id, owner=owner)
             mock_execute.assert_called_with()
 
     def test_get_column(self):
@@ -347,14 +418,25 @@ class TestAtlasProxy(unittest.TestCase):
             self.proxy._get_column(column_id=self.column_id)
 
     def test_get_column_description(self):
+        self._mock_get_table_entity()
         self._mock_get_column()
         response = self.proxy.get_column_description(
-            column_id=self.column_id)
+            table_uri=self.table_id,
+            column_name='column@name')
         self.assertEqual(response, self.test_column['attributes'].get('description'))
+        self.proxy._get_column.assert_called_with(column_id=self.column_id)
+
+    def test_get_column_description_wrong_name(self):
+        self._mock_get_table_entity()
+        with self.assertRaises(NotFoundException):
+            self.proxy.get_column_description(table_uri=self.table_id,
+                                              column_name='DOES_NOT_EXIST')
 
     def test_put_column_description(self):
+        self._mock_get_table_entity()
         self._mock_get_column()
-        self.proxy.put_column_description(column_id=self.column_id,
+        self.proxy.put_column_description(table_uri=self.table_id,
+                                          column_name='column@name',
                                           description='DOESNT_MATTER')
 
 
@@ -0,0 +1,150 @@
+import tempfile
+import time
+import unittest
+from typing import Any
+
+from mock import MagicMock, patch
+
+from metadata_service import create_app
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Table
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.proxy.cached_proxy import CachedProxy
+from metadata_service.util import UserResourceRel
+
+
+class TestCachedProxy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.table_uri = 'hive://gold.foo_schema/foo_table'
+        self.inner = MagicMock()
+        self.inner.get_table.return_value = Table(database='hive', cluster='gold', schema='foo_schema',
+                                                  name='foo_table', description='foo description', columns=[],
+                                                  last_updated_timestamp=1)
+        self.inner.get_tags.return_value = [TagDetail(tag_name='test', tag_count=1)]
+        self.inner.get_popular_tables.return_value = [PopularTable(database='hive', cluster='gold',
+                                                                   schema='foo_schema', name='foo_table')]
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.shared_cache_dir = temp_dir.name
+        self.proxy = self._create_proxy()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def _create_proxy(self, **kwargs: Any) -> CachedProxy:
+        with patch('metadata_service.proxy.cached_proxy.import_string') as mock_import:
+            mock_import.return_value.return_value = self.inner
+            return CachedProxy(host='DOES_NOT_MATTER', port=0000, shared_cache_dir=self.shared_cache_dir, **kwargs)
+
+    def test_cached_reads(self) -> None:
+        for _ in range(2):
+            self.assertEqual(self.proxy.get_table(table_uri=self.table_uri), self.inner.get_table.return_value)
+            self.assertEqual(self.proxy.get_tags(), self.inner.get_tags.return_value)
+            self.assertEqual(self.proxy.get_popular_tables(num_entries=5),
+                             self.inner.get_popular_tables.return_value)
+
+        self.inner.get_table.assert_called_once_with(table_uri=self.table_uri)
+        self.inner.get_tags.assert_called_once_with()
+        self.inner.get_popular_tables.assert_called_once_with(num_entries=5)
+
+        self.proxy.get_popular_tables(num_entries=10)
+        self.assertEqual(self.inner.get_popular_tables.call_count, 2)
+
+    def test_shared_tier(self) -> None:
+        self.proxy.get_table(table_uri=self.table_uri)
+
+        # Another worker, with an empty memory cache, reads the shared cache
+        other_worker = self._create_proxy()
+        table = other_worker.get_table(table_uri=self.table_uri)
+
+        self.assertIsNot(table, self.inner.get_table.return_value)
+        self.assertEqual(table, self.inner.get_table.return_value)
+        self.inner.get_table.assert_called_once_with(table_uri=self.table_uri)
+
+    def test_writes_invalidate(self) -> None:
+        writes = [
+            lambda: self.proxy.put_table_description(table_uri=self.table_uri, description='new'),
+            lambda: self.proxy.put_column_description(table_uri=self.table_uri, column_name='bar',
+                                                      description='new'),
+            lambda: self.proxy.add_owner(table_uri=self.table_uri, owner='tester'),
+            lambda: self.proxy.delete_owner(table_uri=self.table_uri, owner='tester'),
+            lambda: self.proxy.add_table_relation_by_user(table_uri=self.table_uri, user_email='tester',
+                                                          relation_type=UserResourceRel.own),
+            lambda: self.proxy.delete_table_relation_by_user(table_uri=self.table_uri, user_email='tester',
+                                                             relation_type=UserResourceRel.own),
+        ]
+        for i, write in enumerate(writes):
+            self.proxy.get_table(table_uri=self.table_uri)
+            write()
+            self.proxy.get_table(table_uri=self.table_uri)
+            self.assertEqual(self.inner.get_table.call_count, i + 2)
+
+    def test_tag_writes_invalidate_tags(self) -> None:
+        self.proxy.get_tags()
+        self.proxy.add_tag(table_uri=self.table_uri, tag='new')
+        self.proxy.get_tags()
+        self.proxy.delete_tag(table_uri=self.table_uri, tag='new')
+        self.proxy.get_tags()
+
+        self.assertEqual(self.inner.get_tags.call_count, 3)
+        self.inner.add_tag.assert_called_once_with(table_uri=self.table_uri, tag='new')
+        self.inner.delete_tag.assert_called_once_with(table_uri=self.table_uri, tag='new')
+
+    def test_errors_not_cached(self) -> None:
+        self.inner.get_table.side_effect = [ValueError('failed'), self.inner.get_table.return_value]
+
+        with self.assertRaises(ValueError):
+            self.proxy.get_table(table_uri=self.table_uri)
+        self.proxy.get_table(table_uri=self.table_uri)
+
+    def test_local_size_from_shared_cache(self) -> None:
+        with patch('metadata_service.memory_cache.estimate_size') as mock_estimate_size:
+            self.proxy.get_table(table_uri=self.table_uri)
+            # Put by another process
+            proxy = self._create_proxy()
+            proxy.get_table(table_uri=self.table_uri)
+
+        mock_estimate_size.assert_not_called()
+        shared_size = self.proxy._shared_cache.get_with_size('get_table:{}'.format(self.table_uri))[1]
+        self.assertGreater(shared_size, 0)
+        self.assertEqual(self.proxy._local_caches['get_table'].size, shared_size)
+        self.assertEqual(proxy._local_caches['get_table'].size, shared_size)
+
+    def test_pin_tables(self) -> None:
+        proxy = self._create_proxy(local_max_entries=1, local_expire_sec=30)
+        other_table_uri = 'hive://gold.foo_schema/bar_table'
+
+        proxy.pin_tables(table_uris=[self.table_uri])
+        self.inner.get_table.assert_called_once_with(table_uri=self.table_uri)
+
+        # Not evicted by the other tables
+        proxy.get_table(table_uri=other_table_uri)
+        proxy.get_table(table_uri=self.table_uri)
+        self.assertEqual(self.inner.get_table.call_count, 2)
+
+        # Fresh, not refreshed
+        proxy.pin_tables(table_uris=[self.table_uri])
+        self.assertEqual(self.inner.get_table.call_count, 2)
+
+        # Expiring, refreshed from the shared cache
+        now = time.monotonic()
+        with patch('metadata_service.memory_cache.time.monotonic', return_value=now + 20):
+            proxy.pin_tables(table_uris=[self.table_uri])
+        with patch('metadata_service.memory_cache.time.monotonic', return_value=now + 40):
+            proxy.get_table(table_uri=self.table_uri)
+        self.assertEqual(self.inner.get_table.call_count, 2)
+
+        # No longer pinned, evicted from the memory cache
+        proxy.pin_tables(table_uris=[])
+        proxy.get_table(table_uri=other_table_uri)
+        self.assertIsNone(proxy._local_caches['get_table'].expires_in(self.table_uri))
+
+
+if __name__ == '__main__':
+    unittest.main()
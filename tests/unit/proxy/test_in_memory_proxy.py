@@ -0,0 +1,69 @@
+import unittest
+
+from metadata_service import create_app
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.in_memory_proxy import InMemoryProxy
+from metadata_service.tools.synthetic_catalog import generate_catalog, table_key
+from metadata_service.util import UserResourceRel
+
+
+class TestInMemoryProxy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.catalog = generate_catalog(num_tables=20, min_columns=3, max_columns=3, num_users=30, seed=1)
+        self.proxy = InMemoryProxy(catalog=self.catalog)
+        self.table_uri = table_key(database='hive', cluster='gold', schema='schema1', name='table1')
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_generate_catalog(self) -> None:
+        self.assertEqual(len(self.catalog.tables), 20)
+        table = self.catalog.tables[self.table_uri]
+        self.assertEqual([column.name for column in table.columns], ['col0', 'col1', 'col2'])
+        self.assertEqual(len(table.columns[0].stats), 2)
+        self.assertEqual(len(table.table_readers), 5)
+        # Deterministic with the same seed
+        other = generate_catalog(num_tables=20, min_columns=3, max_columns=3, num_users=30, seed=1)
+        self.assertEqual(repr(other.tables[self.table_uri]), repr(table))
+
+    def test_get_table(self) -> None:
+        self.assertIs(self.proxy.get_table(table_uri=self.table_uri), self.catalog.tables[self.table_uri])
+        with self.assertRaises(NotFoundException):
+            self.proxy.get_table(table_uri='hive://gold.schema1/does_not_exist')
+
+    def test_writes(self) -> None:
+        self.proxy.put_column_description(table_uri=self.table_uri, column_name='col1', description='new')
+        self.proxy.add_tag(table_uri=self.table_uri, tag='new_tag')
+        self.proxy.add_owner(table_uri=self.table_uri, owner='new_owner')
+
+        self.assertEqual(self.proxy.get_column_description(table_uri=self.table_uri, column_name='col1'), 'new')
+        self.assertIn('new_tag', [tag.tag_name for tag in self.proxy.get_table(table_uri=self.table_uri).tags])
+        self.assertIn({'tag_name': 'new_tag', 'tag_count': 1}, [tag.to_dict() for tag in self.proxy.get_tags()])
+        owned = self.proxy.get_table_by_user_relation(user_email='new_owner', relation_type=UserResourceRel.own)
+        self.assertEqual([table.name for table in owned['table']], ['table1'])
+        self.assertEqual(self.proxy.get_tables_modified_since(since=0), ([self.table_uri], None))
+
+    def test_get_popular_tables(self) -> None:
+        popular_tables = self.proxy.get_popular_tables(num_entries=3)
+
+        self.assertEqual(len(popular_tables), 3)
+        self.assertEqual(len(list(self.proxy.export_tables(batch_size=7))), 20)
+
+    def test_export_users(self) -> None:
+        self.assertEqual(len(list(self.proxy.export_users(batch_size=7))), 30)
+
+        relations = list(self.proxy.export_user_relations())
+        for user_email, relation_type, table_keys in relations:
+            actual = self.proxy.get_table_by_user_relation(user_email=user_email, relation_type=relation_type)
+            self.assertEqual([table.name for table in actual['table']],
+                             [self.catalog.tables[key].name for key in table_keys])
+        self.assertIn(UserResourceRel.own, [relation_type for _, relation_type, _ in relations])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,11 @@ from neo4j.v1 import GraphDatabase
 
 from metadata_service import create_app
 from metadata_service.entity.popular_table import PopularTable
-from metadata_service.entity.table_detail import (Application, Column, Table, Tag,
+from metadata_service.entity.table_detail import (Application, Column, Reader, Table, Tag,
                                                   Watermark, Source, Statistics, User)
+from metadata_service.entity.table_summary import TableSummary
 from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.popularity import PopularityUpdater, np
 from metadata_service.proxy.neo4j_proxy import Neo4jProxy
 from metadata_service.util import UserResourceRel
 
@@ -480,6 +482,157 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(actual.__repr__(), expected.__repr__())
 
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_get_popular_tables_decayed(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute, \
+                patch.object(PopularityUpdater, 'start') as mock_start:
+            mock_execute.return_value = [{'table_key': 'foo', 'readers': 20, 'total_reads': 10},
+                                         {'table_key': 'bar', 'readers': 1, 'total_reads': 100}]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000, popularity_half_life_days=30)
+
+            self.assertEqual(neo4j_proxy.get_table_read_counts(), [('foo', 20, 10), ('bar', 1, 100)])
+
+            # Not updated yet: readers * log(total reads)
+            with patch.object(Neo4jProxy, '_get_popular_tables_uris', return_value=['foo']) as mock_uris:
+                self.assertEqual(neo4j_proxy._get_popular_tables_uris_from_source(2), ['foo'])
+            mock_uris.assert_called_once_with(2)
+            mock_start.assert_called_once_with()
+
+            neo4j_proxy._popularity_updater.update()  # type: ignore
+            with patch.object(Neo4jProxy, '_get_popular_tables_uris') as mock_uris:
+                self.assertEqual(neo4j_proxy._get_popular_tables_uris_from_source(2), ['bar', 'foo'])
+            mock_uris.assert_not_called()
+
+    def test_export_tables(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            first_batch = [
+                {'table_key': 'db://clstr.sch/bar', 'database_name': 'db', 'cluster_name': 'clstr',
+                 'schema_name': 'sch', 'table_name': 'bar', 'table_description': 'bar description',
+                 'tag_records': [{'key': 'pii', 'tag_type': 'default'}],
+                 'owner_records': [{'key': 'tester@lyft.com', 'email': 'tester@lyft.com'}]},
+                {'table_key': 'db://clstr.sch/foo', 'database_name': 'db', 'cluster_name': 'clstr',
+                 'schema_name': 'sch', 'table_name': 'foo', 'table_description': None,
+                 'tag_records': [], 'owner_records': []}
+            ]
+            second_batch = [
+                {'table_key': 'db://clstr.sch/qux', 'database_name': 'db', 'cluster_name': 'clstr',
+                 'schema_name': 'sch', 'table_name': 'qux', 'tag_records': [], 'owner_records': []}
+            ]
+            mock_execute.side_effect = [first_batch, second_batch]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            actual = list(neo4j_proxy.export_tables(batch_size=2))
+
+            self.assertEqual([table.key for table in actual],
+                             ['db://clstr.sch/bar', 'db://clstr.sch/foo', 'db://clstr.sch/qux'])
+            self.assertEqual(actual[0].__repr__(),
+                             TableSummary(key='db://clstr.sch/bar', database='db', cluster='clstr', schema='sch',
+                                          name='bar', description='bar description',
+                                          tags=[Tag(tag_name='pii', tag_type='default')],
+                                          owners=[User(email='tester@lyft.com')]).__repr__())
+
+            # Keyset pagination: second batch starts after the last key of the first batch
+            self.assertEqual(mock_execute.call_count, 2)
+            self.assertEqual(mock_execute.call_args_list[0][1]['param_dict'], {'last_key': '', 'batch_size': 2})
+            self.assertEqual(mock_execute.call_args_list[1][1]['param_dict'],
+                             {'last_key': 'db://clstr.sch/foo', 'batch_size': 2})
+
+    def test_export_table_keys(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [[{'table_key': 'db://clstr.sch/bar'}, {'table_key': 'db://clstr.sch/foo'}],
+                                        [{'table_key': 'db://clstr.sch/qux'}]]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            actual = list(neo4j_proxy.export_table_keys(batch_size=2))
+
+            self.assertEqual(actual, ['db://clstr.sch/bar', 'db://clstr.sch/foo', 'db://clstr.sch/qux'])
+            self.assertEqual(mock_execute.call_args_list[1][1]['param_dict'],
+                             {'last_key': 'db://clstr.sch/foo', 'batch_size': 2})
+
+    def test_export_table_details(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            table_records = [
+                {'table_key': 'db://clstr.sch/foo', 'database_name': 'db', 'cluster_name': 'clstr',
+                 'schema_name': 'sch', 'tbl': {'name': 'foo', 'is_view': False}, 'table_description': 'foo desc',
+                 'wmk_records': [], 'application': None, 'last_updated_timestamp': 1,
+                 'owner_records': [{'email': 'tester@lyft.com'}],
+                 'tag_records': [{'key': 'pii', 'tag_type': 'default'}], 'src': None},
+                # No columns
+                {'table_key': 'db://clstr.sch/qux', 'database_name': 'db', 'cluster_name': 'clstr',
+                 'schema_name': 'sch', 'tbl': {'name': 'qux'}, 'table_description': None,
+                 'wmk_records': [], 'application': None, 'last_updated_timestamp': None,
+                 'owner_records': [], 'tag_records': [], 'src': None},
+            ]
+            column_records = [
+                {'table_key': 'db://clstr.sch/foo', 'col': {'name': 'id', 'type': 'bigint', 'sort_order': 0},
+                 'col_dscrpt': {'description': 'id desc'},
+                 'col_stats': [{'stat_name': 'avg', 'stat_val': '1', 'start_epoch': 1, 'end_epoch': 2}]},
+                {'table_key': 'db://clstr.sch/foo', 'col': {'name': 'ds', 'type': 'string', 'sort_order': 1},
+                 'col_dscrpt': None, 'col_stats': []},
+            ]
+            reader_records = [{'table_key': 'db://clstr.sch/foo',
+                               'reader_records': [{'email': 'reader@lyft.com', 'read_count': 3}]}]
+            mock_execute.side_effect = [table_records, column_records, reader_records, []]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            actual = list(neo4j_proxy.export_table_details(batch_size=2))
+
+            expected = Table(database='db', cluster='clstr', schema='sch', name='foo',
+                             tags=[Tag(tag_name='pii', tag_type='default')],
+                             description='foo desc',
+                             columns=[Column(name='id', description='id desc', col_type='bigint', sort_order=0,
+                                             stats=[Statistics(stat_type='avg', stat_val='1', start_epoch=1,
+                                                               end_epoch=2)]),
+                                      Column(name='ds', description=None, col_type='string', sort_order=1,
+                                             stats=[])],
+                             owners=[User(email='tester@lyft.com')],
+                             table_readers=[Reader(user=User(email='reader@lyft.com'), read_count=3)],
+                             watermarks=[],
+                             last_updated_timestamp=1,
+                             is_view=False)
+            self.assertEqual([table_key for table_key, _ in actual], ['db://clstr.sch/foo'])
+            self.assertEqual(repr(actual[0][1]), repr(expected))
+
+            # One query per batch for tables, columns and readers, not per table
+            self.assertEqual(mock_execute.call_count, 4)
+            self.assertEqual(mock_execute.call_args_list[1][1]['param_dict'],
+                             {'tbl_keys': ['db://clstr.sch/foo', 'db://clstr.sch/qux']})
+            self.assertEqual(mock_execute.call_args_list[3][1]['param_dict'],
+                             {'last_key': 'db://clstr.sch/qux', 'batch_size': 2})
+
+    def test_get_tables_modified_since(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = [{'table_key': 'db://clstr.sch/bar'}, {'table_key': 'db://clstr.sch/foo'}]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            table_uris, next_cursor = neo4j_proxy.get_tables_modified_since(since=100, num_entries=2)
+
+            self.assertEqual(table_uris, ['db://clstr.sch/bar', 'db://clstr.sch/foo'])
+            self.assertEqual(next_cursor, 'db://clstr.sch/foo')
+            self.assertEqual(mock_execute.call_args[1]['param_dict'],
+                             {'since': 100, 'cursor': '', 'num_entries': 2})
+
+            table_uris, next_cursor = neo4j_proxy.get_tables_modified_since(since=100, cursor=next_cursor,
+                                                                            num_entries=3)
+            self.assertIsNone(next_cursor)
+
+    def test_update_stamps_modified_ts(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(Neo4jProxy, '_modified_ts', return_value=1000):
+            mock_transaction = mock_driver.return_value.session.return_value.begin_transaction.return_value
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.add_tag(table_uri='dummy_uri', tag='hive')
+            neo4j_proxy.delete_owner(table_uri='dummy_uri', owner='tester')
+
+            statement, params = mock_transaction.run.call_args_list[2][0]
+            self.assertIn('SET n2.metadata_modified_ts = $modified_ts', statement)
+            self.assertEqual(params['modified_ts'], 1000)
+
+            statement, params = mock_transaction.run.call_args_list[3][0]
+            self.assertIn('SET n2.metadata_modified_ts = $modified_ts', statement)
+            self.assertEqual(params['modified_ts'], 1000)
+
     def test_get_users(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
             mock_execute.return_value.single.return_value = {
@@ -502,6 +655,44 @@ class TestNeo4jProxy(unittest.TestCase):
             neo4j_user = neo4j_proxy.get_user_detail(user_id='test_email')
             self.assertEquals(neo4j_user.email, 'test_email')
 
+    def test_export_users(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [
+                [{'user_key': 'bar@lyft.com', 'user_record': {'email': 'bar@lyft.com', 'full_name': 'Bar'},
+                  'manager_record': {'full_name': 'Foo'}},
+                 {'user_key': 'foo@lyft.com', 'user_record': {'email': 'foo@lyft.com'}, 'manager_record': None}],
+                [],
+            ]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            actual = list(neo4j_proxy.export_users(batch_size=2))
+
+            self.assertEqual([user.email for user in actual], ['bar@lyft.com', 'foo@lyft.com'])
+            self.assertEqual(actual[0].manager_fullname, 'Foo')
+            self.assertEqual(mock_execute.call_args_list[1][1]['param_dict'],
+                             {'last_key': 'foo@lyft.com', 'batch_size': 2})
+
+    def test_export_user_relations(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [
+                [{'user_key': 'bar@lyft.com',
+                  'relations': [['FOLLOW', ['db://clstr.sch/foo']],
+                                ['OWNER_OF', ['db://clstr.sch/foo', 'db://clstr.sch/qux']]]},
+                 # No related table
+                 {'user_key': 'foo@lyft.com', 'relations': [[None, []]]}],
+                [],
+            ]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            actual = list(neo4j_proxy.export_user_relations(batch_size=2))
+
+            self.assertEqual(actual, [('bar@lyft.com', UserResourceRel.follow, ['db://clstr.sch/foo']),
+                                      ('bar@lyft.com', UserResourceRel.own,
+                                       ['db://clstr.sch/foo', 'db://clstr.sch/qux'])])
+            self.assertIn('[rel:FOLLOW|OWNER_OF|READ]', mock_execute.call_args_list[0][1]['statement'])
+            self.assertEqual(mock_execute.call_args_list[1][1]['param_dict'],
+                             {'last_key': 'foo@lyft.com', 'batch_size': 2})
+
     def test_get_resources_by_user_relation(self) -> None:
         with patch.object(GraphDatabase, 'driver'), \
             patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute, \
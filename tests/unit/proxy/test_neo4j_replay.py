@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from typing import Any, List  # noqa: F401
+
+from mock import MagicMock, patch
+from neo4j.v1 import GraphDatabase, Node, Record
+from neo4j.v1.types.graph import Graph
+
+from metadata_service import create_app
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy.neo4j_replay import NoRecordingError, RecordingDriver, ReplayDriver
+
+
+class FakeResult:
+    def __init__(self, keys: List[str], rows: List[List[Any]]) -> None:
+        self._keys = keys
+        self._records = [Record(zip(keys, row)) for row in rows]
+
+    def __iter__(self) -> Any:
+        return iter(self._records)
+
+    def keys(self) -> List[str]:
+        return self._keys
+
+
+class TestNeo4jReplay(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+        self.app_context.pop()
+
+    def _record(self, statement: str, parameters: Any, result: FakeResult) -> None:
+        driver = MagicMock()
+        driver.session.return_value.run.return_value = result
+        recording_driver = RecordingDriver(driver, self.path)
+        with recording_driver.session() as session:
+            session.run(statement, **parameters)
+        recording_driver.close()
+
+    def test_record_and_replay(self) -> None:
+        node = Graph().put_node(1, ['Table'], {'name': 'test_table', 'is_view': False})
+        self._record('MATCH (tbl:Table {key: $key}) RETURN tbl', {'key': 'hive://gold.test_schema/test_table'},
+                     FakeResult(['tbl', 'tags'], [[node, ['a', 'b']]]))
+
+        driver = ReplayDriver(self.path, latency_scale=0)
+        with driver.session() as session:
+            result = session.run('MATCH (tbl:Table {key: $key}) RETURN tbl', key='hive://gold.test_schema/test_table')
+        record = result.single()
+
+        self.assertEqual(result.keys(), ('tbl', 'tags'))
+        self.assertIsInstance(record['tbl'], Node)
+        self.assertEqual(record['tbl'].labels, {'Table'})
+        self.assertEqual(dict(record['tbl']), {'name': 'test_table', 'is_view': False})
+        self.assertEqual(record.get('tags'), ['a', 'b'])
+
+        # Different parameters fall back to the recordings of the same statement
+        tx = driver.session().begin_transaction()
+        self.assertEqual(tx.run('MATCH (tbl:Table {key: $key}) RETURN tbl', {'key': 'other'}).single()['tags'],
+                         ['a', 'b'])
+        tx.commit()
+        self.assertTrue(tx.closed())
+
+        with self.assertRaises(NoRecordingError):
+            driver.session().run('MATCH (n) RETURN n')
+
+    def test_neo4j_proxy_record_and_replay(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_driver.return_value.session.return_value.run.return_value = FakeResult(
+                ['ts'], [[{'latest_timestmap': 1570230473}]])
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000, record_path=self.path)
+            self.assertEqual(neo4j_proxy.get_latest_updated_ts(), 1570230473)
+
+        neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000, replay_path=self.path, replay_latency_scale=0)
+        self.assertEqual(neo4j_proxy.get_latest_updated_ts(), 1570230473)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import Any, Dict, List  # noqa: F401
+
+from mock import patch
+
+from metadata_service import config, create_app, metrics
+from metadata_service.metrics import init_metrics
+from metadata_service.proxy.single_flight import single_flight
+
+NUM_CALLERS = 8
+
+
+class _Proxy:
+    def __init__(self) -> None:
+        self.calls = []  # type: List[str]
+        self.release = Event()
+
+    @single_flight
+    def get_table(self, *, table_uri: str, table_info: Any =None) -> Dict[str, str]:
+        self.calls.append(table_uri)
+        self.release.wait(5)
+        if table_uri == 'missing':
+            raise LookupError(table_uri)
+        return {'uri': table_uri}
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.proxy = _Proxy()
+        self.executor = ThreadPoolExecutor(max_workers=NUM_CALLERS)
+        self.addCleanup(self.executor.shutdown)
+
+    def tearDown(self) -> None:
+        metrics._metrics = None
+
+    def _call_concurrently(self, table_uri: str, proxy: Any =None) -> List[Any]:
+        proxy = proxy or self.proxy
+        # Coalesced calls are counted in statsd before waiting
+        with patch('metadata_service.proxy.single_flight.increment') as mock_increment:
+            futures = [self.executor.submit(proxy.get_table, table_uri=table_uri) for _ in range(NUM_CALLERS)]
+            deadline = time.time() + 5
+            while mock_increment.call_count < NUM_CALLERS - 1 and time.time() < deadline:
+                time.sleep(0.001)
+            proxy.release.set()
+        mock_increment.assert_called_with('tests.unit.proxy.test_single_flight.get_table.coalesced')
+        return [future.result() if future.exception() is None else future.exception() for future in futures]
+
+    def test_coalesced(self) -> None:
+        results = self._call_concurrently('hive://gold.foo/bar')
+
+        self.assertEqual(self.proxy.calls, ['hive://gold.foo/bar'])
+        self.assertEqual(results, [{'uri': 'hive://gold.foo/bar'}] * NUM_CALLERS)
+        # Not in flight anymore, called again
+        self.proxy.get_table(table_uri='hive://gold.foo/bar')
+        self.assertEqual(len(self.proxy.calls), 2)
+
+    def test_exception_shared(self) -> None:
+        results = self._call_concurrently('missing')
+
+        self.assertEqual(len(self.proxy.calls), 1)
+        self.assertTrue(all(isinstance(result, LookupError) for result in results))
+
+    def test_not_coalesced(self) -> None:
+        self.proxy.release.set()
+        other_proxy = _Proxy()
+        other_proxy.release.set()
+
+        self.proxy.get_table(table_uri='a')
+        self.proxy.get_table(table_uri='b')
+        other_proxy.get_table(table_uri='a')
+        # Unhashable arguments
+        self.proxy.get_table(table_uri='a', table_info={'name': 'a'})
+
+        self.assertEqual(self.proxy.calls, ['a', 'b', 'a'])
+        self.assertEqual(other_proxy.calls, ['a'])
+
+    def test_metrics(self) -> None:
+        app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        app.config[config.METRICS_ENABLED] = True
+        init_metrics(app)
+
+        self._call_concurrently('hive://gold.foo/bar')
+
+        exposition = metrics.get_metrics().registry.exposition()  # type: ignore
+        self.assertIn('metadata_proxy_coalesced_calls_total{{method="get_table"}} {}\n'.format(
+            float(NUM_CALLERS - 1)), exposition)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+
+from typing import Any, Iterator, List, Tuple  # noqa: F401
+
+from mock import patch, MagicMock
+
+from metadata_service import create_app
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Column, Statistics, Table, Tag, User
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.entity.user_detail import User as UserEntity
+from metadata_service.proxy.snapshot_proxy import SnapshotProxy
+from metadata_service.util import UserResourceRel
+
+
+class TestSnapshotProxy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.table_uri = 'hive://gold.foo_schema/foo_table'
+        self.table = Table(database='hive', cluster='gold', schema='foo_schema', name='foo_table',
+                           tags=[Tag(tag_name='test', tag_type='default')],
+                           table_readers=[],
+                           description='foo description',
+                           columns=[Column(name='bar_id_1', description='bar col description', col_type='varchar',
+                                           sort_order=0,
+                                           stats=[Statistics(stat_type='avg', stat_val='1', start_epoch=1,
+                                                             end_epoch=2)]),
+                                    Column(name='bar_id_2', description=None, col_type='bigint', sort_order=1,
+                                           stats=[])],
+                           owners=[User(email='tester')],
+                           watermarks=[],
+                           last_updated_timestamp=1)
+
+        self.inner = MagicMock()
+        self.inner.export_table_details.return_value = iter([(self.table_uri, self.table)])
+        self.inner.get_table.return_value = self.table
+        self.inner.get_tags.return_value = [TagDetail(tag_name='test', tag_count=1)]
+        self.inner.get_popular_tables.return_value = [PopularTable(database='hive', cluster='gold',
+                                                                   schema='foo_schema', name='foo_table',
+                                                                   description='foo description')]
+        self.user = UserEntity(email='tester', first_name='foo', last_name='bar')
+        self.inner.export_users.return_value = iter([self.user])
+        self.inner.export_user_relations.return_value = iter([('tester', UserResourceRel.own, [self.table_uri])])
+
+        with patch('metadata_service.proxy.snapshot_proxy.import_string') as mock_import:
+            mock_import.return_value.return_value = self.inner
+            self.proxy = SnapshotProxy(host='DOES_NOT_MATTER', port=0000, refresh_interval_sec=0)
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_refresh(self) -> None:
+        self.proxy.refresh()
+        self.inner.get_table.reset_mock()
+
+        self.assertEqual(repr(self.proxy.get_table(table_uri=self.table_uri)), repr(self.table))
+        self.assertEqual(self.proxy.get_table_description(table_uri=self.table_uri), 'foo description')
+        self.assertEqual(self.proxy.get_column_description(table_uri=self.table_uri, column_name='bar_id_1'),
+                         'bar col description')
+        self.assertEqual(repr(self.proxy.get_tags()), repr(self.inner.get_tags.return_value))
+        self.assertEqual(repr(self.proxy.get_popular_tables(num_entries=1)),
+                         repr(self.inner.get_popular_tables.return_value))
+        self.assertEqual(self.proxy.get_user_detail(user_id='tester'), self.user)
+        self.assertEqual([table.name for table in self.proxy.get_table_by_user_relation(
+            user_email='tester', relation_type=UserResourceRel.own)['table']], ['foo_table'])
+        self.assertEqual(self.proxy.get_table_by_user_relation(user_email='tester',
+                                                               relation_type=UserResourceRel.follow), {'table': []})
+        self.inner.get_table.assert_not_called()
+        self.inner.get_tags.assert_called_once_with()
+        self.inner.get_popular_tables.assert_called_once_with(num_entries=100)
+        self.inner.get_user_detail.assert_not_called()
+        self.inner.get_table_by_user_relation.assert_not_called()
+
+    def test_refresh_started_on_first_read(self) -> None:
+        with patch('metadata_service.proxy.snapshot_proxy.import_string') as mock_import, \
+                patch('metadata_service.proxy.snapshot_proxy.Thread') as mock_thread:
+            mock_import.return_value.return_value = self.inner
+            proxy = SnapshotProxy(host='DOES_NOT_MATTER', port=0000, refresh_interval_sec=60)
+            mock_thread.assert_not_called()
+
+            proxy.get_tags()
+            proxy.get_table(table_uri=self.table_uri)
+
+        mock_thread.assert_called_once()
+        mock_thread.return_value.start.assert_called_once_with()
+
+    def test_read_falls_through_before_load(self) -> None:
+        for _ in range(2):
+            self.proxy.get_tags()
+            self.proxy.get_popular_tables(num_entries=1)
+            self.proxy.get_table(table_uri=self.table_uri)
+
+        # Added to the snapshot on first read
+        self.inner.get_tags.assert_called_once_with()
+        self.inner.get_popular_tables.assert_called_once_with(num_entries=1)
+        self.inner.get_table.assert_called_once_with(table_uri=self.table_uri)
+
+    def test_more_popular_tables_than_loaded(self) -> None:
+        self.proxy.refresh()
+
+        self.proxy.get_popular_tables(num_entries=200)
+        self.proxy.get_popular_tables(num_entries=200)
+        self.inner.get_popular_tables.assert_called_with(num_entries=200)
+        self.assertEqual(self.inner.get_popular_tables.call_count, 2)
+
+        # Next snapshots load as many
+        self.inner.export_table_details.return_value = iter([(self.table_uri, self.table)])
+        self.proxy.refresh()
+        self.inner.get_popular_tables.assert_called_with(num_entries=200)
+
+    def test_writes_patch_snapshot(self) -> None:
+        self.proxy.refresh()
+
+        self.proxy.put_table_description(table_uri=self.table_uri, description='new description')
+        self.proxy.put_column_description(table_uri=self.table_uri, column_name='bar_id_2',
+                                          description='new col description')
+        self.proxy.add_owner(table_uri=self.table_uri, owner='another_tester')
+        self.proxy.add_tag(table_uri=self.table_uri, tag='new_tag')
+        self.proxy.delete_tag(table_uri=self.table_uri, tag='test')
+
+        self.inner.put_table_description.assert_called_once_with(table_uri=self.table_uri,
+                                                                 description='new description')
+        self.inner.add_tag.assert_called_once_with(table_uri=self.table_uri, tag='new_tag')
+
+        table = self.proxy.get_table(table_uri=self.table_uri)
+        self.assertEqual(table.description, 'new description')
+        self.assertEqual(table.columns[1].description, 'new col description')
+        self.assertEqual([owner.email for owner in table.owners], ['tester', 'another_tester'])
+        self.assertEqual([tag.tag_name for tag in table.tags], ['new_tag'])
+        self.assertEqual(self.proxy.get_popular_tables(num_entries=1)[0].description, 'new description')
+        self.assertEqual({tag.tag_name: tag.tag_count for tag in self.proxy.get_tags()},
+                         {'test': 0, 'new_tag': 1})
+
+    def test_relation_written_while_loading(self) -> None:
+        def export_user_relations(*, batch_size: int) -> Iterator[Tuple[str, Any, List[str]]]:
+            # Exported before the write
+            yield 'tester', UserResourceRel.own, [self.table_uri]
+            self.proxy.add_table_relation_by_user(table_uri=self.table_uri,
+                                                  user_email='tester',
+                                                  relation_type=UserResourceRel.follow)
+
+        self.inner.export_user_relations.side_effect = export_user_relations
+        self.proxy.refresh()
+
+        actual = self.proxy.get_table_by_user_relation(user_email='tester', relation_type=UserResourceRel.follow)
+        self.assertEqual([table.name for table in actual['table']], ['foo_table'])
+        self.inner.get_table_by_user_relation.assert_not_called()
+
+    def test_user_relation_not_exported(self) -> None:
+        self.inner.export_users.side_effect = NotImplementedError
+        self.proxy.refresh()
+        self.inner.get_table_by_user_relation.return_value = {'table': []}
+
+        actual = self.proxy.get_table_by_user_relation(user_email='tester', relation_type=UserResourceRel.follow)
+        self.assertEqual(actual, {'table': []})
+
+        self.proxy.add_table_relation_by_user(table_uri=self.table_uri,
+                                              user_email='tester',
+                                              relation_type=UserResourceRel.follow)
+        actual = self.proxy.get_table_by_user_relation(user_email='tester', relation_type=UserResourceRel.follow)
+
+        self.assertEqual([table.name for table in actual['table']], ['foo_table'])
+        self.inner.get_table_by_user_relation.assert_called_once_with(user_email='tester',
+                                                                      relation_type=UserResourceRel.follow)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from metadata_service import create_app
+from metadata_service.entity.table_detail import Application, Column, Reader, Source, \
+    Statistics, Table, Tag, User, Watermark
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.sqlite_proxy import SqliteProxy
+from metadata_service.tools.sqlite_loader import load_graph_dump
+from metadata_service.util import UserResourceRel
+
+
+class TestSqliteProxy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.table_uri = 'hive://gold.foo_schema/foo_table'
+        self.other_table_uri = 'hive://gold.foo_schema/bar_table'
+
+        nodes = {
+            'Database': {'database://hive': {'name': 'hive'}},
+            'Cluster': {'hive://gold': {'name': 'gold'}},
+            'Schema': {'hive://gold.foo_schema': {'name': 'foo_schema'}},
+            'Table': {self.table_uri: {'name': 'foo_table', 'is_view': 'false'},
+                      self.other_table_uri: {'name': 'bar_table'}},
+            'Description': {self.table_uri + '/_description': {'description': 'foo description'},
+                            self.table_uri + '/bar_id_1/_description': {'description': 'bar col description'}},
+            'Column': {self.table_uri + '/bar_id_1': {'name': 'bar_id_1', 'type': 'varchar', 'sort_order': '0'},
+                       self.table_uri + '/bar_id_2': {'name': 'bar_id_2', 'type': 'bigint', 'sort_order': '1'}},
+            'Stat': {self.table_uri + '/bar_id_1/avg/': {'stat_name': 'avg', 'stat_val': '1',
+                                                         'start_epoch': '1', 'end_epoch': '2'}},
+            'Watermark': {'hive://gold.foo_schema/foo_table/high_watermark/': {'partition_key': 'ds',
+                                                                               'partition_value': 'fake_value',
+                                                                               'create_time': 'fake_time'}},
+            'Application': {'application://airflow/foo': {'application_url': 'airflow_host/admin/airflow/tree',
+                                                          'description': 'DAG generating a table',
+                                                          'name': 'Airflow', 'id': 'dag/task_id'}},
+            'Timestamp': {self.table_uri + '/_last_updated_timestamp': {'last_updated_timestamp': '1'}},
+            'Source': {self.table_uri + '/_source': {'source_type': 'github', 'source': '/source_file_loc'}},
+            'Tag': {'test': {'tag_type': 'default'}, 'unused': {'tag_type': 'default'}},
+            'User': {'tester': {'email': 'tester', 'full_name': 'Tester', 'is_active': 'True'},
+                     'manager': {'email': 'manager', 'full_name': 'Manager'}},
+            'Updatedtimestamp': {'amundsen_updated_timestamp': {'latest_timestmap': '1000'}},
+        }
+
+        relations = {
+            ('Table', 'TABLE_OF', 'Schema'): [(self.table_uri, 'hive://gold.foo_schema', {}),
+                                              (self.other_table_uri, 'hive://gold.foo_schema', {})],
+            ('Schema', 'SCHEMA_OF', 'Cluster'): [('hive://gold.foo_schema', 'hive://gold', {})],
+            ('Cluster', 'CLUSTER_OF', 'Database'): [('hive://gold', 'database://hive', {})],
+            ('Table', 'DESCRIPTION', 'Description'): [(self.table_uri, self.table_uri + '/_description', {})],
+            ('Table', 'COLUMN', 'Column'): [(self.table_uri, self.table_uri + '/bar_id_1', {}),
+                                            (self.table_uri, self.table_uri + '/bar_id_2', {})],
+            ('Column', 'DESCRIPTION', 'Description'): [(self.table_uri + '/bar_id_1',
+                                                        self.table_uri + '/bar_id_1/_description', {})],
+            ('Column', 'STAT', 'Stat'): [(self.table_uri + '/bar_id_1', self.table_uri + '/bar_id_1/avg/', {})],
+            ('Watermark', 'BELONG_TO_TABLE', 'Table'): [('hive://gold.foo_schema/foo_table/high_watermark/',
+                                                         self.table_uri, {})],
+            ('Application', 'GENERATES', 'Table'): [('application://airflow/foo', self.table_uri, {})],
+            ('Table', 'LAST_UPDATED_AT', 'Timestamp'): [(self.table_uri,
+                                                         self.table_uri + '/_last_updated_timestamp', {})],
+            ('Table', 'SOURCE', 'Source'): [(self.table_uri, self.table_uri + '/_source', {})],
+            ('Table', 'TAGGED_BY', 'Tag'): [(self.table_uri, 'test', {})],
+            ('User', 'OWNER_OF', 'Table'): [('tester', self.table_uri, {})],
+            ('User', 'READ', 'Table'): [('tester', self.table_uri, {'read_count': '5'})],
+            ('User', 'MANAGE_BY', 'User'): [('tester', 'manager', {})],
+        }
+
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        conn = sqlite3.connect(self.db_path)
+        load_graph_dump(nodes=nodes, relations=relations, conn=conn)
+        conn.close()
+
+        self.proxy = SqliteProxy(host=self.db_path)
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        os.remove(self.db_path)
+
+    def test_get_table(self) -> None:
+        expected = Table(database='hive', cluster='gold', schema='foo_schema', name='foo_table',
+                         tags=[Tag(tag_name='test', tag_type='default')],
+                         description='foo description',
+                         columns=[Column(name='bar_id_1', description='bar col description', col_type='varchar',
+                                         sort_order=0, stats=[Statistics(stat_type='avg', stat_val='1',
+                                                                         start_epoch=1, end_epoch=2)]),
+                                  Column(name='bar_id_2', description=None, col_type='bigint', sort_order=1,
+                                         stats=[])],
+                         owners=[User(email='tester')],
+                         table_readers=[Reader(user=User(email='tester'), read_count=5)],
+                         watermarks=[Watermark(watermark_type='high_watermark', partition_key='ds',
+                                               partition_value='fake_value', create_time='fake_time')],
+                         table_writer=Application(application_url='airflow_host/admin/airflow/tree',
+                                                  description='DAG generating a table',
+                                                  name='Airflow',
+                                                  id='dag/task_id'),
+                         last_updated_timestamp=1,
+                         source=Source(source_type='github', source='/source_file_loc'),
+                         is_view=False)
+
+        self.assertEqual(repr(self.proxy.get_table(table_uri=self.table_uri)), repr(expected))
+
+    def test_get_table_not_found(self) -> None:
+        with self.assertRaises(NotFoundException):
+            self.proxy.get_table(table_uri='hive://gold.foo_schema/does_not_exist')
+
+    def test_descriptions(self) -> None:
+        self.assertEqual(self.proxy.get_table_description(table_uri=self.table_uri), 'foo description')
+
+        self.proxy.put_table_description(table_uri=self.table_uri, description='new description')
+        self.proxy.put_column_description(table_uri=self.table_uri, column_name='bar_id_2',
+                                          description='new col description')
+
+        self.assertEqual(self.proxy.get_table_description(table_uri=self.table_uri), 'new description')
+        self.assertEqual(self.proxy.get_column_description(table_uri=self.table_uri, column_name='bar_id_2'),
+                         'new col description')
+        self.assertEqual(self.proxy.get_tables_modified_since(since=0), ([self.table_uri], None))
+
+        with self.assertRaises(NotFoundException):
+            self.proxy.put_column_description(table_uri=self.table_uri, column_name='does_not_exist',
+                                              description='new col description')
+
+    def test_tags(self) -> None:
+        self.proxy.add_tag(table_uri=self.other_table_uri, tag='test')
+        self.proxy.add_tag(table_uri=self.other_table_uri, tag='new_tag')
+        self.proxy.delete_tag(table_uri=self.table_uri, tag='test')
+
+        actual = {tag.tag_name: tag.tag_count for tag in self.proxy.get_tags()}
+        self.assertEqual(actual, {'test': 1, 'new_tag': 1, 'unused': 0})
+
+        with self.assertRaises(NotFoundException):
+            self.proxy.add_tag(table_uri='hive://gold.foo_schema/does_not_exist', tag='test')
+
+    def test_owners(self) -> None:
+        self.proxy.add_owner(table_uri=self.other_table_uri, owner='new_owner')
+        self.proxy.delete_owner(table_uri=self.table_uri, owner='tester')
+
+        self.assertEqual(self.proxy.get_table(table_uri=self.table_uri).owners, [])
+        self.assertEqual(repr(self.proxy.get_table(table_uri=self.other_table_uri).owners),
+                         repr([User(email='new_owner')]))
+
+    def test_get_popular_tables(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany('INSERT INTO user_table_relations (user_email, relation, table_key, read_count) '
+                             'VALUES (?, ?, ?, ?)',
+                             [('reader{}'.format(i), 'read', table_uri, 10)
+                              for i in range(11) for table_uri in (self.table_uri, self.other_table_uri)] +
+                             [('reader{}'.format(i), 'read', self.other_table_uri, 10) for i in range(11, 20)])
+        conn.close()
+
+        actual = self.proxy.get_popular_tables(num_entries=1)
+
+        self.assertEqual([(table.name, table.description) for table in actual], [('bar_table', None)])
+        self.assertEqual([table.name for table in self.proxy.get_popular_tables(num_entries=5)],
+                         ['bar_table', 'foo_table'])
+
+    def test_export_tables(self) -> None:
+        actual = list(self.proxy.export_tables(batch_size=1))
+
+        self.assertEqual([table.key for table in actual], [self.other_table_uri, self.table_uri])
+        self.assertEqual(repr(actual[1].tags), repr([Tag(tag_name='test', tag_type='default')]))
+        self.assertEqual(repr(actual[1].owners), repr([User(email='tester')]))
+        self.assertEqual(actual[0].tags, [])
+
+    def test_export_table_keys(self) -> None:
+        self.assertEqual(list(self.proxy.export_table_keys(batch_size=1)), [self.other_table_uri, self.table_uri])
+        self.assertEqual(self.proxy.get_table_count(), 2)
+
+    def test_get_latest_updated_ts(self) -> None:
+        self.assertEqual(self.proxy.get_latest_updated_ts(), 1000)
+
+    def test_get_user_detail(self) -> None:
+        actual = self.proxy.get_user_detail(user_id='tester')
+
+        self.assertEqual(actual.full_name, 'Tester')
+        self.assertEqual(actual.manager_fullname, 'Manager')
+        with self.assertRaises(NotFoundException):
+            self.proxy.get_user_detail(user_id='does_not_exist')
+
+    def test_export_users(self) -> None:
+        actual = list(self.proxy.export_users(batch_size=1))
+
+        self.assertEqual([user.email for user in actual], ['manager', 'tester'])
+        self.assertEqual(actual[1].manager_fullname, 'Manager')
+
+        self.proxy.add_table_relation_by_user(table_uri=self.other_table_uri,
+                                              user_email='follower',
+                                              relation_type=UserResourceRel.follow)
+        self.assertEqual(list(self.proxy.export_user_relations(batch_size=1)),
+                         [('follower', UserResourceRel.follow, [self.other_table_uri]),
+                          ('tester', UserResourceRel.own, [self.table_uri]),
+                          ('tester', UserResourceRel.read, [self.table_uri])])
+
+    def test_table_relation_by_user(self) -> None:
+        self.proxy.add_table_relation_by_user(table_uri=self.other_table_uri,
+                                              user_email='tester',
+                                              relation_type=UserResourceRel.follow)
+
+        actual = self.proxy.get_table_by_user_relation(user_email='tester', relation_type=UserResourceRel.follow)
+        self.assertEqual([table.name for table in actual['table']], ['bar_table'])
+
+        actual = self.proxy.get_table_by_user_relation(user_email='tester', relation_type=UserResourceRel.own)
+        self.assertEqual([table.name for table in actual['table']], ['foo_table'])
+
+        self.proxy.delete_table_relation_by_user(table_uri=self.other_table_uri,
+                                                 user_email='tester',
+                                                 relation_type=UserResourceRel.follow)
+        actual = self.proxy.get_table_by_user_relation(user_email='tester', relation_type=UserResourceRel.follow)
+        self.assertEqual(actual, {'table': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
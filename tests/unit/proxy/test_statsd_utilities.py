@@ -1,14 +1,23 @@
 import unittest
-from mock import patch, MagicMock
+
+from mock import MagicMock, patch
+from neo4j.v1 import GraphDatabase
 from statsd import StatsClient
+
+from metadata_service import config, create_app
 from metadata_service.proxy import statsd_utilities
-from metadata_service.proxy.statsd_utilities import _get_statsd_client
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy.statsd_utilities import _get_statsd_client, init_statsd, timer_with_counter
 
-from flask import current_app
 
-from metadata_service import create_app
-from neo4j.v1 import GraphDatabase
-from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+@timer_with_counter
+def _succeed() -> str:
+    return 'ok'
+
+
+@timer_with_counter
+def _fail() -> None:
+    raise RuntimeError('fail')
 
 
 class TestStatsdUtilities(unittest.TestCase):
@@ -17,45 +26,78 @@ class TestStatsdUtilities(unittest.TestCase):
         self.app_context = self.app.app_context()
         self.app_context.push()
 
-    def test_no_statsd_client(self) -> None:
-        with patch.object(StatsClient, '__init__'):
-            statsd_client = _get_statsd_client(prefix='foo')
-            self.assertIsNone(statsd_client)
-
-    def test_get_statsd_client(self) -> None:
-        with patch.object(current_app, 'config') as mock_config, \
-                patch.object(StatsClient, '__init__', return_value=None) as mock_statsd_init:
-            mock_config.return_value.single.return_value = True
-
-            statsd_client1 = _get_statsd_client(prefix='foo')
-            self.assertIsNotNone(statsd_client1)
-            statsd_client2 = _get_statsd_client(prefix='foo')
-            self.assertIsNotNone(statsd_client2)
-            self.assertEqual(statsd_client1, statsd_client2)
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        statsd_utilities._statsd_client = None
 
-            self.assertEqual(mock_statsd_init.call_count, 1)
-
-            statsd_client3 = _get_statsd_client(prefix='bar')
-            self.assertIsNotNone(statsd_client3)
-            statsd_client4 = _get_statsd_client(prefix='bar')
-            self.assertIsNotNone(statsd_client4)
-            self.assertEqual(statsd_client3, statsd_client4)
-
-            self.assertNotEqual(statsd_client1, statsd_client3)
-            self.assertEqual(mock_statsd_init.call_count, 2)
+    def test_no_statsd_client(self) -> None:
+        with patch.object(StatsClient, '__init__') as mock_statsd_init:
+            init_statsd(self.app)
+
+            self.assertIsNone(_get_statsd_client())
+            self.assertEqual(_succeed(), 'ok')
+            self.assertEqual(mock_statsd_init.call_count, 0)
+
+    def test_all_disabled(self) -> None:
+        self.app.config[config.SERVER_TIMING_ENABLED] = False
+        init_statsd(self.app)
+
+        with patch.object(statsd_utilities, 'get_request_timing') as mock_get_request_timing, \
+                patch.object(statsd_utilities, 'get_metrics') as mock_get_metrics:
+            self.assertEqual(_succeed(), 'ok')
+
+        mock_get_request_timing.assert_not_called()
+        mock_get_metrics.assert_not_called()
+
+    def test_metrics_outside_of_request(self) -> None:
+        self.app.config[config.IS_STATSD_ON] = True
+        init_statsd(self.app)
+        client = _get_statsd_client()
+        self.assertIsInstance(client, StatsClient)
+
+        with patch.object(StatsClient, '_send') as mock_send:
+            _succeed()
+            with self.assertRaises(RuntimeError):
+                _fail()
+
+        sent = [call[0][0] for call in mock_send.call_args_list]
+        self.assertEqual(sent[0], 'tests.unit.proxy.test_statsd_utilities._succeed.success:1|c')
+        self.assertTrue(sent[1].startswith('tests.unit.proxy.test_statsd_utilities._succeed:'))
+        self.assertTrue(sent[1].endswith('|ms'))
+        self.assertEqual(sent[2], 'tests.unit.proxy.test_statsd_utilities._fail.fail:1|c')
+        self.assertEqual(len(sent), 4)
+
+    def test_metrics_batched_per_request(self) -> None:
+        self.app.config[config.IS_STATSD_ON] = True
+        init_statsd(self.app)
+
+        @self.app.route('/statsd_test')
+        def statsd_test() -> str:
+            _succeed()
+            return _succeed()
+
+        with patch.object(StatsClient, '_send') as mock_send:
+            response = self.app.test_client().get('/statsd_test')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_send.call_count, 1)
+        lines = mock_send.call_args[0][0].split('\n')
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], 'tests.unit.proxy.test_statsd_utilities._succeed.success:1|c')
 
     def test_with_neo4j_proxy(self) -> None:
         with patch.object(GraphDatabase, 'driver'), \
                 patch.object(Neo4jProxy, '_execute_cypher_query'), \
-                patch.object(statsd_utilities, '_get_statsd_client') as mock_statsd_client:
+                patch.object(statsd_utilities, '_statsd_client') as mock_statsd_client:
 
             mock_success_incr = MagicMock()
-            mock_statsd_client.return_value.incr = mock_success_incr
+            mock_statsd_client.incr = mock_success_incr
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.add_owner(table_uri='bogus_uri', owner='foo')
 
             self.assertEqual(mock_success_incr.call_count, 1)
+            mock_success_incr.assert_called_with('metadata_service.proxy.neo4j_proxy.add_owner.success')
 
 
 if __name__ == '__main__':
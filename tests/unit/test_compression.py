@@ -0,0 +1,105 @@
+import gzip
+import json
+import unittest
+
+from mock import MagicMock, patch
+
+from metadata_service import compression, config, create_app
+from metadata_service.compression import CompressedBodyCache
+from metadata_service.entity.tag_detail import TagDetail
+
+NUM_TAGS = 200
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.client = self.app.test_client()
+        patcher = patch('metadata_service.api.tag.get_proxy_client')
+        self.mock_proxy = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.mock_proxy.get_tags.return_value = [TagDetail(tag_name='tag{}'.format(i), tag_count=i)
+                                                 for i in range(NUM_TAGS)]
+
+    def tearDown(self) -> None:
+        compression._cache = None
+
+    def test_gzip(self) -> None:
+        response = self.client.get('/tags/', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response.headers['Content-Length']), len(response.data))
+        body = json.loads(gzip.decompress(response.data).decode('utf-8'))
+        self.assertEqual(len(body['tag_usages']), NUM_TAGS)
+
+    def test_not_accepted(self) -> None:
+        for accept_encoding in ('', 'identity', 'gzip;q=0'):
+            response = self.client.get('/tags/', headers={'Accept-Encoding': accept_encoding})
+
+            self.assertNotIn('Content-Encoding', response.headers)
+            self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+            self.assertEqual(len(json.loads(response.data.decode('utf-8'))['tag_usages']), NUM_TAGS)
+
+    def test_small_body(self) -> None:
+        self.mock_proxy.get_tags.return_value = []
+
+        response = self.client.get('/tags/', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertNotIn('Vary', response.headers)
+
+    def test_brotli(self) -> None:
+        mock_brotli = MagicMock()
+        mock_brotli.compress.return_value = b'brotli'
+
+        with patch.object(compression, 'brotli', mock_brotli):
+            response = self.client.get('/tags/', headers={'Accept-Encoding': 'gzip, br'})
+            self.assertEqual(response.headers['Content-Encoding'], 'br')
+            self.assertEqual(response.data, b'brotli')
+
+            # Quality of the client prevails
+            response = self.client.get('/tags/', headers={'Accept-Encoding': 'gzip, br;q=0.5'})
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+
+            self.app.config[config.COMPRESSION_BROTLI_ENABLED] = False
+            response = self.client.get('/tags/', headers={'Accept-Encoding': 'br, gzip'})
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+
+    def test_cached(self) -> None:
+        with patch.object(compression, 'compress', wraps=compression.compress) as mock_compress:
+            first = self.client.get('/tags/', headers={'Accept-Encoding': 'gzip'})
+            second = self.client.get('/tags/', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(mock_compress.call_count, 1)
+        self.assertEqual(first.data, second.data)
+
+    def test_disabled(self) -> None:
+        with patch.object(config.LocalConfig, config.COMPRESSION_ENABLED, False):
+            client = create_app(config_module_class='metadata_service.config.LocalConfig').test_client()
+
+        response = client.get('/tags/', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIsNone(compression._cache)
+
+    def test_compressed_body_cache(self) -> None:
+        cache = CompressedBodyCache(max_bytes=10)
+        cache.put((b'a', 'gzip'), b'1234')
+        cache.put((b'b', 'gzip'), b'1234')
+        cache.get((b'a', 'gzip'))
+        cache.put((b'c', 'gzip'), b'1234')
+        cache.put((b'd', 'gzip'), b'12345678901')
+
+        # Least recently used is evicted, bodies larger than the cache aren't kept
+        self.assertEqual(cache.get((b'a', 'gzip')), b'1234')
+        self.assertIsNone(cache.get((b'b', 'gzip')))
+        self.assertEqual(cache.get((b'c', 'gzip')), b'1234')
+        self.assertIsNone(cache.get((b'd', 'gzip')))
+        self.assertEqual(cache.size, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Column, Statistics, Table, Tag
+from metadata_service.entity.user_detail import User
+
+
+class TestEntity(unittest.TestCase):
+
+    def _column(self, description: str ='description') -> Column:
+        return Column(name='col', description=description, col_type='string', sort_order=0,
+                      stats=[Statistics(stat_type='num_nulls', stat_val='1')])
+
+    def test_slots(self) -> None:
+        column = self._column()
+
+        self.assertFalse(hasattr(column, '__dict__'))
+        with self.assertRaises(AttributeError):
+            column.other = 1  # type: ignore
+
+    def test_eq(self) -> None:
+        self.assertEqual(self._column(), self._column())
+        self.assertNotEqual(self._column(), self._column(description='other'))
+        self.assertNotEqual(Tag(tag_type='default', tag_name='pii'), User(email='pii'))
+        self.assertIn(Tag(tag_type='default', tag_name='pii'), [Tag(tag_type='default', tag_name='pii')])
+
+    def test_to_dict(self) -> None:
+        table = Table(database='hive', cluster='gold', schema='core', name='t', columns=(self._column(),),
+                      tags=[Tag(tag_type='default', tag_name='pii')], last_updated_timestamp=None)
+
+        table_dict = table.to_dict()
+
+        self.assertEqual(table_dict['columns'], [{
+            'name': 'col', 'description': 'description', 'col_type': 'string', 'sort_order': 0,
+            'stats': [{'stat_type': 'num_nulls', 'stat_val': '1', 'start_epoch': None, 'end_epoch': None}],
+        }])
+        self.assertEqual(table_dict['tags'], [{'tag_name': 'pii', 'tag_type': 'default'}])
+        self.assertIsNone(table_dict['table_writer'])
+        self.assertFalse(table_dict['is_view'])
+
+    def test_intern(self) -> None:
+        first = PopularTable(database=''.join(['hi', 've']), cluster='gold', schema='core', name='a')
+        second = PopularTable(database=''.join(['hiv', 'e']), cluster='gold', schema='core', name='b')
+
+        self.assertIs(first.database, second.database)
+        self.assertIsNone(User(email='a').team_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+from collections import Counter
+from http import HTTPStatus
+
+from mock import MagicMock, patch
+
+import metadata_service.proxy
+from metadata_service import config, create_app, hot_keys
+from metadata_service.hot_keys import TABLE_KIND, SpaceSaving, _HotKeys
+from metadata_service.proxy.in_memory_proxy import InMemoryProxy
+from metadata_service.tools.synthetic_catalog import generate_catalog
+
+
+class TestSpaceSaving(unittest.TestCase):
+
+    def test_heavy_hitters(self) -> None:
+        rng = random.Random(1)
+        # Zipf like: key i requested about 1 / (i + 1) of the time of key 0
+        weights = [1 / (i + 1) for i in range(10000)]
+        stream = rng.choices(range(10000), weights=weights, k=50000)
+        sketch = SpaceSaving(200)
+        for key in stream:
+            sketch.add(key)
+
+        self.assertEqual(len(sketch), 200)
+        counts = Counter(stream)
+        top = sketch.top(10)
+        self.assertEqual([hot_key.key for hot_key in top], [key for key, _ in counts.most_common(10)])
+        for hot_key in top:
+            # Never underestimated, overestimated by error at most
+            self.assertGreaterEqual(hot_key.count, counts[hot_key.key])
+            self.assertLessEqual(hot_key.count - hot_key.error, counts[hot_key.key])
+
+    def test_replaces_lowest_count(self) -> None:
+        sketch = SpaceSaving(2)
+        for key in ('a', 'a', 'b', 'c'):
+            sketch.add(key)
+
+        self.assertEqual([tuple(hot_key) for hot_key in sketch.top(2)], [('a', 2, 0), ('c', 2, 1)])
+
+
+class TestHotKeys(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with patch.object(config.LocalConfig, config.HOT_KEYS_ENABLED, True), \
+                patch.object(config.LocalConfig, config.PROXY_EAGER_INIT, False):
+            self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.client = self.app.test_client()
+        self.proxy = InMemoryProxy(catalog=generate_catalog(num_tables=1))
+        metadata_service.proxy._proxy_client = self.proxy
+
+        hot_keys._hot_keys = _HotKeys()
+        # Pinned here rather than by the thread
+        hot_keys._hot_keys.start = MagicMock()  # type: ignore
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+        hot_keys._hot_keys = _HotKeys()
+
+    def test_debug_endpoint(self) -> None:
+        for path, times in (('/table/hive://gold.schema/a', 3), ('/table/hive://gold.schema/b', 1),
+                            ('/table/hive://gold.schema/a/description', 1), ('/user/tester', 2)):
+            for _ in range(times):
+                self.client.get(path)
+        self.client.put('/table/hive://gold.schema/b/description/new')
+
+        response = self.client.get('/debug/hot_keys?limit=1')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, {
+            'tables': [{'key': 'hive://gold.schema/a', 'count': 4, 'error': 0}],
+            'users': [{'key': 'tester', 'count': 2, 'error': 0}],
+        })
+
+    def test_pin_tables(self) -> None:
+        for table in ('a', 'a', 'b', 'c'):
+            self.client.get('/table/hive://gold.schema/{}'.format(table))
+
+        with patch.object(self.proxy, 'pin_tables') as mock_pin_tables:
+            hot_keys._hot_keys.pin_tables(2)
+
+        mock_pin_tables.assert_called_once_with(table_uris=['hive://gold.schema/a', 'hive://gold.schema/b'])
+
+    def test_disabled(self) -> None:
+        with patch.object(config.LocalConfig, config.PROXY_EAGER_INIT, False):
+            client = create_app(config_module_class='metadata_service.config.LocalConfig').test_client()
+
+        client.get('/table/hive://gold.schema/a')
+
+        self.assertEqual(client.get('/debug/hot_keys').status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(hot_keys.get_hot_keys(TABLE_KIND, 10), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
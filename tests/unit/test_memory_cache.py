@@ -0,0 +1,113 @@
+import unittest
+
+from mock import call, patch
+
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.memory_cache import MemoryCache, estimate_size
+from metadata_service.shared_cache import MISSING
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_get_put(self) -> None:
+        cache = MemoryCache('test')
+
+        self.assertIs(cache.get('a'), MISSING)
+        cache.put('a', None)
+        self.assertIsNone(cache.get('a'))
+
+        cache.invalidate('a')
+        self.assertIs(cache.get('a'), MISSING)
+
+    def test_max_entries(self) -> None:
+        cache = MemoryCache('test', max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        # Used, hence evicted after b
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(len(cache), 2)
+
+    def test_max_bytes(self) -> None:
+        value = ['x' * 1000]
+        cache = MemoryCache('test', max_bytes=estimate_size(value) * 2)
+        for key in range(3):
+            cache.put(key, ['{}'.format(key) * 1000])
+
+        self.assertIs(cache.get(0), MISSING)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        cache.put('too_large', ['x' * 10000])
+        self.assertIs(cache.get('too_large'), MISSING)
+
+    def test_given_size(self) -> None:
+        cache = MemoryCache('test', max_bytes=100)
+        with patch('metadata_service.memory_cache.estimate_size') as mock_estimate_size:
+            cache.put('a', ['x' * 1000], size=60)
+            cache.put('b', ['y' * 1000], size=60)
+
+        mock_estimate_size.assert_not_called()
+        self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(cache.size, 60)
+
+    def test_expiry_jitter(self) -> None:
+        cache = MemoryCache('test', expire_sec=60, jitter_sec=10)
+        with patch('metadata_service.memory_cache.time.monotonic', return_value=1000), \
+                patch('metadata_service.memory_cache.random.uniform', return_value=5):
+            cache.put('a', 1)
+        with patch('metadata_service.memory_cache.time.monotonic', return_value=1064):
+            self.assertEqual(cache.get('a'), 1)
+        with patch('metadata_service.memory_cache.time.monotonic', return_value=1066):
+            self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(len(cache), 0)
+
+    def test_decorator(self) -> None:
+        cache = MemoryCache('test')
+        calls = []
+
+        class Proxy:
+            @cache.cached(key=lambda self, num_entries: num_entries)
+            def get_popular(self, num_entries: int) -> list:
+                calls.append(num_entries)
+                return list(range(num_entries))
+
+        self.assertEqual(Proxy().get_popular(2), [0, 1])
+        # Shared by the instances
+        self.assertEqual(Proxy().get_popular(2), [0, 1])
+        self.assertEqual(Proxy().get_popular(3), [0, 1, 2])
+        self.assertEqual(calls, [2, 3])
+        self.assertIs(Proxy.get_popular.cache, cache)  # type: ignore
+
+        cache.clear()
+        Proxy().get_popular(2)
+        self.assertEqual(calls, [2, 3, 2])
+
+    def test_statsd(self) -> None:
+        cache = MemoryCache('test', max_entries=1)
+        with patch('metadata_service.memory_cache.increment') as mock_increment:
+            cache.get('a')
+            cache.put('a', 1)
+            cache.get('a')
+            cache.put('b', 2)
+
+        self.assertEqual(mock_increment.call_args_list, [
+            call('metadata_service.memory_cache.test.miss'),
+            call('metadata_service.memory_cache.test.hit'),
+            call('metadata_service.memory_cache.test.eviction'),
+        ])
+
+    def test_estimate_size(self) -> None:
+        tags = [TagDetail(tag_name='tag{}'.format(i), tag_count=i) for i in range(100)]
+
+        self.assertGreater(estimate_size(tags), estimate_size(tags[:10]) * 5)
+        self.assertGreater(estimate_size(tags[0]), estimate_size('tag0'))
+        shared = 'x' * 1000
+        self.assertLess(estimate_size([shared, shared]), 2 * estimate_size(shared))
+
+
+if __name__ == '__main__':
+    unittest.main()
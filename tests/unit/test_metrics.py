@@ -0,0 +1,115 @@
+import multiprocessing
+import shutil
+import tempfile
+import textwrap
+import unittest
+
+from mock import patch
+
+from metadata_service import config, create_app, metrics
+from metadata_service.metrics import CONTENT_TYPE, MetricsRegistry, init_metrics
+
+
+def _increment_in_child(multiprocess_dir: str) -> None:
+    registry = MetricsRegistry(multiprocess_dir=multiprocess_dir)
+    registry.counter('requests_total', 'Requests', ('route',)).inc(2, route='/tags/')
+    registry.gauge('in_flight', 'In flight').inc()
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.multiprocess_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.multiprocess_dir)
+
+    def test_exposition(self) -> None:
+        registry = MetricsRegistry()
+        requests = registry.counter('requests_total', 'Requests', ('route',))
+        in_flight = registry.gauge('in_flight', 'In flight')
+        latency = registry.histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+
+        requests.inc(route='/tags/')
+        requests.inc(route='/table/<path:table_uri>')
+        requests.inc(route='/tags/')
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+        latency.observe(0.05, route='/tags/')
+        latency.observe(0.1, route='/tags/')
+        latency.observe(0.5, route='/tags/')
+        latency.observe(3, route='/tags/')
+
+        self.assertEqual(registry.exposition(), textwrap.dedent("""\
+        # HELP requests_total Requests
+        # TYPE requests_total counter
+        requests_total{route="/table/<path:table_uri>"} 1.0
+        requests_total{route="/tags/"} 2.0
+        # HELP in_flight In flight
+        # TYPE in_flight gauge
+        in_flight 1.0
+        # HELP latency_seconds Latency
+        # TYPE latency_seconds histogram
+        latency_seconds_bucket{route="/tags/",le="0.1"} 2.0
+        latency_seconds_bucket{route="/tags/",le="1.0"} 3.0
+        latency_seconds_bucket{route="/tags/",le="+Inf"} 4.0
+        latency_seconds_sum{route="/tags/"} 3.65
+        latency_seconds_count{route="/tags/"} 4.0
+        """))
+
+    def test_multiprocess(self) -> None:
+        child = multiprocessing.Process(target=_increment_in_child, args=(self.multiprocess_dir,))
+        child.start()
+        child.join()
+
+        registry = MetricsRegistry(multiprocess_dir=self.multiprocess_dir)
+        requests = registry.counter('requests_total', 'Requests', ('route',))
+        registry.gauge('in_flight', 'In flight').inc()
+        requests.inc(route='/tags/')
+        # Enough keys to grow the file beyond its initial size
+        for i in range(2000):
+            requests.inc(route='/table/{}'.format(i))
+
+        exposition = registry.exposition()
+
+        # Counters of the exited child are summed, its gauges are not
+        self.assertIn('requests_total{route="/tags/"} 3.0\n', exposition)
+        self.assertIn('requests_total{route="/table/1999"} 1.0\n', exposition)
+        self.assertIn('in_flight 1.0\n', exposition)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+
+    def tearDown(self) -> None:
+        metrics._metrics = None
+
+    def test_disabled(self) -> None:
+        self.assertEqual(self.app.test_client().get('/metrics').status_code, 404)
+
+    def test_metrics(self) -> None:
+        self.app.config[config.METRICS_ENABLED] = True
+        init_metrics(self.app)
+        client = self.app.test_client()
+
+        with patch('metadata_service.api.tag.get_proxy_client') as mock_proxy:
+            mock_proxy.return_value.get_tags.return_value = []
+            client.get('/tags/')
+        client.get('/does_not_exist')
+        response = client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+        exposition = response.get_data(as_text=True)
+        self.assertIn('metadata_requests_total{route="/tags/",method="GET",status="200"} 1.0\n', exposition)
+        self.assertIn('metadata_requests_total{route="<unmatched>",method="GET",status="404"} 1.0\n', exposition)
+        self.assertIn('metadata_request_latency_seconds_count{route="/tags/",method="GET"} 1.0\n', exposition)
+        # The request serving /metrics is in flight
+        self.assertIn('metadata_requests_in_flight 1.0\n', exposition)
+
+
+if __name__ == '__main__':
+    unittest.main()
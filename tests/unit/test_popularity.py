@@ -0,0 +1,79 @@
+import unittest
+
+from mock import patch
+
+from metadata_service.popularity import DecayedPopularity, PopularityUpdater, graph_popularity_scores, np
+
+DAY_SEC = 24 * 60 * 60
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestDecayedPopularity(unittest.TestCase):
+
+    def test_decay(self) -> None:
+        popularity = DecayedPopularity(half_life_sec=30 * DAY_SEC, now=0)
+        popularity.add_reads(['old', 'recent'], [100, 10], at=0)
+        popularity.add_reads(['recent', 'recent'], [30, 30], at=30 * DAY_SEC)
+
+        self.assertEqual(popularity.top(2), ['recent', 'old'])
+        scores = popularity.scores(now=30 * DAY_SEC)
+        self.assertAlmostEqual(scores['old'], 50)
+        self.assertAlmostEqual(scores['recent'], 65)
+
+    def test_update_read_counts(self) -> None:
+        popularity = DecayedPopularity(half_life_sec=DAY_SEC, now=0)
+        popularity.update_read_counts(['a', 'b'], [100, 10], at=0)
+        # Lower read count of a, e.g. relations removed: not counted, the next increase is counted from 50
+        popularity.update_read_counts(['a', 'b', 'c'], [50, 10, 5], at=DAY_SEC)
+        popularity.update_read_counts(['a'], [60], at=DAY_SEC)
+
+        scores = popularity.scores(now=DAY_SEC)
+        self.assertAlmostEqual(scores['a'], 60)
+        self.assertAlmostEqual(scores['b'], 5)
+        self.assertAlmostEqual(scores['c'], 5)
+        self.assertEqual(len(popularity), 3)
+
+    def test_top(self) -> None:
+        popularity = DecayedPopularity(half_life_sec=DAY_SEC, now=0)
+        table_keys = ['table{}'.format(i) for i in range(5000)]
+        popularity.add_reads(table_keys, range(5000), at=0)
+
+        self.assertEqual(popularity.top(3), ['table4999', 'table4998', 'table4997'])
+        self.assertEqual(popularity.top(2), ['table4999', 'table4998'])
+        # Never read
+        self.assertNotIn('table0', popularity.top(5000))
+        self.assertEqual(len(popularity.top(10000)), 4999)
+
+        popularity.add_reads(['table0'], [10000], at=0)
+        self.assertEqual(popularity.top(1), ['table0'])
+
+    def test_reference_time_moved(self) -> None:
+        popularity = DecayedPopularity(half_life_sec=1, now=0)
+        popularity.add_reads(['a'], [1], at=0)
+        # exp(ln(2) * 1000) overflows float64 without moving the reference time
+        popularity.add_reads(['b'], [1], at=1000)
+        popularity.add_reads(['a'], [2], at=1000)
+
+        self.assertEqual(popularity.top(2), ['a', 'b'])
+        self.assertAlmostEqual(popularity.scores(now=1001)['b'], 0.5)
+
+    def test_graph_popularity_scores(self) -> None:
+        scores = graph_popularity_scores([20, 5, 11], [100, 1000, 1])
+
+        self.assertAlmostEqual(scores[0], 20 * np.log(100))
+        self.assertEqual(scores[1], 0)
+        self.assertEqual(scores[2], 0)
+
+    def test_updater(self) -> None:
+        popularity = DecayedPopularity(half_life_sec=DAY_SEC)
+        updater = PopularityUpdater(popularity, lambda: (['a', 'b'], [1, 2]), interval_sec=60)
+
+        with patch.object(updater.stop_event, 'wait', side_effect=lambda timeout: updater.stop_event.set()):
+            updater.run()
+
+        self.assertTrue(updater.updated.is_set())
+        self.assertEqual(popularity.top(2), ['b', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
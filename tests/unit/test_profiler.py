@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import unittest
+from http import HTTPStatus
+
+from mock import patch
+
+from metadata_service import config, create_app
+from metadata_service.profiler import PROFILE_ID_HEADER
+
+
+class TestRequestProfiler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.profile_dir = tempfile.mkdtemp()
+        self.app.config[config.REQUEST_PROFILER_ENABLED] = True
+        self.app.config[config.REQUEST_PROFILER_DIR] = self.profile_dir
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.profile_dir)
+
+    def _get_tags(self, **kwargs: str) -> str:
+        with patch('metadata_service.api.tag.get_proxy_client') as mock_proxy:
+            mock_proxy.return_value.get_tags.return_value = []
+            response = self.client.get('/tags/', headers=kwargs)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.headers.get(PROFILE_ID_HEADER)
+
+    def test_profile_on_header(self) -> None:
+        self.assertIsNone(self._get_tags())
+        profile_id = self._get_tags(**{'X-Metadata-Profile': '1'})
+        self.assertIsNotNone(profile_id)
+
+        profiles = self.client.get('/debug/profiles').get_json()['profiles']
+        self.assertEqual([(p['profile_id'], p['method'], p['path'], p['status']) for p in profiles],
+                         [(profile_id, 'GET', '/tags/', 200)])
+
+        response = self.client.get('/debug/profiles/{}'.format(profile_id))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.mimetype, 'application/octet-stream')
+
+        response = self.client.get('/debug/profiles/{}?format=text'.format(profile_id))
+        self.assertIn('tag.py', response.get_data(as_text=True))
+
+        self.assertEqual(self.client.get('/debug/profiles/0-does-not-exist').status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(self.client.get('/debug/profiles/..%2F..%2Fetc').status_code, HTTPStatus.NOT_FOUND)
+
+    def test_sampling_and_retention(self) -> None:
+        self.app.config[config.REQUEST_PROFILER_SAMPLE_RATE] = 1.0
+        self.app.config[config.REQUEST_PROFILER_MAX_PROFILES] = 2
+
+        profile_ids = [self._get_tags() for _ in range(3)]
+
+        profiles = self.client.get('/debug/profiles').get_json()['profiles']
+        self.assertEqual([p['profile_id'] for p in profiles], sorted(profile_ids, reverse=True)[:2])
+
+    def test_disabled(self) -> None:
+        self.app.config[config.REQUEST_PROFILER_ENABLED] = False
+
+        self.assertIsNone(self._get_tags(**{'X-Metadata-Profile': '1'}))
+        self.assertEqual(self.client.get('/debug/profiles').status_code, HTTPStatus.NOT_FOUND)
+
+
+if __name__ == '__main__':
+    unittest.main()
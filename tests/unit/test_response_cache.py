@@ -0,0 +1,156 @@
+import gzip
+import json
+import unittest
+from http import HTTPStatus
+
+from mock import patch
+
+import metadata_service.proxy
+from metadata_service import compression, config, create_app, response_cache
+from metadata_service.proxy.in_memory_proxy import InMemoryProxy
+from metadata_service.response_cache import ResponseCache
+from metadata_service.tools.synthetic_catalog import generate_catalog, table_key
+
+
+class TestResponseCacheEntries(unittest.TestCase):
+
+    def test_evicted_by_size(self) -> None:
+        cache = ResponseCache(max_bytes=25, expire_sec=60)
+        cache.put('/a', b'a' * 10, 'application/json', [])
+        cache.put('/b', b'b' * 10, 'application/json', [])
+        # Used, hence evicted after /b
+        cache.get('/a')
+        cache.put('/c', b'c' * 10, 'application/json', [])
+
+        self.assertIsNotNone(cache.get('/a'))
+        self.assertIsNone(cache.get('/b'))
+        self.assertEqual(cache.size, 20)
+
+        cache.put('/too_large', b'd' * 26, 'application/json', [])
+        self.assertIsNone(cache.get('/too_large'))
+
+    def test_variants_counted(self) -> None:
+        cache = ResponseCache(max_bytes=25, expire_sec=60)
+        cache.put('/a', b'a' * 10, 'application/json', [])
+        cache.put('/b', b'b' * 10, 'application/json', [])
+
+        cache.add_variant('/b', cache.get('/b'), compression.GZIP, b'z' * 6)  # type: ignore
+
+        self.assertIsNone(cache.get('/a'))
+        self.assertEqual(cache.get('/b').variants, {compression.GZIP: b'z' * 6})  # type: ignore
+        self.assertEqual(cache.size, 16)
+
+    def test_expired(self) -> None:
+        cache = ResponseCache(max_bytes=100, expire_sec=60)
+        with patch('metadata_service.response_cache.time.monotonic', return_value=1000):
+            cache.put('/a', b'a', 'application/json', [])
+        with patch('metadata_service.response_cache.time.monotonic', return_value=1061):
+            self.assertIsNone(cache.get('/a'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_invalidate(self) -> None:
+        cache = ResponseCache(max_bytes=100, expire_sec=60)
+        cache.put('/a', b'a', 'application/json', [('table', 'a')])
+        cache.put('/a?x=1', b'a', 'application/json', [('table', 'a')])
+        cache.put('/b', b'b', 'application/json', [('table', 'b')])
+
+        cache.invalidate(('table', 'a'))
+
+        self.assertIsNone(cache.get('/a'))
+        self.assertIsNone(cache.get('/a?x=1'))
+        self.assertIsNotNone(cache.get('/b'))
+        self.assertEqual(cache.size, 1)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with patch.object(config.LocalConfig, config.RESPONSE_CACHE_ENABLED, True), \
+                patch.object(config.LocalConfig, config.PROXY_EAGER_INIT, False):
+            self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.client = self.app.test_client()
+
+        self.proxy = InMemoryProxy(catalog=generate_catalog(num_tables=20, min_columns=20, max_columns=20, seed=1))
+        metadata_service.proxy._proxy_client = self.proxy
+        self.table_uri = table_key(database='hive', cluster='gold', schema='schema1', name='table1')
+        self.table_path = '/table/{}'.format(self.table_uri)
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+        response_cache._cache = None
+        compression._cache = None
+
+    def test_served_from_cache(self) -> None:
+        with patch.object(self.proxy, 'get_table', wraps=self.proxy.get_table) as mock_get_table:
+            first = self.client.get(self.table_path)
+            second = self.client.get(self.table_path)
+
+        self.assertEqual(first.status_code, HTTPStatus.OK)
+        self.assertEqual(second.status_code, HTTPStatus.OK)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second.mimetype, 'application/json')
+        mock_get_table.assert_called_once_with(table_uri=self.table_uri)
+
+    def test_compressed_variant(self) -> None:
+        self.client.get(self.table_path)
+
+        with patch.object(compression, 'compress', wraps=compression.compress) as mock_compress:
+            first = self.client.get(self.table_path, headers={'Accept-Encoding': 'gzip'})
+            second = self.client.get(self.table_path, headers={'Accept-Encoding': 'gzip'})
+        identity = self.client.get(self.table_path)
+
+        self.assertEqual(mock_compress.call_count, 1)
+        for response in (first, second):
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+            self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+            self.assertEqual(gzip.decompress(response.data), identity.data)
+        self.assertNotIn('Content-Encoding', identity.headers)
+
+    def test_not_cached(self) -> None:
+        with patch.object(self.proxy, 'get_table', wraps=self.proxy.get_table) as mock_get_table:
+            for _ in range(2):
+                self.assertEqual(self.client.get('/table/hive://gold.schema1/does_not_exist').status_code,
+                                 HTTPStatus.NOT_FOUND)
+        self.assertEqual(mock_get_table.call_count, 2)
+
+        with patch.object(self.proxy, 'get_table_description',
+                          wraps=self.proxy.get_table_description) as mock_get_table_description:
+            for _ in range(2):
+                self.client.get('{}/description'.format(self.table_path))
+        self.assertEqual(mock_get_table_description.call_count, 2)
+
+    def test_invalidated_by_writes(self) -> None:
+        self.client.get(self.table_path)
+        self.client.get('/popular_tables/')
+        self.client.get('/tags/')
+
+        self.client.put('{}/description/new description'.format(self.table_path))
+        table = json.loads(self.client.get(self.table_path).data.decode('utf-8'))
+        self.assertEqual(table['table_description'], 'new description')
+
+        with patch.object(self.proxy, 'get_popular_tables', wraps=self.proxy.get_popular_tables) as mock_popular, \
+                patch.object(self.proxy, 'get_tags', wraps=self.proxy.get_tags) as mock_get_tags:
+            self.client.get('/popular_tables/')
+            self.client.get('/tags/')
+            self.client.put('{}/tag/new_tag'.format(self.table_path))
+            tags = json.loads(self.client.get('/tags/').data.decode('utf-8'))
+
+        mock_popular.assert_called_once_with()
+        mock_get_tags.assert_called_once_with()
+        self.assertIn('new_tag', [tag['tag_name'] for tag in tags['tag_usages']])
+
+    def test_disabled(self) -> None:
+        with patch.object(config.LocalConfig, config.PROXY_EAGER_INIT, False):
+            app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        client = app.test_client()
+
+        with patch.object(self.proxy, 'get_table', wraps=self.proxy.get_table) as mock_get_table:
+            client.get(self.table_path)
+            client.get(self.table_path)
+
+        self.assertEqual(mock_get_table.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
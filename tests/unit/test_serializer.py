@@ -0,0 +1,82 @@
+import json
+import unittest
+from typing import Any, Mapping
+
+import flask_restful
+from flask_restful import fields
+from flask_restful.fields import MarshallingException
+
+from metadata_service.api.popular_tables import popular_tables_fields
+from metadata_service.api.table import table_detail_fields
+from metadata_service.api.tag import tag_usage_fields
+from metadata_service.api.user import table_list_fields, user_detail_fields
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.entity.table_detail import Column, Table
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.serializer import compile_serializer, marshal
+from metadata_service.tools.synthetic_catalog import generate_catalog
+
+
+class UpperString(fields.Raw):
+    def format(self, value: Any) -> str:
+        return str(value).upper()
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.catalog = generate_catalog(num_tables=5, min_columns=1, max_columns=20, num_users=10)
+
+    def assertSameAsMarshal(self, data: Any, fields_def: Mapping[str, Any], envelope: str =None) -> None:
+        self.assertEqual(json.dumps(marshal(data, fields_def, envelope)),
+                         json.dumps(flask_restful.marshal(data, fields_def, envelope)))
+
+    def test_api_fields(self) -> None:
+        for table in self.catalog.tables.values():
+            self.assertSameAsMarshal(table, table_detail_fields)
+        for user in self.catalog.users.values():
+            self.assertSameAsMarshal(user, user_detail_fields)
+
+        popular_tables = [PopularTable(database='hive', cluster='gold', schema='core', name=str(i)) for i in range(3)]
+        self.assertSameAsMarshal({'popular_tables': popular_tables}, popular_tables_fields)
+        self.assertSameAsMarshal({'table': popular_tables}, table_list_fields)
+        self.assertSameAsMarshal({'table': []}, table_list_fields)
+        self.assertSameAsMarshal({'tag_usages': [TagDetail(tag_name='pii', tag_count=3)]}, tag_usage_fields)
+
+    def test_missing_values(self) -> None:
+        # Nested objects which are None are output with null values, Integers with 0
+        table = Table(database='hive', cluster='gold', schema='core', name='t', columns=(),
+                      last_updated_timestamp=None)
+        self.assertSameAsMarshal(table, table_detail_fields)
+        self.assertSameAsMarshal(None, table_detail_fields)
+        self.assertSameAsMarshal({}, table_detail_fields)
+        self.assertSameAsMarshal([table, None], table_detail_fields, envelope='tables')
+
+    def test_other_fields(self) -> None:
+        other_fields = {
+            'upper': UpperString(attribute='name'),
+            'dotted': fields.String(attribute='col_type.upper'),
+            'callable': fields.Integer(attribute=lambda column: column.sort_order * 2),
+            'names': fields.List(fields.String, attribute='stats'),
+            'nullable': fields.Nested({'name': fields.String}, allow_null=True, attribute='missing'),
+            'default': fields.Nested({'name': fields.String}, default={}, attribute='missing'),
+            'flat': {'name': fields.String, 'type': fields.String(attribute='col_type')},
+            'stats': fields.List(fields.Nested({'stat_type': fields.String})),
+        }
+        column = Column(name='col', description=None, col_type='string', sort_order=3, stats=['a', 'b'])  # type: ignore
+        self.assertSameAsMarshal(column, other_fields)
+        column.stats = {'not', 'a', 'list'}
+        self.assertSameAsMarshal(column, other_fields)
+
+    def test_errors(self) -> None:
+        column = Column(name='col', description=None, col_type='string', sort_order='first', stats=())  # type: ignore
+
+        with self.assertRaises(MarshallingException):
+            marshal(column, {'sort_order': fields.Integer})
+
+    def test_compiled_once(self) -> None:
+        self.assertIs(compile_serializer(table_detail_fields), compile_serializer(table_detail_fields))
+
+
+if __name__ == '__main__':
+    unittest.main()
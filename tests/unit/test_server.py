@@ -0,0 +1,71 @@
+import unittest
+
+from mock import MagicMock, patch
+
+import metadata_service.proxy
+from metadata_service import config, create_app
+from metadata_service.proxy.in_memory_proxy import InMemoryProxy
+from metadata_service.server import gunicorn_options, post_fork, post_worker_init
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app.config[config.PROXY_CLIENT] = 'metadata_service.proxy.in_memory_proxy.InMemoryProxy'
+        self.app.config[config.PROXY_CLIENT_KWARGS] = {'synthetic': {'num_tables': 10}}
+        metadata_service.proxy._proxy_client = None
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+
+    def test_gunicorn_options(self) -> None:
+        self.app.config[config.SERVER_WORKERS] = 3
+        self.app.config[config.SERVER_ACCESS_LOG] = ''
+
+        options = gunicorn_options(self.app)
+
+        self.assertEqual(options['workers'], 3)
+        self.assertEqual(options['worker_class'], 'gthread')
+        self.assertIsNone(options['accesslog'])
+        self.assertTrue(options['preload_app'])
+
+        self.app.config[config.SERVER_WORKER_CLASS] = 'sync'
+        with self.assertRaises(ValueError):
+            gunicorn_options(self.app)
+
+    def test_post_fork(self) -> None:
+        with self.app.app_context():
+            inherited = metadata_service.proxy.get_proxy_client()
+
+        post_fork(MagicMock(), MagicMock())
+
+        with self.app.app_context():
+            self.assertIsNot(metadata_service.proxy.get_proxy_client(), inherited)
+
+    def test_warm_up(self) -> None:
+        self.app.config[config.SERVER_THREADS] = 2
+        self.app.config[config.SERVER_WARMUP_PATHS] = ('/tags/', '/does_not_exist')
+
+        with patch.object(InMemoryProxy, 'get_tags', wraps=lambda: []) as mock_get_tags:
+            post_worker_init(MagicMock(wsgi=self.app))
+
+        self.assertIsInstance(metadata_service.proxy._proxy_client, InMemoryProxy)
+        self.assertEqual(mock_get_tags.call_count, 2)
+
+    def test_no_proxy_client_in_master(self) -> None:
+        with patch.object(config.LocalConfig, config.PROXY_CLIENT,
+                          'metadata_service.proxy.in_memory_proxy.InMemoryProxy'):
+            app = create_app(config_module_class='metadata_service.config.LocalConfig', proxy_eager_init=False)
+        self.assertIsNone(metadata_service.proxy._proxy_client)
+
+        app.config[config.SERVER_WARMUP_PATHS] = ()
+        with patch.object(InMemoryProxy, 'check_connectivity') as mock_check_connectivity:
+            post_worker_init(MagicMock(wsgi=app))
+
+        self.assertIsInstance(metadata_service.proxy._proxy_client, InMemoryProxy)
+        mock_check_connectivity.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
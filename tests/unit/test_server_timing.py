@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+import metadata_service.proxy
+from metadata_service import config, create_app
+from metadata_service.proxy.sqlite_proxy import SqliteProxy
+from metadata_service.server_timing import SERVER_TIMING_HEADER, RequestTiming
+from metadata_service.tools.sqlite_loader import load_graph_dump
+
+
+class TestServerTiming(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        with self.app.app_context():
+            proxy = SqliteProxy(host=self.path)
+            with proxy._connection() as conn:
+                load_graph_dump(nodes={'Tag': {'pii': {'tag_type': 'default'}}}, relations={}, conn=conn)
+
+        self.app.config[config.PROXY_CLIENT] = 'metadata_service.proxy.sqlite_proxy.SqliteProxy'
+        self.app.config[config.PROXY_HOST] = self.path
+        metadata_service.proxy._proxy_client = None
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+        os.remove(self.path)
+
+    def test_header(self) -> None:
+        response = self.app.test_client().get('/tags/')
+
+        self.assertEqual(response.status_code, 200)
+        metrics = [metric.split(';')[0] for metric in response.headers[SERVER_TIMING_HEADER].split(', ')]
+        self.assertEqual(metrics, ['query.get_tags', 'entity', 'marshal', 'total'])
+
+    def test_disabled(self) -> None:
+        self.app.config[config.SERVER_TIMING_ENABLED] = False
+
+        response = self.app.test_client().get('/tags/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(SERVER_TIMING_HEADER, response.headers)
+
+    def test_request_timing(self) -> None:
+        timing = RequestTiming()
+        self.assertEqual(timing.caller(), 'query')
+
+        timing.enter_call('get_table')
+        timing.enter_call('_exec_col_query')
+        timing.add_query(timing.caller(), 0.010)
+        timing.exit_call(0.012)
+        self.assertEqual(timing.caller(), 'get_table')
+        timing.add_query(timing.caller(), 0.001)
+        timing.add_query(timing.caller(), 0.002)
+        timing.exit_call(0.020)
+        timing.marshal_sec = 0.004
+
+        metrics = timing.header_value().split(', ')
+        self.assertEqual(metrics[:4], ['query._exec_col_query;dur=10.000', 'query.get_table;dur=3.000',
+                                       'entity;dur=7.000', 'marshal;dur=4.000'])
+        self.assertTrue(metrics[4].startswith('total;dur='))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from mock import patch
+
+from metadata_service.entity.table_detail import Column, Table
+from metadata_service.shared_cache import MISSING, SharedCache
+
+
+def _put_in_child(directory: str) -> None:
+    SharedCache(directory, max_bytes=1024 * 1024).put('child', 'from child')
+
+
+class TestSharedCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = os.path.join(temp_dir.name, 'cache')
+        self.cache = SharedCache(self.directory, max_bytes=1024 * 1024)
+
+    def test_get_put(self) -> None:
+        table = Table(database='hive', cluster='gold', schema='foo_schema', name='foo_table',
+                      columns=[Column(name='bar', description=None, col_type='int', sort_order=0)],
+                      last_updated_timestamp=1)
+
+        self.assertIs(self.cache.get('table'), MISSING)
+        self.cache.put('table', table)
+        self.cache.put('none', None)
+
+        self.assertEqual(self.cache.get('table'), table)
+        self.assertIsNone(self.cache.get('none'))
+        # No temporary file left
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+        self.cache.delete('table')
+        self.assertIs(self.cache.get('table'), MISSING)
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_expire(self) -> None:
+        self.cache.put('key', 'value', expire_sec=10)
+
+        with patch('metadata_service.shared_cache.time.time', return_value=time.time() + 11):
+            self.assertIs(self.cache.get('key'), MISSING)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_expired_entry_replaced_while_read(self) -> None:
+        self.cache.put('key', 'old', expire_sec=10)
+        fstat = os.fstat
+        replaced = []
+
+        def replace_after_read(fd: int) -> os.stat_result:
+            # Another process puts a fresh value between the read of the expired entry and its removal
+            stat = fstat(fd)
+            if not replaced:
+                replaced.append(True)
+                SharedCache(self.directory, max_bytes=1024 * 1024).put('key', 'new', expire_sec=1000)
+            return stat
+
+        with patch('metadata_service.shared_cache.time.time', return_value=time.time() + 11), \
+                patch('metadata_service.shared_cache.os.fstat', side_effect=replace_after_read):
+            self.assertIs(self.cache.get('key'), MISSING)
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_shared_across_processes(self) -> None:
+        process = multiprocessing.get_context('spawn').Process(target=_put_in_child, args=(self.directory,))
+        process.start()
+        process.join()
+
+        self.assertEqual(self.cache.get('child'), 'from child')
+
+    def test_unreadable_entry(self) -> None:
+        self.cache.put('key', 'value')
+        path = os.path.join(self.directory, os.listdir(self.directory)[0])
+        with open(path, 'r+b') as f:
+            f.truncate(12)
+
+        self.assertIs(self.cache.get('key'), MISSING)
+        self.assertFalse(os.path.exists(path))
+
+    def test_max_bytes(self) -> None:
+        cache = SharedCache(self.directory, max_bytes=8 * 1000)
+        for i in range(20):
+            cache.put('key{}'.format(i), b'x' * 900)
+            # Least recently written are removed first
+            os.utime(cache._path('key{}'.format(i)), (i, i))
+
+        cache.sweep()
+
+        sizes = [os.path.getsize(os.path.join(self.directory, name)) for name in os.listdir(self.directory)]
+        self.assertLessEqual(sum(sizes), 8 * 1000)
+        self.assertEqual(cache.get('key19'), b'x' * 900)
+        self.assertIs(cache.get('key0'), MISSING)
+
+        # Larger than the cache
+        cache.put('large', b'x' * 9000)
+        self.assertIs(cache.get('large'), MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
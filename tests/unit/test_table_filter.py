@@ -0,0 +1,130 @@
+import os
+import unittest
+from http import HTTPStatus
+
+from mock import patch
+
+import metadata_service.proxy
+from metadata_service import config, create_app, table_filter
+from metadata_service.proxy.in_memory_proxy import InMemoryProxy
+from metadata_service.table_filter import BloomFilter, _TableFilter
+from metadata_service.tools.synthetic_catalog import generate_catalog, table_key
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negative(self) -> None:
+        bloom_filter = BloomFilter.for_capacity(10000, false_positive_rate=0.01, max_bytes=1024 * 1024)
+        keys = ['hive://gold.schema{}/table{}'.format(i % 10, i) for i in range(10000)]
+        for key in keys:
+            bloom_filter.add(key)
+
+        self.assertTrue(all(key in bloom_filter for key in keys))
+        false_positives = sum('hive://gold.schema/missing{}'.format(i) in bloom_filter for i in range(10000))
+        self.assertLess(false_positives, 200)
+        # About 9.6 bits per key for 1%
+        self.assertLess(bloom_filter.size_bytes, 13000)
+
+    def test_max_bytes(self) -> None:
+        bloom_filter = BloomFilter.for_capacity(10000, false_positive_rate=0.01, max_bytes=1000)
+
+        self.assertEqual(bloom_filter.size_bytes, 1000)
+        bloom_filter.add('a')
+        self.assertIn('a', bloom_filter)
+
+
+class TestTableFilter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with patch.object(config.LocalConfig, config.TABLE_FILTER_ENABLED, True), \
+                patch.object(config.LocalConfig, config.PROXY_EAGER_INIT, False):
+            self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.client = self.app.test_client()
+
+        self.catalog = generate_catalog(num_tables=20, min_columns=1, max_columns=1, seed=1)
+        self.proxy = InMemoryProxy(catalog=self.catalog)
+        metadata_service.proxy._proxy_client = self.proxy
+        self.table_uri = table_key(database='hive', cluster='gold', schema='schema1', name='table1')
+
+        # Built here rather than by the thread
+        table_filter._table_filter = _TableFilter()
+        table_filter._table_filter.pid = os.getpid()
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+        table_filter._table_filter = _TableFilter()
+
+    def test_not_built(self) -> None:
+        with patch.object(self.proxy, 'get_table', wraps=self.proxy.get_table) as mock_get_table:
+            response = self.client.get('/table/hive://gold.schema1/does_not_exist')
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        mock_get_table.assert_called_once_with(table_uri='hive://gold.schema1/does_not_exist')
+
+    def test_missing_table(self) -> None:
+        with patch.object(self.proxy, 'export_tables') as mock_export_tables:
+            table_filter._table_filter.build(self.app)
+        # Keys only
+        mock_export_tables.assert_not_called()
+
+        with patch.object(self.proxy, 'get_table', wraps=self.proxy.get_table) as mock_get_table, \
+                patch.object(self.proxy, 'get_column_description') as mock_get_column_description:
+            self.assertEqual(self.client.get('/table/{}'.format(self.table_uri)).status_code, HTTPStatus.OK)
+            self.assertEqual(self.client.get('/table/hive://gold.schema1/does_not_exist').status_code,
+                             HTTPStatus.NOT_FOUND)
+            self.assertEqual(self.client.get('/table/hive://gold.schema1/does_not_exist/column/col0/description')
+                             .status_code, HTTPStatus.NOT_FOUND)
+
+        mock_get_table.assert_called_once_with(table_uri=self.table_uri)
+        mock_get_column_description.assert_not_called()
+
+    def test_ingested_table_found(self) -> None:
+        table_filter._table_filter.build(self.app)
+        # Ingested after the filter was built
+        new_table_uri = table_key(database='hive', cluster='gold', schema='schema1', name='ingested_table')
+        self.catalog.tables[new_table_uri] = self.catalog.tables[self.table_uri]
+        latest_updated_ts = self.proxy.get_latest_updated_ts() + 1
+
+        with patch.object(self.proxy, 'get_latest_updated_ts', return_value=latest_updated_ts):
+            self.assertEqual(self.client.get('/table/{}'.format(new_table_uri)).status_code, HTTPStatus.OK)
+            self.assertEqual(self.client.get('/table/hive://gold.schema1/does_not_exist').status_code,
+                             HTTPStatus.NOT_FOUND)
+
+        # Added to the filter once found, and not read if missing
+        self.assertIn(new_table_uri, table_filter._table_filter.bloom_filter)  # type: ignore
+        self.assertNotIn('hive://gold.schema1/does_not_exist', table_filter._table_filter.bloom_filter)  # type: ignore
+
+    def test_updated_table_added(self) -> None:
+        table_filter._table_filter.build(self.app)
+        # Ingested after the filter was built
+        new_table_uri = table_key(database='hive', cluster='gold', schema='schema1', name='new_table')
+        self.catalog.tables[new_table_uri] = self.catalog.tables[self.table_uri]
+        self.assertEqual(self.client.get('/table/{}'.format(new_table_uri)).status_code, HTTPStatus.NOT_FOUND)
+
+        response = self.client.put('/table/{}/description/new'.format(new_table_uri))
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(self.client.get('/table/{}'.format(new_table_uri)).status_code, HTTPStatus.OK)
+
+    def test_rebuilt_on_ingestion(self) -> None:
+        filter_ = table_filter._table_filter
+        check_count = [0]
+
+        def stop_after_checks(timeout: float) -> bool:
+            check_count[0] += 1
+            if check_count[0] == 3:
+                filter_.stop_event.set()
+            return filter_.stop_event.is_set()
+
+        # Catalog updated by an ingestion after the second check
+        with patch.object(filter_.stop_event, 'wait', side_effect=stop_after_checks), \
+                patch.object(filter_, 'build', wraps=filter_.build) as mock_build, \
+                patch.object(self.proxy, 'get_latest_updated_ts', side_effect=lambda: check_count[0] >= 2):
+            filter_.run(self.app)
+
+        # On start, then once the catalog was updated
+        self.assertEqual(mock_build.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from metadata_service.tools.import_time import CREATE_APP_STATEMENT, ImportTime, measure_import_times, \
+    parse_import_times, total_us
+
+IMPORT_TIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _locale
+import time:       300 |        420 |   encodings
+import time:        50 |         50 | json
+Traceback lines and other output are ignored
+"""
+
+# Heavy dependencies of the backends that aren't selected
+BACKEND_MODULES = ('neo4j', 'atlasclient')
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_parse_import_times(self) -> None:
+        import_times = parse_import_times(IMPORT_TIME_OUTPUT)
+
+        self.assertEqual(import_times, [ImportTime(module='_locale', self_us=120, cumulative_us=120, depth=2),
+                                        ImportTime(module='encodings', self_us=300, cumulative_us=420, depth=1),
+                                        ImportTime(module='json', self_us=50, cumulative_us=50, depth=0)])
+        self.assertEqual(total_us(import_times), 50)
+
+    def test_package_import(self) -> None:
+        modules = {import_time.module for import_time in measure_import_times('import metadata_service')}
+
+        self.assertIn('metadata_service', modules)
+        for module in BACKEND_MODULES + ('statsd', 'metadata_service.api'):
+            self.assertNotIn(module, modules)
+
+    def test_create_app_imports_selected_backend_only(self) -> None:
+        # create_app creates the proxy client of the config
+        import_times = measure_import_times(CREATE_APP_STATEMENT, env={'PROXY_CLIENT': 'SQLITE',
+                                                                       'PROXY_HOST': ':memory:',
+                                                                       'PROXY_EAGER_INIT': 'true'})
+        modules = {import_time.module for import_time in import_times}
+
+        self.assertIn('metadata_service.proxy.sqlite_proxy', modules)
+        for module in BACKEND_MODULES:
+            self.assertNotIn(module, modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import metadata_service.proxy
+from metadata_service import config, create_app
+from metadata_service.tools.load_tester import LoggedRequest, RequestResult, RouteMatcher, UNMATCHED_ROUTE, \
+    parse_access_log_line, replay, summarize, wsgi_sender
+
+
+class TestLoadTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app.config[config.PROXY_CLIENT] = 'metadata_service.proxy.in_memory_proxy.InMemoryProxy'
+        self.app.config[config.PROXY_CLIENT_KWARGS] = {'synthetic': {'num_tables': 10, 'max_columns': 5}}
+        metadata_service.proxy._proxy_client = None
+
+    def tearDown(self) -> None:
+        metadata_service.proxy._proxy_client = None
+
+    def test_parse_access_log_line(self) -> None:
+        self.assertEqual(parse_access_log_line('{"method": "put", "path": "/table/a/tag/b", "body": {"x": 1}}'),
+                         LoggedRequest(method='PUT', path='/table/a/tag/b', body=b'{"x": 1}'))
+        self.assertEqual(parse_access_log_line('127.0.0.1 - - [10/Oct/2019:13:55:36 -0700] '
+                                               '"GET /popular_tables/?limit=5 HTTP/1.1" 200 2326 "-" "curl/7.54"'),
+                         LoggedRequest(method='GET', path='/popular_tables/?limit=5', body=None))
+        self.assertIsNone(parse_access_log_line('[2019-10-10 13:55:36] [INFO] Booting worker'))
+        self.assertIsNone(parse_access_log_line(''))
+
+    def test_replay(self) -> None:
+        requests = [
+            LoggedRequest(method='GET', path='/table/hive://gold.schema1/table1', body=None),
+            LoggedRequest(method='GET', path='/table/hive://gold.schema1/does_not_exist', body=None),
+            LoggedRequest(method='PUT', path='/table/hive://gold.schema1/table1/description/new', body=None),
+            LoggedRequest(method='GET', path='/does/not/exist', body=None),
+        ] * 3
+
+        results, duration_sec = replay(requests, wsgi_sender(self.app), RouteMatcher(self.app), concurrency=2)
+        report = summarize(results, duration_sec)
+
+        self.assertEqual([result.status for result in results[:4]], [200, 404, 200, 404])
+        self.assertEqual(list(report['routes'].keys()), ['/table/<path:table_uri>',
+                                                         '/table/<path:table_uri>/description/<path:description_val>',
+                                                         UNMATCHED_ROUTE])
+        self.assertEqual(report['routes']['/table/<path:table_uri>']['statuses'], {'200': 3, '404': 3})
+        self.assertEqual(report['total']['requests'], 12)
+        self.assertEqual(report['total']['errors'], 0)
+
+    def test_summarize(self) -> None:
+        results = [RequestResult(route='/tags/', status=200, elapsed_sec=sec / 1000.0) for sec in range(1, 101)]
+        results.append(RequestResult(route='/tags/', status=None, elapsed_sec=0.5))
+
+        report = summarize(results, 2.0)
+
+        summary = report['routes']['/tags/']
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['statuses'], {'200': 100, 'failed': 1})
+        self.assertAlmostEqual(summary['p50_ms'], 51)
+        self.assertAlmostEqual(summary['p99_ms'], 100)
+        self.assertAlmostEqual(summary['max_ms'], 500)
+        self.assertAlmostEqual(summary['requests_per_sec'], 50.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from metadata_service.popularity import np
+from metadata_service.tools.popularity_check import compare_popular_tables, graph_popular_tables, load_snapshot, \
+    recompute_popularity, save_snapshot
+
+DAY_SEC = 24 * 60 * 60
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestPopularityCheck(unittest.TestCase):
+
+    def test_compare(self) -> None:
+        # Read a lot by many users a year ago, read by a few users since
+        last_year = [('old', 50, 10000), ('recent', 11, 20), ('few_readers', 2, 10)]
+        now = [('old', 50, 10010), ('recent', 12, 2000), ('few_readers', 2, 500)]
+
+        popularity = recompute_popularity([(0, last_year), (365 * DAY_SEC, now)], half_life_sec=30 * DAY_SEC)
+        decayed = popularity.top(2)
+        graph = graph_popular_tables(now, 2)
+
+        self.assertEqual(decayed, ['recent', 'few_readers'])
+        self.assertEqual(graph, ['old', 'recent'])
+        self.assertEqual(compare_popular_tables(decayed, graph), {
+            'num_decayed': 2,
+            'num_graph': 2,
+            'num_both': 1,
+            'decayed_only': [{'table': 'few_readers', 'rank': 1}],
+            'graph_only': [{'table': 'old', 'rank': 0}],
+        })
+
+    def test_snapshot(self) -> None:
+        read_counts = [('hive://gold.schema/table', 12, 345)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'read_counts.json')
+            save_snapshot(path, 1000.0, read_counts)
+
+            self.assertEqual(load_snapshot(path), (1000.0, read_counts))
+
+
+if __name__ == '__main__':
+    unittest.main()
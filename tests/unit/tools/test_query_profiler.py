@@ -0,0 +1,65 @@
+import unittest
+
+from mock import patch, MagicMock
+from neo4j.v1 import GraphDatabase
+from neo4j.v1.result import ProfiledPlan
+
+from metadata_service import create_app
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.tools.query_profiler import profile_queries, summarize_plan
+
+
+class TestQueryProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        label_scan = ProfiledPlan('NodeByLabelScan@neo4j', ['tbl'], {'LabelName': ':Table'}, [], 100, 100)
+        index_seek = ProfiledPlan('NodeIndexSeek', ['user'], {}, [], 2, 1)
+        expand = ProfiledPlan('Expand(All)', ['tbl', 'user'], {}, [label_scan, index_seek], 10, 5)
+        self.plan = ProfiledPlan('ProduceResults', ['tbl'], {}, [expand], 0, 5)
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_summarize_plan(self) -> None:
+        actual = summarize_plan(self.plan)
+
+        self.assertEqual(actual['db_hits'], 112)
+        self.assertEqual(actual['rows'], 5)
+        self.assertEqual(actual['operators'], ['ProduceResults', 'Expand(All)', 'NodeByLabelScan', 'NodeIndexSeek'])
+        self.assertEqual(actual['full_scans'], ['NodeByLabelScan:Table'])
+
+    def test_profile_queries(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value.__enter__.return_value = mock_session
+            mock_session.run.return_value.consume.return_value.profile = self.plan
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            report = profile_queries(neo4j_proxy,
+                                     table_uri='dummy_uri',
+                                     column_name='dummy_column',
+                                     user_id='tester',
+                                     num_entries=2)
+
+            queries = report['queries']
+            self.assertIn('get_table._exec_col_query', queries)
+            self.assertIn('get_tags.get_tags', queries)
+            self.assertIn('get_table_by_user_relation[own].get_table_by_user_relation', queries)
+            self.assertEqual(queries['get_tags.get_tags']['full_scans'], ['NodeByLabelScan:Table'])
+
+            # Mocked results are empty, hence table is not found after profiling the first query
+            self.assertIn('get_table', report['errors'])
+
+            # Profiled statement is executed as usual, then restored
+            self.assertEqual(mock_session.run.call_count, len(queries))
+            self.assertEqual(mock_execute.call_count, len(queries))
+            self.assertEqual(mock_session.run.call_args[0][0][:8], 'PROFILE ')
+            self.assertNotIn('_execute_cypher_query', neo4j_proxy.__dict__)
+
+
+if __name__ == '__main__':
+    unittest.main()
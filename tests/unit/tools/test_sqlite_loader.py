@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import textwrap
+import unittest
+
+from metadata_service.tools.sqlite_loader import read_nodes, read_relations
+
+
+class TestSqliteLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dump_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.dump_dir, 'nodes'))
+        os.mkdir(os.path.join(self.dump_dir, 'relationships'))
+
+        with open(os.path.join(self.dump_dir, 'nodes', 'Column_0.csv'), 'w') as f:
+            f.write(textwrap.dedent("""\
+            name,KEY,type,sort_order:UNQUOTED,LABEL
+            bar_id_1,hive://gold.foo_schema/foo_table/bar_id_1,varchar,0,Column
+            """))
+        with open(os.path.join(self.dump_dir, 'relationships', 'Table_Column_COLUMN.csv'), 'w') as f:
+            f.write(textwrap.dedent("""\
+            END_KEY,START_LABEL,END_LABEL,START_KEY,TYPE,REVERSE_TYPE
+            hive://gold.foo_schema/foo_table/bar_id_1,Table,Column,hive://gold.foo_schema/foo_table,COLUMN,COLUMN_OF
+            """))
+        with open(os.path.join(self.dump_dir, 'relationships', 'User_Table_READ.csv'), 'w') as f:
+            f.write(textwrap.dedent("""\
+            END_KEY,START_LABEL,END_LABEL,START_KEY,TYPE,REVERSE_TYPE,read_count:UNQUOTED
+            tester,Table,User,hive://gold.foo_schema/foo_table,READ_BY,READ,5
+            """))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dump_dir)
+
+    def test_read_nodes(self) -> None:
+        actual = read_nodes(os.path.join(self.dump_dir, 'nodes'))
+
+        self.assertEqual(dict(actual), {'Column': {'hive://gold.foo_schema/foo_table/bar_id_1': {
+            'name': 'bar_id_1', 'type': 'varchar', 'sort_order': '0'}}})
+
+    def test_read_relations(self) -> None:
+        actual = read_relations(os.path.join(self.dump_dir, 'relationships'))
+
+        table_uri = 'hive://gold.foo_schema/foo_table'
+        self.assertEqual(actual[('Table', 'COLUMN', 'Column')], [(table_uri, table_uri + '/bar_id_1', {})])
+        self.assertEqual(actual[('Column', 'COLUMN_OF', 'Table')], [(table_uri + '/bar_id_1', table_uri, {})])
+        # Relation is found in the direction the proxy looks it up, regardless of the direction in the dump
+        self.assertEqual(actual[('User', 'READ', 'Table')], [('tester', table_uri, {'read_count': '5'})])
+
+
+if __name__ == '__main__':
+    unittest.main()